@@ -1,24 +1,89 @@
+import logging
+from typing import Union
 from fastapi import APIRouter, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
 from app.api.schemas import (
     RodCalculateRequest, RodCalculateResponse,
-    PlateCalculateRequest, PlateCalculateResponse,
+    PlateCalculateRequest, PlateCalculateResponse, PlateRemnantPlan,
     ScrapCalculateRequest, ScrapCalculateResponse,
+    RodBatchCalculateRequest, RodBatchCalculateResponse, RodBatchItemResult,
+    CuttingStockRequest, CuttingStockResponse,
+    PlateNestingRequest, PlateNestingResponse,
+    RodSweepRequest, RodSweepResponse,
+    RodStockMixRequest, RodStockMixResponse,
+    RodQuoteRequest, RodQuoteResponse,
+    RodPriceBreakRequest, RodPriceBreakResponse, PriceBreakPoint,
+    RodMaxQuantityRequest, RodMaxQuantityResponse,
     ErrorResponse, ValidationWarning, LegacyFieldSupport
 )
-from core_logic.rod import (
-    calculate_cross_sectional_area, calculate_bars_needed, calculate_material_total_weight,
-    calculate_product_total_weight, calculate_utilization_rate, calculate_total_cost, 
-    calculate_unit_cost, calculate_wastage, validate_rod_calculation
-)
-from core_logic.plate import (
-    calculate_plate_weight, calculate_plate_cost, calculate_unit_cost as plate_unit_cost,
-    calculate_utilization_rate as plate_utilization_rate, calculate_wastage as plate_wastage,
-    calculate_scrap_savings as plate_scrap_savings
-)
+from core_logic.rod import validate_rod_calculation
+from core_logic.rod_pipeline import run_rod_job
+from core_logic.plate import calculate_plate_values
+from core_logic.validation_utils import validate_plate_specific_inputs
 from core_logic.scrap import calculate_scrap_metrics, calculate_scrap_efficiency_metrics
+from core_logic.rod_batch import calculate_rod_batch, sweep_rod, price_breaks, PRICE_BREAK_FIELDS, ROW_OK, ROW_INPUT_ERROR
+from core_logic.cutting_stock import optimize_cutting_stock
+from core_logic.nesting import optimize_plate_nesting, plate_job
+from core_logic.stock_catalog import optimize_stock_mix
+from core_logic.rod_pooling import pool_rod_quote
+from core_logic.rod_inverse import solve_max_quantity
+from core_logic.remnant import plan_plate_with_remnants, plan_rod_with_remnants
+from app.api.remnant_router import get_plate_remnant_store, get_remnant_store
+from app.api.result_cache import result_cache
+from core_logic.column_master import column_registry
+from app.api.metrics import metrics
+from app.api.worker_status import worker_status
+from app.logging_setup import get_logger, log_event
 
 router = APIRouter()
+logger = get_logger("calculate")
+
+SWEEP_MAX_GRID_POINTS = 250000
+
+
+def _rod_input_error(critical_errors) -> ErrorResponse:
+    """봉재 입력값 오류 응답 (validate_rod_calculation 의 error)"""
+    return ErrorResponse(
+        status_code=400,
+        message="입력값 오류: " + "; ".join([w.message for w in critical_errors]),
+        suggestions=[w.suggestion for w in critical_errors if w.suggestion]
+    )
+
+
+def _rod_unusable_bar_error(detail: str = "제품 길이가 사용 가능한 봉재 길이보다 큽니다.") -> ErrorResponse:
+    """봉재 계산 불가 응답 (barsNeeded <= 0)"""
+    return ErrorResponse(
+        status_code=400,
+        message=f"계산 불가능: {detail}",
+        suggestions=["제품 길이를 줄이거나", "절단 손실을 줄이거나", "더 긴 표준 봉재를 사용하세요"]
+    )
+
+
+def _plate_unusable_sheet_error(message: str) -> ErrorResponse:
+    """판재 네스팅 불가 응답 (부품이 원판보다 큼)"""
+    return ErrorResponse(
+        status_code=400,
+        message=f"계산 불가능: {message}",
+        suggestions=["부품 치수를 확인하거나", "가장자리 손실을 줄이거나", "더 큰 원판을 사용하세요"]
+    )
+
+
+def rod_batch_row_result(row) -> RodBatchItemResult:
+    """calculate_rod_batch 행 결과 → /calculate/rod 와 같은 응답/오류 모델"""
+    if row["status"] == ROW_OK:
+        result = RodCalculateResponse(
+            **column_registry.round_output(dict(row["values"])),
+            isPlate=False,
+            warnings=row["warnings"],
+            suggestions=[]
+        )
+        return RodBatchItemResult(index=row["index"], success=True, result=result)
+    if row["status"] == ROW_INPUT_ERROR:
+        critical_errors = [w for w in row["warnings"] if w.type == "error"]
+        return RodBatchItemResult(index=row["index"], success=False, error=_rod_input_error(critical_errors))
+    return RodBatchItemResult(index=row["index"], success=False, error=_rod_unusable_bar_error())
+
 
 @router.post('/calculate/rod', response_model=RodCalculateResponse, response_model_exclude_none=True, responses={400: {"model": ErrorResponse}})
 async def calculate_rod(request: RodCalculateRequest):
@@ -27,100 +92,65 @@ async def calculate_rod(request: RodCalculateRequest):
     
     # 컬럼마스터 별칭 지원
     data = LegacyFieldSupport.apply_aliases(data)
+
+    # 동일 요청 결과 재사용 (잔재 재고를 쓰는 요청은 상태에 의존하므로 제외)
+    cache_key = None if data.get('useRemnants') else result_cache.make_key('rod', data)
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
     try:
-        # 1. 사전 입력값 검증 (컬럼마스터 기준)
-        input_warnings = validate_rod_calculation(data)
-        
-        # 심각한 오류가 있으면 계산 중단
-        critical_errors = [w for w in input_warnings if w.type == "error"]
+        # 입력을 한 번만 변환해 모든 값을 한 번에 계산 (core_logic.rod_pipeline)
+        job = run_rod_job(data, metrics.rod_stage_observers)
+
+        # 1. 사전 입력값 검증 (컬럼마스터 기준) - 심각한 오류가 있으면 계산 결과를 쓰지 않음
+        critical_errors = [w for w in job.input_warnings if w.type == "error"]
         if critical_errors:
-            error_message = "입력값 오류: " + "; ".join([w.message for w in critical_errors])
-            return JSONResponse(
-                status_code=400,
-                content=ErrorResponse(
-                    status_code=400, 
-                    message=error_message,
-                    suggestions=[w.suggestion for w in critical_errors if w.suggestion]
-                ).model_dump()
-            )
-        
-        # 2. 계산 수행
-        bars_needed = calculate_bars_needed(data)
-        data['barsNeeded'] = bars_needed
+            return JSONResponse(status_code=400, content=_rod_input_error(critical_errors).model_dump())
         
         # 봉재가 필요하지 않은 경우 (계산 불가능한 조건)
-        if bars_needed <= 0:
-            return JSONResponse(
-                status_code=400,
-                content=ErrorResponse(
-                    status_code=400, 
-                    message="계산 불가능: 제품 길이가 사용 가능한 봉재 길이보다 큽니다.",
-                    suggestions=["제품 길이를 줄이거나", "절단 손실을 줄이거나", "더 긴 표준 봉재를 사용하세요"]
-                ).model_dump()
-            )
-        
-        material_total_weight = calculate_material_total_weight(data)
-        data['materialTotalWeight'] = material_total_weight
-        
-        product_total_weight = calculate_product_total_weight(data)
-        data['totalWeight'] = product_total_weight
-        total_cost = calculate_total_cost(data)
-        data['totalCost'] = total_cost
-        
-        # 활용률 계산 (컬럼마스터 제약조건: 0-100% 범위)
-        utilization_rate = calculate_utilization_rate(data)
-        data['utilizationRate'] = utilization_rate
-        wastage = calculate_wastage(data)
-
-        # 스크랩 계산 (컬럼마스터 scrap_condition 검증)
-        scrap_result = calculate_scrap_metrics(data)
-        scrap_weight = scrap_result.get('scrapWeight', 0.0)
-        scrap_savings = scrap_result.get('scrapSavings', 0.0)
-        real_cost = scrap_result.get('realCost', total_cost)
-        scrap_warnings = scrap_result.get('warnings', [])
-        
-        # 스크랩 계산에서 업데이트된 제품 총중량 적용
-        updated_total_weight = scrap_result.get('updatedTotalWeight')
-        if updated_total_weight is not None:
-            product_total_weight = updated_total_weight
-            data['totalWeight'] = product_total_weight  # 데이터도 업데이트
-        
-        # 개당 단가는 항상 원재료 기준(스크랩 미반영)
-        unit_cost = calculate_unit_cost(data)
+        if job.bars_needed <= 0:
+            return JSONResponse(status_code=400, content=_rod_unusable_bar_error().model_dump())
 
         # 모든 경고 메시지 통합
-        all_warnings = input_warnings + scrap_warnings
-        
-        # 새로운 필드 계산
-        is_plate = False
-        total_actual_product_weight = scrap_result.get('totalActualProductWeight')
+        all_warnings = job.warnings
 
+        # 잔재 우선 사용 계획 (요청 시)
+        remnant_plan = None
+        if data.get('useRemnants'):
+            # 잔재 재고는 SQLite (app.storage.remnant_store) - 이벤트 루프 밖에서
+            remnant_plan = await run_in_threadpool(
+                plan_rod_with_remnants, get_remnant_store(), data, consume=bool(data.get('consumeRemnants'))
+            )
+            if remnant_plan is None:
+                all_warnings.append(ValidationWarning(
+                    type="info",
+                    field="material",
+                    message="잔재를 사용하려면 재질(material)을 입력해야 합니다.",
+                    suggestion="재질명을 입력하면 잔재 재고를 먼저 사용합니다."
+                ))
+        
+        # 컬럼마스터 precision.rounding 적용
+        values = column_registry.round_output(job.values())
         response = RodCalculateResponse(
-            barsNeeded=bars_needed,
-            materialTotalWeight=material_total_weight,
-            totalWeight=product_total_weight,
-            totalCost=total_cost,
-            unitCost=unit_cost,
-            utilizationRate=utilization_rate,
-            wastage=wastage,
-            scrapWeight=scrap_weight,
-            scrapSavings=scrap_savings,
-            realCost=real_cost,
-            isPlate=is_plate,
-            totalActualProductWeight=total_actual_product_weight,
+            **values,
+            isPlate=False,
+            remnantPlan=remnant_plan,
             warnings=all_warnings,
             suggestions=[]  # 최적화 제안 삭제
         )
         
         # 경고가 있으면 로그에 기록
         if all_warnings:
-            print(f"Rod calculation warnings: {[w.message for w in all_warnings]}")
-        
+            log_event(logger, logging.WARNING, "Rod calculation warnings", sample_key="rod.warnings",
+                      calculation="rod", warnings=[w.message for w in all_warnings])
+
+        result_cache.set(cache_key, response)
         return response
         
     except Exception as e:
-        print(f"Rod calculation error: {str(e)}")
+        log_event(logger, logging.ERROR, "Rod calculation error", exc_info=True, calculation="rod", error=str(e))
+        metrics.record_exception("rod", e)
         return JSONResponse(
             status_code=400, 
             content=ErrorResponse(
@@ -130,6 +160,341 @@ async def calculate_rod(request: RodCalculateRequest):
             ).model_dump()
         )
 
+@router.post('/calculate/rod/batch', response_model=RodBatchCalculateResponse, response_model_exclude_none=True, responses={400: {"model": ErrorResponse}})
+async def calculate_rod_batch_endpoint(request: RodBatchCalculateRequest):
+    """봉재 일괄 계산 API - 다건 요청을 배열 연산 한 번으로 처리 (결과는 /calculate/rod 와 동일)"""
+    rows = [LegacyFieldSupport.apply_aliases(item.model_dump()) for item in request.items]
+
+    try:
+        row_results = calculate_rod_batch(rows)
+    except Exception as e:
+        log_event(logger, logging.ERROR, "Rod batch calculation error", exc_info=True, calculation="rod_batch", error=str(e))
+        metrics.record_exception("rod_batch", e)
+        return JSONResponse(
+            status_code=400,
+            content=ErrorResponse(
+                status_code=400,
+                message=f"일괄 계산 오류: {str(e)}",
+                suggestions=["입력값을 확인하고 다시 시도해주세요"]
+            ).model_dump()
+        )
+
+    results = [rod_batch_row_result(row) for row in row_results]
+    succeeded = sum(1 for r in results if r.success)
+    return RodBatchCalculateResponse(
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results
+    )
+
+def _rounded_grid(key: str, grid) -> list:
+    """스윕 격자 1개를 /calculate/rod 와 같은 자릿수로 반올림한 2차원 목록"""
+    return [column_registry.round_values(key, row) for row in grid[key].tolist()]
+
+
+def _sweep_response(data, x_field, x_values, y_field, y_values) -> Response:
+    """스윕 계산 → 직렬화한 RodSweepResponse 본문 (스레드풀에서 실행)"""
+    grid = sweep_rod(data, x_field, x_values, y_field, y_values)
+    response = RodSweepResponse(
+        xField=x_field,
+        xValues=x_values,
+        yField=y_field,
+        yValues=y_values,
+        barsNeeded=grid["barsNeeded"].tolist(),
+        totalCost=_rounded_grid("totalCost", grid),
+        utilizationRate=_rounded_grid("utilizationRate", grid),
+        realCost=_rounded_grid("realCost", grid),
+        unitCost=_rounded_grid("unitCost", grid)
+    )
+    return Response(content=response.model_dump_json(exclude_none=True), media_type="application/json")
+
+
+@router.post('/calculate/rod/sweep', response_model=RodSweepResponse, response_model_exclude_none=True, responses={400: {"model": ErrorResponse}})
+async def calculate_rod_sweep(request: RodSweepRequest):
+    """봉재 파라미터 스윕 API - 표준 봉재 길이/절단 손실/헤드컷/테일컷/수량 변화에 따른 비용 곡선을 한 번에 계산"""
+    data = LegacyFieldSupport.apply_aliases(request.base.model_dump())
+    y_field = request.y.field if request.y else None
+    y_values = request.y.values if request.y else None
+
+    if len(request.x.values) * (len(y_values) if y_values else 1) > SWEEP_MAX_GRID_POINTS:
+        return JSONResponse(
+            status_code=400,
+            content=ErrorResponse(
+                status_code=400,
+                message=f"격자 크기가 너무 큽니다 (최대 {SWEEP_MAX_GRID_POINTS}개).",
+                suggestions=["축의 범위를 줄이거나 간격을 늘리세요"]
+            ).model_dump()
+        )
+
+    try:
+        # 50만 칸 격자면 계산/반올림/직렬화가 1초 넘게 걸리므로 JSON 본문까지 이벤트 루프 밖에서 만든다
+        return await run_in_threadpool(_sweep_response, data, request.x.field, request.x.values, y_field, y_values)
+    except Exception as e:
+        log_event(logger, logging.ERROR, "Rod sweep error", exc_info=True, calculation="rod_sweep", error=str(e))
+        metrics.record_exception("rod_sweep", e)
+        return JSONResponse(
+            status_code=400,
+            content=ErrorResponse(
+                status_code=400,
+                message=f"스윕 계산 오류: {str(e)}",
+                suggestions=["입력값을 확인하고 다시 시도해주세요"]
+            ).model_dump()
+        )
+
+@router.post('/calculate/rod/price-breaks', response_model=RodPriceBreakResponse, responses={400: {"model": ErrorResponse}})
+async def calculate_rod_price_breaks(request: RodPriceBreakRequest):
+    """수량별 가격표 API - 여러 수량의 개당 단가/실제 재료비/활용률과 마지막 봉재가 꽉 차는 수량(sweet spot)을 한 번에 계산"""
+    data = LegacyFieldSupport.apply_aliases(request.base.model_dump())
+
+    try:
+        breaks = price_breaks(data, request.quantities, request.maxSweetSpots)
+    except Exception as e:
+        log_event(logger, logging.ERROR, "Price break error", exc_info=True, calculation="rod_price_breaks", error=str(e))
+        metrics.record_exception("rod_price_breaks", e)
+        return JSONResponse(
+            status_code=400,
+            content=ErrorResponse(
+                status_code=400,
+                message=f"가격표 계산 오류: {str(e)}",
+                suggestions=["입력값을 확인하고 다시 시도해주세요"]
+            ).model_dump()
+        )
+
+    if breaks is None:
+        return JSONResponse(status_code=400, content=_rod_unusable_bar_error().model_dump())
+
+    curve = {key: column_registry.round_values(key, breaks[key].tolist()) for key in PRICE_BREAK_FIELDS}
+    sweet = {key: column_registry.round_values(key, breaks["sweetSpots"][key].tolist()) for key in PRICE_BREAK_FIELDS}
+    return RodPriceBreakResponse(
+        piecesPerBar=breaks["piecesPerBar"],
+        quantities=breaks["quantities"].tolist(),
+        fullBarQuantity=breaks["fullBarQuantity"].tolist(),
+        sweetSpotCount=breaks["sweetSpotCount"],
+        sweetSpots=[
+            PriceBreakPoint(quantity=quantity, **{key: sweet[key][i] for key in PRICE_BREAK_FIELDS})
+            for i, quantity in enumerate(breaks["sweetSpots"]["quantity"].tolist())
+        ],
+        **curve
+    )
+
+@router.post('/calculate/rod/max-quantity', response_model=RodMaxQuantityResponse, responses={400: {"model": ErrorResponse}})
+async def calculate_rod_max_quantity(request: RodMaxQuantityRequest):
+    """역계산 API - 보유 봉재 수/재료 중량/예산으로 만들 수 있는 최대 수량 (스크랩 회수액 반영 선택)"""
+    data = LegacyFieldSupport.apply_aliases(request.model_dump())
+
+    try:
+        result = solve_max_quantity(data)
+    except ValueError as e:
+        return JSONResponse(
+            status_code=400,
+            content=ErrorResponse(status_code=400, message=str(e), suggestions=["한도 또는 단가 입력값을 확인하세요"]).model_dump()
+        )
+    except Exception as e:
+        log_event(logger, logging.ERROR, "Max quantity error", exc_info=True, calculation="rod_max_quantity", error=str(e))
+        metrics.record_exception("rod_max_quantity", e)
+        return JSONResponse(
+            status_code=400,
+            content=ErrorResponse(
+                status_code=400,
+                message=f"역계산 오류: {str(e)}",
+                suggestions=["입력값을 확인하고 다시 시도해주세요"]
+            ).model_dump()
+        )
+
+    if result is None:
+        return JSONResponse(status_code=400, content=_rod_unusable_bar_error().model_dump())
+
+    return RodMaxQuantityResponse(**column_registry.round_output(result))
+
+def _round_stock_mix(result: dict) -> dict:
+    """길이 조합 결과 반올림 - 길이별 단독 구매, 최적 조합, 조합 내 길이별 값 모두 컬럼마스터 자릿수로"""
+    for option in result["options"]:
+        column_registry.round_output(option)
+    column_registry.round_output(result["optimal"])
+    for entry in result["optimal"]["mix"]:
+        column_registry.round_output(entry)
+    result["savingsVsBestSingle"] = column_registry.round_values("totalCost", [result["savingsVsBestSingle"]])[0]
+    return result
+
+@router.post('/calculate/rod/stock-mix', response_model=RodStockMixResponse, responses={400: {"model": ErrorResponse}})
+async def calculate_rod_stock_mix(request: RodStockMixRequest):
+    """표준 봉재 길이 카탈로그 최적화 API - 길이별 단가가 다를 때 주문 수량을 채우는 최저가 길이 조합"""
+    data = LegacyFieldSupport.apply_aliases(request.model_dump())
+    catalog = data.pop('catalog')
+
+    try:
+        result = optimize_stock_mix(data, catalog)
+    except Exception as e:
+        log_event(logger, logging.ERROR, "Stock mix error", exc_info=True, calculation="rod_stock_mix", error=str(e))
+        metrics.record_exception("rod_stock_mix", e)
+        return JSONResponse(
+            status_code=400,
+            content=ErrorResponse(
+                status_code=400,
+                message=f"봉재 길이 조합 계산 오류: {str(e)}",
+                suggestions=["입력값을 확인하고 다시 시도해주세요"]
+            ).model_dump()
+        )
+
+    if result["optimal"] is None:
+        return JSONResponse(status_code=400, content=_rod_unusable_bar_error().model_dump())
+
+    return RodStockMixResponse(**_round_stock_mix(result))
+
+@router.post('/calculate/rod/cutting-plan', response_model=CuttingStockResponse, responses={400: {"model": ErrorResponse}})
+async def calculate_cutting_plan(request: CuttingStockRequest):
+    """다품종 절단 계획 API - 길이가 다른 제품을 같은 봉재에 섞어 배치해 필요한 봉재 수를 최소화"""
+    data = request.model_dump()
+
+    try:
+        # 제품 수십만 개면 수백 ms 걸리는 계산이라 이벤트 루프 밖에서
+        plan = await run_in_threadpool(optimize_cutting_stock, data)
+    except ValueError as e:
+        return JSONResponse(
+            status_code=400,
+            content=ErrorResponse(
+                status_code=400,
+                message=f"절단 계획 오류: {str(e)}",
+                suggestions=["제품 길이 종류나 수량을 줄여 나눠서 계산하세요"]
+            ).model_dump()
+        )
+    except Exception as e:
+        log_event(logger, logging.ERROR, "Cutting plan error", exc_info=True, calculation="cutting_plan", error=str(e))
+        metrics.record_exception("cutting_plan", e)
+        return JSONResponse(
+            status_code=400,
+            content=ErrorResponse(
+                status_code=400,
+                message=f"절단 계획 오류: {str(e)}",
+                suggestions=["입력값을 확인하고 다시 시도해주세요"]
+            ).model_dump()
+        )
+
+    if plan["barsNeeded"] <= 0:
+        return JSONResponse(status_code=400, content=_rod_unusable_bar_error().model_dump())
+
+    return CuttingStockResponse(**plan)
+
+def _round_quote(values: dict) -> dict:
+    """견적 값 반올림 - 행별 계산 대비 금액/비율은 totalCost/utilizationRate 와 같은 자릿수"""
+    column_registry.round_output(values)
+    for key, like in (("totalCostAlone", "totalCost"), ("costSaved", "totalCost"), ("savingRate", "utilizationRate")):
+        if key in values:
+            values[key] = column_registry.round_values(like, [values[key]])[0]
+    if "allocatedBars" in values:
+        values["allocatedBars"] = round(values["allocatedBars"], 3)
+    return values
+
+
+@router.post('/calculate/rod/quote', response_model=RodQuoteResponse, responses={400: {"model": ErrorResponse}})
+async def calculate_rod_quote(request: RodQuoteRequest):
+    """여러 행 봉재 견적 API - 같은 재질/형상/규격 행의 남는 제품을 공동 봉재로 모으고 봉재 수와 비용을 행별로 배분"""
+    lines = [LegacyFieldSupport.apply_aliases(line.model_dump()) for line in request.lines]
+
+    try:
+        quote = await run_in_threadpool(pool_rod_quote, lines)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content=_rod_unusable_bar_error(str(e)).model_dump())
+    except Exception as e:
+        log_event(logger, logging.ERROR, "Rod quote error", exc_info=True, calculation="rod_quote", error=str(e))
+        metrics.record_exception("rod_quote", e)
+        return JSONResponse(
+            status_code=400,
+            content=ErrorResponse(
+                status_code=400,
+                message=f"견적 계산 오류: {str(e)}",
+                suggestions=["입력값을 확인하고 다시 시도해주세요"]
+            ).model_dump()
+        )
+
+    for values in [quote, *quote["groups"], *quote["lines"]]:
+        _round_quote(values)
+    return RodQuoteResponse(**quote)
+
+@router.post('/calculate/plate/nesting', response_model=PlateNestingResponse, responses={400: {"model": ErrorResponse}})
+async def calculate_plate_nesting(request: PlateNestingRequest):
+    """판재 네스팅 API - 여러 크기의 부품을 원판에 배치해 필요한 원판 수, 배치도, 원판 기준 재료비 계산"""
+    data = LegacyFieldSupport.apply_aliases(request.model_dump())
+
+    try:
+        # 부품 수천 개면 수백 ms 걸리는 계산이라 이벤트 루프 밖에서
+        plan = await run_in_threadpool(optimize_plate_nesting, data)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content=_plate_unusable_sheet_error(str(e)).model_dump())
+    except Exception as e:
+        log_event(logger, logging.ERROR, "Plate nesting error", exc_info=True, calculation="plate_nesting", error=str(e))
+        metrics.record_exception("plate_nesting", e)
+        return JSONResponse(
+            status_code=400,
+            content=ErrorResponse(
+                status_code=400,
+                message=f"네스팅 계산 오류: {str(e)}",
+                suggestions=["입력값을 확인하고 다시 시도해주세요"]
+            ).model_dump()
+        )
+
+    return PlateNestingResponse(**column_registry.round_output(plan))
+
+def plate_response(data) -> Union[PlateCalculateResponse, ErrorResponse]:
+    """판재 계산 (결과 캐시/잔재 재고 없음) → /calculate/plate 와 같은 응답 또는 오류 모델 - data 는 별칭 적용 후"""
+    # 1. 입력값 검증 (판재 특화)
+    plate_validation = validate_plate_specific_inputs(data)
+    errors = plate_validation["errors"]
+    if errors:
+        # 심각한 오류가 있으면 계산 중단
+        return ErrorResponse(
+            status_code=400,
+            message="입력값 오류: " + "; ".join(errors),
+            suggestions=["입력값을 확인하고 다시 시도해주세요"]
+        )
+
+    # 2. 계산 수행 - 원판 크기가 있으면 네스팅한 원판 수 × 원판 중량 기준, 스크랩 회수액 반영 (core_logic.plate)
+    try:
+        plate_values, sheet_plan = calculate_plate_values(data)
+    except ValueError as e:
+        return _plate_unusable_sheet_error(str(e))
+
+    return PlateCalculateResponse(
+        **column_registry.round_output(plate_values),
+        sheetsNeeded=sheet_plan["sheetsNeeded"] if sheet_plan else None,
+        remnantCount=sheet_plan["remnantCount"] if sheet_plan else None,
+        isPlate=True,
+        warnings=[ValidationWarning(type="info", field=None, message=w, suggestion=None)
+                  for w in plate_validation["warnings"]],
+        suggestions=[]  # 최적화 제안 삭제
+    )
+
+
+def scrap_response(data) -> ScrapCalculateResponse:
+    """스크랩 계산 (결과 캐시 없음) → /calculate/scrap 과 같은 응답 모델"""
+    scrap_result = calculate_scrap_metrics(data)
+    scrap_weight = scrap_result.get('scrapWeight', 0.0)
+    scrap_savings = scrap_result.get('scrapSavings', 0.0)
+    real_cost = scrap_result.get('realCost') if scrap_result.get('realCost') is not None else data.get('totalCost', 0.0)
+    unit_cost = scrap_result.get('unitCost', 0.0)
+
+    # 업데이트된 제품 총중량 및 실제 제품 총중량 추가
+    updated_total_weight = scrap_result.get('updatedTotalWeight')
+    total_actual_product_weight = scrap_result.get('totalActualProductWeight')
+
+    values = column_registry.round_output({
+        "scrapWeight": scrap_weight,
+        "scrapSavings": scrap_savings,
+        "realCost": real_cost,
+        "unitCost": unit_cost,
+        "totalActualProductWeight": total_actual_product_weight,  # 실제 제품 총중량
+    })
+    # 업데이트된 제품 총중량은 totalWeight 와 같은 자릿수
+    if updated_total_weight is not None:
+        updated_total_weight = round(updated_total_weight, column_registry.rounding["totalWeight"])
+    return ScrapCalculateResponse(
+        **values,
+        updatedTotalWeight=updated_total_weight,  # 업데이트된 제품 총중량
+        warnings=scrap_result.get('warnings', [])
+    )
+
+
 @router.post('/calculate/plate', response_model=PlateCalculateResponse, response_model_exclude_none=True, responses={400: {"model": ErrorResponse}})
 async def calculate_plate(request: PlateCalculateRequest):
     """판재 계산 API - 컬럼마스터 v2.1 기준 + 검증 시스템"""
@@ -137,110 +502,94 @@ async def calculate_plate(request: PlateCalculateRequest):
     
     # 컬럼마스터 별칭 지원
     data = LegacyFieldSupport.apply_aliases(data)
+
+    # 동일 요청 결과 재사용 (잔재 재고를 쓰는 요청은 상태에 의존하므로 제외)
+    cache_key = None if data.get('useRemnants') else result_cache.make_key('plate', data)
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
     try:
-        # 1. 입력값 검증 (판재 특화)
-        warnings = []
-        
-        # 기본 제약조건 검증
-        from core_logic.validation_utils import validate_plate_specific_inputs
-        plate_validation = validate_plate_specific_inputs(data)
-        warnings.extend(plate_validation["warnings"])
-        
-        # 심각한 오류가 있으면 계산 중단
-        errors = plate_validation["errors"]
-        if errors:
-            error_message = "입력값 오류: " + "; ".join(errors)
-            return JSONResponse(
-                status_code=400, 
-                content=ErrorResponse(
-                    status_code=400, 
-                    message=error_message,
-                    suggestions=["입력값을 확인하고 다시 시도해주세요"]
-                ).model_dump()
+        response = plate_response(data)
+        if isinstance(response, ErrorResponse):
+            return JSONResponse(status_code=400, content=response.model_dump())
+
+        # 잔재 우선 사용 계획 (요청 시)
+        if data.get('useRemnants'):
+            remnant_plan = await run_in_threadpool(
+                plan_plate_with_remnants, get_plate_remnant_store(), plate_job(data),
+                consume=bool(data.get('consumeRemnants'))
             )
-        
-        # 2. 계산 수행
-        total_weight = calculate_plate_weight(data)
-        data['totalWeight'] = total_weight
-        total_cost = calculate_plate_cost(data)
-        data['totalCost'] = total_cost
-        unit_cost = plate_unit_cost(data)
-        utilization_rate = plate_utilization_rate(data)  # 판재는 100%
-        wastage = plate_wastage(data)  # 판재는 0%
-        
-        # 판재는 스크랩 관련 값을 계산하지 않음 → 기본값
-        scrap_savings = 0.0
-        real_cost = total_cost
-
-        # 새로운 필드 계산
-        is_plate = True
-        total_actual_product_weight = None
-
-        response = PlateCalculateResponse(
-            totalWeight=total_weight,
-            totalCost=total_cost,
-            unitCost=unit_cost,
-            utilizationRate=utilization_rate,
-            wastage=wastage,
-            scrapSavings=scrap_savings,
-            realCost=real_cost,
-            isPlate=is_plate,
-            totalActualProductWeight=total_actual_product_weight,
-            warnings=[ValidationWarning(type="info", field=None, message=w, suggestion=None) for w in warnings],
-            suggestions=[]  # 최적화 제안 삭제
-        )
+            if remnant_plan is not None:
+                response.remnantPlan = PlateRemnantPlan(**remnant_plan)
+            else:
+                response.warnings.append(ValidationWarning(
+                    type="info",
+                    field="material",
+                    message="잔재를 사용하려면 재질(material)과 원판 크기(sheetWidth, sheetLength)를 입력해야 합니다.",
+                    suggestion="재질명과 원판 크기를 입력하면 판재 잔재 재고를 먼저 사용합니다."
+                ))
         
         # 경고가 있으면 로그에 기록
-        if warnings:
-            print(f"Plate calculation warnings: {warnings}")
-        
+        if response.warnings:
+            log_event(logger, logging.WARNING, "Plate calculation warnings", sample_key="plate.warnings",
+                      calculation="plate", warnings=[w.message for w in response.warnings])
+
+        result_cache.set(cache_key, response)
         return response
         
     except Exception as e:
-        print(f"Plate calculation error: {str(e)}")
+        log_event(logger, logging.ERROR, "Plate calculation error", exc_info=True, calculation="plate", error=str(e))
+        metrics.record_exception("plate", e)
         raise HTTPException(status_code=400, detail=f"계산 오류: {str(e)}")
 
 @router.post('/calculate/scrap', response_model=ScrapCalculateResponse, response_model_exclude_none=True, responses={400: {"model": ErrorResponse}})
 async def calculate_scrap(request: ScrapCalculateRequest):
     """스크랩 계산 API - 컬럼마스터 v2.1 기준"""
     data = request.dict()
+
+    cache_key = result_cache.make_key('scrap', data)
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
     try:
-        scrap_result = calculate_scrap_metrics(data)
-        scrap_weight = scrap_result.get('scrapWeight', 0.0)
-        scrap_savings = scrap_result.get('scrapSavings', 0.0)
-        real_cost = scrap_result.get('realCost') if scrap_result.get('realCost') is not None else data.get('totalCost', 0.0)
-        unit_cost = scrap_result.get('unitCost', 0.0)
-        warnings = scrap_result.get('warnings', [])
-        
-        # 업데이트된 제품 총중량 및 실제 제품 총중량 추가
-        updated_total_weight = scrap_result.get('updatedTotalWeight')
-        total_actual_product_weight = scrap_result.get('totalActualProductWeight')
-        
-        response = ScrapCalculateResponse(
-            scrapWeight=scrap_weight,
-            scrapSavings=scrap_savings,
-            realCost=real_cost,
-            unitCost=unit_cost,
-            updatedTotalWeight=updated_total_weight,  # 업데이트된 제품 총중량
-            totalActualProductWeight=total_actual_product_weight,  # 실제 제품 총중량
-            warnings=warnings
-        )
+        response = scrap_response(data)
         
         # 경고가 있으면 로그에 기록
-        if warnings:
-            print(f"Scrap calculation warnings: {[w.message for w in warnings]}")
-        
+        if response.warnings:
+            log_event(logger, logging.WARNING, "Scrap calculation warnings", sample_key="scrap.warnings",
+                      calculation="scrap", warnings=[w.message for w in response.warnings])
+
+        result_cache.set(cache_key, response)
         return response
         
     except Exception as e:
-        print(f"Scrap calculation error: {str(e)}")
+        log_event(logger, logging.ERROR, "Scrap calculation error", exc_info=True, calculation="scrap", error=str(e))
+        metrics.record_exception("scrap", e)
         raise HTTPException(status_code=400, detail=f"스크랩 계산 오류: {str(e)}")
 
 @router.get('/health')
 async def health():
-    return {"status": "ok", "version": "v2.1", "column_master_compliant": True}
+    workers = await run_in_threadpool(worker_status.cluster)
+    return {
+        "status": "draining" if worker_status.draining else "ok",
+        "version": "v2.1",
+        "column_master_compliant": True,
+        "result_cache": result_cache.stats(),
+        # 이 요청을 처리한 워커 + (여러 워커로 띄운 경우) 전체 워커 준비 상태
+        "worker": worker_status.snapshot(),
+        "workers": workers,
+        "ready_workers": None if workers is None else sum(1 for w in workers if w["ready"]),
+    }
+
+@router.get('/ready')
+async def ready():
+    """로드밸런서 준비 확인 - 이 워커가 시작을 마쳤고 종료 중이 아니면 200, 아니면 503"""
+    if worker_status.ready and not worker_status.draining:
+        return {"ready": True, "pid": worker_status.pid}
+    return JSONResponse(status_code=503, content={"ready": False, "pid": worker_status.pid,
+                                                  "draining": worker_status.draining})
 
 @router.post('/validate')
 async def validate_inputs(data: dict):
@@ -264,6 +613,11 @@ async def validate_inputs(data: dict):
             errors = validation_result["errors"]
             warning_messages = validation_result["warnings"]
             suggestions = ["판재 규격을 확인해주세요"] if errors else []
+
+        # 컬럼마스터 required_when 기준 필수 입력값
+        missing = column_registry.missing_required(data, "rod" if material_type == "rod" else "sheet")
+        if missing:
+            errors = [f"필수 입력값 누락: {', '.join(missing)}"] + errors
         
         return {
             "valid": len(errors) == 0,
@@ -273,6 +627,7 @@ async def validate_inputs(data: dict):
             "column_master_version": "v2.1"
         }
     except Exception as e:
+        metrics.record_exception("validate", e)
         return {
             "valid": False,
             "errors": [f"검증 중 오류 발생: {str(e)}"],
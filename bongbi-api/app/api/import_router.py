@@ -0,0 +1,83 @@
+import logging
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+from fastapi import APIRouter, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse
+from starlette.background import BackgroundTask
+
+from app.api.schemas import ErrorResponse
+from app.logging_setup import get_logger, log_event
+from core_logic.order_import import import_orders, detect_format
+
+router = APIRouter(prefix="/import", tags=["import"])
+logger = get_logger("import")
+
+# 주문 스프레드시트 업로드 → 계산 결과 열을 덧붙인 파일 반환
+# 계산은 기본으로 요청 스레드(스레드풀)에서 한다 - gunicorn 워커마다 CPU 수만큼 프로세스를 띄우지 않도록
+# 환경변수: IMPORT_WORKERS (1 이하면 현재 프로세스, 2 이상이면 그 수의 공유 워커 프로세스 풀, 기본 1)
+
+IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", "1"))
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _import_error(message: str, suggestions=None) -> JSONResponse:
+    return JSONResponse(
+        status_code=400,
+        content=ErrorResponse(
+            status_code=400,
+            message=message,
+            suggestions=suggestions or ["CSV 또는 XLSX 파일의 첫 행에 컬럼마스터 머리글(key 또는 한글 라벨)이 있는지 확인하세요"]
+        ).model_dump()
+    )
+
+
+@router.post('/orders', responses={400: {"model": ErrorResponse}})
+async def import_order_sheet(file: UploadFile = File(...), outputFormat: Optional[str] = None):
+    """
+    주문 스프레드시트(CSV/XLSX) 일괄 계산 API
+    머리글을 컬럼마스터 key/라벨/별칭으로 매핑해 행별로 봉재/판재 계산 후 결과 파일 반환
+    처리 요약은 X-Import-Total / X-Import-Succeeded / X-Import-Failed 헤더로 전달
+    """
+    try:
+        input_format = detect_format(file.filename)
+        output_format = detect_format(f"out.{outputFormat}") if outputFormat else input_format
+    except ValueError as e:
+        return _import_error(str(e), ["csv 또는 xlsx 파일을 업로드하세요"])
+
+    work_dir = tempfile.mkdtemp(prefix="bongbi-import-")
+    input_path = os.path.join(work_dir, f"input.{input_format}")
+    output_path = os.path.join(work_dir, f"result.{output_format}")
+    cleanup = BackgroundTask(shutil.rmtree, work_dir, ignore_errors=True)
+
+    try:
+        with open(input_path, "wb") as f:
+            await run_in_threadpool(shutil.copyfileobj, file.file, f)
+        summary = await run_in_threadpool(import_orders, input_path, output_path, IMPORT_WORKERS)
+    except (ValueError, RuntimeError) as e:
+        await cleanup()
+        return _import_error(f"가져오기 오류: {str(e)}")
+    except Exception as e:
+        log_event(logger, logging.ERROR, "Order import error", exc_info=True, error=str(e))
+        await cleanup()
+        return _import_error(f"가져오기 오류: {str(e)}", ["파일 내용을 확인하고 다시 시도해주세요"])
+
+    base_name = os.path.splitext(os.path.basename(file.filename))[0] or "orders"
+    return FileResponse(
+        output_path,
+        media_type=MEDIA_TYPES[output_format],
+        filename=f"{base_name}_result.{output_format}",
+        headers={
+            "X-Import-Total": str(summary["total"]),
+            "X-Import-Succeeded": str(summary["succeeded"]),
+            "X-Import-Failed": str(summary["failed"]),
+        },
+        background=cleanup,
+    )
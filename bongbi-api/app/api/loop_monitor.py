@@ -0,0 +1,49 @@
+import asyncio
+import os
+from typing import Callable, Optional
+
+
+# 이벤트 루프 지연 측정
+# 일정 간격으로 sleep 하고 예정보다 늦게 깨어난 시간을 잰다. 동기 계산/블로킹 호출이 루프를 붙잡고 있으면
+# 그만큼 늦게 깨어나므로, 이 값이 커지면 모든 요청의 지연이 같이 늘어난다 (/metrics 의 bongbi_event_loop_lag_seconds).
+# 환경변수: LOOP_LAG_INTERVAL_SECONDS (기본 0.05, 0 이면 측정 안 함)
+
+
+class EventLoopLagMonitor:
+    """루프 지연 관측 - 깨어날 때마다 observe(지연 초) 호출, 최대값 유지"""
+
+    def __init__(self, observe: Callable[[float], None], interval_seconds: float = 0.05):
+        self.observe = observe
+        self.interval_seconds = interval_seconds
+        self.max_lag = 0.0
+        self.last_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls, observe: Callable[[float], None]) -> "EventLoopLagMonitor":
+        return cls(observe, interval_seconds=float(os.getenv("LOOP_LAG_INTERVAL_SECONDS", "0.05")))
+
+    async def start(self) -> None:
+        if self.interval_seconds <= 0 or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            lag = max(0.0, loop.time() - scheduled)
+            self.last_lag = lag
+            if lag > self.max_lag:
+                self.max_lag = lag
+            self.observe(lag)
+
+    def stats(self) -> dict:
+        return {"last_seconds": self.last_lag, "max_seconds": self.max_lag}
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, HTTPException, Request, Response, status
+
+from app.api.schemas import MaterialItem, MaterialListResponse
+from core_logic.material_catalog import material_catalog
+
+router = APIRouter(prefix="/materials", tags=["materials"])
+
+# 재질 카탈로그는 자주 바뀌지 않으므로 ETag 로 재검증 (If-None-Match 일치 시 304, 본문 없음)
+CACHE_CONTROL = "no-cache"
+
+
+def _etag_matches(request: Request) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or material_catalog.etag in tags
+
+
+@router.get("", response_model=MaterialListResponse, responses={304: {"description": "카탈로그 변경 없음"}})
+async def list_materials(request: Request, response: Response):
+    """재질 카탈로그 - 재질별 밀도/표준 길이/봉재·판재·스크랩 단가"""
+    materials = material_catalog.list()
+    headers = {"ETag": material_catalog.etag, "Cache-Control": CACHE_CONTROL}
+    if _etag_matches(request):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return MaterialListResponse(version=material_catalog.version, count=len(materials), materials=materials)
+
+
+@router.get("/{material_id}", response_model=MaterialItem)
+async def get_material(material_id: str, response: Response):
+    material = material_catalog.get(material_id)
+    if material is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"등록되지 않은 재질입니다: {material_id}")
+    response.headers.update({"ETag": material_catalog.etag, "Cache-Control": CACHE_CONTROL})
+    return material
@@ -0,0 +1,222 @@
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from core_logic.rod_pipeline import ROD_STAGES
+
+
+# Prometheus 텍스트 형식 지표 (/metrics)
+# - 라우트별 요청 수 / 지연 히스토그램, 오류 유형별 건수, 봉재 계산 단계별(bars/weights/cost/utilization/scrap) 시간
+# - 히스토그램 버킷은 생성 시 리스트로 미리 할당하고 관측은 bisect + 리스트 원소 증가만 한다 (잠금 없음).
+#   요청 처리는 이벤트 루프 스레드에서 일어나므로 대부분 경합이 없고, 스레드 풀에서 드물게 겹쳐 1건이 유실되는 것은 허용한다.
+# - 구성 요소의 stats() 는 수집(scrape) 시점에 읽는다. 큐 깊이 같은 현재 값은 gauge, 누적 건수(hits, delivered 등)는
+#   counter(_total) 로 내보내 재시작 후 값이 0 으로 돌아가도 rate()/increase() 가 리셋으로 처리하게 한다.
+
+REQUEST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGE_BUCKETS = (1e-06, 2.5e-06, 5e-06, 1e-05, 2.5e-05, 5e-05, 0.0001, 0.00025, 0.001, 0.01)
+LOOP_LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# 상태 코드 → 오류 유형 라벨
+ERROR_TYPES = {400: "bad_request", 404: "not_found", 409: "conflict", 413: "too_large", 422: "validation",
+               429: "rate_limited", 500: "server_error", 503: "unavailable"}
+
+
+class Histogram:
+    """누적 전 버킷 카운트(미리 할당) + 합계 + 건수"""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        sep = "," if labels else ""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{bound:g}"}} {cumulative}')
+        cumulative += self.counts[-1]
+        lines.append(f'{name}_bucket{{{labels}{sep}le="+Inf"}} {cumulative}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.sum!r}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """프로세스 내 지표 저장소"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.errors: Dict[Tuple[str, str], int] = {}
+        self.exceptions: Dict[Tuple[str, str], int] = {}
+        self.rod_stages: Dict[str, Histogram] = {stage: Histogram(STAGE_BUCKETS) for stage in ROD_STAGES}
+        # 관측 함수는 바인딩을 미리 만들어 계산 경로에서 dict 조회 한 번으로 끝나게 한다
+        self.rod_stage_observers: Dict[str, Callable[[float], None]] = {
+            stage: histogram.observe for stage, histogram in self.rod_stages.items()
+        }
+        self.loop_lag = Histogram(LOOP_LAG_BUCKETS)
+        self.in_flight = 0
+        self._stats: List[Tuple[str, str, Callable[[], Dict], frozenset]] = []
+
+    def observe_request(self, route: str, method: str, status_code: int, seconds: float) -> None:
+        key = (route, method, status_code)
+        self.requests[key] = self.requests.get(key, 0) + 1
+        histogram = self.latency.get((route, method))
+        if histogram is None:
+            histogram = self.latency[(route, method)] = Histogram(REQUEST_BUCKETS)
+        histogram.observe(seconds)
+        if status_code >= 400:
+            self.record_error(route, ERROR_TYPES.get(status_code, f"http_{status_code}"))
+
+    def requests_total(self) -> int:
+        return sum(self.requests.values())
+
+    def record_error(self, route: str, error_type: str) -> None:
+        key = (route, error_type)
+        self.errors[key] = self.errors.get(key, 0) + 1
+
+    def record_exception(self, calculation: str, exc: Exception) -> None:
+        """계산 엔드포인트가 잡아서 400 으로 돌려준 예외 (예외 클래스별)"""
+        key = (calculation, type(exc).__name__)
+        self.exceptions[key] = self.exceptions.get(key, 0) + 1
+
+    def observe_rod_stage(self, stage: str, seconds: float) -> None:
+        self.rod_stage_observers[stage](seconds)
+
+    def register_stats(self, prefix: str, help_text: str, stats: Callable[[], Dict], counters: Iterable[str] = ()) -> None:
+        """
+        수집 시 stats() 의 숫자 값(중첩 dict 는 key 를 이어 붙임)을 내보냄
+        counters 에 있는 key 는 누적 건수 - counter(<prefix>_<key>_total), 나머지는 gauge
+        """
+        self._stats.append((prefix, help_text, stats, frozenset(counters)))
+
+    def render(self) -> str:
+        lines = [
+            "# HELP bongbi_uptime_seconds 프로세스 시작 후 경과 시간",
+            "# TYPE bongbi_uptime_seconds gauge",
+            f"bongbi_uptime_seconds {time.time() - self.started_at:.3f}",
+            "# HELP bongbi_http_requests_in_flight 처리 중인 요청 수",
+            "# TYPE bongbi_http_requests_in_flight gauge",
+            f"bongbi_http_requests_in_flight {self.in_flight}",
+            "# HELP bongbi_http_requests_total 라우트/메서드/상태 코드별 요청 수",
+            "# TYPE bongbi_http_requests_total counter",
+        ]
+        for (route, method, status_code), count in sorted(self.requests.items()):
+            lines.append(f'bongbi_http_requests_total{{route="{_escape(route)}",method="{method}",status="{status_code}"}} {count}')
+
+        lines += ["# HELP bongbi_http_request_duration_seconds 라우트별 요청 처리 시간",
+                  "# TYPE bongbi_http_request_duration_seconds histogram"]
+        for (route, method), histogram in sorted(self.latency.items()):
+            lines += histogram.render("bongbi_http_request_duration_seconds", f'route="{_escape(route)}",method="{method}"')
+
+        lines += ["# HELP bongbi_errors_total 라우트/오류 유형별 오류 수",
+                  "# TYPE bongbi_errors_total counter"]
+        for (route, error_type), count in sorted(self.errors.items()):
+            lines.append(f'bongbi_errors_total{{route="{_escape(route)}",type="{_escape(error_type)}"}} {count}')
+
+        lines += ["# HELP bongbi_calculation_exceptions_total 계산 중 발생한 예외 수 (계산 종류/예외 클래스별)",
+                  "# TYPE bongbi_calculation_exceptions_total counter"]
+        for (calculation, exception), count in sorted(self.exceptions.items()):
+            lines.append(f'bongbi_calculation_exceptions_total{{calculation="{calculation}",exception="{_escape(exception)}"}} {count}')
+
+        lines += ["# HELP bongbi_rod_stage_duration_seconds 봉재 계산 단계별 처리 시간",
+                  "# TYPE bongbi_rod_stage_duration_seconds histogram"]
+        for stage, histogram in self.rod_stages.items():
+            lines += histogram.render("bongbi_rod_stage_duration_seconds", f'stage="{stage}"')
+
+        lines += ["# HELP bongbi_event_loop_lag_seconds 이벤트 루프가 예정보다 늦게 깨어난 시간",
+                  "# TYPE bongbi_event_loop_lag_seconds histogram"]
+        lines += self.loop_lag.render("bongbi_event_loop_lag_seconds", "")
+
+        for prefix, help_text, stats, counters in self._stats:
+            try:
+                values = _flatten(stats())
+            except Exception:
+                continue
+            for key, value in values:
+                if key in counters:
+                    name, metric_type = f"{prefix}_{key}_total", "counter"
+                else:
+                    name, metric_type = f"{prefix}_{key}", "gauge"
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}", f"{name} {value!r}"]
+        return "\n".join(lines) + "\n"
+
+
+def _flatten(stats: Dict, prefix: str = "") -> List[Tuple[str, float]]:
+    values = []
+    for key, value in stats.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            values += _flatten(value, f"{name}_")
+        elif isinstance(value, bool):
+            values.append((name, float(value)))
+        elif isinstance(value, (int, float)):
+            values.append((name, float(value)))
+    return values
+
+
+metrics = Metrics()
+
+
+class MetricsMiddleware:
+    """ASGI 미들웨어 - 요청 시간/상태 코드 기록 (라우트 라벨은 경로 템플릿, 매칭 안 된 경로는 'unmatched')"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status_code = 500
+        metrics.in_flight += 1
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception as e:
+            metrics.record_error(_route_label(scope), type(e).__name__)
+            raise
+        finally:
+            metrics.in_flight -= 1
+            metrics.observe_request(_route_label(scope), scope["method"], status_code, time.perf_counter() - started)
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path or "unmatched"
+
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus 텍스트 형식 (version 0.0.4)"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, Optional
+
+from app.logging_setup import get_logger, log_event
+from core_logic.utils import latency_percentiles_ms
+
+logger = get_logger("notion.health")
+
+
+# 노션 연결 상태 캐시
+# /notion/health 를 로드밸런서/업타임 체커가 자주 호출해도 노션 API 를 매번 부르지 않도록,
+# 백그라운드 작업이 주기적으로 노션 데이터베이스 조회(스레드에서 실행)를 하고 결과를 캐시한다.
+# 엔드포인트는 캐시만 읽으므로 이벤트 루프를 막지 않는다.
+# 환경변수: NOTION_HEALTH_INTERVAL_SECONDS(기본 30), NOTION_HEALTH_TIMEOUT_SECONDS(기본 10)
+
+LATENCY_SAMPLE_SIZE = 256
+
+
+class NotionHealthProber:
+    """주기적 노션 연결 확인 - 마지막 결과, 마지막 성공/실패 시각, 응답 시간 백분위"""
+
+    def __init__(self, probe: Callable[[], Dict], interval_seconds: float = 30.0, timeout_seconds: float = 10.0):
+        self.probe = probe
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLE_SIZE)
+
+        self.status = "checking"  # 첫 확인 전
+        self.database_title: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.checked_at: Optional[datetime] = None
+        self._checked_monotonic: Optional[float] = None
+        self.last_success_at: Optional[datetime] = None
+        self.last_failure_at: Optional[datetime] = None
+        self.consecutive_failures = 0
+        self.probes = 0
+
+    @classmethod
+    def from_env(cls, probe: Callable[[], Dict]) -> "NotionHealthProber":
+        return cls(
+            probe,
+            interval_seconds=float(os.getenv("NOTION_HEALTH_INTERVAL_SECONDS", "30")),
+            timeout_seconds=float(os.getenv("NOTION_HEALTH_TIMEOUT_SECONDS", "10")),
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done() and self._loop is not None and not self._loop.is_closed()
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self.running and self._loop is loop:
+            return
+        self._loop = loop
+        self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def check_once(self) -> None:
+        """노션 조회 1회 (스레드에서 실행, timeout_seconds 초과 시 실패로 기록)"""
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        try:
+            info = await asyncio.wait_for(loop.run_in_executor(None, self.probe), self.timeout_seconds)
+        except Exception as e:
+            error = f"{self.timeout_seconds:g}초 안에 응답이 없습니다." if isinstance(e, asyncio.TimeoutError) else str(e)
+            self._record(False, time.monotonic() - started, error=error)
+        else:
+            self._record(True, time.monotonic() - started, info=info)
+
+    def _record(self, ok: bool, latency: float, info: Optional[Dict] = None, error: Optional[str] = None) -> None:
+        now = datetime.now()
+        self.probes += 1
+        self.checked_at = now
+        self._checked_monotonic = time.monotonic()
+        self._latencies.append(latency)
+        if ok:
+            self.status = "healthy"
+            self.database_title = (info or {}).get("database_title")
+            self.last_error = None
+            self.last_success_at = now
+            self.consecutive_failures = 0
+        else:
+            if self.consecutive_failures == 0:
+                log_event(logger, logging.WARNING, "노션 연결 확인 실패", error=error)
+            self.status = "unhealthy"
+            self.last_error = error
+            self.last_failure_at = now
+            self.consecutive_failures += 1
+
+    async def _run(self) -> None:
+        while True:
+            await self.check_once()
+            await asyncio.sleep(self.interval_seconds)
+
+    def latency_percentiles(self) -> Dict[str, Optional[float]]:
+        return latency_percentiles_ms(self._latencies)
+
+    def snapshot(self) -> Dict:
+        """캐시된 연결 상태 (노션 호출 없음)"""
+        age = None if self._checked_monotonic is None else round(time.monotonic() - self._checked_monotonic, 3)
+        return {
+            "status": self.status,
+            "database_connection": {"healthy": "success", "unhealthy": "failed"}.get(self.status, "unknown"),
+            "database_title": self.database_title,
+            "connection_error": self.last_error,
+            "checked_at": self.checked_at.isoformat() if self.checked_at else None,
+            "age_seconds": age,
+            "last_success_at": self.last_success_at.isoformat() if self.last_success_at else None,
+            "last_failure_at": self.last_failure_at.isoformat() if self.last_failure_at else None,
+            "consecutive_failures": self.consecutive_failures,
+            "probes": self.probes,
+            "interval_seconds": self.interval_seconds,
+            "latency_ms": self.latency_percentiles(),
+        }
@@ -0,0 +1,433 @@
+import asyncio
+import logging
+import os
+import random
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Deque, Dict, Optional, Set
+
+from app.logging_setup import get_logger, log_event
+from app.storage.inquiry_spool import InquirySpool
+from core_logic.utils import latency_percentiles_ms
+
+logger = get_logger("notion.outbox")
+
+
+# 노션 문의 전송 아웃박스
+# notion-client 는 동기 HTTP 클라이언트라 async 엔드포인트에서 바로 부르면 왕복 시간 동안 이벤트 루프 전체가 멈춘다.
+# 엔드포인트는 문의를 아웃박스에 넣고 바로 응답하고, 백그라운드 워커가 전용 스레드 풀(동시 전송 수 제한)에서
+# 노션에 전송한다. 일시적 오류는 지수 백오프로 재시도하고, 429(rate_limited)는 Retry-After 동안 전송을 멈춘다.
+# 스풀(app.storage.inquiry_spool)이 있으면 문의를 먼저 스풀에 커밋한 뒤 접수 응답을 하고,
+# 노션 설정이 없거나 재시도 한도를 넘긴 문의는 스풀에 남겨 두었다가 재전송 주기(및 재시작 시)에 다시 보낸다.
+# 환경변수: NOTION_OUTBOX_CONCURRENCY(기본 3), NOTION_OUTBOX_RATE_PER_SEC(기본 3 - 노션 평균 허용량),
+#          NOTION_OUTBOX_MAX_PENDING(기본 10000), NOTION_OUTBOX_MAX_ATTEMPTS(기본 8),
+#          NOTION_OUTBOX_BACKOFF_SECONDS(기본 1), NOTION_OUTBOX_MAX_BACKOFF_SECONDS(기본 60),
+#          NOTION_OUTBOX_REPLAY_SECONDS(기본 30)
+
+STATUS_QUEUED = "queued"
+STATUS_SENDING = "sending"
+STATUS_RETRYING = "retrying"
+STATUS_DELIVERED = "delivered"
+STATUS_FAILED = "failed"
+
+# 재시도해도 결과가 같은 노션 오류 코드 (토큰/DB ID/속성 구조 문제)
+PERMANENT_ERROR_CODES = {
+    "unauthorized", "restricted_resource", "object_not_found",
+    "invalid_json", "invalid_request_url", "invalid_request", "validation_error",
+}
+
+LATENCY_SAMPLE_SIZE = 2048
+
+
+class OutboxFull(Exception):
+    """대기 중인 문의가 NOTION_OUTBOX_MAX_PENDING 에 도달 (스풀이 없을 때만)"""
+
+
+class OutboxItem:
+    """아웃박스 문의 1건"""
+
+    __slots__ = ("id", "properties", "created_at", "enqueued_at", "attempts", "round_attempts", "status",
+                 "page_id", "error", "next_attempt_at", "delivered_at")
+
+    def __init__(self, properties: Dict, item_id: Optional[str] = None,
+                 created_at: Optional[datetime] = None, attempts: int = 0):
+        self.id = item_id or uuid.uuid4().hex
+        self.properties = properties
+        self.created_at = created_at or datetime.now()
+        self.enqueued_at = time.monotonic()
+        self.attempts = attempts
+        self.round_attempts = 0  # 이번 재전송 주기의 시도 횟수
+        self.status = STATUS_QUEUED
+        self.page_id: Optional[str] = None
+        self.error: Optional[str] = None
+        self.next_attempt_at: Optional[float] = None
+        self.delivered_at: Optional[datetime] = None
+
+    def as_dict(self) -> Dict:
+        return {
+            "inquiry_id": self.id,
+            "status": self.status,
+            "attempts": self.attempts,
+            "page_id": self.page_id,
+            "error": self.error,
+            "created_at": self.created_at,
+            "delivered_at": self.delivered_at,
+        }
+
+
+class _RateLimiter:
+    """토큰 버킷 - 이벤트 루프 안에서만 쓰므로 잠금 없음"""
+
+    def __init__(self, rate_per_sec: float, burst: float):
+        self.rate = rate_per_sec
+        self.burst = max(burst, 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def pause(self, seconds: float) -> None:
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                continue
+            if self.rate <= 0:
+                return
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return
+            await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+
+def _error_code(exc: Exception) -> str:
+    code = getattr(exc, "code", None)
+    return str(getattr(code, "value", code) or type(exc).__name__)
+
+
+def is_retryable(exc: Exception) -> bool:
+    """일시적 오류 여부 - 429/5xx/시간 초과/네트워크 오류는 재시도, 그 외 4xx 와 영구 오류 코드는 실패 처리"""
+    if _error_code(exc) in PERMANENT_ERROR_CODES:
+        return False
+    status = getattr(exc, "status", None)
+    if isinstance(status, int) and 400 <= status < 500 and status not in (408, 409, 429):
+        return False
+    return True
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    headers = getattr(exc, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_ms(value: datetime) -> int:
+    return int(value.timestamp() * 1000)
+
+
+class NotionOutbox:
+    """비동기 노션 전송 큐 - 동시 전송 수 제한, 초당 전송 수 제한, 백오프 재시도, 전송 지표, 선택적 로컬 스풀"""
+
+    def __init__(self, send: Callable[[Dict], str], concurrency: int = 3, rate_per_sec: float = 3.0,
+                 max_pending: int = 10000, max_attempts: int = 8, backoff_seconds: float = 1.0,
+                 max_backoff_seconds: float = 60.0, history_size: int = 10000,
+                 spool: Optional[InquirySpool] = None, replay_seconds: float = 30.0):
+        self.send = send
+        self.concurrency = max(1, concurrency)
+        self.rate_per_sec = rate_per_sec
+        self.max_pending = max_pending
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.history_size = history_size
+        self.spool = spool
+        self.replay_seconds = replay_seconds
+
+        self._ready: Deque[OutboxItem] = deque()
+        self._items: "OrderedDict[str, OutboxItem]" = OrderedDict()
+        self._active: Set[str] = set()  # 메모리 큐에 있거나 스풀 기록이 끝나지 않은 문의
+        self._pending = 0  # 대기 + 재시도 대기 + 전송 중
+        self._in_flight = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers = []
+        self._replayer: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._limiter = _RateLimiter(rate_per_sec, burst=self.concurrency)
+
+        self.enqueued = 0
+        self.delivered = 0
+        self.failed = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.rejected = 0
+        self.spooled_only = 0
+        self.replayed = 0
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLE_SIZE)
+
+    @classmethod
+    def from_env(cls, send: Callable[[Dict], str], spool: Optional[InquirySpool] = None) -> "NotionOutbox":
+        return cls(
+            send,
+            concurrency=int(os.getenv("NOTION_OUTBOX_CONCURRENCY", "3")),
+            rate_per_sec=float(os.getenv("NOTION_OUTBOX_RATE_PER_SEC", "3")),
+            max_pending=int(os.getenv("NOTION_OUTBOX_MAX_PENDING", "10000")),
+            max_attempts=int(os.getenv("NOTION_OUTBOX_MAX_ATTEMPTS", "8")),
+            backoff_seconds=float(os.getenv("NOTION_OUTBOX_BACKOFF_SECONDS", "1")),
+            max_backoff_seconds=float(os.getenv("NOTION_OUTBOX_MAX_BACKOFF_SECONDS", "60")),
+            spool=spool,
+            replay_seconds=float(os.getenv("NOTION_OUTBOX_REPLAY_SECONDS", "30")),
+        )
+
+    # 수명 주기 ------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers) and self._loop is not None and not self._loop.is_closed()
+
+    async def start(self) -> None:
+        """현재 이벤트 루프에 전송 워커 시작 (이미 실행 중이면 무시) - 스풀이 있으면 미전송 문의부터 다시 적재"""
+        loop = asyncio.get_running_loop()
+        if self.running and self._loop is loop:
+            return
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="notion-outbox")
+        self._workers = [loop.create_task(self._worker()) for _ in range(self.concurrency)]
+        if self.spool is not None:
+            self._replayer = loop.create_task(self._replay_loop())
+        if self._ready:
+            self._wakeup.set()
+
+    async def stop(self, drain_seconds: float = 5.0) -> None:
+        """대기 중인 문의를 drain_seconds 동안 보내 보고 워커 종료 (남은 문의는 스풀에 queued 로 남음)"""
+        deadline = time.monotonic() + drain_seconds
+        while self._pending and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        tasks = self._workers + ([self._replayer] if self._replayer else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._replayer = None
+        if self._pending:
+            log_event(logger, logging.WARNING, "노션 아웃박스 종료 시 미전송 문의", pending=self._pending)
+        if self.spool is not None:
+            # 스풀에 남은 문의는 다음 시작 때(또는 다른 워커가) 다시 적재하므로 임대를 풀고 메모리 큐는 비운다
+            if self._active:
+                try:
+                    await asyncio.wrap_future(self.spool.release(list(self._active)))
+                except Exception as e:
+                    log_event(logger, logging.ERROR, "노션 문의 임대 해제 실패", error=str(e))
+            self._ready.clear()
+            self._active.clear()
+            self._pending = 0
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    # 적재/조회 -------------------------------------------------------------
+
+    async def enqueue(self, properties: Dict) -> OutboxItem:
+        """
+        문의 접수 - 스풀이 있으면 스풀 커밋(fsync)이 끝난 뒤 반환
+        워커가 실행 중이 아니거나(노션 미설정) 메모리 큐가 가득 차면 스풀에만 남기고 재전송 주기에 보낸다
+        """
+        if self.spool is None:
+            return self.submit(properties)
+        item = OutboxItem(properties)
+        self._active.add(item.id)  # 커밋 직후 재적재 주기가 같은 문의를 읽어 가지 않도록
+        try:
+            await asyncio.wrap_future(self.spool.append(item.id, properties, _to_ms(item.created_at)))
+        except Exception:
+            self._active.discard(item.id)
+            raise
+        self.enqueued += 1
+        if self.running and self._pending < self.max_pending:
+            self._remember(item)
+            self._activate(item)
+        else:
+            self._active.discard(item.id)
+            self.spooled_only += 1
+        return item
+
+    def submit(self, properties: Dict, item_id: Optional[str] = None) -> OutboxItem:
+        """메모리 큐에만 넣고 바로 반환 (이벤트 루프 스레드에서 호출)"""
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise OutboxFull(f"노션 전송 대기 문의가 {self._pending}건입니다.")
+        item = OutboxItem(properties, item_id)
+        self._remember(item)
+        self.enqueued += 1
+        self._activate(item)
+        return item
+
+    def get(self, item_id: str) -> Optional[OutboxItem]:
+        return self._items.get(item_id)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._pending
+
+    def latency_percentiles(self) -> Dict[str, Optional[float]]:
+        """적재 → 노션 저장 완료까지 걸린 시간 (최근 LATENCY_SAMPLE_SIZE 건, ms)"""
+        return latency_percentiles_ms(self._latencies, include_max=True)
+
+    def stats(self) -> Dict:
+        return {
+            "running": self.running,
+            "queue_depth": self._pending,
+            "ready": len(self._ready),
+            "in_flight": self._in_flight,
+            "enqueued": self.enqueued,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "rejected": self.rejected,
+            "spooled_only": self.spooled_only,
+            "replayed": self.replayed,
+            "concurrency": self.concurrency,
+            "rate_per_sec": self.rate_per_sec,
+            "delivery_latency_ms": self.latency_percentiles(),
+        }
+
+    # 내부 ----------------------------------------------------------------
+
+    def _remember(self, item: OutboxItem) -> None:
+        self._items[item.id] = item
+        # 완료된 문의부터 오래된 순으로 상태 기록 정리
+        while len(self._items) > self.history_size:
+            oldest_id, oldest = next(iter(self._items.items()))
+            if oldest.status not in (STATUS_DELIVERED, STATUS_FAILED):
+                break
+            del self._items[oldest_id]
+
+    def _activate(self, item: OutboxItem) -> None:
+        self._active.add(item.id)
+        self._pending += 1
+        self._push(item)
+
+    def _push(self, item: OutboxItem) -> None:
+        self._ready.append(item)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _retry(self, item: OutboxItem) -> None:
+        # 재시도 대기 중 stop() 으로 큐가 비워졌거나 재적재로 교체된 문의는 무시
+        if item.id in self._active and self._items.get(item.id) is item:
+            self._push(item)
+
+    def _settle(self, item: OutboxItem, spool_write) -> None:
+        """메모리 큐에서 내보냄 - 스풀 기록이 커밋된 뒤에 재적재 대상에서 제외를 푼다 (중복 전송 방지)"""
+        self._pending -= 1
+        if spool_write is None:
+            self._active.discard(item.id)
+            return
+        loop = self._loop
+        spool_write.add_done_callback(
+            lambda _: loop.call_soon_threadsafe(self._active.discard, item.id) if not loop.is_closed() else None
+        )
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.max_backoff_seconds, self.backoff_seconds * (2 ** (attempts - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            while not self._ready:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            item = self._ready.popleft()
+            await self._limiter.acquire()
+            item.status = STATUS_SENDING
+            item.attempts += 1
+            item.round_attempts += 1
+            self._in_flight += 1
+            try:
+                page_id = await loop.run_in_executor(self._executor, self.send, item.properties)
+            except asyncio.CancelledError:
+                self._in_flight -= 1
+                self._ready.appendleft(item)
+                raise
+            except Exception as e:
+                self._in_flight -= 1
+                self._on_error(loop, item, e)
+            else:
+                self._in_flight -= 1
+                item.status = STATUS_DELIVERED
+                item.page_id = page_id
+                item.error = None
+                item.delivered_at = datetime.now()
+                item.properties = None  # 전송이 끝난 본문은 보관하지 않음
+                self.delivered += 1
+                self._latencies.append(time.monotonic() - item.enqueued_at)
+                self._settle(item, self.spool.mark_delivered(item.id, page_id, item.attempts) if self.spool else None)
+
+    def _on_error(self, loop: asyncio.AbstractEventLoop, item: OutboxItem, exc: Exception) -> None:
+        item.error = f"{_error_code(exc)}: {exc}"
+        if not is_retryable(exc):
+            self._fail(item)
+            return
+        if item.round_attempts >= self.max_attempts:
+            if self.spool is None:
+                self._fail(item)
+            else:
+                # 스풀에 queued 로 남겨 다음 재전송 주기에 다시 보냄
+                item.status = STATUS_QUEUED
+                item.next_attempt_at = None
+                log_event(logger, logging.WARNING, "노션 문의 전송 보류", inquiry_id=item.id, attempts=item.attempts, error=item.error)
+                self._settle(item, self.spool.mark_attempted(item.id, item.error, item.attempts))
+            return
+
+        delay = self._backoff(item.round_attempts)
+        if _error_code(exc) == "rate_limited" or getattr(exc, "status", None) == 429:
+            self.rate_limited += 1
+            retry_after = _retry_after(exc)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            self._limiter.pause(delay)
+        self.retries += 1
+        item.status = STATUS_RETRYING
+        item.next_attempt_at = time.monotonic() + delay
+        loop.call_later(delay, self._retry, item)
+
+    def _fail(self, item: OutboxItem) -> None:
+        item.status = STATUS_FAILED
+        self.failed += 1
+        log_event(logger, logging.ERROR, "노션 문의 전송 실패", inquiry_id=item.id, attempts=item.attempts, error=item.error)
+        self._settle(item, self.spool.mark_failed(item.id, item.error, item.attempts) if self.spool else None)
+
+    async def _replay_loop(self) -> None:
+        """스풀에만 있는 미전송 문의를 메모리 큐 여유만큼 주기적으로 임대해 적재 (시작 직후 1회 포함)"""
+        while True:
+            capacity = self.max_pending - self._pending
+            if capacity > 0:
+                try:
+                    rows = await asyncio.wrap_future(self.spool.claim(capacity, list(self._active)))
+                except Exception as e:
+                    log_event(logger, logging.ERROR, "노션 문의 스풀 읽기 실패", exc_info=True, error=str(e))
+                    rows = []
+                for row in rows:
+                    if row["id"] in self._active:
+                        continue
+                    item = OutboxItem(row["properties"], row["id"],
+                                      created_at=datetime.fromtimestamp(row["created_at"] / 1000),
+                                      attempts=row["attempts"])
+                    self._remember(item)
+                    self._activate(item)
+                    self.replayed += 1
+            await asyncio.sleep(self.replay_seconds)
@@ -1,150 +1,200 @@
 from fastapi import APIRouter, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from datetime import datetime
 import os
 import logging
 from typing import Optional
 
+from app.logging_setup import get_logger, log_event
+
 # 노션 클라이언트 임포트 (추후 설치)
 try:
     from notion_client import Client
     NOTION_AVAILABLE = True
 except ImportError:
     NOTION_AVAILABLE = False
-    logging.warning("notion-client가 설치되지 않았습니다. pip install notion-client로 설치하세요.")
+    get_logger("notion").warning("notion-client가 설치되지 않았습니다. pip install notion-client로 설치하세요.")
 
 from app.api.schemas import (
     CustomerInquiryRequest, 
     CustomerInquiryResponse, 
+    InquiryDeliveryStatus,
     NotionErrorResponse
 )
+from app.api.notion_outbox import NotionOutbox, OutboxFull
+from app.api.notion_health import NotionHealthProber
+from app.storage.inquiry_spool import InquirySpool
 
 router = APIRouter(prefix="/notion", tags=["notion"])
+logger = get_logger("notion")
 
 # 환경변수에서 노션 설정 가져오기
 NOTION_TOKEN = os.getenv("NOTION_TOKEN")
 NOTION_DATABASE_ID = os.getenv("NOTION_DATABASE_ID")
+# 부하 테스트 등에서 로컬 노션 대역 서버(benchmarks.fake_notion)로 보낼 때 지정
+NOTION_BASE_URL = os.getenv("NOTION_BASE_URL")
 
 # 노션 클라이언트 초기화
 notion_client: Optional[Client] = None
 if NOTION_AVAILABLE and NOTION_TOKEN:
-    notion_client = Client(auth=NOTION_TOKEN)
+    notion_client = Client(auth=NOTION_TOKEN, base_url=NOTION_BASE_URL) if NOTION_BASE_URL else Client(auth=NOTION_TOKEN)
+
+
+def _send_to_notion(properties: dict) -> str:
+    """아웃박스 워커 스레드에서 호출 - 노션 데이터베이스에 페이지 생성 후 페이지 ID 반환"""
+    if not notion_client or not NOTION_DATABASE_ID:
+        raise RuntimeError("노션 클라이언트가 설정되지 않았습니다.")
+    response = notion_client.pages.create(
+        parent={"database_id": NOTION_DATABASE_ID},
+        properties=properties
+    )
+    return response["id"]
+
+
+def notion_configured() -> bool:
+    return bool(NOTION_AVAILABLE and NOTION_TOKEN and NOTION_DATABASE_ID and notion_client)
+
+
+# 모든 문의는 로컬 스풀에 먼저 기록 (INQUIRY_SPOOL_PATH) - 노션 미설정/장애 시에도 접수하고 나중에 전송
+inquiry_spool = InquirySpool.from_env()
+notion_outbox = NotionOutbox.from_env(_send_to_notion, spool=inquiry_spool)
+
+
+def _inquiry_properties(inquiry: CustomerInquiryRequest, received_at: datetime) -> dict:
+    """문의 → 노션 데이터베이스 속성"""
+    return {
+        "이름": {
+            "title": [
+                {
+                    "text": {
+                        "content": inquiry.name
+                    }
+                }
+            ]
+        },
+        "이메일": {
+            "email": inquiry.email
+        },
+        "제목": {
+            "rich_text": [
+                {
+                    "text": {
+                        "content": inquiry.subject
+                    }
+                }
+            ]
+        },
+        "메시지": {
+            "rich_text": [
+                {
+                    "text": {
+                        "content": inquiry.message
+                    }
+                }
+            ]
+        },
+        "접수일시": {
+            "date": {
+                "start": received_at.isoformat()
+            }
+        }
+        # "처리상태": {
+        #     "select": {
+        #         "name": "신규"
+        #     }
+        # }
+    }
 
 
-@router.post("/customer-inquiry", response_model=CustomerInquiryResponse)
+@router.post("/customer-inquiry", response_model=CustomerInquiryResponse, status_code=status.HTTP_202_ACCEPTED)
 async def create_customer_inquiry(inquiry: CustomerInquiryRequest):
     """
-    고객 문의를 노션 데이터베이스에 저장
+    고객 문의를 노션 전송 아웃박스에 넣고 바로 응답 (노션 저장은 백그라운드 워커가 처리)
     
     - **name**: 문의자 이름 (필수)
     - **email**: 문의자 이메일 (필수)
     - **subject**: 문의 제목 (필수)
     - **message**: 문의 내용 (필수)
+
+    응답의 inquiry_id 로 GET /notion/customer-inquiry/{inquiry_id} 에서 전송 상태를 확인할 수 있다.
     """
     current_time = datetime.now()
-    
-    # 노션 설정 검증
-    if not NOTION_AVAILABLE:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="노션 연동 서비스를 사용할 수 없습니다. notion-client 패키지가 필요합니다."
-        )
-    
-    if not NOTION_TOKEN or not NOTION_DATABASE_ID:
+
+    # 노션이 설정돼 있으면 전송 워커 시작 (lifespan 밖에서 호출된 경우 대비 - 테스트 등)
+    configured = notion_configured()
+    if configured and not notion_outbox.running:
+        await notion_outbox.start()
+
+    try:
+        # 스풀 커밋 후 반환 - 노션 미설정이면 스풀에만 남기고 설정 후 재시작 시 전송
+        item = await notion_outbox.enqueue(_inquiry_properties(inquiry, current_time))
+    except OutboxFull as e:
+        log_event(logger, logging.ERROR, "노션 아웃박스 적재 실패", error=str(e))
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="노션 설정이 완료되지 않았습니다. NOTION_TOKEN과 NOTION_DATABASE_ID를 설정하세요."
+            detail="문의 접수가 일시적으로 많습니다. 잠시 후 다시 시도해주세요."
         )
-    
-    if not notion_client:
+    except Exception as e:
+        log_event(logger, logging.ERROR, "문의 스풀 기록 실패", exc_info=True, error=str(e))
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="노션 클라이언트 초기화에 실패했습니다."
-        )
-    
-    try:
-        # 노션 데이터베이스에 페이지 생성
-        response = notion_client.pages.create(
-            parent={"database_id": NOTION_DATABASE_ID},
-            properties={
-                "이름": {
-                    "title": [
-                        {
-                            "text": {
-                                "content": inquiry.name
-                            }
-                        }
-                    ]
-                },
-                "이메일": {
-                    "email": inquiry.email
-                },
-                "제목": {
-                    "rich_text": [
-                        {
-                            "text": {
-                                "content": inquiry.subject
-                            }
-                        }
-                    ]
-                },
-                "메시지": {
-                    "rich_text": [
-                        {
-                            "text": {
-                                "content": inquiry.message
-                            }
-                        }
-                    ]
-                },
-                "접수일시": {
-                    "date": {
-                        "start": current_time.isoformat()
-                    }
-                }
-                # "처리상태": {
-                #     "select": {
-                #         "name": "신규"
-                #     }
-                # }
-            }
-        )
-        
-        return CustomerInquiryResponse(
-            success=True,
-            message="문의가 성공적으로 접수되었습니다.",
-            inquiry_id=response["id"],
-            timestamp=current_time
+            detail="문의를 저장하지 못했습니다. 잠시 후 다시 시도해주세요."
         )
-        
-    except Exception as e:
-        logging.error(f"노션 API 오류: {str(e)}")
-        
-        # 노션 API 특정 오류 처리
-        if "invalid_database_id" in str(e):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="잘못된 데이터베이스 ID입니다. NOTION_DATABASE_ID를 확인하세요."
-            )
-        elif "unauthorized" in str(e).lower():
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="노션 API 인증에 실패했습니다. NOTION_TOKEN을 확인하세요."
-            )
-        elif "validation" in str(e).lower():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"노션 데이터베이스 구조와 맞지 않습니다: {str(e)}"
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"노션 연동 중 오류가 발생했습니다: {str(e)}"
-            )
+
+    if not configured:
+        log_event(logger, logging.WARNING, "노션 설정이 없어 문의를 로컬 스풀에만 저장했습니다", inquiry_id=item.id)
+
+    return CustomerInquiryResponse(
+        success=True,
+        message="문의가 성공적으로 접수되었습니다.",
+        inquiry_id=item.id,
+        timestamp=current_time
+    )
+
+
+@router.get("/customer-inquiry/{inquiry_id}", response_model=InquiryDeliveryStatus)
+async def get_customer_inquiry_status(inquiry_id: str):
+    """문의 노션 전송 상태 (queued | sending | retrying | delivered | failed)"""
+    item = notion_outbox.get(inquiry_id)
+    if item is not None:
+        return item.as_dict()
+    # 메모리에 없는 문의(재시작 이전 접수, 스풀에만 있는 문의)는 스풀에서 조회
+    row = await run_in_threadpool(inquiry_spool.get, inquiry_id)
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="문의를 찾을 수 없습니다.")
+    return {
+        "inquiry_id": row["id"],
+        "status": row["status"],
+        "attempts": row["attempts"],
+        "page_id": row["page_id"],
+        "error": row["error"],
+        "created_at": datetime.fromtimestamp(row["created_at"] / 1000),
+        "delivered_at": datetime.fromtimestamp(row["delivered_at"] / 1000) if row["delivered_at"] else None,
+    }
+
+
+@router.get("/outbox")
+async def notion_outbox_stats():
+    """노션 전송 아웃박스 지표 - 대기 건수, 전송/실패/재시도 수, 전송 지연 백분위(ms), 스풀 상태별 건수"""
+    stats = notion_outbox.stats()
+    stats["spool"] = await run_in_threadpool(inquiry_spool.counts)
+    stats["spool_commits"] = inquiry_spool.commits
+    stats["spool_rows_written"] = inquiry_spool.rows_written
+    return stats
+
+
+def _probe_notion() -> dict:
+    """헬스 프로버 스레드에서 호출 - 노션 데이터베이스 조회"""
+    database_info = notion_client.databases.retrieve(database_id=NOTION_DATABASE_ID)
+    return {"database_title": database_info.get("title", [{}])[0].get("plain_text", "Unknown")}
+
+
+notion_health = NotionHealthProber.from_env(_probe_notion)
 
 
 @router.get("/health")
 async def notion_health_check():
-    """노션 연동 상태 확인"""
+    """노션 연동 상태 확인 - 백그라운드 프로버가 주기적으로 확인한 결과를 캐시에서 반환 (노션 호출 없음)"""
     status_info = {
         "notion_client_available": NOTION_AVAILABLE,
         "notion_token_set": bool(NOTION_TOKEN),
@@ -153,17 +203,11 @@ async def notion_health_check():
         "timestamp": datetime.now().isoformat()
     }
     
-    if all([NOTION_AVAILABLE, NOTION_TOKEN, NOTION_DATABASE_ID, notion_client]):
-        try:
-            # 노션 데이터베이스 연결 테스트
-            database_info = notion_client.databases.retrieve(database_id=NOTION_DATABASE_ID)
-            status_info["database_connection"] = "success"
-            status_info["database_title"] = database_info.get("title", [{}])[0].get("plain_text", "Unknown")
-            status_info["status"] = "healthy"
-        except Exception as e:
-            status_info["database_connection"] = "failed"
-            status_info["connection_error"] = str(e)
-            status_info["status"] = "unhealthy"
+    if notion_configured():
+        # lifespan 밖에서 호출된 경우 대비 - 첫 결과가 나올 때까지 status 는 checking
+        if not notion_health.running:
+            await notion_health.start()
+        status_info.update(notion_health.snapshot())
     else:
         status_info["status"] = "not_configured"
     
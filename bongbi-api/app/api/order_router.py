@@ -0,0 +1,148 @@
+import json
+import os
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+
+from app.api.schemas import (
+    OrderCreateRequest, OrderUpdateRequest, OrderItem, OrderListResponse, OrderStatus,
+    RodCalculateResponse, PlateCalculateResponse, ErrorResponse
+)
+from app.api.calculate_router import calculate_rod, calculate_plate
+from app.storage.order_store import OrderStore, DEFAULT_ORDER_DB_PATH
+
+router = APIRouter(prefix="/orders", tags=["orders"])
+
+_order_store: Optional[OrderStore] = None
+
+
+def get_order_store() -> OrderStore:
+    """주문 저장소 (첫 요청 시 ORDER_DB_PATH 로 생성)"""
+    global _order_store
+    if _order_store is None:
+        _order_store = OrderStore(os.getenv("ORDER_DB_PATH", DEFAULT_ORDER_DB_PATH))
+    return _order_store
+
+
+def _to_datetime(ms: int) -> datetime:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+def _to_ms(day: date) -> int:
+    return int(datetime.combine(day, time.min, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _to_order_item(order) -> OrderItem:
+    return OrderItem(**{**order, "createdAt": _to_datetime(order["createdAt"]), "updatedAt": _to_datetime(order["updatedAt"])})
+
+
+def _not_found(order_id: int) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"주문을 찾을 수 없습니다: {order_id}")
+
+
+@router.post("", response_model=OrderItem, status_code=status.HTTP_201_CREATED, responses={400: {"model": ErrorResponse}})
+async def create_order(request: OrderCreateRequest, store: OrderStore = Depends(get_order_store)):
+    """주문 저장 - 견적 계산 응답 원문을 함께 저장 (result 미입력 시 저장 시점에 1회 계산)"""
+    is_plate = request.plate is not None
+    quote_request = request.plate if is_plate else request.rod
+    response_model = PlateCalculateResponse if is_plate else RodCalculateResponse
+
+    if request.result is not None:
+        try:
+            response_model(**request.result)
+        except ValueError as e:
+            return JSONResponse(
+                status_code=400,
+                content=ErrorResponse(
+                    status_code=400,
+                    message="견적 결과 형식 오류",
+                    detail=str(e),
+                    field="result",
+                    suggestions=["/calculate/rod 또는 /calculate/plate 응답을 그대로 전달하세요"]
+                ).model_dump()
+            )
+        result = request.result
+    else:
+        response = await (calculate_plate if is_plate else calculate_rod)(quote_request)
+        if isinstance(response, JSONResponse):
+            return response
+        result = json.loads(response.model_dump_json(exclude_none=True))
+
+    order = await run_in_threadpool(store.create, {
+        "customer": request.customer,
+        "productName": request.productName,
+        "material": request.material or getattr(quote_request, "material", None),
+        "materialType": "plate" if is_plate else "rod",
+        "status": request.status,
+        "quantity": quote_request.quantity,
+        "deliveryDate": request.deliveryDate.isoformat() if request.deliveryDate else None,
+        "deliveryUnitPrice": request.deliveryUnitPrice,
+        "notes": request.notes,
+        "request": quote_request.model_dump(mode="json", exclude_none=True),
+        "result": result,
+    })
+    return _to_order_item(order)
+
+
+@router.get("", response_model=OrderListResponse, responses={400: {"model": ErrorResponse}})
+async def list_orders(
+    customer: Optional[str] = None,
+    material: Optional[str] = None,
+    status_filter: Optional[OrderStatus] = Query(None, alias="status"),
+    materialType: Optional[str] = Query(None, pattern="^(rod|plate)$"),
+    createdFrom: Optional[date] = Query(None, description="생성일 시작 (포함, UTC)"),
+    createdTo: Optional[date] = Query(None, description="생성일 끝 (포함, UTC)"),
+    cursor: Optional[str] = Query(None, description="이전 페이지의 nextCursor"),
+    limit: int = Query(50, ge=1, le=500),
+    store: OrderStore = Depends(get_order_store),
+):
+    """주문 목록 - 최신순, 고객사/재질/상태/생성일 필터, 키셋 페이지네이션"""
+    try:
+        page = await run_in_threadpool(
+            store.list,
+            customer=customer,
+            material=material,
+            status=status_filter,
+            material_type=materialType,
+            created_from=_to_ms(createdFrom) if createdFrom else None,
+            created_to=_to_ms(createdTo + timedelta(days=1)) if createdTo else None,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        return JSONResponse(
+            status_code=400,
+            content=ErrorResponse(status_code=400, message=str(e), field="cursor").model_dump()
+        )
+    items = [_to_order_item(order) for order in page["items"]]
+    return OrderListResponse(items=items, count=len(items), nextCursor=page["nextCursor"])
+
+
+@router.get("/{order_id}", response_model=OrderItem)
+async def get_order(order_id: int, store: OrderStore = Depends(get_order_store)):
+    order = await run_in_threadpool(store.get, order_id)
+    if order is None:
+        raise _not_found(order_id)
+    return _to_order_item(order)
+
+
+@router.patch("/{order_id}", response_model=OrderItem)
+async def update_order(order_id: int, request: OrderUpdateRequest, store: OrderStore = Depends(get_order_store)):
+    """주문 수정 - 상태/고객사/납기 등 (견적 결과는 그대로 유지)"""
+    changes = request.model_dump(exclude_unset=True)
+    if changes.get("deliveryDate") is not None:
+        changes["deliveryDate"] = changes["deliveryDate"].isoformat()
+    order = await run_in_threadpool(store.update, order_id, changes)
+    if order is None:
+        raise _not_found(order_id)
+    return _to_order_item(order)
+
+
+@router.delete("/{order_id}")
+async def delete_order(order_id: int, store: OrderStore = Depends(get_order_store)):
+    if not await run_in_threadpool(store.delete, order_id):
+        raise _not_found(order_id)
+    return {"success": True, "id": order_id}
@@ -0,0 +1,170 @@
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.api.schemas import (
+    PlateRemnantCreateRequest, PlateRemnantListResponse, RemnantCreateRequest, RemnantListResponse
+)
+from app.storage.remnant_store import PlateRemnantStore, RemnantStore, DEFAULT_REMNANT_DB_PATH
+from core_logic.remnant import make_plate_remnant_key, make_remnant_key
+
+router = APIRouter(prefix="/remnants", tags=["remnants"])
+
+# 잔재 재고 (calculate_router 의 useRemnants 계산과 공유) - SQLite 라 재시작 후에도 유지되고 워커끼리 공유
+_remnant_store: Optional[RemnantStore] = None
+_plate_remnant_store: Optional[PlateRemnantStore] = None
+
+
+def get_remnant_store() -> RemnantStore:
+    """봉재 잔재 재고 (첫 사용 시 REMNANT_DB_PATH 로 생성)"""
+    global _remnant_store
+    if _remnant_store is None:
+        _remnant_store = RemnantStore(os.getenv("REMNANT_DB_PATH", DEFAULT_REMNANT_DB_PATH))
+    return _remnant_store
+
+
+def get_plate_remnant_store() -> PlateRemnantStore:
+    """판재 잔재 재고 (봉재 잔재와 같은 파일)"""
+    global _plate_remnant_store
+    if _plate_remnant_store is None:
+        _plate_remnant_store = PlateRemnantStore(os.getenv("REMNANT_DB_PATH", DEFAULT_REMNANT_DB_PATH))
+    return _plate_remnant_store
+
+
+def _require_key(material, shape, diameter, width, height):
+    key = make_remnant_key(material, shape, diameter, width, height)
+    if key is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="재질(material)과 형상(shape)이 필요합니다."
+        )
+    return key
+
+
+def _require_plate_key(material, thickness):
+    key = make_plate_remnant_key(material, thickness)
+    if key is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="재질(material)과 두께(plateThickness)가 필요합니다."
+        )
+    return key
+
+
+@router.post("")
+async def add_remnants(request: RemnantCreateRequest, store: RemnantStore = Depends(get_remnant_store)):
+    """잔재 등록 - 같은 재질/형상/규격의 자투리 길이를 한 번에 등록"""
+    key = _require_key(request.material, request.shape, request.diameter, request.width, request.height)
+
+    def add_all():
+        with store.lock:
+            return [store.add(key, length) for length in request.lengths]
+
+    ids = await run_in_threadpool(add_all)
+    return {"success": True, "count": len(ids), "ids": ids}
+
+
+@router.get("", response_model=RemnantListResponse)
+async def list_remnants(
+    material: str,
+    shape: str,
+    diameter: Optional[float] = None,
+    width: Optional[float] = None,
+    height: Optional[float] = None,
+    store: RemnantStore = Depends(get_remnant_store),
+):
+    """재질/형상/규격별 잔재 목록 (길이 오름차순)"""
+    key = _require_key(material, shape, diameter, width, height)
+    remnants = await run_in_threadpool(store.list, key)
+    return RemnantListResponse(
+        material=key[0],
+        shape=key[1],
+        count=len(remnants),
+        totalLength=sum(r["length"] for r in remnants),
+        remnants=remnants
+    )
+
+
+@router.get("/lookup")
+async def lookup_remnant(
+    material: str,
+    shape: str,
+    length: float = Query(..., gt=0, description="필요 길이 (mm)"),
+    diameter: Optional[float] = None,
+    width: Optional[float] = None,
+    height: Optional[float] = None,
+    store: RemnantStore = Depends(get_remnant_store),
+):
+    """필요 길이 이상인 가장 짧은 잔재 조회"""
+    key = _require_key(material, shape, diameter, width, height)
+    found = await run_in_threadpool(store.find_shortest_at_least, key, length)
+    return {"found": found is not None, "remnant": found}
+
+
+@router.post("/plates")
+async def add_plate_remnants(request: PlateRemnantCreateRequest,
+                             store: PlateRemnantStore = Depends(get_plate_remnant_store)):
+    """판재 잔재 등록 - 같은 재질/두께의 직사각형 잔재를 한 번에 등록"""
+    key = _require_plate_key(request.material, request.plateThickness)
+
+    def add_all():
+        with store.lock:
+            return [store.add(key, r.width, r.length) for r in request.remnants]
+
+    ids = await run_in_threadpool(add_all)
+    return {"success": True, "count": len(ids), "ids": ids}
+
+
+@router.get("/plates", response_model=PlateRemnantListResponse)
+async def list_plate_remnants(material: str, plateThickness: float = Query(..., gt=0),
+                              store: PlateRemnantStore = Depends(get_plate_remnant_store)):
+    """재질/두께별 판재 잔재 목록 (면적 오름차순)"""
+    key = _require_plate_key(material, plateThickness)
+    remnants = await run_in_threadpool(store.list, key)
+    return PlateRemnantListResponse(
+        material=key[0],
+        plateThickness=key[2],
+        count=len(remnants),
+        totalArea=sum(r["width"] * r["length"] for r in remnants),
+        remnants=remnants
+    )
+
+
+@router.get("/plates/lookup")
+async def lookup_plate_remnant(
+    material: str,
+    plateThickness: float = Query(..., gt=0),
+    width: float = Query(..., gt=0, description="부품 폭 (mm)"),
+    length: float = Query(..., gt=0, description="부품 길이 (mm)"),
+    allowRotation: bool = True,
+    store: PlateRemnantStore = Depends(get_plate_remnant_store),
+):
+    """부품이 들어가는 가장 작은 판재 잔재 조회"""
+    key = _require_plate_key(material, plateThickness)
+    found = await run_in_threadpool(store.find_smallest_fitting, key, width, length, allowRotation)
+    return {"found": found is not None, "remnant": found}
+
+
+@router.delete("/plates/{remnant_id}")
+async def delete_plate_remnant(remnant_id: int, store: PlateRemnantStore = Depends(get_plate_remnant_store)):
+    """판재 잔재 삭제 (사용 완료/폐기)"""
+    if not await run_in_threadpool(store.remove, remnant_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="잔재를 찾을 수 없습니다.")
+    return {"success": True, "id": remnant_id}
+
+
+@router.get("/stats")
+async def remnant_stats(store: RemnantStore = Depends(get_remnant_store),
+                        plate_store: PlateRemnantStore = Depends(get_plate_remnant_store)):
+    """잔재 재고 현황 (봉재 + 판재)"""
+    return {**(await run_in_threadpool(store.stats)), "plates": await run_in_threadpool(plate_store.stats)}
+
+
+@router.delete("/{remnant_id}")
+async def delete_remnant(remnant_id: int, store: RemnantStore = Depends(get_remnant_store)):
+    """잔재 삭제 (사용 완료/폐기)"""
+    if not await run_in_threadpool(store.remove, remnant_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="잔재를 찾을 수 없습니다.")
+    return {"success": True, "id": remnant_id}
@@ -0,0 +1,107 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.api.schemas import LegacyFieldSupport
+
+
+# 계산 결과 캐시 (프로세스 내 LRU + TTL)
+# 계산 엔드포인트는 요청 본문에 대한 순수 함수이므로, 별칭 정규화 + 실수 양자화한 요청을 키로 응답을 재사용한다.
+# 환경변수: RESULT_CACHE_ENABLED(기본 true), RESULT_CACHE_MAX_SIZE(기본 1024), RESULT_CACHE_TTL_SECONDS(기본 300)
+
+FLOAT_QUANTIZE_DIGITS = 6
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _canonical_value(value):
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        # 100 과 100.0, 20.0000000001 과 20.0 을 같은 키로
+        return round(float(value), FLOAT_QUANTIZE_DIGITS) + 0.0
+    if isinstance(value, str):
+        return value.strip().lower()
+    if isinstance(value, dict):
+        return tuple(sorted((k, _canonical_value(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical_value(v) for v in value)
+    return value
+
+
+class ResultCache:
+    """계산 응답 LRU/TTL 캐시 - 크기 제한, 적중/실패 카운터"""
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 300.0, enabled: bool = True):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(endpoint: str, data: dict) -> Hashable:
+        """요청 정규화 키 - 별칭을 실제 필드명으로 바꾸고 실수는 양자화"""
+        resolved = LegacyFieldSupport.apply_aliases(data)
+        return (endpoint, tuple(sorted((k, _canonical_value(v)) for k, v in resolved.items())))
+
+    def get(self, key: Optional[Hashable]) -> Any:
+        if not self.enabled or key is None:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Optional[Hashable], value: Any) -> None:
+        if not self.enabled or key is None or self.max_size <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+result_cache = ResultCache(
+    max_size=int(os.getenv("RESULT_CACHE_MAX_SIZE", "1024")),
+    ttl_seconds=float(os.getenv("RESULT_CACHE_TTL_SECONDS", "300")),
+    enabled=_env_flag("RESULT_CACHE_ENABLED", True),
+)
@@ -1,6 +1,27 @@
-from typing import Optional, List
+from typing import Optional, List, Literal, Dict, Any, ClassVar, Tuple
 from pydantic import BaseModel, Field, conint, confloat, model_validator, EmailStr
-from datetime import datetime
+from datetime import datetime, date
+
+from core_logic.column_master import column_registry
+
+
+SWEEP_MAX_POINTS = 1000
+PRICE_BREAK_MAX_POINTS = 10000
+
+
+def _fill_from_material_catalog(values, kind: str):
+    """materialId 가 있으면 재질 카탈로그 기본값으로 빈 필드 채움 (직접 입력한 값 우선)"""
+    if isinstance(values, dict) and values.get("materialId"):
+        # core_logic 이 이 모듈을 import 하므로 지연 import
+        from core_logic.material_catalog import material_catalog
+        return material_catalog.apply_defaults(values, kind)
+    return values
+
+
+def _require_fields(model: BaseModel, fields) -> None:
+    missing = [field for field in fields if getattr(model, field) is None]
+    if missing:
+        raise ValueError(f"{', '.join(missing)} 값이 필요합니다 (또는 materialId 로 재질 지정)")
 
 
 class RodCalculateRequest(BaseModel):
@@ -16,15 +37,27 @@ class RodCalculateRequest(BaseModel):
     cuttingLoss: confloat(ge=0) = Field(0, description="절단 시 손실되는 길이 (mm)")
     headCut: confloat(ge=0) = Field(0, description="봉재 선단 가공 손실 (mm)")
     tailCut: confloat(ge=0) = Field(0, description="봉재 후단 가공 손실 (mm)")
-    standardBarLength: confloat(gt=0) = Field(..., description="표준 봉재 길이 (mm)")
-    materialDensity: confloat(gt=0) = Field(..., description="재질의 밀도 (kg/m³)")
-    materialPrice: confloat(ge=0) = Field(..., description="봉재의 kg당 단가 (₩/kg)")
+    standardBarLength: Optional[confloat(gt=0)] = Field(None, description="표준 봉재 길이 (mm) - materialId 사용 시 생략 가능")
+    materialDensity: Optional[confloat(gt=0)] = Field(None, description="재질의 밀도 (kg/m³) - materialId 사용 시 생략 가능")
+    materialPrice: Optional[confloat(ge=0)] = Field(None, description="봉재의 kg당 단가 (₩/kg) - materialId 사용 시 생략 가능")
     actualProductWeight: Optional[confloat(ge=0)] = Field(None, description="사용자가 입력하는 제품 1개 실제 중량 (g)")
     recoveryRatio: Optional[confloat(ge=0, le=100)] = Field(None, description="스크랩 환산율 (%)")
     scrapUnitPrice: Optional[confloat(ge=0)] = Field(None, description="스크랩 회수 단가 (₩/kg)")
+    material: Optional[str] = Field(None, max_length=50, description="재질명 (예: SUM24L) - 잔재 재고 조회 키")
+    useRemnants: bool = Field(False, description="잔재 재고를 신규 봉재보다 먼저 사용")
+    consumeRemnants: bool = Field(False, description="잔재 사용 계획을 재고에 반영 (사용 잔재 차감, 새 자투리 등록)")
+    materialId: Optional[str] = Field(None, max_length=50, description="재질 카탈로그 id (/materials) - 밀도/단가/표준 길이 기본값 사용")
+
+    MATERIAL_REQUIRED_FIELDS: ClassVar[Tuple[str, ...]] = ("standardBarLength", "materialDensity", "materialPrice")
+
+    @model_validator(mode="before")
+    @classmethod
+    def apply_material_defaults(cls, values):
+        return _fill_from_material_catalog(values, "rod")
 
     @model_validator(mode="after")
     def validate_shape_dimensions(self) -> "RodCalculateRequest":
+        _require_fields(self, self.MATERIAL_REQUIRED_FIELDS)
         shape_lower = (self.shape or "").lower()
         if shape_lower == "rectangle":
             if self.width is None or self.height is None:
@@ -42,8 +75,33 @@ class PlateCalculateRequest(BaseModel):
     plateWidth: confloat(gt=0) = Field(..., description="판재의 폭 (mm)")
     plateLength: confloat(gt=0) = Field(..., description="판재의 길이 (mm)")
     quantity: conint(ge=1) = Field(..., description="총 제작 수량 (개)")
-    materialDensity: confloat(gt=0) = Field(..., description="재질의 밀도 (kg/m³)")
-    plateUnitPrice: confloat(ge=0) = Field(..., description="판재의 kg당 단가 (₩/kg)")
+    materialDensity: Optional[confloat(gt=0)] = Field(None, description="재질의 밀도 (kg/m³) - materialId 사용 시 생략 가능")
+    plateUnitPrice: Optional[confloat(ge=0)] = Field(None, description="판재의 kg당 단가 (₩/kg) - materialId 사용 시 생략 가능")
+    materialId: Optional[str] = Field(None, max_length=50, description="재질 카탈로그 id (/materials) - 밀도/판재 단가 기본값 사용")
+    sheetWidth: Optional[confloat(gt=0)] = Field(None, description="원판 폭 (mm) - 원판 크기를 주면 네스팅으로 원판 수/실제 재료비 계산")
+    sheetLength: Optional[confloat(gt=0)] = Field(None, description="원판 길이 (mm)")
+    cuttingLoss: confloat(ge=0) = Field(0, description="절단 폭 (mm) - 네스팅 시 부품 사이 간격")
+    edgeTrim: confloat(ge=0) = Field(0, description="원판 가장자리 손실 - 사방 (mm)")
+    allowRotation: bool = Field(True, description="부품 90° 회전 배치 허용 (결 방향이 있으면 false)")
+    minRemnantSize: confloat(gt=0) = Field(100, description="재사용 잔재로 남길 최소 가로/세로 (mm) - 이보다 작은 자투리는 스크랩")
+    actualProductWeight: Optional[confloat(ge=0)] = Field(None, description="사용자가 입력하는 제품 1개 실제 중량 (g) - 가공 칩까지 스크랩으로 계산")
+    recoveryRatio: Optional[confloat(ge=0, le=100)] = Field(None, description="스크랩 환산율 (%)")
+    scrapUnitPrice: Optional[confloat(ge=0)] = Field(None, description="스크랩 회수 단가 (₩/kg) - materialId 사용 시 생략 가능")
+    material: Optional[str] = Field(None, max_length=50, description="재질명 - 판재 잔재 재고 조회 키 (재질 + 두께)")
+    useRemnants: bool = Field(False, description="판재 잔재 재고에 먼저 배치 (원판 크기 필요)")
+    consumeRemnants: bool = Field(False, description="잔재 사용 계획을 재고에 반영 (사용 잔재 차감, 새 잔재 등록)")
+
+    @model_validator(mode="before")
+    @classmethod
+    def apply_material_defaults(cls, values):
+        return _fill_from_material_catalog(values, "plate")
+
+    @model_validator(mode="after")
+    def validate_material_fields(self) -> "PlateCalculateRequest":
+        _require_fields(self, ("materialDensity", "plateUnitPrice"))
+        if (self.sheetWidth is None) != (self.sheetLength is None):
+            raise ValueError("원판 크기는 sheetWidth 와 sheetLength 를 함께 입력해야 합니다")
+        return self
 
 
 class ScrapCalculateRequest(BaseModel):
@@ -64,6 +122,58 @@ class ValidationWarning(BaseModel):
     suggestion: Optional[str] = Field(None, description="개선 제안")
 
 
+class RemnantUsage(BaseModel):
+    """잔재 사용 내역"""
+    id: int = Field(..., description="잔재 ID")
+    length: float = Field(..., description="잔재 길이 (mm)")
+    pieces: int = Field(..., description="이 잔재에서 만드는 제품 수 (개)")
+    leftoverLength: float = Field(..., description="사용 후 남는 길이 (mm)")
+
+
+class RemnantPlan(BaseModel):
+    """봉재 계산의 잔재 우선 사용 계획"""
+    remnantsUsed: List[RemnantUsage] = Field(default_factory=list, description="사용하는 잔재 목록")
+    piecesFromRemnants: int = Field(..., description="잔재로 만드는 제품 수 (개)")
+    barsNeededWithoutRemnants: int = Field(..., description="잔재 없이 필요한 봉재 수 (개)")
+    barsNeededAfterRemnants: int = Field(..., description="잔재 사용 후 필요한 신규 봉재 수 (개)")
+    barsSaved: int = Field(..., description="잔재 사용으로 절약한 봉재 수 (개)")
+    consumed: bool = Field(False, description="재고 반영 여부")
+    remnantsAdded: int = Field(0, description="재고에 새로 등록된 자투리 수 (개)")
+
+
+class NestingPlacement(BaseModel):
+    """배치 묶음 - (x, y) 부터 같은 부품을 열 × 행 격자로, 행 단위로 채움 (간격 = 부품 치수 + 절단 폭)"""
+    item: int = Field(..., description="요청 items 의 순번 (0부터)")
+    x: float = Field(..., description="첫 부품 왼쪽 아래 X - 원판 폭 방향 (mm)")
+    y: float = Field(..., description="첫 부품 왼쪽 아래 Y - 원판 길이 방향 (mm)")
+    partWidth: float = Field(..., description="놓인 방향의 폭 (mm)")
+    partLength: float = Field(..., description="놓인 방향의 길이 (mm)")
+    rotated: bool = Field(..., description="90° 회전 여부")
+    columns: int = Field(..., description="열 수")
+    rows: int = Field(..., description="행 수")
+    count: int = Field(..., description="묶음의 부품 수 (마지막 행은 덜 찰 수 있음)")
+
+
+class PlateRemnantUsage(BaseModel):
+    """판재 잔재 사용 내역"""
+    id: int = Field(..., description="잔재 ID")
+    width: float = Field(..., description="잔재 폭 (mm)")
+    length: float = Field(..., description="잔재 길이 (mm)")
+    pieces: int = Field(..., description="이 잔재에서 만드는 부품 수 (개)")
+    placements: List[NestingPlacement] = Field(default_factory=list, description="잔재 위 배치 묶음")
+
+
+class PlateRemnantPlan(BaseModel):
+    """판재 계산의 잔재 우선 사용 계획"""
+    remnantsUsed: List[PlateRemnantUsage] = Field(default_factory=list, description="사용하는 잔재 목록")
+    piecesFromRemnants: int = Field(..., description="잔재로 만드는 부품 수 (개)")
+    sheetsNeededWithoutRemnants: int = Field(..., description="잔재 없이 필요한 원판 수 (장)")
+    sheetsNeededAfterRemnants: int = Field(..., description="잔재 사용 후 필요한 신규 원판 수 (장)")
+    sheetsSaved: int = Field(..., description="잔재 사용으로 절약한 원판 수 (장)")
+    consumed: bool = Field(False, description="재고 반영 여부")
+    remnantsAdded: int = Field(0, description="재고에 새로 등록된 잔재 수 (개)")
+
+
 class RodCalculateResponse(BaseModel):
     """봉재 계산 응답 - 컬럼마스터 v2.2 기준 + 검증 기능"""
     barsNeeded: int = Field(..., description="필요한 봉재 수량 (개)")
@@ -78,6 +188,7 @@ class RodCalculateResponse(BaseModel):
     realCost: float = Field(..., description="총 재료비에서 스크랩 절감액을 차감한 실제 재료비 (₩)")
     isPlate: bool = Field(False, description="판재 여부")
     totalActualProductWeight: Optional[float] = Field(None, description="실제 제품 1개 중량 × 수량의 합 (kg)")
+    remnantPlan: Optional[RemnantPlan] = Field(None, description="잔재 우선 사용 계획 (useRemnants 요청 시)")
     warnings: List[ValidationWarning] = Field(default_factory=list, description="검증 경고 메시지 목록")
     suggestions: List[str] = Field(default_factory=list, description="최적화 제안 목록")
 
@@ -87,11 +198,18 @@ class PlateCalculateResponse(BaseModel):
     totalWeight: float = Field(..., description="전체 판재의 총 중량 (kg)")
     totalCost: float = Field(..., description="전체 생산에 필요한 재료비 (₩)")
     unitCost: float = Field(..., description="제품 1개당 재료 단가 (₩)")
-    utilizationRate: float = Field(..., description="자재 사용 효율 (%) - 판재는 100%")
-    wastage: float = Field(..., description="자재 사용 손실률 (%) - 판재는 0%")
+    utilizationRate: float = Field(..., description="자재 사용 효율 (%) - 원판 크기가 없으면 100%")
+    wastage: float = Field(..., description="자재 사용 손실률 (%) - 원판 크기가 없으면 0%")
     scrapSavings: float = Field(0.0, description="스크랩 회수로 절약된 금액 (₩)")
     realCost: float = Field(..., description="총 재료비에서 스크랩 절감액을 차감한 실제 재료비 (₩)")
     isPlate: bool = Field(True, description="판재 여부")
+    sheetsNeeded: Optional[int] = Field(None, description="필요한 원판 수 (장) - 원판 크기 입력 시")
+    sheetWeight: Optional[float] = Field(None, description="원판 1장 중량 (kg)")
+    partsWeight: Optional[float] = Field(None, description="부품 총 중량 (kg) - totalWeight 는 원판 전체 중량")
+    scrapWeight: Optional[float] = Field(None, description="스크랩 중량 (kg) - 원판 중량 - 부품 중량 - 재사용 잔재 중량")
+    remnantWeight: Optional[float] = Field(None, description="재사용 잔재 중량 (kg) - 스크랩으로 팔지 않고 재고로 남김")
+    remnantCount: Optional[int] = Field(None, description="재사용 잔재 수 (개)")
+    remnantPlan: Optional[PlateRemnantPlan] = Field(None, description="잔재 우선 사용 계획 (useRemnants 요청 시)")
     totalActualProductWeight: Optional[float] = Field(None, description="실제 제품 1개 중량 × 수량의 합 (kg)")
     warnings: List[ValidationWarning] = Field(default_factory=list, description="검증 경고 메시지 목록")
     suggestions: List[str] = Field(default_factory=list, description="최적화 제안 목록")
@@ -108,6 +226,184 @@ class ScrapCalculateResponse(BaseModel):
     warnings: List[ValidationWarning] = Field(default_factory=list, description="검증 경고 메시지 목록")
 
 
+class RodBatchCalculateRequest(BaseModel):
+    """봉재 일괄 계산 요청 - ERP 내보내기 등 다건 견적용"""
+    items: List[RodCalculateRequest] = Field(..., min_length=1, max_length=10000, description="봉재 계산 요청 목록")
+
+
+class CuttingStockItem(BaseModel):
+    """절단 계획 요청 - 제품 길이별 수량"""
+    productLength: confloat(gt=0) = Field(..., description="제품 길이 (mm)")
+    quantity: conint(ge=1) = Field(..., description="제작 수량 (개)")
+
+
+class CuttingStockRequest(BaseModel):
+    """다품종 절단 계획 요청 - 같은 직경/재질 봉재에 여러 길이의 제품을 배치"""
+    items: List[CuttingStockItem] = Field(..., min_length=1, max_length=1000, description="제품 길이별 수량 목록")
+    cuttingLoss: confloat(ge=0) = Field(0, description="절단 시 손실되는 길이 (mm)")
+    headCut: confloat(ge=0) = Field(0, description="봉재 선단 가공 손실 (mm)")
+    tailCut: confloat(ge=0) = Field(0, description="봉재 후단 가공 손실 (mm)")
+    standardBarLength: confloat(gt=0) = Field(..., description="표준 봉재 길이 (mm)")
+
+
+class CuttingPatternCut(BaseModel):
+    """절단 패턴 내 제품"""
+    productLength: float = Field(..., description="제품 길이 (mm)")
+    count: int = Field(..., description="봉재 1개에서 자르는 개수")
+
+
+class CuttingPattern(BaseModel):
+    """봉재 절단 패턴 - 같은 패턴으로 자르는 봉재 묶음"""
+    bars: int = Field(..., description="이 패턴으로 자르는 봉재 수 (개)")
+    cuts: List[CuttingPatternCut] = Field(default_factory=list, description="봉재 1개의 절단 구성")
+    usedLength: float = Field(..., description="봉재 1개에서 사용되는 길이 - 절단 손실 포함 (mm)")
+    remnantLength: float = Field(..., description="봉재 1개의 남는 길이 - 헤드컷/테일컷 제외 (mm)")
+
+
+class CuttingStockResponse(BaseModel):
+    """다품종 절단 계획 응답"""
+    barsNeeded: int = Field(..., description="필요한 봉재 수량 (개)")
+    lowerBound: int = Field(..., description="이론상 최소 봉재 수 (개)")
+    isOptimal: bool = Field(..., description="하한에 도달한 최적 계획 여부")
+    perJobBarsNeeded: int = Field(..., description="제품 길이별로 따로 계산했을 때의 봉재 수 (개)")
+    barsSaved: int = Field(..., description="개별 계산 대비 절약한 봉재 수 (개)")
+    usableLength: float = Field(..., description="봉재 1개의 사용 가능 길이 (mm)")
+    totalPieces: int = Field(..., description="총 제품 수량 (개)")
+    utilizationRate: float = Field(..., description="자재 사용 효율 (%)")
+    wastage: float = Field(..., description="자재 사용 손실률 (%)")
+    patterns: List[CuttingPattern] = Field(default_factory=list, description="봉재별 절단 계획")
+
+
+class SweepAxis(BaseModel):
+    """스윕 축 - 값 목록(values) 또는 범위(start, stop, step)"""
+    field: Literal["standardBarLength", "cuttingLoss", "headCut", "tailCut", "quantity"] = Field(..., description="변화시킬 입력 항목")
+    values: Optional[List[confloat(ge=0)]] = Field(None, description="값 목록")
+    start: Optional[confloat(ge=0)] = Field(None, description="범위 시작값 (포함)")
+    stop: Optional[confloat(ge=0)] = Field(None, description="범위 끝값 (포함)")
+    step: Optional[confloat(gt=0)] = Field(None, description="범위 간격")
+
+    @model_validator(mode="after")
+    def validate_axis(self) -> "SweepAxis":
+        if self.values is None:
+            if self.start is None or self.stop is None or self.step is None:
+                raise ValueError("values 또는 start/stop/step 을 입력해야 합니다")
+            if self.stop < self.start:
+                raise ValueError("stop 은 start 이상이어야 합니다")
+            count = int((self.stop - self.start) / self.step + 1e-9) + 1
+            if count > SWEEP_MAX_POINTS:
+                raise ValueError(f"축의 값은 최대 {SWEEP_MAX_POINTS}개까지 가능합니다")
+            self.values = [self.start + i * self.step for i in range(count)]
+        if not self.values:
+            raise ValueError("축의 값이 비어 있습니다")
+        if len(self.values) > SWEEP_MAX_POINTS:
+            raise ValueError(f"축의 값은 최대 {SWEEP_MAX_POINTS}개까지 가능합니다")
+        if self.field == "quantity" and any(v < 1 or v != int(v) for v in self.values):
+            raise ValueError("수량 축은 1 이상의 정수여야 합니다")
+        return self
+
+
+class RodSweepRequest(BaseModel):
+    """봉재 파라미터 스윕 요청 - 기준 요청 + 1~2개 축"""
+    base: RodCalculateRequest = Field(..., description="기준 봉재 계산 요청")
+    x: SweepAxis = Field(..., description="x 축")
+    y: Optional[SweepAxis] = Field(None, description="y 축 (선택)")
+
+
+class RodPriceBreakRequest(BaseModel):
+    """수량별 가격표 요청 - 기준 요청(quantity 는 무시) + 수량 목록(quantities) 또는 범위(start, stop, step)"""
+    base: RodCalculateRequest = Field(..., description="기준 봉재 계산 요청")
+    quantities: Optional[List[conint(ge=1)]] = Field(None, description="수량 목록 (예: 100, 500, 1000, 5000)")
+    start: Optional[conint(ge=1)] = Field(None, description="수량 범위 시작값 (포함)")
+    stop: Optional[conint(ge=1)] = Field(None, description="수량 범위 끝값 (포함)")
+    step: conint(ge=1) = Field(1, description="수량 범위 간격")
+    maxSweetSpots: conint(ge=0, le=1000) = Field(100, description="돌려줄 sweet spot 최대 개수")
+
+    @model_validator(mode="after")
+    def validate_quantities(self) -> "RodPriceBreakRequest":
+        if self.quantities is None:
+            if self.start is None or self.stop is None:
+                raise ValueError("quantities 또는 start/stop 을 입력해야 합니다")
+            if self.stop < self.start:
+                raise ValueError("stop 은 start 이상이어야 합니다")
+            if (self.stop - self.start) // self.step + 1 > PRICE_BREAK_MAX_POINTS:
+                raise ValueError(f"수량은 최대 {PRICE_BREAK_MAX_POINTS}개까지 가능합니다")
+            self.quantities = list(range(self.start, self.stop + 1, self.step))
+        if not self.quantities:
+            raise ValueError("수량 목록이 비어 있습니다")
+        if len(self.quantities) > PRICE_BREAK_MAX_POINTS:
+            raise ValueError(f"수량은 최대 {PRICE_BREAK_MAX_POINTS}개까지 가능합니다")
+        return self
+
+
+class RodMaxQuantityRequest(RodCalculateRequest):
+    """역계산 요청 - 보유 봉재 수/재료 중량/예산 한도로 만들 수 있는 최대 수량 (quantity 는 사용하지 않음)"""
+    quantity: Optional[conint(ge=1)] = Field(None, description="사용하지 않음 (계산 결과)")
+    barsAvailable: Optional[conint(ge=0)] = Field(None, description="보유 봉재 수 (개)")
+    maxMaterialWeight: Optional[confloat(ge=0)] = Field(None, description="사용 가능한 봉재 중량 (kg)")
+    maxCost: Optional[confloat(ge=0)] = Field(None, description="재료비 예산 (₩)")
+    useScrapCredit: bool = Field(False, description="예산을 스크랩 회수액 차감 실제 재료비(realCost)와 비교 - actualProductWeight, recoveryRatio, scrapUnitPrice 필요")
+
+    @model_validator(mode="after")
+    def validate_limits(self) -> "RodMaxQuantityRequest":
+        if self.barsAvailable is None and self.maxMaterialWeight is None and self.maxCost is None:
+            raise ValueError("barsAvailable, maxMaterialWeight, maxCost 중 하나 이상 입력해야 합니다")
+        return self
+
+
+class StockLengthOption(BaseModel):
+    """구매 가능한 표준 봉재 길이"""
+    standardBarLength: confloat(gt=0) = Field(..., description="표준 봉재 길이 (mm)")
+    materialPrice: Optional[confloat(ge=0)] = Field(None, description="이 길이의 kg당 단가 (₩/kg) - 없으면 요청의 materialPrice")
+
+
+class RodStockMixRequest(RodCalculateRequest):
+    """표준 봉재 길이 카탈로그 최적화 요청 - standardBarLength 대신 catalog 사용"""
+    standardBarLength: Optional[confloat(gt=0)] = Field(None, description="사용하지 않음 (catalog 로 대체)")
+    MATERIAL_REQUIRED_FIELDS: ClassVar[Tuple[str, ...]] = ("materialDensity", "materialPrice")
+    catalog: List[StockLengthOption] = Field(..., min_length=1, max_length=20, description="구매 가능한 길이/단가 목록")
+
+
+OrderStatus = Literal["quoted", "ordered", "in_production", "completed", "cancelled"]
+
+
+class OrderCreateRequest(BaseModel):
+    """주문 저장 요청 - rod/plate 중 하나의 계산 요청, result 가 없으면 저장 시 1회 계산"""
+    customer: Optional[str] = Field(None, max_length=100, description="고객사 이름")
+    productName: Optional[str] = Field(None, max_length=200, description="제품 이름")
+    material: Optional[str] = Field(None, max_length=50, description="재질명 (예: SUM24L)")
+    status: OrderStatus = Field("quoted", description="주문 상태")
+    deliveryDate: Optional[date] = Field(None, description="납기일")
+    deliveryUnitPrice: Optional[confloat(ge=0)] = Field(None, description="납품 단가 (₩)")
+    notes: Optional[str] = Field(None, max_length=2000, description="메모")
+    rod: Optional[RodCalculateRequest] = Field(None, description="봉재 계산 요청")
+    plate: Optional[PlateCalculateRequest] = Field(None, description="판재 계산 요청")
+    result: Optional[Dict[str, Any]] = Field(None, description="견적 당시 계산 응답 (RodCalculateResponse/PlateCalculateResponse)")
+
+    @model_validator(mode="after")
+    def validate_single_quote(self) -> "OrderCreateRequest":
+        if (self.rod is None) == (self.plate is None):
+            raise ValueError("rod 와 plate 중 하나만 입력해야 합니다")
+        return self
+
+
+class OrderUpdateRequest(BaseModel):
+    """주문 수정 요청 - 조회용 필드만 (견적 요청/결과는 변경 불가)"""
+    customer: Optional[str] = Field(None, max_length=100, description="고객사 이름")
+    productName: Optional[str] = Field(None, max_length=200, description="제품 이름")
+    material: Optional[str] = Field(None, max_length=50, description="재질명")
+    status: Optional[OrderStatus] = Field(None, description="주문 상태")
+    deliveryDate: Optional[date] = Field(None, description="납기일")
+    deliveryUnitPrice: Optional[confloat(ge=0)] = Field(None, description="납품 단가 (₩)")
+    notes: Optional[str] = Field(None, max_length=2000, description="메모")
+
+    @model_validator(mode="after")
+    def validate_status_not_null(self) -> "OrderUpdateRequest":
+        # 상태는 비울 수 없음 - 생략하면 그대로, null 을 보내면 오류
+        if "status" in self.model_fields_set and self.status is None:
+            raise ValueError("status 는 null 로 바꿀 수 없습니다")
+        return self
+
+
 class ErrorResponse(BaseModel):
     """오류 응답 - 컬럼마스터 v2.1 기준"""
     status_code: int = Field(..., description="HTTP 상태 코드")
@@ -117,34 +413,361 @@ class ErrorResponse(BaseModel):
     suggestions: List[str] = Field(default_factory=list, description="해결 방안 제안")
 
 
+class RodBatchItemResult(BaseModel):
+    """봉재 일괄 계산 - 행별 결과"""
+    index: int = Field(..., description="요청 목록 내 행 번호 (0부터)")
+    success: bool = Field(..., description="계산 성공 여부")
+    result: Optional[RodCalculateResponse] = Field(None, description="계산 결과 (성공 시)")
+    error: Optional[ErrorResponse] = Field(None, description="오류 내용 (실패 시)")
+
+
+class RodBatchCalculateResponse(BaseModel):
+    """봉재 일괄 계산 응답"""
+    total: int = Field(..., description="요청 행 수")
+    succeeded: int = Field(..., description="계산 성공 행 수")
+    failed: int = Field(..., description="계산 실패 행 수")
+    results: List[RodBatchItemResult] = Field(default_factory=list, description="행별 결과 목록")
+
+
+class RodQuoteRequest(BaseModel):
+    """여러 행 봉재 견적 요청 - 재질/형상/규격/봉재 조건이 같은 행끼리 봉재를 공동 사용"""
+    lines: List[RodCalculateRequest] = Field(..., min_length=1, max_length=10000, description="견적 행 목록 (/calculate/rod 요청 형식)")
+
+
+class RodQuoteLineResult(BaseModel):
+    """여러 행 견적 - 행별 배분 결과"""
+    index: int = Field(..., description="요청 목록 내 행 번호 (0부터)")
+    group: int = Field(..., description="공동 사용 그룹 번호")
+    quantity: int = Field(..., description="제작 수량 (개)")
+    barsNeededAlone: int = Field(..., description="행 단독 계산 시 봉재 수 (개)")
+    allocatedBars: float = Field(..., description="배분된 봉재 수 - 행 전용 봉재 + 공동 봉재 몫 (개)")
+    materialTotalWeight: float = Field(..., description="배분된 봉재 중량 (kg)")
+    totalCost: float = Field(..., description="배분된 재료비 (₩)")
+    unitCost: float = Field(..., description="개당 재료비 (₩)")
+    totalCostAlone: float = Field(..., description="행 단독 계산 시 재료비 (₩)")
+    costSaved: float = Field(..., description="행 단독 계산 대비 절약액 (₩)")
+
+
+class RodQuoteGroup(BaseModel):
+    """여러 행 견적 - 같은 봉재를 공동 사용하는 행 묶음"""
+    group: int = Field(..., description="그룹 번호")
+    material: Optional[str] = Field(None, description="재질명 또는 재질 id")
+    shape: str = Field(..., description="봉재 형상")
+    lines: List[int] = Field(default_factory=list, description="그룹에 속한 행 번호")
+    pooledPieces: int = Field(..., description="공동 봉재에 배치한 제품 수 - 행별 나머지 (개)")
+    barsNeededAlone: int = Field(..., description="행별 계산 봉재 수 합계 (개)")
+    barsNeeded: int = Field(..., description="공동 사용 시 봉재 수 (개)")
+    barsSaved: int = Field(..., description="절약한 봉재 수 (개)")
+    totalCostAlone: float = Field(..., description="행별 계산 재료비 합계 (₩)")
+    totalCost: float = Field(..., description="공동 사용 시 재료비 (₩)")
+    costSaved: float = Field(..., description="절약액 (₩)")
+
+
+class RodQuoteResponse(BaseModel):
+    """여러 행 봉재 견적 응답"""
+    barsNeededAlone: int = Field(..., description="행별 계산 봉재 수 합계 (개)")
+    barsNeeded: int = Field(..., description="공동 사용 시 봉재 수 (개)")
+    barsSaved: int = Field(..., description="절약한 봉재 수 (개)")
+    totalCostAlone: float = Field(..., description="행별 계산 재료비 합계 (₩)")
+    totalCost: float = Field(..., description="공동 사용 시 재료비 (₩)")
+    costSaved: float = Field(..., description="절약액 (₩)")
+    savingRate: float = Field(..., description="절약률 (%)")
+    groups: List[RodQuoteGroup] = Field(default_factory=list, description="공동 사용 그룹 목록")
+    lines: List[RodQuoteLineResult] = Field(default_factory=list, description="행별 배분 결과 (요청 순서)")
+
+
+class RemnantCreateRequest(BaseModel):
+    """잔재 등록 요청"""
+    material: str = Field(..., min_length=1, max_length=50, description="재질명 (예: SUM24L)")
+    shape: str = Field(..., description="봉재 형상 종류 (circle, hexagon, square, rectangle)")
+    diameter: Optional[confloat(gt=0)] = Field(None, description="원형/육각형/정사각형의 직경 (mm)")
+    width: Optional[confloat(gt=0)] = Field(None, description="직사각형(봉재) 가로 (mm)")
+    height: Optional[confloat(gt=0)] = Field(None, description="직사각형(봉재) 세로 (mm)")
+    lengths: List[confloat(gt=0)] = Field(..., min_length=1, max_length=10000, description="잔재 길이 목록 (mm)")
+
+    @model_validator(mode="after")
+    def validate_shape_dimensions(self) -> "RemnantCreateRequest":
+        shape_lower = (self.shape or "").lower()
+        if shape_lower == "rectangle":
+            if self.width is None or self.height is None:
+                raise ValueError("직사각형의 경우 가로와 세로가 필요합니다")
+        elif self.diameter is None:
+            raise ValueError(f"{shape_lower} 형상의 경우 직경이 필요합니다")
+        return self
+
+
+class PlateRemnantSize(BaseModel):
+    """판재 잔재 치수"""
+    width: confloat(gt=0) = Field(..., description="폭 (mm)")
+    length: confloat(gt=0) = Field(..., description="길이 (mm)")
+
+
+class PlateRemnantCreateRequest(BaseModel):
+    """판재 잔재 등록 요청"""
+    material: str = Field(..., min_length=1, max_length=50, description="재질명")
+    plateThickness: confloat(gt=0) = Field(..., description="판재 두께 (mm)")
+    remnants: List[PlateRemnantSize] = Field(..., min_length=1, max_length=10000, description="잔재 치수 목록")
+
+
+class PlateRemnantItem(BaseModel):
+    """판재 잔재 재고 항목"""
+    id: int = Field(..., description="잔재 ID")
+    width: float = Field(..., description="폭 (mm)")
+    length: float = Field(..., description="길이 (mm)")
+
+
+class PlateRemnantListResponse(BaseModel):
+    """판재 잔재 목록 응답"""
+    material: str = Field(..., description="재질명")
+    plateThickness: float = Field(..., description="판재 두께 (mm)")
+    count: int = Field(..., description="잔재 수 (개)")
+    totalArea: float = Field(..., description="잔재 면적 합계 (mm²)")
+    remnants: List[PlateRemnantItem] = Field(default_factory=list, description="면적 오름차순 잔재 목록")
+
+
+class RemnantItem(BaseModel):
+    """잔재 재고 항목"""
+    id: int = Field(..., description="잔재 ID")
+    length: float = Field(..., description="잔재 길이 (mm)")
+
+
+class RemnantListResponse(BaseModel):
+    """잔재 목록 응답"""
+    material: str = Field(..., description="재질명")
+    shape: str = Field(..., description="봉재 형상 종류")
+    count: int = Field(..., description="잔재 수 (개)")
+    totalLength: float = Field(..., description="잔재 길이 합계 (mm)")
+    remnants: List[RemnantItem] = Field(default_factory=list, description="길이 오름차순 잔재 목록")
+
+
+class RodSweepResponse(BaseModel):
+    """봉재 파라미터 스윕 응답 - 격자는 [y][x] 순서 (y 축이 없으면 1행)"""
+    xField: str = Field(..., description="x 축 항목")
+    xValues: List[float] = Field(..., description="x 축 값")
+    yField: Optional[str] = Field(None, description="y 축 항목")
+    yValues: Optional[List[float]] = Field(None, description="y 축 값")
+    barsNeeded: List[List[int]] = Field(..., description="필요한 봉재 수량 (개) - 계산 불가 조건은 0")
+    totalCost: List[List[float]] = Field(..., description="총 재료비 (₩)")
+    utilizationRate: List[List[float]] = Field(..., description="자재 사용 효율 (%)")
+    realCost: List[List[float]] = Field(..., description="스크랩 절감액 차감 실제 재료비 (₩)")
+    unitCost: List[List[float]] = Field(..., description="제품 1개당 재료 단가 (₩)")
+
+
+class PriceBreakPoint(BaseModel):
+    """sweet spot - 마지막 봉재까지 꽉 차는 수량"""
+    quantity: int = Field(..., description="수량 (봉재당 제품 수의 배수)")
+    barsNeeded: int = Field(..., description="필요한 봉재 수량 (개)")
+    totalCost: float = Field(..., description="총 재료비 (₩)")
+    unitCost: float = Field(..., description="제품 1개당 재료 단가 (₩)")
+    realCost: float = Field(..., description="스크랩 절감액 차감 실제 재료비 (₩)")
+    utilizationRate: float = Field(..., description="자재 사용 효율 (%)")
+
+
+class RodPriceBreakResponse(BaseModel):
+    """수량별 가격표 응답 - 목록은 요청 수량 순서"""
+    piecesPerBar: int = Field(..., description="봉재 1개당 제품 수 (개)")
+    quantities: List[int] = Field(..., description="수량")
+    barsNeeded: List[int] = Field(..., description="필요한 봉재 수량 (개)")
+    totalCost: List[float] = Field(..., description="총 재료비 (₩)")
+    unitCost: List[float] = Field(..., description="제품 1개당 재료 단가 (₩)")
+    realCost: List[float] = Field(..., description="스크랩 절감액 차감 실제 재료비 (₩)")
+    utilizationRate: List[float] = Field(..., description="자재 사용 효율 (%)")
+    fullBarQuantity: List[int] = Field(..., description="같은 봉재 수로 만들 수 있는 최대 수량 (개)")
+    sweetSpotCount: int = Field(..., description="요청 수량 범위 안의 sweet spot 수")
+    sweetSpots: List[PriceBreakPoint] = Field(default_factory=list, description="sweet spot 목록 (최대 maxSweetSpots 개)")
+
+
+class MaxQuantityLimit(BaseModel):
+    """한도 1개에 대한 최대 수량"""
+    limit: Literal["bars", "weight", "cost"] = Field(..., description="한도 종류 (보유 봉재 수, 재료 중량, 예산)")
+    value: float = Field(..., description="한도 값 (개, kg, ₩)")
+    maxQuantity: int = Field(..., description="이 한도만 있을 때의 최대 수량 (개)")
+    barsNeeded: int = Field(..., description="그때 필요한 봉재 수 (개)")
+
+
+class RodMaxQuantityResponse(BaseModel):
+    """역계산 응답 - 최대 수량과 그 수량의 /calculate/rod 계산 값"""
+    piecesPerBar: int = Field(..., description="봉재 1개당 제품 수 (개)")
+    maxQuantity: int = Field(..., description="모든 한도를 지키는 최대 수량 (개)")
+    limitingFactor: str = Field(..., description="최대 수량을 정한 한도 (bars, weight, cost)")
+    scrapCreditApplied: bool = Field(..., description="예산에 스크랩 회수액을 반영했는지 여부")
+    limits: List[MaxQuantityLimit] = Field(default_factory=list, description="한도별 최대 수량")
+    barsNeeded: int = Field(..., description="필요한 봉재 수량 (개)")
+    materialTotalWeight: float = Field(..., description="봉재 총 중량 (kg)")
+    totalCost: float = Field(..., description="총 재료비 (₩)")
+    realCost: float = Field(..., description="스크랩 절감액 차감 실제 재료비 (₩)")
+    unitCost: float = Field(..., description="제품 1개당 재료 단가 (₩)")
+    utilizationRate: float = Field(..., description="자재 사용 효율 (%)")
+    notes: List[str] = Field(default_factory=list, description="적용하지 않은 한도 등 참고 사항")
+
+
+class StockLengthResult(BaseModel):
+    """표준 봉재 길이 1종만 구매할 때의 결과"""
+    standardBarLength: float = Field(..., description="표준 봉재 길이 (mm)")
+    materialPrice: float = Field(..., description="kg당 단가 (₩/kg)")
+    piecesPerBar: int = Field(..., description="봉재 1개당 제품 수 (개)")
+    barsNeeded: int = Field(..., description="필요한 봉재 수량 (개)")
+    materialTotalWeight: float = Field(..., description="봉재 총 중량 (kg)")
+    totalCost: float = Field(..., description="총 재료비 (₩)")
+    unitCost: float = Field(..., description="제품 1개당 재료 단가 (₩)")
+    utilizationRate: float = Field(..., description="자재 사용 효율 (%)")
+
+
+class StockMixEntry(BaseModel):
+    """최적 조합 내 길이별 구매 수량"""
+    standardBarLength: float = Field(..., description="표준 봉재 길이 (mm)")
+    materialPrice: float = Field(..., description="kg당 단가 (₩/kg)")
+    piecesPerBar: int = Field(..., description="봉재 1개당 제품 수 (개)")
+    bars: int = Field(..., description="구매 봉재 수 (개)")
+    materialTotalWeight: float = Field(..., description="봉재 총 중량 (kg)")
+    totalCost: float = Field(..., description="재료비 (₩)")
+
+
+class StockMixResult(BaseModel):
+    """최저가 길이 조합"""
+    barsNeeded: int = Field(..., description="전체 봉재 수량 (개)")
+    materialTotalWeight: float = Field(..., description="봉재 총 중량 (kg)")
+    totalCost: float = Field(..., description="총 재료비 (₩)")
+    unitCost: float = Field(..., description="제품 1개당 재료 단가 (₩)")
+    utilizationRate: float = Field(..., description="자재 사용 효율 (%)")
+    mix: List[StockMixEntry] = Field(default_factory=list, description="길이별 구매 수량")
+
+
+class RodStockMixResponse(BaseModel):
+    """표준 봉재 길이 카탈로그 최적화 응답"""
+    quantity: int = Field(..., description="총 제작 수량 (개)")
+    options: List[StockLengthResult] = Field(default_factory=list, description="길이별 단독 구매 결과")
+    optimal: StockMixResult = Field(..., description="최저가 길이 조합")
+    savingsVsBestSingle: float = Field(..., description="단독 구매 최저가 대비 절감액 (₩)")
+
+
+class PlateNestingItem(BaseModel):
+    """네스팅 부품 - 부품 치수별 수량"""
+    partWidth: confloat(gt=0) = Field(..., description="부품 폭 (mm)")
+    partLength: confloat(gt=0) = Field(..., description="부품 길이 (mm)")
+    quantity: conint(ge=1) = Field(..., description="제작 수량 (개)")
+    allowRotation: bool = Field(True, description="90° 회전 배치 허용 (결 방향이 있으면 false)")
+
+
+class PlateNestingRequest(BaseModel):
+    """판재 네스팅 요청 - 같은 두께/재질 원판에 여러 크기의 부품을 배치"""
+    items: List[PlateNestingItem] = Field(..., min_length=1, max_length=1000, description="부품 치수별 수량 목록")
+    sheetWidth: confloat(gt=0) = Field(..., description="원판 폭 (mm)")
+    sheetLength: confloat(gt=0) = Field(..., description="원판 길이 (mm)")
+    plateThickness: confloat(gt=0) = Field(..., description="판재 두께 (mm)")
+    cuttingLoss: confloat(ge=0) = Field(0, description="절단 폭 (mm)")
+    edgeTrim: confloat(ge=0) = Field(0, description="원판 가장자리 손실 - 사방 (mm)")
+    minRemnantSize: confloat(gt=0) = Field(100, description="재사용 잔재로 보고할 최소 가로/세로 (mm)")
+    materialDensity: Optional[confloat(gt=0)] = Field(None, description="재질의 밀도 (kg/m³) - materialId 사용 시 생략 가능")
+    plateUnitPrice: Optional[confloat(ge=0)] = Field(None, description="판재의 kg당 단가 (₩/kg) - materialId 사용 시 생략 가능")
+    materialId: Optional[str] = Field(None, max_length=50, description="재질 카탈로그 id (/materials)")
+
+    @model_validator(mode="before")
+    @classmethod
+    def apply_material_defaults(cls, values):
+        return _fill_from_material_catalog(values, "plate")
+
+    @model_validator(mode="after")
+    def validate_material_fields(self) -> "PlateNestingRequest":
+        _require_fields(self, ("materialDensity", "plateUnitPrice"))
+        return self
+
+
+class NestingRemnant(BaseModel):
+    """배치 후 남는 재사용 잔재 영역"""
+    x: float = Field(..., description="왼쪽 아래 X (mm)")
+    y: float = Field(..., description="왼쪽 아래 Y (mm)")
+    width: float = Field(..., description="폭 (mm)")
+    length: float = Field(..., description="길이 (mm)")
+
+
+class NestingLayout(BaseModel):
+    """원판 배치도 - 같은 배치로 자르는 원판 묶음"""
+    sheets: int = Field(..., description="이 배치로 자르는 원판 수 (장)")
+    pieces: int = Field(..., description="원판 1장의 부품 수 (개)")
+    usedArea: float = Field(..., description="원판 1장의 부품 면적 (mm²)")
+    utilizationRate: float = Field(..., description="원판 1장의 사용 효율 (%)")
+    placements: List[NestingPlacement] = Field(default_factory=list, description="배치 묶음 목록")
+    remnants: List[NestingRemnant] = Field(default_factory=list, description="원판 1장에서 남는 재사용 잔재 (minRemnantSize 이상)")
+
+
+class PlateNestingResponse(BaseModel):
+    """판재 네스팅 응답"""
+    sheetsNeeded: int = Field(..., description="필요한 원판 수 (장)")
+    lowerBound: int = Field(..., description="면적 기준 최소 원판 수 (장)")
+    isOptimal: bool = Field(..., description="하한에 도달한 최적 계획 여부")
+    totalPieces: int = Field(..., description="총 부품 수량 (개)")
+    sheetWeight: float = Field(..., description="원판 1장 중량 (kg)")
+    totalWeight: float = Field(..., description="구매 원판 총 중량 (kg)")
+    partsWeight: float = Field(..., description="부품 총 중량 (kg)")
+    remnantWeight: float = Field(..., description="재사용 잔재 총 중량 (kg)")
+    remnantCount: int = Field(..., description="재사용 잔재 수 (개)")
+    totalCost: float = Field(..., description="원판 재료비 (₩)")
+    unitCost: float = Field(..., description="부품 1개당 재료 단가 (₩)")
+    utilizationRate: float = Field(..., description="자재 사용 효율 (%) - 부품 면적 / 원판 면적")
+    wastage: float = Field(..., description="자재 사용 손실률 (%)")
+    layouts: List[NestingLayout] = Field(default_factory=list, description="원판별 배치도")
+
+
+class OrderItem(BaseModel):
+    """저장된 주문"""
+    id: int = Field(..., description="주문 ID")
+    customer: Optional[str] = Field(None, description="고객사 이름")
+    productName: Optional[str] = Field(None, description="제품 이름")
+    material: Optional[str] = Field(None, description="재질명")
+    materialType: Literal["rod", "plate"] = Field(..., description="봉재/판재 구분")
+    status: str = Field(..., description="주문 상태")
+    quantity: int = Field(..., description="총 제작 수량 (개)")
+    totalCost: Optional[float] = Field(None, description="총 재료비 (₩)")
+    unitCost: Optional[float] = Field(None, description="개당 재료 단가 (₩)")
+    deliveryDate: Optional[date] = Field(None, description="납기일")
+    deliveryUnitPrice: Optional[float] = Field(None, description="납품 단가 (₩)")
+    notes: Optional[str] = Field(None, description="메모")
+    createdAt: datetime = Field(..., description="생성 시각")
+    updatedAt: datetime = Field(..., description="수정 시각")
+    request: Dict[str, Any] = Field(..., description="견적 계산 요청 원문")
+    result: Dict[str, Any] = Field(..., description="견적 계산 응답 원문")
+
+
+class OrderListResponse(BaseModel):
+    """주문 목록 (최신순, 키셋 페이지네이션)"""
+    items: List[OrderItem] = Field(default_factory=list, description="주문 목록")
+    count: int = Field(..., description="이번 페이지 주문 수")
+    nextCursor: Optional[str] = Field(None, description="다음 페이지 커서 (마지막 페이지면 없음)")
+
+
+class MaterialItem(BaseModel):
+    """재질 카탈로그 항목"""
+    id: str = Field(..., description="재질 id (계산 요청의 materialId)")
+    name: str = Field(..., description="재질명")
+    standardBarLength: Optional[float] = Field(None, description="표준 봉재 길이 (mm)")
+    materialDensity: Optional[float] = Field(None, description="재질의 밀도 (kg/m³)")
+    barUnitPrice: Optional[float] = Field(None, description="봉재 kg당 단가 (₩/kg)")
+    plateUnitPrice: Optional[float] = Field(None, description="판재 kg당 단가 (₩/kg)")
+    scrapUnitPrice: Optional[float] = Field(None, description="스크랩 회수 단가 (₩/kg)")
+
+
+class MaterialListResponse(BaseModel):
+    """재질 카탈로그 목록"""
+    version: Optional[str] = Field(None, description="카탈로그 버전")
+    count: int = Field(..., description="재질 수")
+    materials: List[MaterialItem] = Field(default_factory=list, description="재질 목록")
+
+
 # 컬럼마스터 정책 준수를 위한 별칭 지원
 class LegacyFieldSupport:
-    """컬럼마스터의 aliases 지원을 위한 필드 매핑"""
-    FIELD_ALIASES = {
-        # API 요청 시 별칭 지원
-        "scrapPrice": "scrapUnitPrice",
-        "thickness": "plateThickness", 
-        "width_plate": "plateWidth",
-        "length_plate": "plateLength",
-        
-        # API 응답 시 별칭 지원
-        "materialCost": "totalCost",
-        "costPerPiece": "unitCost",
-    }
-    
+    """컬럼마스터의 aliases 지원을 위한 필드 매핑 (컬럼마스터 레지스트리에서 컴파일된 별칭 맵 사용)"""
+    FIELD_ALIASES = column_registry.alias_map
+
     @classmethod
     def resolve_alias(cls, field_name: str) -> str:
         """별칭을 실제 필드명으로 변환"""
         return cls.FIELD_ALIASES.get(field_name, field_name)
-    
+
     @classmethod
     def apply_aliases(cls, data: dict) -> dict:
         """딕셔너리에서 별칭을 실제 필드명으로 변환"""
-        resolved_data = {}
-        for key, value in data.items():
-            resolved_key = cls.resolve_alias(key)
-            resolved_data[resolved_key] = value
-        return resolved_data
+        return column_registry.normalize(data)
 
 
 # 컬럼마스터 단위 정책 준수
@@ -216,6 +839,17 @@ class CustomerInquiryResponse(BaseModel):
     timestamp: datetime = Field(..., description="처리 시간")
 
 
+class InquiryDeliveryStatus(BaseModel):
+    """고객 문의 노션 전송 상태"""
+    inquiry_id: str = Field(..., description="문의 접수 ID")
+    status: Literal["queued", "sending", "retrying", "delivered", "failed"] = Field(..., description="전송 상태")
+    attempts: int = Field(..., description="전송 시도 횟수")
+    page_id: Optional[str] = Field(None, description="노션 페이지 ID (전송 완료 시)")
+    error: Optional[str] = Field(None, description="마지막 전송 오류")
+    created_at: datetime = Field(..., description="접수 시각")
+    delivered_at: Optional[datetime] = Field(None, description="노션 저장 시각")
+
+
 class NotionErrorResponse(BaseModel):
     """노션 연동 오류 응답"""
     success: bool = Field(False, description="저장 성공 여부")
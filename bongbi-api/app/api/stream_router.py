@@ -0,0 +1,224 @@
+import json
+import logging
+import os
+from typing import AsyncIterator, Dict, List, Optional
+
+from fastapi import APIRouter, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+
+from app.api.schemas import (
+    RodCalculateRequest, PlateCalculateRequest, ScrapCalculateRequest,
+    ErrorResponse, LegacyFieldSupport
+)
+from app.api.calculate_router import plate_response, scrap_response, rod_batch_row_result
+from app.logging_setup import get_logger, log_event
+from core_logic.rod_batch import calculate_rod_batch
+
+router = APIRouter()
+logger = get_logger("stream")
+
+# NDJSON 스트리밍 일괄 계산
+# 요청 본문을 줄 단위로 읽어 STREAM_CHUNK_ROWS 행씩 계산하고 결과 줄을 바로 내보낸다.
+# 한 번에 메모리에 올라가는 것은 청크 1개 + 미완성 줄 1개뿐이라 입력 크기와 무관하게 메모리가 일정하다.
+# 입력 줄: {"type": "rod"|"plate"|"scrap", "id": (선택, 그대로 돌려줌), ...계산 요청 필드}
+# 출력 줄: {"line": 입력 줄 번호(1부터), "id", "type", "success", "result" | "error"}
+# 모든 종류가 상태 없는 계산이다 - 결과 캐시를 거치지 않고 잔재 재고도 쓰지 않는다 (useRemnants/consumeRemnants 무시).
+# 잔재를 반영한 견적은 단건 /calculate/rod, /calculate/plate 로 요청한다.
+
+STREAM_CHUNK_ROWS = int(os.getenv("STREAM_CHUNK_ROWS", "500"))
+STREAM_MAX_LINE_BYTES = int(os.getenv("STREAM_MAX_LINE_BYTES", str(64 * 1024)))
+
+STREAM_REQUEST_MODELS = {
+    "rod": RodCalculateRequest,
+    "plate": PlateCalculateRequest,
+    "scrap": ScrapCalculateRequest,
+}
+
+
+class _BodyStreamingResponse(StreamingResponse):
+    """
+    요청 본문을 읽으면서 응답을 내보내는 StreamingResponse
+    기본 구현은 응답 중 receive() 로 연결 종료를 감시해서 아직 읽지 않은 본문 메시지를 가로채므로 감시를 생략한다.
+    (클라이언트가 끊기면 request.stream() 의 ClientDisconnect 또는 send 실패로 종료됨)
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _line_error(message: str, detail: Optional[str] = None, field: Optional[str] = None) -> Dict:
+    return ErrorResponse(
+        status_code=400,
+        message=message,
+        detail=detail,
+        field=field,
+        suggestions=["해당 줄의 입력값을 확인하세요"]
+    ).model_dump()
+
+
+def _validation_error(e: ValidationError) -> Dict:
+    first = e.errors()[0]
+    field = ".".join(str(loc) for loc in first.get("loc", ())) or None
+    return _line_error(f"입력값 오류: {first.get('msg')}", detail=str(e), field=field)
+
+
+async def _iter_lines(request: Request) -> AsyncIterator[tuple]:
+    """본문을 줄 단위로 (줄 번호, bytes | None) 반환 - 너무 긴 줄은 버리고 None"""
+    buffer = bytearray()
+    line_no = 0
+    overflow = False
+    async for chunk in request.stream():
+        start = 0
+        while True:
+            newline = chunk.find(b"\n", start)
+            if newline < 0:
+                if not overflow:
+                    buffer.extend(chunk[start:])
+                    if len(buffer) > STREAM_MAX_LINE_BYTES:
+                        buffer.clear()
+                        overflow = True
+                break
+            line_no += 1
+            if overflow:
+                overflow = False
+                yield line_no, None
+            else:
+                buffer.extend(chunk[start:newline])
+                if len(buffer) > STREAM_MAX_LINE_BYTES:
+                    yield line_no, None
+                else:
+                    yield line_no, bytes(buffer)
+            buffer.clear()
+            start = newline + 1
+    if overflow:
+        yield line_no + 1, None
+    elif buffer.strip():
+        yield line_no + 1, bytes(buffer)
+
+
+def _parse_line(line_no: int, raw: Optional[bytes]) -> Optional[Dict]:
+    """입력 줄 1개 → 계산 대기 행 (빈 줄은 None) - 어떤 입력이든 예외 대신 오류 줄로 (스트림 중단 없음)"""
+    row = {"line": line_no, "id": None, "type": None, "request": None, "error": None}
+    try:
+        return _parse_row(row, raw)
+    except Exception as e:
+        log_event(logger, logging.ERROR, "Stream line parse error", exc_info=True, line=line_no, error=str(e))
+        row["request"] = None
+        row["error"] = _line_error(f"입력 처리 오류: {str(e)}")
+        return row
+
+
+def _parse_row(row: Dict, raw: Optional[bytes]) -> Optional[Dict]:
+    if raw is None:
+        row["error"] = _line_error(f"줄이 너무 깁니다 (최대 {STREAM_MAX_LINE_BYTES} bytes)")
+        return row
+    if not raw.strip():
+        return None
+    try:
+        payload = json.loads(raw)
+    except ValueError as e:
+        row["error"] = _line_error("JSON 형식 오류", detail=str(e))
+        return row
+    if not isinstance(payload, dict):
+        row["error"] = _line_error("각 줄은 JSON 객체여야 합니다")
+        return row
+
+    row["id"] = payload.pop("id", None)
+    row["type"] = payload.pop("type", "rod")
+    model = STREAM_REQUEST_MODELS.get(row["type"]) if isinstance(row["type"], str) else None
+    if model is None:
+        row["error"] = _line_error(f"지원하지 않는 계산 종류: {row['type']}", field="type")
+        return row
+    try:
+        row["request"] = model(**payload)
+    except ValidationError as e:
+        row["error"] = _validation_error(e)
+    return row
+
+
+def _calculate_single(row: Dict) -> Dict:
+    """판재/스크랩 행 - 단건 엔드포인트와 같은 계산/응답 모델 (캐시/잔재 재고 없음)"""
+    data = row["request"].model_dump()
+    try:
+        if row["type"] == "plate":
+            response = plate_response(LegacyFieldSupport.apply_aliases(data))
+        else:
+            response = scrap_response(data)
+    except Exception as e:
+        log_event(logger, logging.ERROR, "Stream row error", exc_info=True, line=row["line"], type=row["type"], error=str(e))
+        return {"success": False, "error": _line_error(f"계산 오류: {str(e)}")}
+    if isinstance(response, ErrorResponse):
+        return {"success": False, "error": response.model_dump()}
+    return {"success": True, "result": response.model_dump(mode="json", exclude_none=True)}
+
+
+def _calculate_singles(rows: List[Dict]) -> List[Dict]:
+    return [_calculate_single(row) for row in rows]
+
+
+async def _calculate_chunk(rows: List[Dict]) -> List[Dict]:
+    """청크 계산 - 봉재 행은 배열 연산 한 번, 판재/스크랩은 행별 (모두 스레드풀에서)"""
+    outcomes: List[Optional[Dict]] = [None] * len(rows)
+    rod_positions = [i for i, row in enumerate(rows) if row["error"] is None and row["type"] == "rod"]
+
+    if rod_positions:
+        rod_rows = [LegacyFieldSupport.apply_aliases(rows[i]["request"].model_dump()) for i in rod_positions]
+        try:
+            batch = await run_in_threadpool(calculate_rod_batch, rod_rows)
+            for position, batch_row in zip(rod_positions, batch):
+                item = rod_batch_row_result(batch_row)
+                if item.success:
+                    outcomes[position] = {"success": True, "result": item.result.model_dump(mode="json", exclude_none=True)}
+                else:
+                    outcomes[position] = {"success": False, "error": item.error.model_dump()}
+        except Exception as e:
+            log_event(logger, logging.ERROR, "Stream rod chunk error", exc_info=True, rows=len(rod_positions), error=str(e))
+            for position in rod_positions:
+                outcomes[position] = {"success": False, "error": _line_error(f"계산 오류: {str(e)}")}
+
+    single_positions = []
+    for i, row in enumerate(rows):
+        if row["error"] is not None:
+            outcomes[i] = {"success": False, "error": row["error"]}
+        elif outcomes[i] is None:
+            single_positions.append(i)
+    if single_positions:
+        singles = await run_in_threadpool(_calculate_singles, [rows[i] for i in single_positions])
+        for position, outcome in zip(single_positions, singles):
+            outcomes[position] = outcome
+    return outcomes
+
+
+def _encode(row: Dict, outcome: Dict) -> str:
+    line = {"line": row["line"], "id": row["id"], "type": row["type"], **outcome}
+    return json.dumps(line, ensure_ascii=False) + "\n"
+
+
+async def _stream_results(request: Request) -> AsyncIterator[str]:
+    pending: List[Dict] = []
+    async for line_no, raw in _iter_lines(request):
+        row = _parse_line(line_no, raw)
+        if row is None:
+            continue
+        pending.append(row)
+        if len(pending) >= STREAM_CHUNK_ROWS:
+            outcomes = await _calculate_chunk(pending)
+            yield "".join(_encode(row, outcome) for row, outcome in zip(pending, outcomes))
+            pending = []
+    if pending:
+        outcomes = await _calculate_chunk(pending)
+        yield "".join(_encode(row, outcome) for row, outcome in zip(pending, outcomes))
+
+
+@router.post('/calculate/stream')
+async def calculate_stream(request: Request):
+    """
+    NDJSON 스트리밍 일괄 계산 API - 전체 품목 재산정(10만 행 이상)용
+    줄마다 봉재/판재/스크랩 계산 결과 또는 오류 줄을 입력 순서대로 스트리밍 (실패 행이 있어도 중단하지 않음)
+    결과 캐시와 잔재 재고는 쓰지 않음 - 같은 입력이면 언제나 같은 결과
+    """
+    return _BodyStreamingResponse(_stream_results(request), media_type="application/x-ndjson")
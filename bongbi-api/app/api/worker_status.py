@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+from app.api.metrics import metrics
+
+
+# 워커 프로세스 준비 상태
+# 여러 워커(gunicorn) 로 띄우면 /health 요청은 워커 하나만 받으므로, 각 워커가 WORKER_STATE_DIR 에
+# 자기 상태(준비/종료 중, 처리 중 요청 수 등)를 주기적으로 써 두고 /health 는 전체 워커 목록을 읽어 보여준다.
+# WORKER_STATE_DIR 이 없으면(단일 프로세스) 자기 상태만 보고한다.
+# 환경변수: WORKER_STATE_DIR, WORKER_HEARTBEAT_SECONDS (기본 2)
+
+STALE_HEARTBEATS = 3  # 이 주기 수 이상 갱신이 없으면 응답 없는 워커로 본다
+
+
+class WorkerStatus:
+    """이 워커의 준비 상태 + 하트비트 파일"""
+
+    def __init__(self, state_dir: Optional[str] = None, heartbeat_seconds: float = 2.0,
+                 stats: Optional[Callable[[], Dict]] = None):
+        self.state_dir = state_dir
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stats = stats
+        self.pid = os.getpid()
+        self.started_at: Optional[float] = None
+        self.ready = False
+        self.draining = False
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls, stats: Optional[Callable[[], Dict]] = None) -> "WorkerStatus":
+        return cls(
+            os.getenv("WORKER_STATE_DIR") or None,
+            heartbeat_seconds=float(os.getenv("WORKER_HEARTBEAT_SECONDS", "2")),
+            stats=stats,
+        )
+
+    @property
+    def _path(self) -> Optional[str]:
+        return os.path.join(self.state_dir, f"worker-{self.pid}.json") if self.state_dir else None
+
+    async def start(self) -> None:
+        """lifespan 시작이 끝난 뒤 호출 - 준비 완료 표시, 하트비트 시작"""
+        self.pid = os.getpid()  # 프리포크 후 워커 pid
+        self.started_at = time.time()
+        self.ready = True
+        self.draining = False
+        self.write()
+        if self.state_dir and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+
+    def mark_draining(self) -> None:
+        """종료 시작 - /ready 가 503 을 돌려 로드밸런서가 새 요청을 보내지 않게 함"""
+        self.draining = True
+        self.write()
+
+    async def stop(self) -> None:
+        self.ready = False
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        path = self._path
+        if path:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            self.write()
+
+    def snapshot(self) -> Dict:
+        state = {
+            "pid": self.pid,
+            "ready": self.ready and not self.draining,
+            "draining": self.draining,
+            "started_at": self.started_at,
+            "heartbeat_at": time.time(),
+        }
+        if self.stats is not None:
+            state.update(self.stats())
+        return state
+
+    def write(self) -> None:
+        path = self._path
+        if not path:
+            return
+        # 쓰는 중인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(temp_path, path)
+
+    def cluster(self) -> Optional[List[Dict]]:
+        """WORKER_STATE_DIR 의 모든 워커 상태 (하트비트가 끊긴 워커는 ready=false, stale=true)"""
+        if not self.state_dir:
+            return None
+        workers = []
+        now = time.time()
+        try:
+            names = sorted(os.listdir(self.state_dir))
+        except FileNotFoundError:
+            return []
+        for name in names:
+            if not (name.startswith("worker-") and name.endswith(".json")):
+                continue
+            try:
+                with open(os.path.join(self.state_dir, name), encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                continue
+            age = now - state.get("heartbeat_at", 0)
+            state["heartbeat_age_seconds"] = round(age, 3)
+            state["stale"] = age > self.heartbeat_seconds * STALE_HEARTBEATS
+            if state["stale"]:
+                state["ready"] = False
+            workers.append(state)
+        return workers
+
+
+def _worker_stats() -> Dict:
+    return {"in_flight": metrics.in_flight, "requests": metrics.requests_total()}
+
+
+worker_status = WorkerStatus.from_env(_worker_stats)
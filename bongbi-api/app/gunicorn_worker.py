@@ -0,0 +1,57 @@
+import asyncio
+import os
+import sys
+from types import FrameType
+from typing import Optional
+
+from gunicorn.arbiter import Arbiter
+from uvicorn.config import Config
+from uvicorn.server import Server
+from uvicorn.workers import UvicornWorker
+
+from app.api.worker_status import worker_status
+
+
+# gunicorn 워커 - 종료 신호를 받으면 먼저 draining 으로 표시하고 잠시 더 요청을 받은 뒤 종료
+# uvicorn Server.shutdown 은 리스너를 닫고 처리 중인 요청을 기다린 다음에야 lifespan 종료를 부르므로,
+# lifespan 에서 draining 을 표시하면 /ready 503 을 돌려줄 기회가 없다. 신호 처리기에서 바로 표시하고
+# READY_DRAIN_SECONDS 동안은 그대로 요청을 받아 로드밸런서가 /ready 503 을 보고 이 워커를 빼게 한 뒤
+# uvicorn 의 graceful 종료(리스너 닫기 → 처리 중인 요청 마무리 → lifespan 종료)로 넘어간다.
+# 대기 중 종료 신호를 한 번 더 받으면 바로 종료를 시작한다 (SIGINT 두 번이면 uvicorn 과 같이 강제 종료).
+# 환경변수: READY_DRAIN_SECONDS (기본 5, gunicorn graceful_timeout 보다 작게)
+
+
+class DrainingServer(Server):
+    """종료 신호 → worker_status draining 표시 → drain_seconds 뒤 uvicorn 종료"""
+
+    def __init__(self, config: Config, drain_seconds: float = 0.0):
+        super().__init__(config)
+        self.drain_seconds = drain_seconds
+        self._drain_handle: Optional[asyncio.TimerHandle] = None
+
+    def handle_exit(self, sig: int, frame: Optional[FrameType]) -> None:
+        if worker_status.draining or self.drain_seconds <= 0:
+            if self._drain_handle is not None:
+                self._drain_handle.cancel()
+                self._drain_handle = None
+            worker_status.mark_draining()
+            super().handle_exit(sig, frame)
+            return
+        worker_status.mark_draining()
+        self._drain_handle = asyncio.get_running_loop().call_later(self.drain_seconds, self._begin_shutdown, sig)
+
+    def _begin_shutdown(self, sig: int) -> None:
+        self._drain_handle = None
+        super().handle_exit(sig, None)
+
+
+class DrainingUvicornWorker(UvicornWorker):
+    """gunicorn.conf.py 의 worker_class - UvicornWorker._serve 와 같되 DrainingServer 사용"""
+
+    async def _serve(self) -> None:
+        self.config.app = self.wsgi
+        server = DrainingServer(config=self.config, drain_seconds=float(os.getenv("READY_DRAIN_SECONDS", "5")))
+        self._install_sigquit_handler()
+        await server.serve(sockets=self.sockets)
+        if not server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
@@ -0,0 +1,233 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+
+# 구조화(JSON 한 줄) 로깅
+# - 요청 처리 스레드/이벤트 루프는 레코드를 큐에 넣기만 하고, stdout 쓰기와 JSON 직렬화는 리스너 스레드가 한다.
+#   (pm2 가 stdout 을 파이프로 받을 때 쓰기가 막혀도 요청 처리가 같이 멈추지 않음 - 큐가 가득 차면 버리고 건수만 셈)
+# - 요청마다 request_id (X-Request-ID 헤더가 있으면 그 값) 를 모든 로그 줄에 붙인다.
+# - 입력 경고처럼 양이 많은 로그는 키별로 초당 LOG_SAMPLE_BURST 건까지 기록하고, 그 뒤로는 LOG_SAMPLE_EVERY 건 중 1건만 기록한다.
+# 환경변수: LOG_LEVEL (기본 INFO), LOG_LEVELS ("bongbi.calculate=WARNING,bongbi.notion=DEBUG"),
+#          LOG_FORMAT (json | text, 기본 json), LOG_QUEUE_SIZE (기본 10000), LOG_SAMPLE_BURST (기본 10), LOG_SAMPLE_EVERY (기본 100)
+
+LOGGER_PREFIX = "bongbi"
+REQUEST_ID_HEADER = b"x-request-id"
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# logging.LogRecord 기본 속성 - 이 밖의 extra 값은 JSON 필드로 내보낸다
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(f"{LOGGER_PREFIX}.{name}")
+
+
+class JsonFormatter(logging.Formatter):
+    """LogRecord → JSON 한 줄 (ts, level, logger, message, request_id, extra 필드, exc)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """개발용 사람이 읽는 형식 (extra 필드는 key=value 로 뒤에 붙임)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        extras = " ".join(
+            f"{key}={value}" for key, value in record.__dict__.items()
+            if key not in _RECORD_ATTRS and not key.startswith("_")
+        )
+        request_id = getattr(record, "request_id", None)
+        line = f"{self.formatTime(record)} {record.levelname} {record.name}"
+        if request_id:
+            line += f" [{request_id}]"
+        line += f" {record.getMessage()}"
+        if extras:
+            line += f" {extras}"
+        if record.exc_text:
+            line += f"\n{record.exc_text}"
+        return line
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """큐에 넣기만 하는 핸들러 - 가득 차면 기다리지 않고 버림"""
+
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 기본 prepare 는 호출 스레드에서 포맷까지 하므로, 메시지 병합/예외 문자열화만 하고 직렬화는 리스너에 맡긴다
+        record.request_id = request_id_var.get()
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogSampler:
+    """키별 로그 샘플링 - 초당 burst 건, 이후 every 건 중 1건 (기록되는 줄에 생략 건수 표시)"""
+
+    def __init__(self, burst: int = 10, every: int = 100):
+        self.burst = burst
+        self.every = max(1, every)
+        self._windows: Dict[str, Tuple[int, int, int]] = {}  # key → (초, 이번 초 건수, 생략 건수)
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> Tuple[bool, int]:
+        """(기록 여부, 기록할 때 그 전까지 생략된 건수)"""
+        second = int(time.monotonic())
+        with self._lock:
+            window, seen, skipped = self._windows.get(key, (second, 0, 0))
+            if window != second:
+                seen = 0
+            seen += 1
+            if seen <= self.burst or (seen - self.burst) % self.every == 0:
+                self._windows[key] = (second, seen, 0)
+                return True, skipped
+            self._windows[key] = (second, seen, skipped + 1)
+            return False, 0
+
+
+sampler = LogSampler(
+    burst=int(os.getenv("LOG_SAMPLE_BURST", "10")),
+    every=int(os.getenv("LOG_SAMPLE_EVERY", "100")),
+)
+
+
+def log_event(logger: logging.Logger, level: int, message: str, sample_key: Optional[str] = None,
+              exc_info: bool = False, **fields) -> None:
+    """구조화 로그 1건 - 레벨이 꺼져 있으면 레코드를 만들지 않고, sample_key 가 있으면 샘플링"""
+    if not logger.isEnabledFor(level):
+        return
+    if sample_key is not None:
+        allowed, skipped = sampler.allow(sample_key)
+        if not allowed:
+            return
+        if skipped:
+            fields["sampled_out"] = skipped
+    logger.log(level, message, exc_info=exc_info, extra=fields)
+
+
+_listener: Optional[QueueListener] = None
+_handler: Optional[NonBlockingQueueHandler] = None
+
+
+def configure_logging() -> None:
+    """bongbi.* 로거에 큐 핸들러 연결, 리스너 스레드 시작 (여러 번 호출해도 한 번만 설정)"""
+    global _listener, _handler
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(TextFormatter() if os.getenv("LOG_FORMAT", "json").lower() == "text" else JsonFormatter())
+
+    _handler = NonBlockingQueueHandler(queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000"))))
+    _listener = QueueListener(_handler.queue, output, respect_handler_level=False)
+
+    root = logging.getLogger(LOGGER_PREFIX)
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    root.addHandler(_handler)
+    root.propagate = False
+    for spec in filter(None, (part.strip() for part in os.getenv("LOG_LEVELS", "").split(","))):
+        name, _, level = spec.partition("=")
+        logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """큐에 남은 로그를 모두 쓴 뒤 리스너 종료"""
+    global _listener, _handler
+    if _listener is None:
+        return
+    _listener.stop()
+    logging.getLogger(LOGGER_PREFIX).removeHandler(_handler)
+    _listener = None
+    _handler = None
+
+
+def _restart_after_fork() -> None:
+    """프리포크 서버(gunicorn preload)의 워커 - 부모의 리스너 스레드는 복제되지 않으므로 새 큐/리스너로 다시 설정"""
+    global _listener, _handler
+    if _listener is None:
+        return
+    logging.getLogger(LOGGER_PREFIX).removeHandler(_handler)
+    _listener = None
+    _handler = None
+    configure_logging()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def dropped_records() -> int:
+    return _handler.dropped if _handler is not None else 0
+
+
+class RequestIdMiddleware:
+    """ASGI 미들웨어 - 요청 id 를 컨텍스트에 두고 응답 헤더(X-Request-ID)로 돌려줌"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = None
+        for name, value in scope.get("headers", ()):
+            if name == REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex[:16]
+        header = (REQUEST_ID_HEADER, request_id.encode("latin-1"))
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [header]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id_var.reset(token)
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -6,14 +7,66 @@ import os
 # .env를 가장 먼저 로드
 load_dotenv()
 
+# 로깅 설정 (라우터 import 중 남기는 로그도 JSON 큐 핸들러로)
+from app.logging_setup import configure_logging, dropped_records, RequestIdMiddleware
+configure_logging()
+
 # 라우터는 이후에 import
 from app.api.calculate_router import router as calculate_router
-from app.api.notion_router import router as notion_router
+from app.api.notion_router import (
+    router as notion_router, notion_outbox, notion_health, inquiry_spool, notion_configured
+)
+from app.api.remnant_router import router as remnant_router
+from app.api.stream_router import router as stream_router
+from app.api.import_router import router as import_router
+from app.api.order_router import router as order_router
+from app.api.material_router import router as material_router
+from app.api.metrics import router as metrics_router, metrics, MetricsMiddleware
+from app.api.result_cache import result_cache
+from app.api.loop_monitor import EventLoopLagMonitor
+from app.api.worker_status import worker_status
+from core_logic.material_catalog import material_catalog
+from core_logic.order_import import shutdown_pool as shutdown_import_pool
+
+loop_monitor = EventLoopLagMonitor.from_env(metrics.loop_lag.observe)
+
+
+def warm_up() -> None:
+    """읽기 전용 상태를 미리 만들어 둠 - 재질 카탈로그, OpenAPI 스키마 (컬럼마스터는 import 시 컴파일됨)
+    여러 워커로 띄울 때는 gunicorn 마스터가 fork 전에 호출해 워커들이 같은 메모리 페이지를 공유한다 (gunicorn.conf.py)
+    """
+    material_catalog.list()
+    app.openapi()
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # 백그라운드 작업: 노션 문의 전송 아웃박스 (노션 미설정 시 문의는 로컬 스풀에만 쌓임)
+    # 노션 연결 상태 프로버 (/notion/health 는 이 캐시만 읽음)
+    # 이벤트 루프 지연 측정 (/metrics)
+    warm_up()
+    await loop_monitor.start()
+    if notion_configured():
+        await notion_outbox.start()
+        await notion_health.start()
+    # 시작 완료 - /ready 200, 워커 상태 파일 기록
+    await worker_status.start()
+    yield
+    # 종료 - gunicorn 워커는 종료 신호를 받을 때 이미 draining 으로 표시함 (app/gunicorn_worker.py), 단독 uvicorn 은 여기서
+    worker_status.mark_draining()
+    await loop_monitor.stop()
+    await notion_health.stop()
+    await notion_outbox.stop(drain_seconds=float(os.getenv("NOTION_OUTBOX_DRAIN_SECONDS", "5")))
+    inquiry_spool.close()
+    shutdown_import_pool()
+    await worker_status.stop()
+
 
 app = FastAPI(
     title="봉비서 API",
     version="2.1.0",
-    description="소공장을 위한 자재산출 및 작업관리 SaaS"
+    description="소공장을 위한 자재산출 및 작업관리 SaaS",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -28,9 +81,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청 지표 (/metrics) - CORS 보다 바깥에서 전체 처리 시간을 잰다
+app.add_middleware(MetricsMiddleware)
+
+# 요청 id (X-Request-ID) - 가장 바깥, 모든 로그 줄에 붙음
+app.add_middleware(RequestIdMiddleware)
+
+# 수집 시점에 읽는 상태 지표 (counters 는 누적 건수 → _total counter)
+metrics.register_stats("bongbi_notion_outbox", "노션 문의 아웃박스 상태", notion_outbox.stats,
+                       counters=("enqueued", "delivered", "failed", "retries", "rate_limited", "rejected",
+                                 "spooled_only", "replayed"))
+metrics.register_stats("bongbi_notion_health", "노션 연결 확인 상태", notion_health.snapshot, counters=("probes",))
+metrics.register_stats("bongbi_result_cache", "계산 결과 캐시 상태", result_cache.stats,
+                       counters=("hits", "misses", "evictions"))
+metrics.register_stats("bongbi_log", "로그 큐 상태", lambda: {"dropped_records": dropped_records()},
+                       counters=("dropped_records",))
+
 # 라우터 등록
 app.include_router(calculate_router, prefix="/api/v1")
 app.include_router(notion_router, prefix="/api/v1")
+app.include_router(remnant_router, prefix="/api/v1")
+app.include_router(stream_router, prefix="/api/v1")
+app.include_router(import_router, prefix="/api/v1")
+app.include_router(order_router, prefix="/api/v1")
+app.include_router(material_router, prefix="/api/v1")
+app.include_router(metrics_router)
 
 @app.get("/")
 async def root():
@@ -0,0 +1,300 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Sequence
+
+
+# 고객 문의 로컬 스풀 (내장 SQLite, WAL)
+# 모든 문의는 노션 전송 전에 여기에 먼저 기록된다 - 노션 설정이 없거나 노션이 응답하지 않아도 문의가 사라지지 않고,
+# 프로세스를 재시작하면 미전송 문의를 다시 읽어 노션에 보낸다 (최소 1회 전송).
+# 쓰기는 전용 스레드 하나가 모아서 처리한다: 대기 중인 쓰기를 한 트랜잭션으로 묶어 커밋하므로(synchronous=FULL)
+# fsync 는 묶음당 1회이고, 문의가 몰려도 요청당 지연은 커밋 1회 수준으로 유지된다.
+# 여러 워커 프로세스가 같은 스풀을 쓸 때는 행마다 담당 프로세스(owner pid)와 임대 만료 시각을 두어
+# 한 문의를 두 워커가 동시에 전송하지 않게 한다 - 담당 프로세스가 죽었거나 임대가 끝난 문의만 다른 워커가 가져간다.
+# 환경변수: INQUIRY_SPOOL_PATH (기본 bongbi-api/data/inquiries.db), INQUIRY_SPOOL_RETENTION_DAYS (기본 30),
+#          INQUIRY_SPOOL_LEASE_SECONDS (기본 600)
+
+DEFAULT_INQUIRY_SPOOL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "inquiries.db"
+)
+
+SPOOL_QUEUED = "queued"
+SPOOL_DELIVERED = "delivered"
+SPOOL_FAILED = "failed"
+
+MAX_BATCH = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS inquiries (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    created_at INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    page_id TEXT,
+    error TEXT,
+    delivered_at INTEGER,
+    properties_json TEXT,
+    owner INTEGER,
+    lease_until INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_inquiries_status ON inquiries (status, seq);
+"""
+# 임대 열이 없던 스풀 파일 업그레이드
+_LEASE_COLUMNS = (("owner", "INTEGER"), ("lease_until", "INTEGER"))
+
+_INSERT = ("INSERT OR IGNORE INTO inquiries (id, created_at, status, properties_json, owner, lease_until) "
+           "VALUES (?, ?, 'queued', ?, ?, ?)")
+# 전송이 끝난 문의는 본문을 지워 스풀이 커지지 않게 한다
+_DELIVERED = ("UPDATE inquiries SET status = 'delivered', attempts = ?, page_id = ?, error = NULL, "
+              "delivered_at = ?, properties_json = NULL WHERE id = ?")
+_FAILED = "UPDATE inquiries SET status = 'failed', attempts = ?, error = ? WHERE id = ?"
+# 이번 전송 주기를 마친 문의는 임대를 풀어 어느 워커든 다음 주기에 가져갈 수 있게 한다
+_ATTEMPTED = ("UPDATE inquiries SET attempts = ?, error = ?, owner = NULL, lease_until = NULL "
+              "WHERE id = ? AND status = 'queued'")
+_RELEASE = "UPDATE inquiries SET owner = NULL, lease_until = NULL WHERE id = ? AND owner = ? AND status = 'queued'"
+_CLAIM = ("UPDATE inquiries SET owner = ?, lease_until = ? "
+          "WHERE id = ? AND status = 'queued' AND owner IS ? AND lease_until IS ?")
+
+_STOP = object()
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class InquirySpool:
+    """문의 스풀 - 쓰기 전용 스레드의 그룹 커밋 + 스레드별 읽기 연결"""
+
+    def __init__(self, path: str = DEFAULT_INQUIRY_SPOOL_PATH, retention_days: float = 30.0,
+                 lease_seconds: float = 600.0):
+        self.path = path
+        self.retention_days = retention_days
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._initialized = False
+        self._writer: Optional[threading.Thread] = None
+        self.commits = 0
+        self.rows_written = 0
+
+    def _ensure_open(self) -> None:
+        """첫 사용 시 스키마 생성/보관 기간 지난 전송 완료 문의 정리, 쓰기 스레드 시작"""
+        if self._initialized and self._writer is not None and self._writer.is_alive():
+            return
+        with self._lock:
+            if not self._initialized:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                conn = self._open()
+                with conn:
+                    conn.executescript(_SCHEMA)
+                    columns = {row[1] for row in conn.execute("PRAGMA table_info(inquiries)")}
+                    for name, kind in _LEASE_COLUMNS:
+                        if name not in columns:
+                            conn.execute(f"ALTER TABLE inquiries ADD COLUMN {name} {kind}")
+                    if self.retention_days > 0:
+                        cutoff = _now_ms() - int(self.retention_days * 86400 * 1000)
+                        conn.execute("DELETE FROM inquiries WHERE status = 'delivered' AND delivered_at < ?", (cutoff,))
+                conn.close()
+                self._initialized = True
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._run_writer, name="inquiry-spool", daemon=True)
+                self._writer.start()
+
+    @classmethod
+    def from_env(cls) -> "InquirySpool":
+        return cls(
+            os.getenv("INQUIRY_SPOOL_PATH", DEFAULT_INQUIRY_SPOOL_PATH),
+            retention_days=float(os.getenv("INQUIRY_SPOOL_RETENTION_DAYS", "30")),
+            lease_seconds=float(os.getenv("INQUIRY_SPOOL_LEASE_SECONDS", "600")),
+        )
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # 커밋마다 WAL fsync - 접수 응답 전에 디스크에 남아 있어야 함
+        conn.execute("PRAGMA synchronous=FULL")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        self._ensure_open()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+        return conn
+
+    # 쓰기 (모두 Future 반환 - 커밋되면 완료) ------------------------------------
+
+    def _lease_until(self) -> int:
+        return _now_ms() + int(self.lease_seconds * 1000)
+
+    def _submit(self, sql: Any, params: Sequence[Any]) -> Future:
+        self._ensure_open()
+        future: Future = Future()
+        self._queue.put((sql, params, future))
+        return future
+
+    def append(self, item_id: str, properties: Dict, created_at_ms: Optional[int] = None) -> Future:
+        payload = json.dumps(properties, ensure_ascii=False, separators=(",", ":"))
+        return self._submit(_INSERT, (item_id, created_at_ms or _now_ms(), payload, os.getpid(), self._lease_until()))
+
+    def mark_delivered(self, item_id: str, page_id: Optional[str], attempts: int) -> Future:
+        return self._submit(_DELIVERED, (attempts, page_id, _now_ms(), item_id))
+
+    def mark_failed(self, item_id: str, error: Optional[str], attempts: int) -> Future:
+        return self._submit(_FAILED, (attempts, error, item_id))
+
+    def mark_attempted(self, item_id: str, error: Optional[str], attempts: int) -> Future:
+        """전송 실패 후 다음 재전송 주기로 미룬 문의 - 상태는 queued 유지"""
+        return self._submit(_ATTEMPTED, (attempts, error, item_id))
+
+    def release(self, item_ids: Sequence[str]) -> Future:
+        """이 프로세스가 들고 있던 미전송 문의의 임대 해제 (정상 종료 시 - 다른 워커가 바로 가져갈 수 있게)"""
+        pid = os.getpid()
+        return self._submit(_claim_or_release, ("release", [(item_id, pid) for item_id in item_ids]))
+
+    def claim(self, limit: int, exclude: Sequence[str] = ()) -> Future:
+        """
+        전송할 미전송 문의를 최대 limit 건 가져와 이 프로세스 담당으로 임대 (결과: pending() 과 같은 행 목록)
+        담당이 없거나, 이 프로세스 담당이거나, 담당 프로세스가 죽었거나, 임대가 끝난 문의만 가져간다.
+        """
+        return self._submit(_claim_or_release, ("claim", (limit, tuple(exclude))))
+
+    def _run_writer(self) -> None:
+        conn = self._open()
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            # 그룹 커밋: 앞 커밋(fsync) 동안 쌓인 쓰기를 한 트랜잭션으로
+            batch = [first]
+            stop = False
+            while len(batch) < MAX_BATCH:
+                try:
+                    op = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if op is _STOP:
+                    stop = True
+                    break
+                batch.append(op)
+            # 임대(claim/release)는 읽고 쓰는 작업이라 묶음 커밋 뒤 각자 즉시 트랜잭션으로 처리
+            calls = [op for op in batch if callable(op[0])]
+            writes = [op for op in batch if not callable(op[0])]
+            try:
+                if writes:
+                    with conn:
+                        for sql, params, _ in writes:
+                            conn.execute(sql, params)
+                    self.commits += 1
+                    self.rows_written += len(writes)
+                for _, _, future in writes:
+                    future.set_result(None)
+            except Exception as e:
+                for _, _, future in writes:
+                    if not future.done():
+                        future.set_exception(e)
+            for fn, params, future in calls:
+                try:
+                    future.set_result(fn(self, conn, *params))
+                except Exception as e:
+                    future.set_exception(e)
+            if stop:
+                break
+        conn.close()
+
+    def close(self, timeout: float = 10.0) -> None:
+        """대기 중인 쓰기를 커밋한 뒤 쓰기 스레드 종료"""
+        with self._lock:
+            if self._writer is not None and self._writer.is_alive():
+                self._queue.put(_STOP)
+                self._writer.join(timeout)
+            self._writer = None
+
+    # 읽기 -----------------------------------------------------------------
+
+    def pending(self, limit: int, exclude: Sequence[str] = ()) -> List[Dict]:
+        """미전송 문의 (접수 순) - exclude 의 id 는 건너뜀"""
+        excluded = set(exclude)
+        rows = self._reader().execute(
+            "SELECT id, created_at, attempts, properties_json FROM inquiries "
+            "WHERE status = 'queued' ORDER BY seq LIMIT ?",
+            (limit + len(excluded),),
+        ).fetchall()
+        return [
+            {"id": row[0], "created_at": row[1], "attempts": row[2], "properties": json.loads(row[3])}
+            for row in rows if row[0] not in excluded
+        ][:limit]
+
+    def get(self, item_id: str) -> Optional[Dict]:
+        row = self._reader().execute(
+            "SELECT id, status, attempts, page_id, error, created_at, delivered_at FROM inquiries WHERE id = ?",
+            (item_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row[0], "status": row[1], "attempts": row[2], "page_id": row[3], "error": row[4],
+            "created_at": row[5], "delivered_at": row[6],
+        }
+
+    def counts(self) -> Dict[str, int]:
+        rows = self._reader().execute("SELECT status, COUNT(*) FROM inquiries GROUP BY status").fetchall()
+        counts = {SPOOL_QUEUED: 0, SPOOL_DELIVERED: 0, SPOOL_FAILED: 0}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+
+def _claim_or_release(spool: InquirySpool, conn: sqlite3.Connection, action: str, args) -> Any:
+    """쓰기 스레드에서 실행 - BEGIN IMMEDIATE 로 다른 프로세스의 임대와 겹치지 않게 처리"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if action == "release":
+            conn.executemany(_RELEASE, args)
+            conn.commit()
+            return None
+
+        limit, exclude = args
+        excluded = set(exclude)
+        pid, now = os.getpid(), _now_ms()
+        rows = conn.execute(
+            "SELECT id, created_at, attempts, properties_json, owner, lease_until FROM inquiries "
+            "WHERE status = 'queued' ORDER BY seq LIMIT ?",
+            (limit + len(excluded) + 100,),
+        ).fetchall()
+        claimed = []
+        alive: Dict[int, bool] = {}
+        lease_until = spool._lease_until()
+        for item_id, created_at, attempts, properties_json, owner, lease in rows:
+            if len(claimed) >= limit:
+                break
+            if item_id in excluded:
+                continue
+            if owner is not None and owner != pid and lease is not None and lease > now:
+                if alive.setdefault(owner, _pid_alive(owner)):
+                    continue  # 살아 있는 다른 워커가 전송 중
+            cursor = conn.execute(_CLAIM, (pid, lease_until, item_id, owner, lease))
+            if cursor.rowcount == 1:
+                claimed.append({"id": item_id, "created_at": created_at, "attempts": attempts,
+                                "properties": json.loads(properties_json)})
+        conn.commit()
+        return claimed
+    except Exception:
+        conn.rollback()
+        raise
@@ -0,0 +1,222 @@
+import base64
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+# 주문 저장소 (내장 SQLite)
+# 주문 1건 = 견적 당시의 계산 요청/응답(JSON 원문) + 조회용 컬럼(고객사, 재질, 상태, 생성일 등)
+# 목록은 (created_at, id) 키셋 페이지네이션 - OFFSET 없이 인덱스 범위 검색만 하므로 100만 건에서도 페이지 비용이 일정
+# 환경변수: ORDER_DB_PATH (기본 bongbi-api/data/orders.db)
+
+DEFAULT_ORDER_DB_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "orders.db"
+)
+
+ORDER_STATUSES = ("quoted", "ordered", "in_production", "completed", "cancelled")
+UPDATABLE_FIELDS = ("customer", "productName", "material", "status", "deliveryDate", "deliveryUnitPrice", "notes")
+
+_COLUMN_BY_FIELD = {
+    "customer": "customer",
+    "productName": "product_name",
+    "material": "material",
+    "status": "status",
+    "deliveryDate": "delivery_date",
+    "deliveryUnitPrice": "delivery_unit_price",
+    "notes": "notes",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    customer TEXT,
+    product_name TEXT,
+    material TEXT,
+    material_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    total_cost REAL,
+    unit_cost REAL,
+    delivery_date TEXT,
+    delivery_unit_price REAL,
+    notes TEXT,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    request_json TEXT NOT NULL,
+    result_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_orders_created ON orders (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_orders_customer ON orders (customer, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_orders_material ON orders (material, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_orders_status ON orders (status, created_at, id);
+"""
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def encode_cursor(created_at: int, order_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{created_at}:{order_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """다음 페이지 커서 → (created_at, id) - 형식이 틀리면 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, order_id = raw.split(":")
+        return int(created_at), int(order_id)
+    except Exception as e:
+        raise ValueError("잘못된 페이지 커서입니다") from e
+
+
+class OrderStore:
+    """SQLite 주문 저장소 - 스레드별 연결, WAL 모드"""
+
+    def __init__(self, path: str = DEFAULT_ORDER_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._memory_conn = None
+        if path == ":memory:":
+            # 메모리 DB 는 연결마다 별도 DB 이므로 연결 하나를 공유
+            self._memory_conn = sqlite3.connect(path, check_same_thread=False)
+            self._memory_lock = threading.Lock()
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._transaction() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        if self._memory_conn is not None:
+            self._memory_lock.acquire()
+        conn = self._memory_conn or self._connect()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if self._memory_conn is not None:
+                self._memory_lock.release()
+
+    @staticmethod
+    def _row_to_order(row) -> Dict[str, Any]:
+        return {
+            "id": row[0],
+            "customer": row[1],
+            "productName": row[2],
+            "material": row[3],
+            "materialType": row[4],
+            "status": row[5],
+            "quantity": row[6],
+            "totalCost": row[7],
+            "unitCost": row[8],
+            "deliveryDate": row[9],
+            "deliveryUnitPrice": row[10],
+            "notes": row[11],
+            "createdAt": row[12],
+            "updatedAt": row[13],
+            "request": json.loads(row[14]),
+            "result": json.loads(row[15]),
+        }
+
+    _SELECT = (
+        "SELECT id, customer, product_name, material, material_type, status, quantity, total_cost, unit_cost, "
+        "delivery_date, delivery_unit_price, notes, created_at, updated_at, request_json, result_json FROM orders"
+    )
+
+    def create(self, order: Dict[str, Any], created_at: Optional[int] = None) -> Dict[str, Any]:
+        """주문 저장 - order: {customer, productName, material, materialType, status, quantity, request, result, ...}"""
+        created_at = _now_ms() if created_at is None else created_at
+        result = order["result"]
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO orders (customer, product_name, material, material_type, status, quantity, total_cost, "
+                "unit_cost, delivery_date, delivery_unit_price, notes, created_at, updated_at, request_json, result_json) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    order.get("customer"), order.get("productName"), order.get("material"),
+                    order["materialType"], order.get("status") or ORDER_STATUSES[0], int(order["quantity"]),
+                    result.get("totalCost"), result.get("unitCost"),
+                    order.get("deliveryDate"), order.get("deliveryUnitPrice"), order.get("notes"),
+                    created_at, created_at,
+                    json.dumps(order["request"], ensure_ascii=False), json.dumps(result, ensure_ascii=False),
+                ),
+            )
+            order_id = cursor.lastrowid
+        return self.get(order_id)
+
+    def get(self, order_id: int) -> Optional[Dict[str, Any]]:
+        with self._transaction() as conn:
+            row = conn.execute(f"{self._SELECT} WHERE id = ?", (order_id,)).fetchone()
+        return self._row_to_order(row) if row else None
+
+    def update(self, order_id: int, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """조회용 필드만 수정 (견적 요청/결과는 변경 불가)"""
+        fields = [f for f in UPDATABLE_FIELDS if f in changes]
+        if not fields:
+            return self.get(order_id)
+        assignments = ", ".join(f"{_COLUMN_BY_FIELD[f]} = ?" for f in fields)
+        values = [changes[f] for f in fields] + [_now_ms(), order_id]
+        with self._transaction() as conn:
+            updated = conn.execute(f"UPDATE orders SET {assignments}, updated_at = ? WHERE id = ?", values).rowcount
+        return self.get(order_id) if updated else None
+
+    def delete(self, order_id: int) -> bool:
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM orders WHERE id = ?", (order_id,)).rowcount > 0
+
+    def list(self, customer: Optional[str] = None, material: Optional[str] = None,
+             status: Optional[str] = None, material_type: Optional[str] = None,
+             created_from: Optional[int] = None, created_to: Optional[int] = None,
+             cursor: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
+        """
+        최신순 목록 - 필터(고객사/재질/상태/재질유형/생성일 범위) + 키셋 페이지네이션
+        반환: {"items", "nextCursor"(마지막 페이지면 None)}
+        """
+        conditions, params = [], []
+        for column, value in (("customer", customer), ("material", material),
+                              ("status", status), ("material_type", material_type)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if created_from is not None:
+            conditions.append("created_at >= ?")
+            params.append(created_from)
+        if created_to is not None:
+            conditions.append("created_at < ?")
+            params.append(created_to)
+        if cursor:
+            last_created_at, last_id = decode_cursor(cursor)
+            conditions.append("(created_at, id) < (?, ?)")
+            params.extend([last_created_at, last_id])
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"{self._SELECT}{where} ORDER BY created_at DESC, id DESC LIMIT ?"
+        with self._transaction() as conn:
+            rows = conn.execute(query, params + [limit + 1]).fetchall()
+
+        items = [self._row_to_order(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit and items:
+            next_cursor = encode_cursor(items[-1]["createdAt"], items[-1]["id"])
+        return {"items": items, "nextCursor": next_cursor}
+
+    def count(self) -> int:
+        with self._transaction() as conn:
+            return conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
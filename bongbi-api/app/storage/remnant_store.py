@@ -0,0 +1,329 @@
+import json
+import math
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core_logic.nesting import pack_onto_rectangle
+from core_logic.remnant import PLATE_REMNANT_FIT_ATTEMPTS, RemnantKey
+
+
+# 잔재 재고 저장소 (내장 SQLite)
+# 봉재/판재 잔재 재고(add/remove/list/find/plan_draw/commit, lock) - core_logic.remnant 의 사용 계획이 이 저장소를 쓴다.
+# 재시작 후에도 재고가 남고, 여러 워커(gunicorn)가 같은 재고를 쓴다.
+# - 재고 키(재질, 형상, 규격 튜플)는 JSON 문자열 1개 컬럼, (키, 길이, id) 인덱스 범위 검색으로 조회 O(log n)
+# - lock 은 재진입 가능한 쓰기 트랜잭션(BEGIN IMMEDIATE) - plan_draw → commit 을 묶으면 다른 워커가 같은 잔재를
+#   중복 배정하지 못한다 (plan_rod_with_remnants 가 with inventory.lock 으로 묶음)
+# - 조회(get/list/find/stats)는 쓰기 잠금 없이 읽으므로 다른 워커의 커밋을 기다리지 않는다
+# - 판재 잔재는 같은 파일의 plate_remnants 테이블, (키, 면적, id) 인덱스
+# 환경변수: REMNANT_DB_PATH (기본 bongbi-api/data/remnants.db)
+
+DEFAULT_REMNANT_DB_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "remnants.db"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rod_remnants (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL,
+    length REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_rod_remnants_key_length ON rod_remnants (key, length, id);
+"""
+
+_PLATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS plate_remnants (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL,
+    width REAL NOT NULL,
+    length REAL NOT NULL,
+    area REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_plate_remnants_key_area ON plate_remnants (key, area, id);
+"""
+
+
+def _key_text(key: RemnantKey) -> str:
+    return json.dumps(list(key), ensure_ascii=False)
+
+
+class _SqliteRemnantStore:
+    """스레드별 연결(WAL) + 재진입 가능한 쓰기 트랜잭션"""
+
+    def __init__(self, path: str, schema: str):
+        self.path = path
+        self._local = threading.local()
+        self._memory_conn = None
+        if path == ":memory:":
+            # 메모리 DB 는 연결마다 별도 DB 이므로 연결 하나를 공유
+            self._memory_conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._memory_lock = threading.RLock()
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self.lock as conn:
+            for statement in schema.strip().split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # 트랜잭션은 직접 BEGIN/COMMIT (isolation_level=None)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @property
+    def lock(self):
+        """with store.lock as conn: - 바깥 블록이 끝날 때 커밋 (예외면 롤백)"""
+        return self._transaction()
+
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        """조회 전용 - 쓰기 잠금 없이 자동 커밋 읽기 (WAL 스냅샷, 진행 중인 트랜잭션 안이면 그 트랜잭션에서 읽음)"""
+        if self._memory_conn is not None:
+            self._memory_lock.acquire()
+        try:
+            yield self._memory_conn or self._connect()
+        finally:
+            if self._memory_conn is not None:
+                self._memory_lock.release()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        if self._memory_conn is not None:
+            self._memory_lock.acquire()
+        conn = self._memory_conn or self._connect()
+        depth = getattr(self._local, "depth", 0)
+        try:
+            if depth == 0:
+                conn.execute("BEGIN IMMEDIATE")
+            self._local.depth = depth + 1
+            try:
+                yield conn
+            except BaseException:
+                if depth == 0:
+                    conn.execute("ROLLBACK")
+                raise
+            if depth == 0:
+                conn.execute("COMMIT")
+        finally:
+            self._local.depth = depth
+            if self._memory_conn is not None:
+                self._memory_lock.release()
+
+
+class RemnantStore(_SqliteRemnantStore):
+    """봉재 잔재 재고 - (키, 길이, id) 인덱스"""
+
+    def __init__(self, path: str = DEFAULT_REMNANT_DB_PATH):
+        super().__init__(path, _SCHEMA)
+
+    def add(self, key: RemnantKey, length: float) -> int:
+        with self.lock as conn:
+            return conn.execute("INSERT INTO rod_remnants (key, length) VALUES (?, ?)",
+                                (_key_text(key), float(length))).lastrowid
+
+    def remove(self, remnant_id: int) -> bool:
+        with self.lock as conn:
+            return conn.execute("DELETE FROM rod_remnants WHERE id = ?", (remnant_id,)).rowcount > 0
+
+    def get(self, remnant_id: int) -> Optional[Dict]:
+        with self._read() as conn:
+            row = conn.execute("SELECT key, length FROM rod_remnants WHERE id = ?", (remnant_id,)).fetchone()
+        if row is None:
+            return None
+        return {"id": remnant_id, "key": tuple(json.loads(row[0])), "length": row[1]}
+
+    def list(self, key: RemnantKey) -> List[Dict]:
+        with self._read() as conn:
+            rows = conn.execute("SELECT id, length FROM rod_remnants WHERE key = ? ORDER BY length, id",
+                                (_key_text(key),)).fetchall()
+        return [{"id": remnant_id, "length": length} for remnant_id, length in rows]
+
+    def find_shortest_at_least(self, key: RemnantKey, length: float) -> Optional[Dict]:
+        """필요 길이 이상인 가장 짧은 잔재 (인덱스 범위 검색)"""
+        with self._read() as conn:
+            row = conn.execute(
+                "SELECT id, length FROM rod_remnants WHERE key = ? AND length >= ? ORDER BY length, id LIMIT 1",
+                (_key_text(key), float(length)),
+            ).fetchone()
+        return {"id": row[0], "length": row[1]} if row else None
+
+    def stats(self) -> Dict:
+        with self._read() as conn:
+            total, keys = conn.execute("SELECT COUNT(*), COUNT(DISTINCT key) FROM rod_remnants").fetchone()
+        return {"totalRemnants": total, "keys": keys}
+
+    def plan_draw(self, key: RemnantKey, unit_length: float, head_cut: float, tail_cut: float, quantity: int) -> List[Dict]:
+        """
+        재고를 변경하지 않고 잔재 사용 계획 작성
+        - 남은 수량을 한 번에 만들 수 있으면 그 길이 이상인 가장 짧은 잔재 1개 사용
+        - 아니면 가장 긴 잔재부터 사용 - (길이, id) 상한으로 이미 쓴 긴 잔재를 제외 (단계마다 인덱스 조회 1회)
+        """
+        overhead = head_cut + tail_cut
+        if unit_length <= 0 or quantity <= 0:
+            return []
+        key_text = _key_text(key)
+        usage = []
+        upper = None  # (길이, id) - 이 값 이상은 이미 사용
+        with self.lock as conn:
+            remaining = quantity
+            while remaining > 0:
+                bound, bound_params = ("", ()) if upper is None else (" AND (length, id) < (?, ?)", upper)
+                need = remaining * unit_length + overhead
+                row = conn.execute(
+                    f"SELECT length, id FROM rod_remnants WHERE key = ? AND length >= ?{bound} ORDER BY length, id LIMIT 1",
+                    (key_text, need, *bound_params),
+                ).fetchone()
+                if row is not None:
+                    length, remnant_id = row
+                    pieces = remaining
+                else:
+                    row = conn.execute(
+                        f"SELECT length, id FROM rod_remnants WHERE key = ?{bound} ORDER BY length DESC, id DESC LIMIT 1",
+                        (key_text, *bound_params),
+                    ).fetchone()
+                    if row is None:
+                        break
+                    length, remnant_id = row
+                    pieces = int(math.floor((length - overhead) / unit_length))
+                    if pieces <= 0:
+                        break
+                    upper = (length, remnant_id)
+                remaining -= pieces
+                usage.append({
+                    "id": remnant_id,
+                    "length": length,
+                    "pieces": pieces,
+                    # 사용 후 실물 잔여 길이 (헤드컷 + 제품들을 잘라낸 나머지)
+                    "leftoverLength": max(length - head_cut - pieces * unit_length, 0.0),
+                })
+        return usage
+
+    def commit(self, key: RemnantKey, usage: List[Dict], new_offcuts: List[float], min_length: float) -> List[int]:
+        """사용 계획 확정 - 사용한 잔재 제거, 최소 길이 이상의 잔여분/신규 자투리 등록"""
+        added = []
+        with self.lock:
+            for item in usage:
+                self.remove(item["id"])
+            for length in [item["leftoverLength"] for item in usage] + list(new_offcuts):
+                if length >= min_length:
+                    added.append(self.add(key, length))
+        return added
+
+
+class PlateRemnantStore(_SqliteRemnantStore):
+    """판재 잔재 재고 - (키, 면적, id) 인덱스"""
+
+    def __init__(self, path: str = DEFAULT_REMNANT_DB_PATH):
+        super().__init__(path, _PLATE_SCHEMA)
+
+    def add(self, key: RemnantKey, width: float, length: float) -> int:
+        width, length = float(width), float(length)
+        with self.lock as conn:
+            return conn.execute("INSERT INTO plate_remnants (key, width, length, area) VALUES (?, ?, ?, ?)",
+                                (_key_text(key), width, length, width * length)).lastrowid
+
+    def remove(self, remnant_id: int) -> bool:
+        with self.lock as conn:
+            return conn.execute("DELETE FROM plate_remnants WHERE id = ?", (remnant_id,)).rowcount > 0
+
+    def get(self, remnant_id: int) -> Optional[Dict]:
+        with self._read() as conn:
+            row = conn.execute("SELECT key, width, length FROM plate_remnants WHERE id = ?", (remnant_id,)).fetchone()
+        if row is None:
+            return None
+        return {"id": remnant_id, "key": tuple(json.loads(row[0])), "width": row[1], "length": row[2]}
+
+    def list(self, key: RemnantKey) -> List[Dict]:
+        with self._read() as conn:
+            rows = conn.execute("SELECT id, width, length FROM plate_remnants WHERE key = ? ORDER BY area, id",
+                                (_key_text(key),)).fetchall()
+        return [{"id": remnant_id, "width": width, "length": length} for remnant_id, width, length in rows]
+
+    def find_smallest_fitting(self, key: RemnantKey, width: float, length: float, allow_rotation: bool = True) -> Optional[Dict]:
+        """width × length 부품이 들어가는 가장 작은(면적) 잔재"""
+        with self._read() as conn:
+            row = conn.execute(
+                "SELECT id, width, length FROM plate_remnants WHERE key = ? AND area >= ? "
+                "AND ((width >= ? AND length >= ?) OR (? AND width >= ? AND length >= ?)) ORDER BY area, id LIMIT 1",
+                (_key_text(key), width * length, width, length, int(allow_rotation), length, width),
+            ).fetchone()
+        return {"id": row[0], "width": row[1], "length": row[2]} if row else None
+
+    def stats(self) -> Dict:
+        with self._read() as conn:
+            total, keys, area = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT key), COALESCE(SUM(width * length), 0) FROM plate_remnants"
+            ).fetchone()
+        return {"totalRemnants": total, "keys": keys, "totalArea": area}
+
+    def plan_draw(self, key: RemnantKey, items: List[Dict], kerf: float, min_size: float) -> Tuple[List[Dict], List[int]]:
+        """
+        재고를 변경하지 않고 잔재 사용 계획 작성
+        - 남은 부품을 모두 배치할 수 있는 잔재가 있으면 그중 면적이 가장 작은 1장 사용 (필요 면적 이상 후보부터 최대 N장 시도)
+        - 아니면 가장 큰 잔재부터 채움 - (면적, id) 상한으로 이미 쓴 큰 잔재를 제외
+        items: nesting.nesting_items 형식, 반환: (사용 내역, 잔재 사용 후 남은 품목별 수량)
+        """
+        remaining = [item["quantity"] for item in items]
+        key_text = _key_text(key)
+        usage = []
+        upper = None  # (면적, id) - 이 값 이상은 이미 사용
+        with self.lock as conn:
+            while any(remaining):
+                bound, bound_params = ("", ()) if upper is None else (" AND (area, id) < (?, ?)", upper)
+                need = sum((item["width"] + kerf) * (item["length"] + kerf) * left for item, left in zip(items, remaining))
+                chosen = None
+                candidates = conn.execute(
+                    f"SELECT id, width, length FROM plate_remnants WHERE key = ? AND area >= ?{bound} "
+                    f"ORDER BY area, id LIMIT ?",
+                    (key_text, need, *bound_params, PLATE_REMNANT_FIT_ATTEMPTS),
+                ).fetchall()
+                for remnant_id, width, length in candidates:
+                    packed = pack_onto_rectangle(items, remaining, width, length, kerf, min_size)
+                    if packed["pieces"] == sum(remaining):
+                        chosen = (remnant_id, width, length, packed)
+                        break
+                if chosen is None:
+                    row = conn.execute(
+                        f"SELECT id, width, length, area FROM plate_remnants WHERE key = ?{bound} "
+                        f"ORDER BY area DESC, id DESC LIMIT 1",
+                        (key_text, *bound_params),
+                    ).fetchone()
+                    if row is None:
+                        break
+                    remnant_id, width, length, area = row
+                    upper = (area, remnant_id)
+                    packed = pack_onto_rectangle(items, remaining, width, length, kerf, min_size)
+                    if not packed["pieces"]:
+                        continue
+                    chosen = (remnant_id, width, length, packed)
+                remnant_id, width, length, packed = chosen
+                for index, count in packed["counts"].items():
+                    remaining[index] -= count
+                usage.append({
+                    "id": remnant_id,
+                    "width": width,
+                    "length": length,
+                    "pieces": packed["pieces"],
+                    "placements": packed["placements"],
+                    # 사용 후 다시 잔재로 쓸 수 있는 영역
+                    "leftovers": [{"width": r["width"], "length": r["length"]} for r in packed["remnants"]],
+                })
+        return usage, remaining
+
+    def commit(self, key: RemnantKey, usage: List[Dict], new_offcuts: List[Tuple[float, float]]) -> List[int]:
+        """사용 계획 확정 - 사용한 잔재 제거, 사용 후 남은 영역과 신규 원판의 잔재 등록"""
+        added = []
+        with self.lock:
+            for item in usage:
+                self.remove(item["id"])
+            leftovers = [(r["width"], r["length"]) for item in usage for r in item["leftovers"]]
+            for width, length in leftovers + list(new_offcuts):
+                added.append(self.add(key, width, length))
+        return added
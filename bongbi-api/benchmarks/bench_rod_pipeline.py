@@ -0,0 +1,150 @@
+"""
+봉재 단건 계산 CPU 시간 비교 - 기존 dict 연쇄 방식 vs RodJob 파이프라인
+
+    cd bongbi-api
+    python -m benchmarks.bench_rod_pipeline [--requests 20000] [--repeat 5]
+
+계산 부분(core)과 calculate_rod 엔드포인트 함수 전체(endpoint, 결과 캐시 끔)를 각각 요청 1건당 µs 로 출력한다.
+엔드포인트 비교의 '기존' 값은 calculate_rod 안의 계산을 이전 구현과 같은 함수 연쇄로 바꿔 측정한다.
+엔드포인트 시간은 응답 모델 생성이 대부분이라 계산 부분 절감분이 측정 잡음에 가려질 수 있다 (반복 횟수를 늘려 확인).
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import random
+import time
+
+from app.api import calculate_router
+from app.api.result_cache import result_cache
+from app.api.schemas import RodCalculateRequest, LegacyFieldSupport
+from core_logic.rod import (
+    calculate_bars_needed, calculate_material_total_weight, calculate_product_total_weight,
+    calculate_total_cost, calculate_utilization_rate, calculate_wastage, calculate_unit_cost,
+    validate_rod_calculation
+)
+from core_logic.rod_pipeline import run_rod_job, RodJob
+from core_logic.scrap import calculate_scrap_metrics
+
+
+def threaded_rod(data):
+    """기존 calculate_rod 의 계산 부분 - 중간 결과를 dict 에 써 넣고 함수마다 다시 변환"""
+    input_warnings = validate_rod_calculation(data)
+    data['barsNeeded'] = calculate_bars_needed(data)
+    data['materialTotalWeight'] = calculate_material_total_weight(data)
+    data['totalWeight'] = calculate_product_total_weight(data)
+    data['totalCost'] = calculate_total_cost(data)
+    data['utilizationRate'] = calculate_utilization_rate(data)
+    wastage = calculate_wastage(data)
+    scrap = calculate_scrap_metrics(data)
+    if scrap.get('updatedTotalWeight') is not None:
+        data['totalWeight'] = scrap['updatedTotalWeight']
+    return {
+        "barsNeeded": data['barsNeeded'],
+        "materialTotalWeight": data['materialTotalWeight'],
+        "totalWeight": data['totalWeight'],
+        "totalCost": data['totalCost'],
+        "unitCost": calculate_unit_cost(data),
+        "utilizationRate": data['utilizationRate'],
+        "wastage": wastage,
+        "scrapWeight": scrap['scrapWeight'],
+        "scrapSavings": scrap['scrapSavings'],
+        "realCost": scrap['realCost'],
+        "totalActualProductWeight": scrap['totalActualProductWeight'],
+    }, input_warnings, scrap['warnings']
+
+
+class _ThreadedJob:
+    """엔드포인트 비교용 - threaded_rod 결과를 RodJob 과 같은 모양으로 노출"""
+
+    def __init__(self, data, stage_observers=None):
+        self._values, self.input_warnings, scrap_warnings = threaded_rod(data)
+        self.warnings = self.input_warnings + scrap_warnings
+        self.bars_needed = self._values["barsNeeded"]
+
+    def values(self):
+        return dict(self._values)
+
+
+def make_requests(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        data = {
+            "shape": rng.choice(["circle", "square", "rectangle", "hexagon"]),
+            "diameter": round(rng.uniform(6, 80), 1),
+            "width": round(rng.uniform(6, 60), 1),
+            "height": round(rng.uniform(6, 60), 1),
+            "productLength": round(rng.uniform(10, 600), 1),
+            "quantity": rng.randint(1, 5000),
+            "cuttingLoss": 2,
+            "headCut": 20,
+            "tailCut": 50,
+            "standardBarLength": 2500,
+            "materialDensity": 7850,
+            "materialPrice": 7000,
+        }
+        if rng.random() < 0.5:
+            data.update(actualProductWeight=round(rng.uniform(5, 300), 1), recoveryRatio=80, scrapUnitPrice=2500)
+        requests.append(LegacyFieldSupport.apply_aliases(RodCalculateRequest(**data).model_dump()))
+    return requests
+
+
+def _per_request_us(pairs, items, repeat: int):
+    """process_time 기준 최솟값 (µs/건) - 두 경로를 번갈아 측정해 CPU 클럭 변동 영향을 줄인다"""
+    best = [float("inf")] * len(pairs)
+    for _ in range(repeat):
+        for i, fn in enumerate(pairs):
+            start = time.process_time()
+            for item in items:
+                fn(item)
+            best[i] = min(best[i], time.process_time() - start)
+    return [b / len(items) * 1e6 for b in best]
+
+
+def bench_core(requests, repeat):
+    return _per_request_us(
+        (lambda data: threaded_rod(dict(data)), lambda data: run_rod_job(data).values()), requests, repeat)
+
+
+def bench_endpoint(requests, repeat):
+    models = [RodCalculateRequest(**data) for data in requests]
+    loop = asyncio.new_event_loop()
+    original = calculate_router.run_rod_job
+
+    def call_with(job_factory):
+        def call(model):
+            calculate_router.run_rod_job = job_factory
+            return loop.run_until_complete(calculate_router.calculate_rod(model))
+        return call
+
+    enabled = result_cache.enabled
+    result_cache.enabled = False
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):  # 경고 로그 출력 제외
+            return _per_request_us((call_with(_ThreadedJob), call_with(original)), models, repeat)
+    finally:
+        calculate_router.run_rod_job = original
+        result_cache.enabled = enabled
+        loop.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="봉재 계산 파이프라인 CPU 시간 비교")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    requests = make_requests(args.requests)
+    # 두 경로 결과가 같은지 먼저 확인
+    for data in requests[:1000]:
+        assert run_rod_job(data).values() == threaded_rod(dict(data))[0]
+
+    print(f"요청 {len(requests)}건, 반복 {args.repeat}회 (process_time 최솟값, RodJob slots={len(RodJob.__slots__)})")
+    for name, bench in (("core", bench_core), ("endpoint", bench_endpoint)):
+        legacy, pipeline = bench(requests, args.repeat)
+        print(f"{name:9s} 기존 {legacy:8.2f} µs/건  RodJob {pipeline:8.2f} µs/건  ({(1 - pipeline / legacy) * 100:5.1f}% 감소)")
+
+
+if __name__ == "__main__":
+    main()
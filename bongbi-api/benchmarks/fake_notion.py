@@ -0,0 +1,93 @@
+"""
+로컬 노션 API 대역 서버 - 부하 테스트용 (지연/오류 주입)
+
+    cd bongbi-api
+    python -m benchmarks.fake_notion --port 8700 --latency-ms 300 --jitter-ms 100 --error-rate 0.02 --rate-limit-rate 0.01
+
+API 서버는 NOTION_BASE_URL=http://127.0.0.1:8700, NOTION_TOKEN/NOTION_DATABASE_ID 에 아무 값이나 주고 띄운다.
+notion-client 가 쓰는 두 호출만 흉내 낸다:
+  POST /v1/pages                 → 페이지 생성 (문의 전송)
+  GET  /v1/databases/{id}        → 데이터베이스 조회 (연결 확인)
+GET /_stats 로 받은 요청 수/주입한 오류 수를 확인할 수 있다.
+"""
+import argparse
+import asyncio
+import random
+import uuid
+from typing import Dict
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def create_app(latency_ms: float = 300.0, jitter_ms: float = 100.0, error_rate: float = 0.0,
+               rate_limit_rate: float = 0.0, retry_after_seconds: float = 1.0, seed: int = 0) -> FastAPI:
+    """노션 대역 앱 - 응답마다 latency_ms ± jitter_ms 대기, error_rate 비율로 503, rate_limit_rate 비율로 429"""
+    rng = random.Random(seed)
+    stats: Dict[str, int] = {"pages": 0, "databases": 0, "errors": 0, "rate_limited": 0}
+    app = FastAPI(title="fake notion")
+
+    def _error(status: int, code: str, message: str, headers=None) -> JSONResponse:
+        return JSONResponse(
+            status_code=status,
+            content={"object": "error", "status": status, "code": code, "message": message},
+            headers=headers,
+        )
+
+    async def _respond(kind: str, body: Dict) -> JSONResponse:
+        delay = max(0.0, latency_ms + rng.uniform(-jitter_ms, jitter_ms)) / 1000.0
+        await asyncio.sleep(delay)
+        roll = rng.random()
+        if roll < rate_limit_rate:
+            stats["rate_limited"] += 1
+            return _error(429, "rate_limited", "Rate limited", {"Retry-After": f"{retry_after_seconds:g}"})
+        if roll < rate_limit_rate + error_rate:
+            stats["errors"] += 1
+            return _error(503, "service_unavailable", "Injected failure")
+        stats[kind] += 1
+        return JSONResponse(body)
+
+    @app.post("/v1/pages")
+    async def create_page(request: Request):
+        payload = await request.json()
+        return await _respond("pages", {
+            "object": "page",
+            "id": str(uuid.uuid4()),
+            "parent": payload.get("parent"),
+            "properties": {},
+        })
+
+    @app.get("/v1/databases/{database_id}")
+    async def retrieve_database(database_id: str):
+        return await _respond("databases", {
+            "object": "database",
+            "id": database_id,
+            "title": [{"type": "text", "plain_text": "Fake inquiries"}],
+        })
+
+    @app.get("/_stats")
+    async def fake_stats():
+        return stats
+
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 노션 API 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8700)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 응답 비율 (0~1)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 응답 비율 (0~1)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="429 응답의 Retry-After (초)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    app = create_app(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit_rate, args.retry_after, args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+부하 생성기 - 실제 트래픽 비율(rod/plate/scrap/validate/inquiry)로 목표 초당 요청 수를 재생하고
+처리량, 지연 백분위, 서버 이벤트 루프 지연을 보고한다.
+
+    cd bongbi-api
+    # 이미 떠 있는 서버에
+    python -m benchmarks.loadgen --url http://127.0.0.1:8000 --rate 200 --duration 20
+    # 노션 대역 서버 + API 서버를 직접 띄워서, 단계별로 올리며 포화 지점 찾기
+    python -m benchmarks.loadgen --spawn --rates 50,100,200,400 --duration 15 --notion-latency-ms 300
+    # 워커 여러 개 (gunicorn.conf.py 운영 설정 그대로)
+    python -m benchmarks.loadgen --spawn --workers 4 --rates 100,200,400,800 --duration 15
+
+요청은 정해진 시각에 보내는 개방형(open-loop) 방식이라 서버가 느려져도 보내는 속도가 줄지 않는다.
+지연은 '보냈어야 할 시각'부터 잰다 (동시 요청 한도에 걸려 늦게 보낸 시간도 포함 - coordinated omission 보정).
+서버 이벤트 루프 지연은 /metrics 의 bongbi_event_loop_lag_seconds 히스토그램을 단계 전후로 읽어 차이로 계산한다.
+(워커가 여러 개면 /metrics 는 요청을 받은 워커 하나의 값이다)
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from core_logic.utils import latency_percentiles_ms
+
+DEFAULT_MIX = "rod=60,plate=15,scrap=10,validate=10,inquiry=5"
+LAG_METRIC = "bongbi_event_loop_lag_seconds"
+
+
+def parse_mix(spec: str) -> List[Tuple[str, float]]:
+    mix = []
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        kind, _, weight = part.partition("=")
+        if kind not in PayloadFactory.KINDS:
+            raise ValueError(f"알 수 없는 요청 종류: {kind} ({', '.join(PayloadFactory.KINDS)})")
+        mix.append((kind, float(weight or 1)))
+    return mix
+
+
+class PayloadFactory:
+    """요청 종류별 그럴듯한 입력 (seed 고정 - 실행마다 같은 순서)"""
+
+    KINDS = ("rod", "plate", "scrap", "validate", "inquiry")
+
+    def __init__(self, seed: int = 0):
+        self.rng = random.Random(seed)
+
+    def rod_body(self) -> Dict:
+        rng = self.rng
+        body = {
+            "shape": rng.choice(["circle", "circle", "hexagon", "square", "rectangle"]),
+            "diameter": round(rng.uniform(6, 80), 1),
+            "width": round(rng.uniform(6, 60), 1),
+            "height": round(rng.uniform(6, 60), 1),
+            "productLength": round(rng.uniform(10, 600), 1),
+            "quantity": rng.randint(1, 5000),
+            "cuttingLoss": 2, "headCut": 20, "tailCut": 50,
+            "standardBarLength": rng.choice([2500, 3000]),
+            "materialDensity": rng.choice([7850, 8500, 2700]),
+            "materialPrice": rng.choice([1800, 7000, 9500]),
+        }
+        if rng.random() < 0.5:
+            body.update(actualProductWeight=round(rng.uniform(5, 300), 1), recoveryRatio=80, scrapUnitPrice=2500)
+        return body
+
+    def make(self, kind: str) -> Tuple[str, str, Dict]:
+        rng = self.rng
+        if kind == "rod":
+            return "POST", "/api/v1/calculate/rod", self.rod_body()
+        if kind == "plate":
+            return "POST", "/api/v1/calculate/plate", {
+                "plateThickness": rng.choice([3, 6, 10, 20]), "plateWidth": round(rng.uniform(50, 1200), 1),
+                "plateLength": round(rng.uniform(50, 2400), 1), "quantity": rng.randint(1, 500),
+                "materialDensity": 7850, "plateUnitPrice": 1500,
+            }
+        if kind == "scrap":
+            quantity = rng.randint(1, 3000)
+            total_weight = round(quantity * rng.uniform(0.01, 0.5), 3)
+            return "POST", "/api/v1/calculate/scrap", {
+                "totalWeight": total_weight, "totalCost": round(total_weight * 1.3 * 7000), "quantity": quantity,
+                "actualProductWeight": round(total_weight * 1000 / quantity * rng.uniform(0.5, 0.95), 1),
+                "recoveryRatio": 80, "scrapUnitPrice": 2500,
+            }
+        if kind == "validate":
+            return "POST", "/api/v1/validate", self.rod_body()
+        if kind == "inquiry":
+            n = rng.randint(1, 10 ** 6)
+            return "POST", "/api/v1/notion/customer-inquiry", {
+                "name": f"부하테스트 {n}", "email": f"load{n}@example.com",
+                "subject": "견적 문의", "message": "황동 봉재 절단 견적 문의드립니다.",
+            }
+        raise ValueError(kind)
+
+
+def parse_histogram(text: str, name: str) -> Dict[str, float]:
+    """Prometheus 텍스트에서 라벨 없는 히스토그램 1개 - {le: 누적 건수, "_sum", "_count"}"""
+    values = {}
+    for line in text.splitlines():
+        if line.startswith(f"{name}_bucket"):
+            le = line[line.index('le="') + 4:line.index('"}')]
+            values[le] = float(line.rsplit(" ", 1)[1])
+        elif line.startswith(f"{name}_sum "):
+            values["_sum"] = float(line.rsplit(" ", 1)[1])
+        elif line.startswith(f"{name}_count "):
+            values["_count"] = float(line.rsplit(" ", 1)[1])
+    return values
+
+
+def histogram_delta_summary(before: Dict[str, float], after: Dict[str, float]) -> Optional[Dict[str, Optional[float]]]:
+    """두 시점 히스토그램의 차이로 구간 평균/백분위 추정 (백분위는 해당 버킷 상한, ms)"""
+    count = after.get("_count", 0) - before.get("_count", 0)
+    if count <= 0:
+        return None
+    buckets = sorted(((float(le), after[le] - before.get(le, 0)) for le in after if not le.startswith("_")),
+                     key=lambda pair: pair[0])
+
+    def quantile(q):
+        for bound, cumulative in buckets:
+            if cumulative >= q * count:
+                return None if bound == float("inf") else bound * 1000.0
+        return None
+
+    return {
+        "samples": int(count),
+        "mean_ms": round((after["_sum"] - before.get("_sum", 0)) / count * 1000.0, 3),
+        "p50_ms": quantile(0.50), "p99_ms": quantile(0.99),
+    }
+
+
+async def _scrape_lag(client: httpx.AsyncClient) -> Dict[str, float]:
+    try:
+        response = await client.get("/metrics", timeout=5.0)
+        return parse_histogram(response.text, LAG_METRIC)
+    except httpx.HTTPError:
+        return {}
+
+
+async def run_step(client: httpx.AsyncClient, rate: float, duration: float, mix: List[Tuple[str, float]],
+                   max_in_flight: int, poisson: bool, factory: PayloadFactory) -> Dict:
+    """목표 rate 로 duration 초 동안 요청 - 종류별 지연/상태 코드, 부하 생성기 자신의 루프 지연"""
+    loop = asyncio.get_running_loop()
+    kinds = [kind for kind, _ in mix]
+    weights = [weight for _, weight in mix]
+    rng = random.Random(1)
+    samples: Dict[str, List[float]] = {kind: [] for kind in kinds}
+    statuses: Dict[str, Dict[str, int]] = {kind: {} for kind in kinds}
+    in_flight = 0
+    skipped = 0
+    tasks = set()
+    client_lag: List[float] = []
+
+    async def one(kind: str, scheduled: float):
+        nonlocal in_flight
+        method, path, body = factory.make(kind)
+        try:
+            response = await client.request(method, path, json=body)
+            status = str(response.status_code)
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        finally:
+            in_flight -= 1
+        samples[kind].append(loop.time() - scheduled)
+        statuses[kind][status] = statuses[kind].get(status, 0) + 1
+
+    lag_before = await _scrape_lag(client)
+    started = loop.time()
+    next_at = started
+    deadline = started + duration
+    while next_at < deadline:
+        now = loop.time()
+        if next_at > now:
+            await asyncio.sleep(next_at - now)
+        client_lag.append(max(0.0, loop.time() - next_at))
+        if in_flight >= max_in_flight:
+            skipped += 1  # 부하 생성기 한도 - 보내지 못한 요청
+        else:
+            in_flight += 1
+            task = loop.create_task(one(rng.choices(kinds, weights)[0], next_at))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        next_at += rng.expovariate(rate) if poisson else 1.0 / rate
+    if tasks:
+        await asyncio.wait(tasks, timeout=60)
+    elapsed = loop.time() - started
+    lag_after = await _scrape_lag(client)
+
+    completed = sum(len(values) for values in samples.values())
+    all_latencies = [value for values in samples.values() for value in values]
+    ok = sum(count for kind in kinds for status, count in statuses[kind].items() if status.startswith("2"))
+    return {
+        "target_rps": rate,
+        "achieved_rps": round(completed / elapsed, 1),
+        "completed": completed,
+        "ok": ok,
+        "error_rate": round(1 - ok / completed, 4) if completed else None,
+        "skipped": skipped,
+        "latency_ms": _summary(all_latencies),
+        "by_kind": {kind: {"latency_ms": _summary(samples[kind]), "status": statuses[kind]} for kind in kinds},
+        "server_loop_lag": histogram_delta_summary(lag_before, lag_after) if lag_before else None,
+        "client_loop_lag_ms": latency_percentiles_ms(client_lag, (0.99,), include_max=True, digits=2),
+    }
+
+
+def _summary(latencies: List[float]) -> Dict[str, Optional[float]]:
+    return latency_percentiles_ms(latencies, (0.50, 0.90, 0.99), include_max=True, digits=2)
+
+
+def is_saturated(step: Dict, slo_p99_ms: float, max_error_rate: float) -> bool:
+    """목표 처리량의 95% 미달, p99 SLO 초과, 오류율 초과, 부하 생성기 한도 도달 중 하나면 포화"""
+    p99 = step["latency_ms"]["p99"]
+    return (step["achieved_rps"] < 0.95 * step["target_rps"]
+            or (p99 is not None and p99 > slo_p99_ms)
+            or (step["error_rate"] or 0) > max_error_rate
+            or step["skipped"] > 0)
+
+
+def print_step(step: Dict, saturated: bool) -> None:
+    latency = step["latency_ms"]
+    lag = step["server_loop_lag"] or {}
+    print(f"목표 {step['target_rps']:7.1f} rps → 처리 {step['achieved_rps']:7.1f} rps  "
+          f"p50 {latency['p50']} ms  p99 {latency['p99']} ms  max {latency['max']} ms  "
+          f"오류율 {step['error_rate']}  미전송 {step['skipped']}  "
+          f"서버 루프 지연 p99 {lag.get('p99_ms')} ms (평균 {lag.get('mean_ms')} ms)  "
+          f"생성기 루프 지연 p99 {step['client_loop_lag_ms']['p99']} ms"
+          + ("  ← 포화" if saturated else ""))
+    for kind, detail in step["by_kind"].items():
+        print(f"    {kind:9s} p50 {detail['latency_ms']['p50']} ms  p99 {detail['latency_ms']['p99']} ms  {detail['status']}")
+
+
+# --spawn: 노션 대역 서버 + API 서버를 하위 프로세스로 ---------------------------------
+
+def _wait_ready(url: str, timeout: float = 30.0, workers: int = 1) -> None:
+    """url 이 응답할 때까지 대기 - workers > 1 이면 /health 의 ready_workers 가 그 수가 될 때까지"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            response = httpx.get(url, timeout=1.0)
+            if response.status_code < 500 and (workers <= 1 or response.json().get("ready_workers", 0) >= workers):
+                return
+        except (httpx.HTTPError, ValueError):
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} 이 {timeout:g}초 안에 준비되지 않았습니다.")
+
+
+def spawn_servers(args) -> List[subprocess.Popen]:
+    workdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    spool_dir = tempfile.mkdtemp(prefix="bongbi-load-")
+    notion_url = f"http://127.0.0.1:{args.notion_port}"
+    env = dict(os.environ, PYTHONPATH=workdir, NOTION_TOKEN="fake-token", NOTION_DATABASE_ID="fake-db",
+               NOTION_BASE_URL=notion_url, INQUIRY_SPOOL_PATH=os.path.join(spool_dir, "inquiries.db"),
+               LOG_LEVEL=os.getenv("LOG_LEVEL", "WARNING"))
+    processes = [subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_notion", "--port", str(args.notion_port),
+         "--latency-ms", str(args.notion_latency_ms), "--jitter-ms", str(args.notion_jitter_ms),
+         "--error-rate", str(args.notion_error_rate), "--rate-limit-rate", str(args.notion_rate_limit_rate)],
+        cwd=workdir, env=env,
+    )]
+    _wait_ready(f"{notion_url}/_stats")
+    port = args.url.rsplit(":", 1)[1].split("/")[0]
+    if args.workers > 1:
+        env.update(BIND=f"127.0.0.1:{port}", WEB_CONCURRENCY=str(args.workers),
+                   WORKER_STATE_DIR=os.path.join(spool_dir, "workers"))
+        os.makedirs(env["WORKER_STATE_DIR"])
+        command = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--log-level", "warning"]
+    else:
+        command = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", port,
+                   "--log-level", "warning", "--no-access-log"]
+    processes.append(subprocess.Popen(command, cwd=workdir, env=env, stdout=subprocess.DEVNULL))
+    _wait_ready(f"{args.url}/api/v1/health", workers=args.workers)
+    return processes
+
+
+async def run(args) -> List[Dict]:
+    mix = parse_mix(args.mix)
+    rates = [float(r) for r in args.rates.split(",")] if args.rates else [args.rate]
+    factory = PayloadFactory(args.seed)
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+    results = []
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        if args.warmup > 0:
+            await run_step(client, min(rates), args.warmup, mix, args.max_in_flight, args.poisson, factory)
+        for rate in rates:
+            step = await run_step(client, rate, args.duration, mix, args.max_in_flight, args.poisson, factory)
+            saturated = is_saturated(step, args.slo_p99_ms, args.max_error_rate)
+            step["saturated"] = saturated
+            results.append(step)
+            if not args.json:
+                print_step(step, saturated)
+            if saturated and args.stop_at_saturation:
+                break
+        try:
+            outbox = (await client.get("/api/v1/notion/outbox")).json()
+        except (httpx.HTTPError, ValueError):
+            outbox = None
+    if not args.json:
+        sustained = [step["target_rps"] for step in results if not step["saturated"]]
+        print(f"포화 전 최대 목표 처리량: {max(sustained) if sustained else '없음'} rps "
+              f"(p99 ≤ {args.slo_p99_ms:g} ms, 오류율 ≤ {args.max_error_rate:g})")
+        if outbox:
+            print(f"노션 아웃박스: 대기 {outbox.get('queue_depth')}  전송 {outbox.get('delivered')}  "
+                  f"재시도 {outbox.get('retries')}  429 {outbox.get('rate_limited')}")
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="봉비서 API 부하 생성기")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--rate", type=float, default=100.0, help="목표 초당 요청 수")
+    parser.add_argument("--rates", help="단계별 목표 (예: 50,100,200,400) - 지정하면 --rate 무시")
+    parser.add_argument("--duration", type=float, default=15.0, help="단계별 측정 시간 (초)")
+    parser.add_argument("--warmup", type=float, default=3.0, help="측정 전 준비 운전 (초)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"요청 비율 (기본 {DEFAULT_MIX})")
+    parser.add_argument("--max-in-flight", type=int, default=512, help="동시 요청 한도 (넘으면 미전송으로 집계)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--poisson", action="store_true", help="도착 간격을 지수 분포로 (기본: 일정 간격)")
+    parser.add_argument("--slo-p99-ms", type=float, default=250.0)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--stop-at-saturation", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="단계별 결과를 JSON 으로 출력")
+    parser.add_argument("--spawn", action="store_true", help="노션 대역 서버와 API 서버를 직접 띄움")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="--spawn 의 API 워커 수 (1: uvicorn 1프로세스, 2 이상: gunicorn.conf.py)")
+    parser.add_argument("--notion-port", type=int, default=8700)
+    parser.add_argument("--notion-latency-ms", type=float, default=300.0)
+    parser.add_argument("--notion-jitter-ms", type=float, default=100.0)
+    parser.add_argument("--notion-error-rate", type=float, default=0.0)
+    parser.add_argument("--notion-rate-limit-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    processes = spawn_servers(args) if args.spawn else []
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            try:
+                process.wait(10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
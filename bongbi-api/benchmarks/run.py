@@ -0,0 +1,188 @@
+"""
+벤치마크 실행 + 기준선 비교 (회귀 시 종료 코드 1)
+
+    cd bongbi-api
+    python -m benchmarks.run                         # 전체 실행, 기준선이 있으면 변화율 표시
+    python -m benchmarks.run --group micro --check   # 기준선 대비 임계값 초과 시 실패 (CI 용)
+    python -m benchmarks.run --save                  # 현재 결과를 기준선으로 저장
+
+측정값은 입력 1건당 ns (perf_counter, 반복 중 최솟값). 기계가 달라도 비교할 수 있도록
+벤치마크마다 고정 작업(reference_workload) 시간을 번갈아 재서 함께 저장하고, 비교는 그 비율로 한다 (--no-normalize 로 끔).
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional
+
+# 엔드포인트 경고 로그(stdout 쓰기)는 측정에서 뺀다 - app.main 이 로깅을 설정하기 전에 지정
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+from benchmarks.suite import BENCHMARKS, reference_workload
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def _calibrate(items: List, fn, min_time: float) -> int:
+    """준비 운전 1회 + 표본 1개가 min_time 초 이상이 되는 반복 횟수"""
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    once = max(time.perf_counter() - start, 1e-9)
+    return max(1, math.ceil(min_time / once))
+
+
+def _sample(items: List, fn, passes: int) -> float:
+    start = time.perf_counter()
+    for _ in range(passes):
+        for item in items:
+            fn(item)
+    return (time.perf_counter() - start) / (passes * len(items)) * 1e9
+
+
+def measure(items: List, fn, repeat: int = 7, min_time: float = 0.1) -> Dict[str, float]:
+    """입력 목록을 여러 번 돌려 1건당 ns (표본 사이사이에 기준 작업도 재서 reference_ns 로 함께 기록)
+
+    기준 작업을 같은 시점에 번갈아 재기 때문에 측정 중 CPU 클럭/부하가 바뀌어도 두 값의 비율은 안정적이다.
+    """
+    reference_items = [None] * 64
+    passes = _calibrate(items, fn, min_time)
+    reference_passes = _calibrate(reference_items, reference_workload, min_time)
+    samples, references = [], []
+    for _ in range(repeat):
+        references.append(_sample(reference_items, reference_workload, reference_passes))
+        samples.append(_sample(items, fn, passes))
+    return {
+        "min_ns": min(samples),
+        "median_ns": statistics.median(samples),
+        "reference_ns": min(references),
+        "ops": passes * len(items),
+    }
+
+
+def run_benchmarks(group: str = "all", name_filter: Optional[str] = None, repeat: int = 7,
+                   min_time: float = 0.1, names: Optional[List[str]] = None) -> Dict:
+    results = {}
+    for bench in BENCHMARKS:
+        if group != "all" and bench.group != group:
+            continue
+        if name_filter and name_filter not in bench.name:
+            continue
+        if names is not None and bench.name not in names:
+            continue
+        items, fn = bench.setup()
+        results[bench.name] = dict(measure(items, fn, repeat, min_time), group=bench.group)
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def _normalized(result: Dict) -> float:
+    """기준 작업 대비 상대 시간 (기계 속도와 무관한 값)"""
+    return result["min_ns"] / result["reference_ns"]
+
+
+def compare(current: Dict, baseline: Dict, threshold: float, endpoint_threshold: float,
+            normalize: bool = True) -> List[Dict]:
+    """벤치마크별 기준선 대비 비율 (1.10 = 10% 느려짐), 임계값을 넘으면 regression"""
+    base = baseline.get("results", {})
+    rows = []
+    for name, result in current["results"].items():
+        row = {"name": name, "group": result.get("group"), "min_ns": result["min_ns"], "baseline_ns": None,
+               "ratio": None, "regression": False}
+        if name in base:
+            limit = endpoint_threshold if result.get("group") == "endpoint" else threshold
+            row["baseline_ns"] = base[name]["min_ns"]
+            if normalize:
+                row["ratio"] = _normalized(result) / _normalized(base[name])
+            else:
+                row["ratio"] = result["min_ns"] / base[name]["min_ns"]
+            row["regression"] = row["ratio"] > 1 + limit
+        rows.append(row)
+    return rows
+
+
+def _format_ns(ns: float) -> str:
+    return f"{ns / 1000:9.2f} µs" if ns >= 10000 else f"{ns:9.0f} ns"
+
+
+def print_report(current: Dict, rows: List[Dict], baseline_path: Optional[str]) -> None:
+    print(f"Python {current['python']} ({current['machine']})" + (f", 기준선 {baseline_path}" if baseline_path else ""))
+    for row in rows:
+        line = f"{row['name']:28s} {_format_ns(row['min_ns'])}/건"
+        if row["ratio"] is not None:
+            change = (row["ratio"] - 1) * 100
+            line += f"  기준선 {_format_ns(row['baseline_ns']).strip():>12s}  {change:+6.1f}%"
+            if row["regression"]:
+                line += "  ← 회귀"
+        elif baseline_path:
+            line += "  (기준선 없음)"
+        print(line)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="core_logic/엔드포인트 벤치마크와 기준선 회귀 검사")
+    parser.add_argument("--group", choices=("all", "micro", "endpoint"), default="all")
+    parser.add_argument("--filter", dest="name_filter", help="이름에 이 문자열이 들어간 벤치마크만")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.1, help="표본 1개의 최소 측정 시간 (초)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="결과를 기준선 파일에 저장 (기존 항목은 갱신)")
+    parser.add_argument("--check", action="store_true", help="임계값을 넘는 회귀가 있으면 종료 코드 1")
+    parser.add_argument("--threshold", type=float, default=0.25, help="micro 허용 증가율 (기본 25%%)")
+    parser.add_argument("--endpoint-threshold", type=float, default=0.35, help="endpoint 허용 증가율 (기본 35%%)")
+    parser.add_argument("--confirm", type=int, default=2, help="회귀로 보이는 항목을 다시 재는 횟수")
+    parser.add_argument("--no-normalize", action="store_true", help="기준 작업 시간으로 기계 속도를 보정하지 않음")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.group, args.name_filter, args.repeat, args.min_time)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    elif args.check:
+        print(f"기준선 파일이 없습니다: {args.baseline} (--save 로 먼저 만드세요)", file=sys.stderr)
+        return 2
+
+    rows = compare(current, baseline or {}, args.threshold, args.endpoint_threshold, not args.no_normalize)
+    for _ in range(args.confirm):
+        # 회귀로 보이는 항목만 다시 재서 더 빠른 쪽을 채택 - 일시적인 부하로 인한 오탐을 줄인다
+        suspects = [row["name"] for row in rows if row["regression"]]
+        if not suspects:
+            break
+        rerun = run_benchmarks(names=suspects, repeat=args.repeat, min_time=args.min_time)
+        for name, result in rerun["results"].items():
+            if _normalized(result) < _normalized(current["results"][name]):
+                current["results"][name] = result
+        rows = compare(current, baseline or {}, args.threshold, args.endpoint_threshold, not args.no_normalize)
+    if args.json:
+        print(json.dumps({"current": current, "comparison": rows}, ensure_ascii=False, indent=2))
+    else:
+        print_report(current, rows, args.baseline if baseline else None)
+
+    if args.save:
+        saved = baseline or {}
+        saved.update(python=current["python"], machine=current["machine"])
+        saved.setdefault("results", {}).update(current["results"])
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(saved, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"기준선 저장: {args.baseline}")
+
+    regressions = [row for row in rows if row["regression"]]
+    if args.check and regressions:
+        print(f"회귀 {len(regressions)}건: {', '.join(row['name'] for row in regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+벤치마크 정의 - core_logic 함수(micro)와 ASGI 테스트 클라이언트를 통한 엔드포인트(endpoint)
+
+각 벤치마크는 (이름, 그룹, 준비 함수) 이고, 준비 함수는 (입력 목록, 입력 1건 처리 함수) 를 돌려준다.
+실행/기준선 비교는 benchmarks.run 에서 한다. 네트워크/외부 서비스 없이 실행된다 (노션 설정 불필요).
+"""
+import random
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from benchmarks.bench_rod_pipeline import make_requests
+from core_logic.rod import (
+    calculate_cross_sectional_area, calculate_bars_needed, calculate_material_total_weight,
+    calculate_product_total_weight, validate_rod_calculation
+)
+from core_logic.rod_pipeline import run_rod_job
+from core_logic.scrap import calculate_scrap_metrics, validate_scrap_inputs, validate_scrap_conditions
+
+INPUT_COUNT = 256
+
+
+class Benchmark(NamedTuple):
+    name: str
+    group: str  # micro | endpoint
+    setup: Callable[[], Tuple[List, Callable]]
+
+
+def _rod_inputs() -> List[Dict]:
+    return make_requests(INPUT_COUNT, seed=11)
+
+
+def _scrap_inputs() -> List[Dict]:
+    """봉재 계산 결과(총중량/재료비)를 채운 스크랩 계산 입력"""
+    rng = random.Random(13)
+    inputs = []
+    for data in _rod_inputs():
+        values = run_rod_job(data).values()
+        inputs.append(dict(
+            data,
+            totalWeight=values["totalWeight"],
+            totalCost=values["totalCost"],
+            materialTotalWeight=values["materialTotalWeight"],
+            actualProductWeight=round(rng.uniform(5, 300), 1),
+            recoveryRatio=rng.choice([60, 80, 100]),
+            scrapUnitPrice=2500,
+        ))
+    return inputs
+
+
+def _micro(fn: Callable, inputs: Callable[[], List[Dict]]) -> Callable[[], Tuple[List, Callable]]:
+    return lambda: (inputs(), fn)
+
+
+def _validate_all(data: Dict):
+    """계산 전 검증 묶음 - 봉재 입력 검증 + 스크랩 조건/입력 검증"""
+    validate_scrap_conditions(data.get("recoveryRatio"), data.get("scrapUnitPrice"), data.get("actualProductWeight"))
+    return validate_rod_calculation(data) + validate_scrap_inputs(data)
+
+
+def _endpoint(path: str, payloads: Callable[[], List[Dict]]) -> Callable[[], Tuple[List, Callable]]:
+    def setup():
+        from fastapi.testclient import TestClient
+        from app.api.result_cache import result_cache
+        from app.main import app
+
+        result_cache.enabled = False  # 캐시 적중이 아닌 계산 경로를 잰다
+        client = TestClient(app)
+
+        def call(payload):
+            response = client.post(path, json=payload)
+            if response.status_code != 200:
+                raise RuntimeError(f"{path} → {response.status_code}: {response.text[:200]}")
+            return response
+
+        return payloads(), call
+    return setup
+
+
+def _rod_payloads() -> List[Dict]:
+    return [{k: v for k, v in data.items() if v is not None} for data in _rod_inputs()[:64]]
+
+
+def _plate_payloads() -> List[Dict]:
+    rng = random.Random(17)
+    return [
+        {"plateThickness": rng.choice([3, 6, 10, 20]), "plateWidth": rng.uniform(50, 1200),
+         "plateLength": rng.uniform(50, 2400), "quantity": rng.randint(1, 500),
+         "materialDensity": 7850, "plateUnitPrice": 1500}
+        for _ in range(64)
+    ]
+
+
+def _scrap_payloads() -> List[Dict]:
+    fields = ("totalWeight", "totalCost", "quantity", "actualProductWeight", "recoveryRatio", "scrapUnitPrice")
+    return [{field: data[field] for field in fields} for data in _scrap_inputs()[:64]]
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("rod.cross_sectional_area", "micro", _micro(calculate_cross_sectional_area, _rod_inputs)),
+    Benchmark("rod.bars_needed", "micro", _micro(calculate_bars_needed, _rod_inputs)),
+    Benchmark("rod.material_total_weight", "micro", _micro(calculate_material_total_weight, _rod_inputs)),
+    Benchmark("rod.product_total_weight", "micro", _micro(calculate_product_total_weight, _rod_inputs)),
+    Benchmark("rod.pipeline", "micro", _micro(lambda data: run_rod_job(data).values(), _rod_inputs)),
+    Benchmark("scrap.metrics", "micro", _micro(calculate_scrap_metrics, _scrap_inputs)),
+    Benchmark("validate.rod", "micro", _micro(validate_rod_calculation, _rod_inputs)),
+    Benchmark("validate.scrap", "micro", _micro(validate_scrap_inputs, _scrap_inputs)),
+    Benchmark("validate.all", "micro", _micro(_validate_all, _scrap_inputs)),
+    Benchmark("endpoint.rod", "endpoint", _endpoint("/api/v1/calculate/rod", _rod_payloads)),
+    Benchmark("endpoint.plate", "endpoint", _endpoint("/api/v1/calculate/plate", _plate_payloads)),
+    Benchmark("endpoint.scrap", "endpoint", _endpoint("/api/v1/calculate/scrap", _scrap_payloads)),
+]
+
+
+def reference_workload(_item=None) -> float:
+    """기계 속도 보정용 고정 작업 - 순수 파이썬 산술/dict 접근 (코드 변경과 무관)"""
+    data = {"a": 1.5, "b": 2.5}
+    total = 0.0
+    for i in range(200):
+        total += data["a"] * i + data["b"] / (i + 1)
+    return total
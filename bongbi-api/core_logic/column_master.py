@@ -0,0 +1,157 @@
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# 컬럼마스터(config/column_master_v2_1.json) 런타임 레지스트리
+# 모듈 import 시 한 번 읽어 별칭 맵, 머리글 색인, 반올림 표, 필수 항목 비트마스크로 컴파일한다.
+# 요청 처리 중에는 JSON 을 다시 읽거나 맵을 다시 만들지 않고, 미리 만든 표로 payload 를 한 번에 정규화/반올림한다.
+# (app.api.schemas 가 이 모듈을 import 하므로 여기서는 schemas 를 import 하지 않는다)
+
+COLUMN_MASTER_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "column_master_v2_1.json"
+)
+
+# 컬럼마스터에서 삭제됐지만 기존 클라이언트 호환을 위해 받는 별칭
+EXTRA_ALIASES = {
+    "scrapPrice": "scrapUnitPrice",
+}
+
+# required_when 의 재질 구분 (rod: 봉재, sheet: 판재)
+MATERIAL_KINDS = ("rod", "sheet")
+
+
+def _normalize_header(header) -> str:
+    return "".join(str(header).split()).lower()
+
+
+class ColumnRegistry:
+    """컴파일된 컬럼마스터 - 조회용 표는 모두 생성 시 한 번 계산"""
+
+    def __init__(self, master: Dict):
+        self.version: str = master.get("version")
+        self.columns: Tuple[Dict, ...] = tuple(master["columns"])
+        self.types: Dict[str, str] = {c["key"]: c.get("type") for c in self.columns}
+
+        # 별칭 → key (컬럼마스터 aliases + 호환 별칭)
+        self.alias_map: Dict[str, str] = {}
+        for column in self.columns:
+            for alias in column.get("aliases") or []:
+                self.alias_map[alias] = column["key"]
+        for alias, key in EXTRA_ALIASES.items():
+            self.alias_map.setdefault(alias, key)
+
+        # 외부 파일 머리글(key, 한글 라벨, 별칭; 공백/대소문자 무시) → key
+        self.header_index: Dict[str, str] = {}
+        for column in self.columns:
+            for name in [column["key"], column.get("label_kr")] + list(column.get("aliases") or []):
+                if name:
+                    self.header_index.setdefault(_normalize_header(name), column["key"])
+        for alias, key in self.alias_map.items():
+            self.header_index.setdefault(_normalize_header(alias), key)
+
+        # 출력 실수 컬럼 반올림 자릿수 (precision.rounding)
+        self.rounding: Dict[str, int] = {
+            c["key"]: int(c["precision"]["rounding"])
+            for c in self.columns
+            if c.get("scope") == "output" and c.get("type") == "float" and (c.get("precision") or {}).get("rounding") is not None
+        }
+        self._rounding_items: Tuple[Tuple[str, int], ...] = tuple(self.rounding.items())
+
+        # 필수 항목 비트마스크 (required_when 이 True 인 컬럼 + policy.required_rules 의 단순 key 항목)
+        self.bits: Dict[str, int] = {c["key"]: 1 << i for i, c in enumerate(self.columns)}
+        self.required_masks: Dict[str, int] = {kind: 0 for kind in MATERIAL_KINDS}
+        for column in self.columns:
+            required_when = column.get("required_when") or {}
+            for kind in MATERIAL_KINDS:
+                if required_when.get(kind) is True:
+                    self.required_masks[kind] |= self.bits[column["key"]]
+        required_rules = (master.get("policy") or {}).get("required_rules") or {}
+        for kind in MATERIAL_KINDS:
+            for rule in required_rules.get(kind) or []:
+                if rule in self.bits:  # "(diameter) OR (width AND height)" 같은 조건식은 요청 모델 검증에서 처리
+                    self.required_masks[kind] |= self.bits[rule]
+
+    @classmethod
+    def load(cls, path: str = COLUMN_MASTER_PATH) -> "ColumnRegistry":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def normalize(self, payload: Dict) -> Dict:
+        """별칭 key 를 컬럼마스터 key 로 바꾼 새 dict (한 번 순회)"""
+        alias_map = self.alias_map
+        return {alias_map.get(key, key): value for key, value in payload.items()}
+
+    def round_output(self, values: Dict) -> Dict:
+        """출력 값을 precision.rounding 자릿수로 반올림 (제자리 수정 후 반환)"""
+        for key, digits in self._rounding_items:
+            value = values.get(key)
+            if isinstance(value, float):
+                values[key] = round(value, digits)
+        return values
+
+    def round_values(self, key: str, values: Iterable[float]) -> List[float]:
+        """한 컬럼의 값 목록 반올림 (반올림 대상이 아니면 그대로)"""
+        digits = self.rounding.get(key)
+        if digits is None:
+            return list(values)
+        return [round(value, digits) for value in values]
+
+    def missing_required(self, payload: Dict, kind: str) -> List[str]:
+        """required_when[kind] 가 True 인데 값이 없는 컬럼 key 목록"""
+        required = self.required_masks.get(kind, 0)
+        present = 0
+        bits = self.bits
+        for key, value in payload.items():
+            bit = bits.get(key)
+            if bit is not None and value is not None and value != "":
+                present |= bit
+        missing = required & ~present
+        return [key for key, bit in bits.items() if missing & bit]
+
+    def resolve_header(self, header) -> Optional[str]:
+        if header is None:
+            return None
+        return self.header_index.get(_normalize_header(header))
+
+    def coerce_value(self, key: str, value):
+        """컬럼 타입(float/int/str/bool)에 맞게 셀 값 변환 - 빈 칸은 None, 변환 불가 값은 원본 그대로 (검증 단계에서 오류 처리)"""
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = value.strip()
+            if value == "":
+                return None
+        column_type = self.types.get(key)
+        if column_type in ("float", "int"):
+            if isinstance(value, str):
+                try:
+                    number = float(value.replace(",", ""))
+                except ValueError:
+                    return value
+            elif isinstance(value, bool):
+                return value
+            elif isinstance(value, (int, float)):
+                number = float(value)
+            else:
+                return value
+            if column_type == "int" and number.is_integer():
+                return int(number)
+            return number
+        if column_type == "str":
+            return str(value)
+        if column_type == "bool" and isinstance(value, str):
+            return value.lower() in ("1", "true", "y", "yes", "o")
+        return value
+
+
+column_registry = ColumnRegistry.load()
+
+
+def resolve_header(header) -> Optional[str]:
+    """머리글 1개 → 컬럼 key (모르는 머리글은 None)"""
+    return column_registry.resolve_header(header)
+
+
+def coerce_value(key: str, value):
+    return column_registry.coerce_value(key, value)
@@ -0,0 +1,307 @@
+import bisect
+import math
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .utils import parse_float_safe
+from .rod import calculate_bars_needed
+
+
+# 다품종 절단 계획 (1차원 cutting-stock)
+# 같은 직경/재질의 봉재에서 길이가 다른 제품을 섞어 자를 때 필요한 최소 봉재 수와 봉재별 절단 패턴을 구한다.
+# - 품종 수가 적으면: 열 생성(Gilmore-Gomory) LP 해를 내림한 패턴 + 잔여 수요 휴리스틱,
+#   순차 휴리스틱(SHP, 봉재를 가장 꽉 채우는 패턴을 분기한정으로 찾아 반복 적용)
+# - 최적 적합 감소(BFD) - 남은 길이 정렬 인덱스(bisect)로 O(n log n), 품종 수와 무관하게 사용
+# 후보 중 봉재 수가 가장 적은 계획을 채택하고, 하한(LP 목적값, 총 소요 길이 / 사용 가능 길이)과 비교해 최적 여부를 표시한다.
+
+FIT_EPSILON = 1e-6  # mm - 부동소수점 누적 오차 허용치
+PATTERN_SEARCH_MAX_TYPES = 40
+PATTERN_SEARCH_NODE_LIMIT = 1000
+COLUMN_GENERATION_MAX_ITERATIONS = 200
+BFD_MAX_PIECES = 200000
+
+
+def _best_fill_pattern(units: List[float], remaining: List[int], usable_length: float) -> List[int]:
+    """남은 수요 안에서 봉재 1개를 가장 많이 채우는 패턴 (분기한정, 노드 수 제한)"""
+    n = len(units)
+    suffix_length = [0.0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        suffix_length[i] = suffix_length[i + 1] + units[i] * remaining[i]
+
+    # 초기 해: 긴 제품부터 욕심껏 채우기
+    best = [0] * n
+    cap = usable_length
+    for i in range(n):
+        count = min(remaining[i], int(math.floor((cap + FIT_EPSILON) / units[i])))
+        best[i] = count
+        cap -= count * units[i]
+    best_fill = usable_length - cap
+    target = min(usable_length, suffix_length[0])
+
+    current = [0] * n
+    nodes = 0
+
+    def search(i, fill):
+        nonlocal best, best_fill, nodes
+        if best_fill >= target - FIT_EPSILON or nodes >= PATTERN_SEARCH_NODE_LIMIT:
+            return
+        nodes += 1
+        if i == n:
+            if fill > best_fill + FIT_EPSILON:
+                best_fill = fill
+                best = current[:]
+            return
+        cap_left = usable_length - fill
+        if fill + min(cap_left, suffix_length[i]) <= best_fill + FIT_EPSILON:
+            return
+        max_count = min(remaining[i], int(math.floor((cap_left + FIT_EPSILON) / units[i])))
+        for count in range(max_count, -1, -1):
+            current[i] = count
+            search(i + 1, fill + count * units[i])
+        current[i] = 0
+
+    search(0, 0.0)
+    return best
+
+
+def _best_value_pattern(units: List[float], values: List[float], limits: List[int], usable_length: float) -> Tuple[float, List[int], bool]:
+    """
+    열 생성 가격 결정 문제 - sum(values * a) 최대화, sum(units * a) <= usable_length, 0 <= a <= limits
+    (값/길이 비율 순 분기한정, 분수 배낭 상한으로 가지치기, 노드 수 제한)
+    반환: (최대값, 패턴, 탐색 완료 여부 - 노드 제한에 걸리지 않았으면 True)
+    """
+    n = len(units)
+    order = sorted((i for i in range(n) if values[i] > 0 and limits[i] > 0),
+                   key=lambda i: values[i] / units[i], reverse=True)
+    best_value = 0.0
+    best = [0] * n
+    current = [0] * n
+    nodes = 0
+
+    def bound(k, cap):
+        # 남은 품종을 분수로 채울 때의 상한
+        total = 0.0
+        for i in order[k:]:
+            take = min(limits[i], cap / units[i])
+            total += take * values[i]
+            cap -= take * units[i]
+            if cap <= FIT_EPSILON:
+                break
+        return total
+
+    def search(k, cap, value):
+        nonlocal best_value, best, nodes
+        if nodes >= PATTERN_SEARCH_NODE_LIMIT:
+            return
+        nodes += 1
+        if value > best_value + 1e-12:
+            best_value = value
+            best = current[:]
+        if k == len(order) or value + bound(k, cap) <= best_value + 1e-12:
+            return
+        i = order[k]
+        max_count = min(limits[i], int(math.floor((cap + FIT_EPSILON) / units[i])))
+        for count in range(max_count, -1, -1):
+            current[i] = count
+            search(k + 1, cap - count * units[i], value + count * values[i])
+        current[i] = 0
+
+    search(0, usable_length, 0.0)
+    return best_value, best, nodes < PATTERN_SEARCH_NODE_LIMIT
+
+
+def _column_generation(units: List[float], quantities: List[int], usable_length: float):
+    """
+    Gilmore-Gomory 열 생성으로 LP 완화 해를 구한 뒤 내림(floor)한 패턴을 확정
+    반환: (확정 패턴 목록, 남은 수요, LP 목적값 - 가격 결정이 끝까지 탐색되어 하한으로 쓸 수 있을 때만, 아니면 None)
+    """
+    n = len(units)
+    demand = np.array(quantities, dtype=np.float64)
+    # 초기 기저: 품종별 단일 패턴
+    basis = np.diag([float(min(quantities[i], math.floor((usable_length + FIT_EPSILON) / units[i]))) for i in range(n)])
+    x_basis = np.linalg.solve(basis, demand)
+
+    lp_converged = False
+    for _ in range(COLUMN_GENERATION_MAX_ITERATIONS):
+        duals = np.linalg.solve(basis.T, np.ones(n))
+        value, pattern, complete = _best_value_pattern(units, duals.tolist(), quantities, usable_length)
+        if value <= 1.0 + 1e-9:
+            lp_converged = complete
+            break
+        column = np.array(pattern, dtype=np.float64)
+        direction = np.linalg.solve(basis, column)
+        positive = direction > 1e-9
+        if not positive.any():
+            break
+        ratios = np.full(n, np.inf)
+        ratios[positive] = x_basis[positive] / direction[positive]
+        leaving = int(np.argmin(ratios))
+        basis[:, leaving] = column
+        x_basis = np.linalg.solve(basis, demand)
+        x_basis[np.abs(x_basis) < 1e-9] = 0.0
+
+    lp_bars = float(x_basis.sum()) if lp_converged else None
+    remaining = list(quantities)
+    plan = []
+    for j in range(n):
+        repeats = int(math.floor(x_basis[j] + 1e-9))
+        pattern = [int(round(c)) for c in basis[:, j]]
+        if repeats <= 0 or not any(pattern):
+            continue
+        repeats = min([repeats] + [remaining[i] // c for i, c in enumerate(pattern) if c > 0])
+        if repeats <= 0:
+            continue
+        for i, count in enumerate(pattern):
+            remaining[i] -= count * repeats
+        plan.append((repeats, _sparse(pattern)))
+    return plan, remaining, lp_bars
+
+
+def _sparse(pattern: Sequence[int]) -> Tuple[Tuple[int, int], ...]:
+    return tuple((i, count) for i, count in enumerate(pattern) if count > 0)
+
+
+def _sequential_heuristic(units: List[float], quantities: List[int], usable_length: float) -> List[Tuple[int, Tuple[Tuple[int, int], ...]]]:
+    """SHP - 최적 채움 패턴을 찾아 가능한 만큼 반복 적용"""
+    remaining = list(quantities)
+    plan = []
+    while any(remaining):
+        pattern = _best_fill_pattern(units, remaining, usable_length)
+        repeats = min(remaining[i] // count for i, count in enumerate(pattern) if count > 0)
+        for i, count in enumerate(pattern):
+            remaining[i] -= count * repeats
+        plan.append((repeats, _sparse(pattern)))
+    return plan
+
+
+def _best_fit_decreasing(units: List[float], quantities: List[int], usable_length: float) -> List[Tuple[int, Tuple[Tuple[int, int], ...]]]:
+    """BFD - 긴 제품부터, 들어갈 수 있는 봉재 중 남은 길이가 가장 짧은 봉재에 배치"""
+    open_bars: List[Tuple[float, int]] = []  # (남은 길이, 봉재 번호) 정렬 인덱스
+    contents: List[Dict[int, int]] = []
+    for i, unit in enumerate(units):
+        for _ in range(quantities[i]):
+            pos = bisect.bisect_left(open_bars, (unit - FIT_EPSILON,))
+            if pos < len(open_bars):
+                cap, bar_id = open_bars.pop(pos)
+            else:
+                cap, bar_id = usable_length, len(contents)
+                contents.append({})
+            contents[bar_id][i] = contents[bar_id].get(i, 0) + 1
+            bisect.insort(open_bars, (cap - unit, bar_id))
+
+    counts: Dict[Tuple[Tuple[int, int], ...], int] = {}
+    for content in contents:
+        key = tuple(sorted(content.items()))
+        counts[key] = counts.get(key, 0) + 1
+    return [(repeats, pattern) for pattern, repeats in counts.items()]
+
+
+def _plan_bars(plan) -> int:
+    return sum(repeats for repeats, _ in plan)
+
+
+def optimize_cutting_stock(data) -> Dict:
+    """
+    다품종 절단 계획 계산
+    data: items=[{productLength, quantity}], cuttingLoss, headCut, tailCut, standardBarLength
+    제품 1개 소요 길이 = productLength + cuttingLoss, 봉재 사용 가능 길이 = standardBarLength - headCut - tailCut
+    (calculate_bars_needed 와 동일한 기준). 배치할 수 없는 제품이 있으면 barsNeeded 0 반환.
+    품종이 PATTERN_SEARCH_MAX_TYPES 를 넘고 총 수량이 BFD_MAX_PIECES 를 넘으면 ValueError.
+    """
+    cutting_loss = parse_float_safe(data.get('cuttingLoss'))
+    head_cut = parse_float_safe(data.get('headCut'))
+    tail_cut = parse_float_safe(data.get('tailCut'))
+    standard_bar_length = parse_float_safe(data.get('standardBarLength'))
+    usable_length = standard_bar_length - head_cut - tail_cut
+
+    # 같은 길이는 하나의 품종으로 합치고 긴 제품부터 정렬
+    demand: Dict[float, int] = {}
+    for item in data.get('items') or []:
+        product_length = parse_float_safe(item.get('productLength'))
+        quantity = int(parse_float_safe(item.get('quantity')))
+        if product_length > 0 and quantity > 0:
+            demand[product_length] = demand.get(product_length, 0) + quantity
+    product_lengths = sorted(demand, reverse=True)
+    units = [length + cutting_loss for length in product_lengths]
+    quantities = [demand[length] for length in product_lengths]
+
+    empty_result = {
+        "barsNeeded": 0,
+        "lowerBound": 0,
+        "isOptimal": False,
+        "perJobBarsNeeded": 0,
+        "barsSaved": 0,
+        "usableLength": usable_length,
+        "totalPieces": sum(quantities),
+        "utilizationRate": 0.0,
+        "wastage": 100.0,
+        "patterns": [],
+    }
+    if not units or standard_bar_length <= 0 or usable_length <= 0 or units[0] > usable_length:
+        return empty_result
+
+    # 기존 방식(제품 길이별 개별 계산) 봉재 수
+    per_job_bars = sum(
+        calculate_bars_needed({
+            'productLength': length, 'quantity': demand[length], 'cuttingLoss': cutting_loss,
+            'headCut': head_cut, 'tailCut': tail_cut, 'standardBarLength': standard_bar_length,
+        })
+        for length in product_lengths
+    )
+
+    total_used_length = sum(u * q for u, q in zip(units, quantities))
+    lower_bound = max(1, math.ceil(total_used_length / usable_length - FIT_EPSILON))
+
+    candidates = []
+    if len(units) <= PATTERN_SEARCH_MAX_TYPES:
+        # 열 생성 LP 해의 정수 부분 + 잔여 수요는 휴리스틱으로 보완
+        fixed_plan, residual, lp_bars = _column_generation(units, quantities, usable_length)
+        if lp_bars is not None:
+            lower_bound = max(lower_bound, math.ceil(lp_bars - 1e-6))
+        if any(residual):
+            residual_plans = [_sequential_heuristic(units, residual, usable_length)]
+            if sum(residual) <= BFD_MAX_PIECES:
+                residual_plans.append(_best_fit_decreasing(units, residual, usable_length))
+            fixed_plan = fixed_plan + min(residual_plans, key=_plan_bars)
+        candidates.append(fixed_plan)
+        candidates.append(_sequential_heuristic(units, quantities, usable_length))
+    if sum(quantities) <= BFD_MAX_PIECES:
+        candidates.append(_best_fit_decreasing(units, quantities, usable_length))
+    elif not candidates:
+        # 품종이 많으면 BFD 만 쓸 수 있는데, 제품 1개씩 배치하므로 총 수량을 제한한다
+        raise ValueError(
+            f"제품 길이가 {PATTERN_SEARCH_MAX_TYPES}종을 넘으면 총 수량은 {BFD_MAX_PIECES}개까지 계산할 수 있습니다."
+        )
+    plan = min(candidates, key=_plan_bars)
+
+    # 같은 패턴은 하나로 합쳐 봉재 수가 많은 순으로 정리
+    merged: Dict[Tuple[Tuple[int, int], ...], int] = {}
+    for repeats, pattern in plan:
+        merged[pattern] = merged.get(pattern, 0) + repeats
+
+    bars_needed = _plan_bars(plan)
+    patterns = []
+    for pattern, repeats in sorted(merged.items(), key=lambda p: -p[1]):
+        used_length = sum(count * units[i] for i, count in pattern)
+        patterns.append({
+            "bars": repeats,
+            "cuts": [{"productLength": product_lengths[i], "count": count} for i, count in pattern],
+            "usedLength": used_length,
+            "remnantLength": max(usable_length - used_length, 0.0),
+        })
+
+    utilization_rate = min((total_used_length / (bars_needed * usable_length)) * 100.0, 100.0)
+
+    return {
+        "barsNeeded": bars_needed,
+        "lowerBound": lower_bound,
+        "isOptimal": bars_needed <= lower_bound,
+        "perJobBarsNeeded": per_job_bars,
+        "barsSaved": max(per_job_bars - bars_needed, 0),
+        "usableLength": usable_length,
+        "totalPieces": sum(quantities),
+        "utilizationRate": utilization_rate,
+        "wastage": max(100.0 - utilization_rate, 0.0),
+        "patterns": patterns,
+    }
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+
+# 재질 카탈로그 (config/materials.json)
+# 서버 시작 후 첫 사용 시 한 번 읽어 id/재질명 색인을 만들고, 계산 요청의 materialId 로 밀도/단가/표준 길이를 채운다.
+# ETag 는 카탈로그 내용의 해시 - 파일을 고치고 reload() 하면 바뀐다.
+# 환경변수: MATERIAL_CATALOG_PATH (기본 config/materials.json)
+
+DEFAULT_MATERIAL_CATALOG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "materials.json"
+)
+
+MATERIAL_NUMERIC_FIELDS = (
+    "standardBarLength", "materialDensity", "barUnitPrice", "plateUnitPrice", "scrapUnitPrice",
+)
+
+# 계산 요청 필드 ← 카탈로그 필드 (요청에 값이 없을 때만 채움)
+ROD_DEFAULTS = (
+    ("standardBarLength", "standardBarLength"),
+    ("materialDensity", "materialDensity"),
+    ("materialPrice", "barUnitPrice"),
+)
+PLATE_DEFAULTS = (
+    ("materialDensity", "materialDensity"),
+    ("plateUnitPrice", "plateUnitPrice"),
+)
+
+
+class MaterialCatalog:
+    """재질 카탈로그 - id(소문자)와 재질명(소문자) 색인, 스레드 안전한 재적재"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("MATERIAL_CATALOG_PATH", DEFAULT_MATERIAL_CATALOG_PATH)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.version: Optional[str] = None
+        self.etag: Optional[str] = None
+        self._materials: List[Dict] = []
+        self._by_id: Dict[str, Dict] = {}
+        self._by_name: Dict[str, Dict] = {}
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.reload()
+
+    def reload(self) -> None:
+        """카탈로그 파일을 다시 읽어 색인 교체"""
+        with open(self.path, encoding="utf-8") as f:
+            raw = json.load(f)
+
+        materials, by_id, by_name = [], {}, {}
+        for entry in raw.get("materials", []):
+            material_id = str(entry["id"]).strip()
+            if material_id.lower() in by_id:
+                raise ValueError(f"재질 id 중복: {material_id}")
+            material = {"id": material_id, "name": entry.get("name") or material_id}
+            for field in MATERIAL_NUMERIC_FIELDS:
+                value = entry.get(field)
+                material[field] = float(value) if value is not None else None
+            materials.append(material)
+            by_id[material_id.lower()] = material
+            by_name.setdefault(material["name"].strip().lower(), material)
+
+        canonical = json.dumps({"version": raw.get("version"), "materials": materials}, sort_keys=True, ensure_ascii=False)
+        with self._lock:
+            self.version = raw.get("version")
+            self.etag = '"' + hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32] + '"'
+            self._materials = materials
+            self._by_id = by_id
+            self._by_name = by_name
+            self._loaded = True
+
+    def list(self) -> List[Dict]:
+        self._ensure_loaded()
+        return self._materials
+
+    def get(self, material_id: Optional[str]) -> Optional[Dict]:
+        """id 또는 재질명으로 조회 (대소문자 무시)"""
+        if not material_id:
+            return None
+        self._ensure_loaded()
+        key = str(material_id).strip().lower()
+        return self._by_id.get(key) or self._by_name.get(key)
+
+    def apply_defaults(self, data: dict, kind: str = "rod") -> dict:
+        """
+        materialId 에 해당하는 재질 기본값으로 비어 있는 요청 필드를 채운 새 dict 반환
+        kind: rod | plate - 요청에 직접 넣은 값이 항상 우선, 없는 materialId 는 ValueError
+        """
+        material = self.get(data.get("materialId"))
+        if material is None:
+            raise ValueError(f"등록되지 않은 재질입니다: {data.get('materialId')}")
+        filled = dict(data)
+        for request_field, catalog_field in (PLATE_DEFAULTS if kind == "plate" else ROD_DEFAULTS):
+            if filled.get(request_field) is None and material.get(catalog_field) is not None:
+                filled[request_field] = material[catalog_field]
+        # 스크랩 단가는 스크랩 계산을 하는 경우에만 채움 (봉재: 실중량 입력, 판재: 환산율 입력)
+        wants_scrap = filled.get("actualProductWeight") if kind == "rod" else filled.get("recoveryRatio")
+        if wants_scrap is not None and filled.get("scrapUnitPrice") is None:
+            filled["scrapUnitPrice"] = material.get("scrapUnitPrice")
+        return filled
+
+
+material_catalog = MaterialCatalog()
@@ -0,0 +1,392 @@
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .utils import parse_float_safe, kg_per_m3_to_g_per_cm3
+
+
+# 판재 네스팅 (2차원 직사각형 배치)
+# 원판(sheetWidth × sheetLength) 에 크기가 다른 직사각형 부품을 배치해 필요한 원판 수와 원판별 배치도를 구한다.
+# - 길로틴 방식: 빈 영역을 직사각형 목록으로 관리하고, 부품을 놓을 때마다 남은 영역을 끝까지 자르는 두 직사각형으로 나눈다.
+#   (전단기/판재 톱으로 그대로 자를 수 있는 배치)
+# - 같은 부품은 빈 영역 하나에 격자 묶음(열 × 행)으로 한 번에 배치 - 부품 수가 수천 개여도 배치 단위는 묶음 수
+# - 절단 폭(cuttingLoss)은 부품 치수에 더해 계산하고, 원판 가장자리 손실(edgeTrim)은 사방에서 뺀다.
+# - 회전 허용 부품은 90° 돌려 놓을 수 있다 (결 방향이 있는 부품은 allowRotation=false)
+# - 한 장을 채운 배치는 남은 수량이 허용하는 만큼 반복 적용하고, 정렬/영역 선택/분할 규칙 조합 중 원판 수가 가장 적은 계획을 채택한다.
+# 하한: 부품 총면적 / 원판 사용 가능 면적 (올림)
+# 배치 후 남는 빈 영역 중 가로/세로가 모두 minRemnantSize 이상인 것은 재사용 잔재로 보고한다 (나머지는 스크랩)
+
+FIT_EPSILON = 1e-6  # mm
+MAX_PIECES = 200000
+DEFAULT_MIN_PLATE_REMNANT_SIZE = 100.0  # mm - 잔재로 남길 최소 가로/세로
+
+# (부품 정렬, 빈 영역 선택, 분할 규칙)
+NESTING_STRATEGIES = (
+    ("area", "best_area", "max_area"),
+    ("area", "best_short_side", "shorter_leftover"),
+    ("long_side", "best_area", "shorter_leftover"),
+    ("long_side", "best_short_side", "max_area"),
+)
+
+_SORT_KEYS = {
+    "area": lambda part: (part[1] * part[2], max(part[1], part[2])),
+    "long_side": lambda part: (max(part[1], part[2]), part[1] * part[2]),
+}
+
+
+def _block_shapes(count: int, max_cols: int, max_rows: int) -> List[Tuple[int, int]]:
+    """count 개를 격자로 놓는 후보 (열, 행) - 가로로 길게 / 세로로 길게 (마지막 행은 덜 찰 수 있음)"""
+    capacity = max_cols * max_rows
+    count = min(count, capacity)
+    cols = min(max_cols, count)
+    shapes = [(cols, math.ceil(count / cols))]
+    tall_cols = math.ceil(count / max_rows)
+    tall = (tall_cols, math.ceil(count / tall_cols))
+    if tall != shapes[0]:
+        shapes.append(tall)
+    return shapes
+
+
+def _split(rect, block_w: float, block_h: float, rule: str):
+    """빈 영역 왼쪽 아래에 block 을 놓은 뒤 남는 두 직사각형 (길로틴 분할)"""
+    x, y, w, h = rect
+    right_w = w - block_w
+    top_h = h - block_h
+    if rule == "max_area":
+        # 두 조각 중 큰 조각이 더 커지는 쪽으로 자름
+        horizontal = max(right_w * block_h, w * top_h) >= max(right_w * h, block_w * top_h)
+    else:
+        # 남는 폭이 남는 높이보다 짧으면 가로로 길게 자름 (짧은 쪽 자투리를 작게)
+        horizontal = right_w < top_h
+    if horizontal:
+        return (x + block_w, y, right_w, block_h), (x, y + block_h, w, top_h)
+    return (x + block_w, y, right_w, h), (x, y + block_h, block_w, top_h)
+
+
+def _grid_count(w: float, h: float, ow: float, oh: float) -> int:
+    return int((w + FIT_EPSILON) // ow) * int((h + FIT_EPSILON) // oh)
+
+
+def _orientation_yield(rect, ow: float, oh: float, orientations, split_rule: str, wanted: int) -> int:
+    """빈 영역에 이 방향으로 격자를 채우고, 남는 두 조각에 어느 방향이든 격자로 더 놓을 수 있는 개수 (한 단계 앞보기)"""
+    _, _, w, h = rect
+    cols, rows = int((w + FIT_EPSILON) // ow), int((h + FIT_EPSILON) // oh)
+    placed = cols * rows
+    if placed >= wanted:
+        return wanted
+    for piece in _split(rect, cols * ow, rows * oh, split_rule):
+        placed += max(_grid_count(piece[2], piece[3], pw, ph) for pw, ph, _ in orientations)
+    return min(placed, wanted)
+
+
+def _pack_sheet(parts, remaining: List[int], bin_w: float, bin_h: float, rect_rule: str, split_rule: str):
+    """
+    원판 1장 채우기
+    parts: [(품목 번호, 폭 + 절단 폭, 길이 + 절단 폭, 회전 허용)] - 배치 순서대로
+    반환: (묶음 목록 [(품목, x, y, 놓인 폭, 놓인 길이, 회전 여부, 열, 행, 개수)], 품목별 개수, 남은 빈 영역 목록)
+    """
+    free = [(0.0, 0.0, bin_w, bin_h)]
+    offcuts = []  # 더 놓을 부품이 없어 탐색에서 뺀 빈 영역 (잔재/스크랩 계산용)
+    blocks = []
+    counts: Dict[int, int] = {}
+    left = {index: remaining[index] for index, _, _, _ in parts}
+
+    # 남은 부품 중 가장 짧은 변 - 빈 영역의 두 변 중 하나라도 이보다 짧으면 더 놓을 부품이 없음
+    # (부품이 떨어질 때만 앞으로 이동하는 포인터)
+    by_side = sorted((min(w, h), index) for index, w, h, _ in parts)
+    cursor = 0
+
+    def min_side():
+        nonlocal cursor
+        while cursor < len(by_side) and left[by_side[cursor][1]] == 0:
+            cursor += 1
+        return by_side[cursor][0] if cursor < len(by_side) else math.inf
+
+    smallest = min_side()
+    largest_area = bin_w * bin_h  # 빈 영역 중 가장 큰 면적 - 이보다 큰 부품은 영역을 훑지 않고 건너뜀
+    for index, part_w, part_h, rotate in parts:
+        orientations = [(part_w, part_h, False)]
+        if rotate and abs(part_w - part_h) > FIT_EPSILON:
+            orientations.append((part_h, part_w, True))
+        while left[index] > 0 and free and part_w * part_h <= largest_area + FIT_EPSILON:
+            # 이 부품이 들어가는 빈 영역 중 규칙상 가장 좋은 곳
+            best = None
+            for k, (_, _, w, h) in enumerate(free):
+                for ow, oh, rotated in orientations:
+                    if ow > w + FIT_EPSILON or oh > h + FIT_EPSILON:
+                        continue
+                    if rect_rule == "best_area":
+                        score = (w * h, min(w - ow, h - oh))
+                    else:
+                        score = (min(w - ow, h - oh), max(w - ow, h - oh))
+                    if best is None or score < best[0]:
+                        best = (score, k, ow, oh, rotated)
+            if best is None:
+                break
+            _, k, ow, oh, rotated = best
+            rect = free.pop(k)
+            if len(orientations) > 1 and rect[2] >= orientations[1][0] - FIT_EPSILON and rect[3] >= orientations[1][1] - FIT_EPSILON \
+                    and rect[2] >= orientations[0][0] - FIT_EPSILON and rect[3] >= orientations[0][1] - FIT_EPSILON:
+                # 두 방향 모두 들어가면 이 영역에 더 많이 놓이는 방향 (같으면 규칙이 고른 방향)
+                yields = {o: _orientation_yield(rect, o[0], o[1], orientations, split_rule, left[index]) for o in orientations}
+                ow, oh, rotated = max(orientations, key=lambda o: (yields[o], o[2] == rotated))
+            x, y, w, h = rect
+            max_cols = int((w + FIT_EPSILON) // ow)
+            max_rows = int((h + FIT_EPSILON) // oh)
+
+            # 묶음 모양은 남는 가장 큰 조각이 커지는 쪽
+            choice = None
+            for cols, rows in _block_shapes(left[index], max_cols, max_rows):
+                pieces = _split(rect, cols * ow, rows * oh, split_rule)
+                largest = max(piece[2] * piece[3] for piece in pieces)
+                if choice is None or largest > choice[0]:
+                    choice = (largest, cols, rows, pieces)
+            _, cols, rows, pieces = choice
+            count = min(left[index], cols * rows)
+            blocks.append((index, x, y, ow, oh, rotated, cols, rows, count))
+            left[index] -= count
+            counts[index] = counts.get(index, 0) + count
+
+            new_rects = list(pieces)
+            last_row = count - (rows - 1) * cols
+            if last_row < cols:
+                # 덜 찬 마지막 행의 빈 칸
+                new_rects.append((x + last_row * ow, y + (rows - 1) * oh, (cols - last_row) * ow, oh))
+            if left[index] == 0:
+                smallest = min_side()
+            for piece in new_rects:
+                if piece[2] >= smallest - FIT_EPSILON and piece[3] >= smallest - FIT_EPSILON:
+                    free.append(piece)
+                elif piece[2] > FIT_EPSILON and piece[3] > FIT_EPSILON:
+                    offcuts.append(piece)
+            if left[index] == 0:
+                kept = []
+                for piece in free:
+                    (kept if piece[2] >= smallest - FIT_EPSILON and piece[3] >= smallest - FIT_EPSILON else offcuts).append(piece)
+                free = kept
+            largest_area = max((piece[2] * piece[3] for piece in free), default=0.0)
+    return blocks, counts, free + offcuts
+
+
+def _nest(parts, quantities: List[int], bin_w: float, bin_h: float, rect_rule: str, split_rule: str):
+    """원판을 한 장씩 채우고, 같은 배치를 남은 수량만큼 반복 - [(반복 수, 묶음 목록, 품목별 개수, 빈 영역)]"""
+    remaining = list(quantities)
+    plan = []
+    while any(remaining):
+        blocks, counts, empty = _pack_sheet(parts, remaining, bin_w, bin_h, rect_rule, split_rule)
+        if not counts:
+            raise ValueError("원판에 배치할 수 없는 부품이 있습니다.")
+        repeats = min(remaining[index] // count for index, count in counts.items())
+        for index, count in counts.items():
+            remaining[index] -= count * repeats
+        plan.append((repeats, blocks, counts, empty))
+    return plan
+
+
+def _plan_sheets(plan) -> int:
+    return sum(layout[0] for layout in plan)
+
+
+def _prepare_parts(items: Sequence[Dict], kerf: float) -> List[Tuple[int, float, float, bool]]:
+    return [(index, item["width"] + kerf, item["length"] + kerf, item.get("allowRotation", True))
+            for index, item in enumerate(items)]
+
+
+def _reusable_offcuts(empty, kerf: float, offset: float, min_size: float) -> List[Dict]:
+    """빈 영역 → 가로/세로 모두 min_size 이상인 잔재 (실제 치수 = 영역 - 절단 폭, 좌표는 원판 기준)"""
+    remnants = []
+    for x, y, w, h in empty:
+        width, length = w - kerf, h - kerf
+        if width >= min_size - FIT_EPSILON and length >= min_size - FIT_EPSILON:
+            remnants.append({"x": x + offset, "y": y + offset, "width": width, "length": length})
+    return remnants
+
+
+def _placements(blocks, kerf: float, offset: float) -> List[Dict]:
+    return [
+        {
+            "item": index,
+            "x": x + offset,
+            "y": y + offset,
+            "partWidth": placed_w - kerf,
+            "partLength": placed_h - kerf,
+            "rotated": rotated,
+            "columns": cols,
+            "rows": rows,
+            "count": count,
+        }
+        for index, x, y, placed_w, placed_h, rotated, cols, rows, count in blocks
+    ]
+
+
+def pack_onto_rectangle(items: Sequence[Dict], remaining: Sequence[int], width: float, length: float,
+                        kerf: float = 0.0, min_remnant_size: float = DEFAULT_MIN_PLATE_REMNANT_SIZE) -> Dict:
+    """
+    잔재 1장(가장자리 손실 없음)에 남은 수량의 부품을 최대한 배치
+    반환: placements, counts (품목별 개수), pieces, remnants (배치 후 다시 잔재로 쓸 수 있는 영역)
+    """
+    parts = sorted(_prepare_parts(items, kerf), key=_SORT_KEYS["area"], reverse=True)
+    _, rect_rule, split_rule = NESTING_STRATEGIES[0]
+    blocks, counts, empty = _pack_sheet(parts, list(remaining), width + kerf, length + kerf, rect_rule, split_rule)
+    return {
+        "placements": _placements(blocks, kerf, 0.0),
+        "counts": counts,
+        "pieces": sum(counts.values()),
+        "remnants": _reusable_offcuts(empty, kerf, 0.0, min_remnant_size),
+    }
+
+
+def nest_rectangles(items: Sequence[Dict], sheet_width: float, sheet_length: float,
+                    kerf: float = 0.0, edge_trim: float = 0.0, strategies=NESTING_STRATEGIES):
+    """
+    items: [{width, length, quantity, allowRotation}] → (배치 계획, 부품 총면적, 원판 수 하한)
+    배치 계획: [(원판 수, 묶음 목록, 품목별 개수)] - 묶음 좌표는 원판 가장자리 손실을 뺀 영역 기준
+    원판에 들어가지 않는 부품이 있으면 ValueError
+    """
+    usable_w = sheet_width - 2 * edge_trim
+    usable_h = sheet_length - 2 * edge_trim
+    quantities = [0] * len(items)
+    parts_area = 0.0
+    for index, item in enumerate(items):
+        width, length, quantity = item["width"], item["length"], item["quantity"]
+        rotate = item.get("allowRotation", True)
+        fits = width <= usable_w + FIT_EPSILON and length <= usable_h + FIT_EPSILON
+        if rotate:
+            fits = fits or (length <= usable_w + FIT_EPSILON and width <= usable_h + FIT_EPSILON)
+        if not fits:
+            raise ValueError(f"{index + 1}번째 부품({width:g} × {length:g} mm)이 원판 사용 가능 영역({usable_w:g} × {usable_h:g} mm)보다 큽니다.")
+        quantities[index] = quantity
+        parts_area += width * length * quantity
+    parts = _prepare_parts(items, kerf)
+
+    # 절단 폭을 부품에 더했으므로 원판 끝의 마지막 부품 뒤에는 절단 폭이 필요 없게 원판도 같은 만큼 늘림
+    bin_w, bin_h = usable_w + kerf, usable_h + kerf
+    lower_bound = max(1, math.ceil(parts_area / (usable_w * usable_h) - FIT_EPSILON))
+    best = None
+    for sort_key, rect_rule, split_rule in strategies:
+        ordered = sorted(parts, key=_SORT_KEYS[sort_key], reverse=True)
+        plan = _nest(ordered, quantities, bin_w, bin_h, rect_rule, split_rule)
+        rank = (_plan_sheets(plan), len(plan))
+        if best is None or rank < best[0]:
+            best = (rank, plan)
+        if rank[0] <= lower_bound:
+            break
+    return best[1], parts_area, lower_bound
+
+
+def nesting_items(data) -> List[Dict]:
+    """요청 items=[{partWidth, partLength, quantity, allowRotation}] → [{width, length, quantity, allowRotation}] (빈 항목 제외)"""
+    items = []
+    for item in data.get('items') or []:
+        items.append({
+            "width": parse_float_safe(item.get('partWidth')),
+            "length": parse_float_safe(item.get('partLength')),
+            "quantity": int(parse_float_safe(item.get('quantity'))),
+            "allowRotation": item.get('allowRotation', True) is not False,
+        })
+    return [item for item in items if item["width"] > 0 and item["length"] > 0 and item["quantity"] > 0]
+
+
+def plate_weight_kg(area_mm2: float, data) -> float:
+    """면적(mm²) × plateThickness × materialDensity(kg/m³) → kg"""
+    thickness = parse_float_safe(data.get('plateThickness'))
+    density_g_per_cm3 = kg_per_m3_to_g_per_cm3(parse_float_safe(data.get('materialDensity')))
+    return area_mm2 * thickness / 1000.0 * density_g_per_cm3 / 1000.0
+
+
+def optimize_plate_nesting(data) -> Dict:
+    """
+    판재 네스팅 계산
+    data: items=[{partWidth, partLength, quantity, allowRotation}], sheetWidth, sheetLength, cuttingLoss, edgeTrim,
+          plateThickness, materialDensity (kg/m³), plateUnitPrice (₩/kg), minRemnantSize
+    재료비는 부품 면적이 아니라 구매하는 원판 전체 중량 기준. 원판에 들어가지 않는 부품이 있으면 ValueError.
+    """
+    sheet_width = parse_float_safe(data.get('sheetWidth'))
+    sheet_length = parse_float_safe(data.get('sheetLength'))
+    kerf = parse_float_safe(data.get('cuttingLoss'))
+    edge_trim = parse_float_safe(data.get('edgeTrim'))
+    unit_price = parse_float_safe(data.get('plateUnitPrice'))
+    min_remnant_size = parse_float_safe(data.get('minRemnantSize')) or DEFAULT_MIN_PLATE_REMNANT_SIZE
+
+    items = nesting_items(data)
+    total_pieces = sum(item["quantity"] for item in items)
+    if not items:
+        raise ValueError("배치할 부품이 없습니다.")
+    if total_pieces > MAX_PIECES:
+        raise ValueError(f"총 부품 수가 {MAX_PIECES}개를 초과합니다.")
+    if sheet_width - 2 * edge_trim <= 0 or sheet_length - 2 * edge_trim <= 0:
+        raise ValueError("원판 가장자리 손실이 원판 크기보다 큽니다.")
+
+    plan, parts_area, lower_bound = nest_rectangles(items, sheet_width, sheet_length, kerf, edge_trim)
+    sheets_needed = _plan_sheets(plan)
+    sheet_area = sheet_width * sheet_length
+
+    layouts = []
+    remnant_area = 0.0
+    remnant_count = 0
+    for repeats, blocks, counts, empty in sorted(plan, key=lambda layout: -layout[0]):
+        used_area = sum(items[index]["width"] * items[index]["length"] * count for index, count in counts.items())
+        remnants = _reusable_offcuts(empty, kerf, edge_trim, min_remnant_size)
+        remnant_area += repeats * sum(r["width"] * r["length"] for r in remnants)
+        remnant_count += repeats * len(remnants)
+        layouts.append({
+            "sheets": repeats,
+            "pieces": sum(counts.values()),
+            "usedArea": used_area,
+            "utilizationRate": used_area / sheet_area * 100.0,
+            "placements": _placements(blocks, kerf, edge_trim),
+            "remnants": remnants,
+        })
+
+    utilization_rate = min(parts_area / (sheets_needed * sheet_area) * 100.0, 100.0)
+    sheet_weight = plate_weight_kg(sheet_area, data)
+    total_weight = sheet_weight * sheets_needed
+    total_cost = total_weight * unit_price
+    return {
+        "sheetsNeeded": sheets_needed,
+        "lowerBound": lower_bound,
+        "isOptimal": sheets_needed <= lower_bound,
+        "totalPieces": total_pieces,
+        "sheetWeight": sheet_weight,
+        "totalWeight": total_weight,
+        "partsWeight": plate_weight_kg(parts_area, data),
+        "remnantWeight": plate_weight_kg(remnant_area, data),
+        "remnantCount": remnant_count,
+        "totalCost": total_cost,
+        "unitCost": total_cost / total_pieces,
+        "utilizationRate": utilization_rate,
+        "wastage": max(100.0 - utilization_rate, 0.0),
+        "layouts": layouts,
+    }
+
+
+def expand_placements(layout: Dict, kerf: float = 0.0) -> List[Tuple[int, float, float, float, float]]:
+    """배치 묶음 → 부품별 (품목, x, y, 폭, 길이) - 묶음 안에서는 행 단위로 채움 (간격 = 부품 치수 + 절단 폭)"""
+    pieces = []
+    for block in layout["placements"]:
+        pitch_x = block["partWidth"] + kerf
+        pitch_y = block["partLength"] + kerf
+        for n in range(block["count"]):
+            row, col = divmod(n, block["columns"])
+            pieces.append((block["item"], block["x"] + col * pitch_x, block["y"] + row * pitch_y,
+                           block["partWidth"], block["partLength"]))
+    return pieces
+
+
+def plate_job(data) -> Dict:
+    """/calculate/plate 요청(plateWidth × plateLength 부품 1종) → 네스팅 요청 형식"""
+    return {
+        **data,
+        "items": [{
+            "partWidth": data.get('plateWidth'),
+            "partLength": data.get('plateLength'),
+            "quantity": data.get('quantity'),
+            "allowRotation": data.get('allowRotation', True),
+        }],
+    }
+
+
+def plate_sheet_plan(data) -> Optional[Dict]:
+    """/calculate/plate 용 - sheetWidth/sheetLength 가 있으면 단일 부품 네스팅, 없으면 None"""
+    if not data.get('sheetWidth') or not data.get('sheetLength'):
+        return None
+    return optimize_plate_nesting(plate_job(data))
@@ -0,0 +1,355 @@
+import argparse
+import codecs
+import csv
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from pydantic import ValidationError
+
+from app.api.schemas import RodCalculateRequest, PlateCalculateRequest, LegacyFieldSupport
+from .column_master import column_registry, resolve_header, coerce_value
+from .rod_batch import calculate_rod_batch, ROW_OK, ROW_INPUT_ERROR
+from .plate import calculate_plate_values
+from .validation_utils import validate_plate_specific_inputs
+
+
+# 주문 스프레드시트(CSV/XLSX) 일괄 가져오기
+# 파일을 IMPORT_CHUNK_ROWS 행씩 읽어 머리글을 컬럼마스터 key 로 매핑하고, 청크를 워커 프로세스에서 계산한 뒤
+# 입력 순서대로 결과 열(상태/메시지/계산값)을 덧붙인 파일을 쓴다. 동시에 메모리에 있는 청크 수는 워커 수의 2배로 제한.
+# 워커 프로세스 풀은 프로세스당 하나를 만들어 모든 가져오기가 같이 쓴다 (forkserver/spawn 으로 시작 -
+# 스레드와 이벤트 루프가 떠 있는 API 워커를 fork 하지 않음). API 는 기본으로 현재 프로세스에서 계산한다.
+# CLI: python -m core_logic.order_import orders.xlsx -o orders_result.xlsx
+
+IMPORT_CHUNK_ROWS = 2000
+STATUS_COLUMN = "importStatus"
+MESSAGE_COLUMN = "importMessage"
+OUTPUT_FIELDS = (
+    "barsNeeded", "materialTotalWeight", "totalWeight", "totalCost", "unitCost",
+    "utilizationRate", "wastage", "scrapWeight", "scrapSavings", "realCost",
+)
+SUPPORTED_FORMATS = ("csv", "xlsx")
+UNUSABLE_BAR_MESSAGE = "계산 불가능: 제품 길이가 사용 가능한 봉재 길이보다 큽니다."
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _pool_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """공유 워커 프로세스 풀 - 처음 요청한 워커 수로 만들고 이후 가져오기는 그 풀을 같이 쓴다"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context())
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """공유 워커 프로세스 풀 종료 (다음 가져오기에서 다시 만든다)"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def detect_format(filename: str) -> str:
+    extension = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    if extension not in SUPPORTED_FORMATS:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {extension or filename} (csv, xlsx 만 지원)")
+    return extension
+
+
+def _detect_csv_encoding(path: str) -> str:
+    """UTF-8(BOM 포함) 우선, 디코딩 실패 시 엑셀 한글 기본 인코딩(cp949)"""
+    with open(path, "rb") as f:
+        sample = f.read(64 * 1024)
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "cp949"
+
+
+def _read_csv(path: str, encoding: Optional[str] = None) -> Iterator[list]:
+    with open(path, newline="", encoding=encoding or _detect_csv_encoding(path)) as f:
+        yield from csv.reader(f)
+
+
+def _load_openpyxl():
+    try:
+        import openpyxl
+    except ImportError as e:
+        raise RuntimeError("XLSX 처리를 위해 openpyxl 패키지가 필요합니다 (pip install openpyxl)") from e
+    return openpyxl
+
+
+def _read_xlsx(path: str) -> Iterator[list]:
+    openpyxl = _load_openpyxl()
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from (list(row) for row in workbook.active.iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+
+def _read_rows(path: str, file_format: str, encoding: Optional[str] = None) -> Iterator[list]:
+    return _read_xlsx(path) if file_format == "xlsx" else _read_csv(path, encoding)
+
+
+def _is_blank(cells: Sequence) -> bool:
+    return all(cell is None or (isinstance(cell, str) and not cell.strip()) for cell in cells)
+
+
+def map_row(keys: Sequence[Optional[str]], cells: Sequence) -> Dict:
+    """셀 목록 → {컬럼 key: 변환된 값} (매핑되지 않은 열은 제외)"""
+    row = {}
+    for key, cell in zip(keys, cells):
+        if key is not None:
+            value = coerce_value(key, cell)
+            if value is not None:
+                row[key] = value
+    return row
+
+
+def _row_kind(row: Dict) -> str:
+    material_type = str(row.get("materialType") or "").strip().lower()
+    if material_type in ("sheet", "plate", "판재"):
+        return "plate"
+    if material_type in ("rod", "봉재"):
+        return "rod"
+    return "plate" if "shape" not in row and "plateThickness" in row else "rod"
+
+
+def _validation_message(e: ValidationError) -> str:
+    return "입력값 오류: " + "; ".join(
+        f"{'.'.join(str(loc) for loc in err.get('loc', ())) or '-'}: {err.get('msg')}" for err in e.errors()
+    )
+
+
+def _evaluate_plate(request: PlateCalculateRequest) -> Dict:
+    """판재 1행 - /calculate/plate 와 같은 산식 (원판 네스팅, 스크랩 회수액 포함)"""
+    data = LegacyFieldSupport.apply_aliases(request.model_dump())
+    validation = validate_plate_specific_inputs(data)
+    if validation["errors"]:
+        return {"status": "error", "message": "입력값 오류: " + "; ".join(validation["errors"])}
+    try:
+        values, _sheet_plan = calculate_plate_values(data)
+    except ValueError as e:
+        return {"status": "error", "message": f"계산 불가능: {e}"}
+    return {
+        "status": "ok",
+        "message": "; ".join(validation["warnings"]),
+        "values": column_registry.round_output(values),
+    }
+
+
+def evaluate_chunk(rows: List[Dict]) -> List[Dict]:
+    """
+    매핑된 행 목록 계산 - 행별 {"status": ok|error, "message", "values"}
+    봉재 행은 calculate_rod_batch 한 번으로, 판재 행은 행별로 계산 (요청 검증은 API 요청 모델 그대로 사용)
+    """
+    outcomes: List[Optional[Dict]] = [None] * len(rows)
+    rod_positions, rod_rows = [], []
+
+    for i, row in enumerate(rows):
+        kind = _row_kind(row)
+        model = PlateCalculateRequest if kind == "plate" else RodCalculateRequest
+        try:
+            request = model(**row)
+        except ValidationError as e:
+            outcomes[i] = {"status": "error", "message": _validation_message(e)}
+            continue
+        if kind == "plate":
+            outcomes[i] = _evaluate_plate(request)
+        else:
+            rod_positions.append(i)
+            rod_rows.append(LegacyFieldSupport.apply_aliases(request.model_dump()))
+
+    for position, result in zip(rod_positions, calculate_rod_batch(rod_rows)):
+        if result["status"] == ROW_OK:
+            outcomes[position] = {
+                "status": "ok",
+                "message": "; ".join(w.message for w in result["warnings"]),
+                "values": column_registry.round_output(result["values"]),
+            }
+        elif result["status"] == ROW_INPUT_ERROR:
+            errors = [w.message for w in result["warnings"] if w.type == "error"]
+            outcomes[position] = {"status": "error", "message": "입력값 오류: " + "; ".join(errors)}
+        else:
+            outcomes[position] = {"status": "error", "message": UNUSABLE_BAR_MESSAGE}
+    return outcomes
+
+
+class _CsvWriter:
+    def __init__(self, path: str):
+        # 엑셀에서 바로 열 수 있도록 BOM 포함 UTF-8
+        self._file = open(path, "w", newline="", encoding="utf-8-sig")
+        self._writer = csv.writer(self._file)
+
+    def write(self, cells: Sequence) -> None:
+        self._writer.writerow(["" if cell is None else cell for cell in cells])
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _XlsxWriter:
+    def __init__(self, path: str):
+        openpyxl = _load_openpyxl()
+        self._path = path
+        self._workbook = openpyxl.Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet()
+
+    def write(self, cells: Sequence) -> None:
+        self._sheet.append(list(cells))
+
+    def close(self) -> None:
+        self._workbook.save(self._path)
+
+
+def _output_layout(headers: List, keys: List[Optional[str]]):
+    """결과 파일 머리글 - 입력 열 + 상태/메시지 + (입력에 없는) 계산값 열"""
+    out_headers = list(headers) + [STATUS_COLUMN, MESSAGE_COLUMN]
+    positions = {}
+    for field in OUTPUT_FIELDS:
+        if field in keys:
+            positions[field] = keys.index(field)
+        else:
+            positions[field] = len(out_headers)
+            out_headers.append(field)
+    return out_headers, positions
+
+
+def _annotated(cells: List, width: int, header_count: int, positions: Dict[str, int], outcome: Dict) -> List:
+    out = list(cells[:header_count]) + [None] * (header_count - len(cells)) + [outcome["status"], outcome["message"] or None]
+    out += [None] * (width - len(out))
+    values = outcome.get("values") or {}
+    for field, position in positions.items():
+        out[position] = values.get(field)
+    return out
+
+
+def _chunked(rows: Iterator[list], keys: List[Optional[str]], chunk_rows: int) -> Iterator[tuple]:
+    cells_chunk, mapped_chunk = [], []
+    for cells in rows:
+        if _is_blank(cells):
+            continue
+        cells_chunk.append(cells)
+        mapped_chunk.append(map_row(keys, cells))
+        if len(cells_chunk) >= chunk_rows:
+            yield cells_chunk, mapped_chunk
+            cells_chunk, mapped_chunk = [], []
+    if cells_chunk:
+        yield cells_chunk, mapped_chunk
+
+
+def import_orders(input_path: str, output_path: str, workers: Optional[int] = None,
+                  chunk_rows: int = IMPORT_CHUNK_ROWS, input_format: Optional[str] = None,
+                  output_format: Optional[str] = None, encoding: Optional[str] = None) -> Dict:
+    """
+    주문 파일 일괄 계산 → 결과 파일 작성
+    workers: 워커 프로세스 수 (None 이면 CPU 수, 1 이하면 현재 프로세스에서 계산) - 공유 풀에서 이 수만큼 청크를 동시에 계산
+    반환: {total, succeeded, failed, unmappedHeaders, elapsedSeconds, output}
+    """
+    started = time.perf_counter()
+    input_format = input_format or detect_format(input_path)
+    output_format = output_format or detect_format(output_path)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    rows = _read_rows(input_path, input_format, encoding)
+    headers = next(rows, None)
+    if headers is None:
+        raise ValueError("빈 파일입니다")
+    headers = ["" if h is None else str(h).strip() for h in headers]
+    keys = [resolve_header(h) for h in headers]
+    if not any(keys):
+        raise ValueError("컬럼마스터와 일치하는 머리글이 없습니다")
+
+    out_headers, positions = _output_layout(headers, keys)
+    writer = _XlsxWriter(output_path) if output_format == "xlsx" else _CsvWriter(output_path)
+    summary = {"total": 0, "succeeded": 0, "failed": 0}
+
+    def write_chunk(cells_chunk, outcomes):
+        for cells, outcome in zip(cells_chunk, outcomes):
+            writer.write(_annotated(cells, len(out_headers), len(headers), positions, outcome))
+            summary["total"] += 1
+            summary["succeeded" if outcome["status"] == "ok" else "failed"] += 1
+
+    try:
+        writer.write(out_headers)
+        chunks = _chunked(rows, keys, chunk_rows)
+        if workers <= 1:
+            for cells_chunk, mapped_chunk in chunks:
+                write_chunk(cells_chunk, evaluate_chunk(mapped_chunk))
+        else:
+            executor = _get_pool(workers)
+            in_flight = deque()
+            try:
+                for cells_chunk, mapped_chunk in chunks:
+                    in_flight.append((cells_chunk, executor.submit(evaluate_chunk, mapped_chunk)))
+                    if len(in_flight) >= workers * 2:
+                        cells_done, future = in_flight.popleft()
+                        write_chunk(cells_done, future.result())
+                while in_flight:
+                    cells_done, future = in_flight.popleft()
+                    write_chunk(cells_done, future.result())
+            except BrokenProcessPool:
+                # 워커가 죽은 풀은 다시 쓸 수 없으므로 버리고 다음 가져오기에서 새로 만든다
+                shutdown_pool()
+                raise
+            finally:
+                for _, future in in_flight:
+                    future.cancel()
+    finally:
+        writer.close()
+
+    summary["unmappedHeaders"] = [h for h, k in zip(headers, keys) if k is None and h]
+    summary["elapsedSeconds"] = round(time.perf_counter() - started, 3)
+    summary["output"] = output_path
+    return summary
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="주문 스프레드시트(CSV/XLSX) 일괄 자재 계산")
+    parser.add_argument("input", help="입력 파일 (.csv, .xlsx)")
+    parser.add_argument("-o", "--output", help="결과 파일 (기본: <입력>_result.<확장자>)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--chunk-rows", type=int, default=IMPORT_CHUNK_ROWS, help="청크당 행 수")
+    parser.add_argument("--encoding", default=None, help="CSV 인코딩 (기본: 자동 - utf-8/cp949)")
+    args = parser.parse_args(argv)
+
+    base, extension = os.path.splitext(args.input)
+    output = args.output or f"{base}_result{extension}"
+    try:
+        summary = import_orders(args.input, output, workers=args.workers,
+                                chunk_rows=args.chunk_rows, encoding=args.encoding)
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"가져오기 실패: {e}", file=sys.stderr)
+        return 1
+    finally:
+        shutdown_pool()
+
+    print(f"{summary['total']}행 처리 (성공 {summary['succeeded']}, 실패 {summary['failed']}) "
+          f"- {summary['elapsedSeconds']}s → {summary['output']}")
+    if summary["unmappedHeaders"]:
+        print(f"매핑되지 않은 열: {', '.join(summary['unmappedHeaders'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 from .utils import parse_float_safe, kg_per_m3_to_g_per_cm3
+from .nesting import plate_sheet_plan
 
 
 def calculate_plate_weight(data):
@@ -36,7 +37,8 @@ def calculate_unit_cost(data):
 
 
 def calculate_utilization_rate(_data):
-    # Plates assume full utilization in current minimal model
+    # Without a stock sheet size parts are costed by their own area (full utilization);
+    # with sheetWidth/sheetLength the router uses nesting.plate_sheet_plan instead
     return 100.0
 
 
@@ -44,8 +46,78 @@ def calculate_wastage(_data):
     return 0.0
 
 
-def calculate_scrap_savings(_data):
-    # Scrap is calculated in scrap module; return 0 for plate path
-    return 0.0
-
-
+def calculate_plate_scrap(data):
+    """
+    Plate scrap: material bought minus finished parts minus reusable remnants kept in stock.
+    totalWeight is the purchased material (kg, whole sheets when nested), remnantWeight the
+    offcuts large enough to reuse (kg), partsWeight the blank weight (kg). actualProductWeight (g/piece),
+    when given, replaces the blank weight so machining chips are counted as scrap too.
+    The scrap credit is scrapWeight * scrapUnitPrice * recoveryRatio%.
+    """
+    total_weight = parse_float_safe(data.get("totalWeight"))
+    total_cost = parse_float_safe(data.get("totalCost"))
+    quantity = parse_float_safe(data.get("quantity"))
+    remnant_weight = parse_float_safe(data.get("remnantWeight"))
+    parts_weight = parse_float_safe(data.get("partsWeight")) or total_weight
+    actual_product_weight_g = parse_float_safe(data.get("actualProductWeight"))
+    recovery_ratio = min(parse_float_safe(data.get("recoveryRatio")), 100.0)
+    scrap_unit_price = parse_float_safe(data.get("scrapUnitPrice"))
+
+    product_weight = actual_product_weight_g * quantity / 1000.0 if actual_product_weight_g > 0 else parts_weight
+    scrap_weight = max(total_weight - remnant_weight - product_weight, 0.0)
+    scrap_savings = 0.0
+    if recovery_ratio > 0 and scrap_unit_price > 0:
+        scrap_savings = scrap_weight * scrap_unit_price * (recovery_ratio / 100.0)
+    return {
+        "scrapWeight": scrap_weight,
+        "scrapSavings": scrap_savings,
+        "realCost": max(total_cost - scrap_savings, 0.0),
+        "totalActualProductWeight": product_weight if actual_product_weight_g > 0 else None,
+    }
+
+
+def calculate_scrap_savings(data):
+    return calculate_plate_scrap(data)["scrapSavings"]
+
+
+def calculate_plate_values(data):
+    """
+    All /calculate/plate values for one validated request (aliases applied).
+    With sheetWidth/sheetLength the part is nested onto whole sheets (nesting.plate_sheet_plan) and
+    weight/cost/utilization come from the sheets; otherwise parts are costed by their own area.
+    Scrap credit is applied in both cases. Raises ValueError when the part does not fit on the sheet.
+    Returns (values, sheet_plan) - sheet_plan is None without a sheet size.
+    """
+    sheet_plan = plate_sheet_plan(data)
+    if sheet_plan is None:
+        total_weight = calculate_plate_weight(data)
+        total_cost = calculate_plate_cost({**data, "totalWeight": total_weight})
+        costed = {**data, "totalWeight": total_weight, "totalCost": total_cost}
+        values = {
+            "totalWeight": total_weight,
+            "totalCost": total_cost,
+            "unitCost": calculate_unit_cost(costed),
+            "utilizationRate": calculate_utilization_rate(costed),  # no sheet size -> 100%
+            "wastage": calculate_wastage(costed),  # no sheet size -> 0%
+        }
+    else:
+        values = {key: sheet_plan[key] for key in ("totalWeight", "totalCost", "unitCost", "utilizationRate", "wastage")}
+
+    # Scrap: sheet weight minus parts and reusable remnants (only machining chips without a sheet size)
+    scrap = calculate_plate_scrap({
+        **data,
+        "totalWeight": values["totalWeight"],
+        "totalCost": values["totalCost"],
+        "partsWeight": sheet_plan["partsWeight"] if sheet_plan else values["totalWeight"],
+        "remnantWeight": sheet_plan["remnantWeight"] if sheet_plan else 0.0,
+    })
+    values.update({
+        "scrapSavings": scrap["scrapSavings"],
+        "realCost": scrap["realCost"],
+        "totalActualProductWeight": scrap["totalActualProductWeight"],
+        "scrapWeight": scrap["scrapWeight"],
+        "sheetWeight": sheet_plan["sheetWeight"] if sheet_plan else None,
+        "partsWeight": sheet_plan["partsWeight"] if sheet_plan else None,
+        "remnantWeight": sheet_plan["remnantWeight"] if sheet_plan else None,
+    })
+    return values, sheet_plan
@@ -0,0 +1,144 @@
+import math
+from typing import Dict, Optional, Tuple
+
+from .utils import parse_float_safe
+from .rod import calculate_bars_needed
+from .nesting import DEFAULT_MIN_PLATE_REMNANT_SIZE, nesting_items, optimize_plate_nesting
+
+
+# 잔재(자투리 봉재) 사용 계획
+# 재고는 app.storage.remnant_store (SQLite) - (재질, 형상, 규격) 키별 (길이, 잔재 ID) 인덱스로
+# "필요 길이 이상인 가장 짧은 잔재" 를 찾는다. 여기서는 재고 키와 계획(plan_draw → 신규 봉재 수 → commit)만 다룬다.
+# 잔재 길이는 실물 길이(헤드컷/테일컷 미제외)이며, 사용 시 표준 봉재와 같이 헤드컷/테일컷을 다시 뺀다.
+
+DEFAULT_MIN_REMNANT_LENGTH = 100.0  # mm - 이보다 짧은 자투리는 재고로 등록하지 않음
+
+RemnantKey = Tuple
+
+
+def make_remnant_key(material, shape, diameter=None, width=None, height=None) -> Optional[RemnantKey]:
+    """재질/형상/규격으로 재고 키 생성 (재질 또는 형상이 없으면 None)"""
+    material = (material or "").strip().lower()
+    shape = (shape or "").strip().lower()
+    if not material or not shape:
+        return None
+    if shape == "rectangle":
+        return (material, shape, round(parse_float_safe(width), 3), round(parse_float_safe(height), 3))
+    return (material, shape, round(parse_float_safe(diameter), 3))
+
+
+def plan_rod_with_remnants(inventory, data, consume: bool = False,
+                           min_remnant_length: float = DEFAULT_MIN_REMNANT_LENGTH) -> Optional[Dict]:
+    """
+    봉재 계산에서 잔재를 먼저 사용하는 계획 (inventory: app.storage.remnant_store.RemnantStore)
+    반환: 잔재 사용 내역, 잔재로 만드는 수량, 잔재 사용 전/후 신규 봉재 수, 절약 봉재 수 (재고 키가 없으면 None)
+    """
+    key = make_remnant_key(data.get('material'), data.get('shape'),
+                           data.get('diameter'), data.get('width'), data.get('height'))
+    if key is None:
+        return None
+
+    product_length = parse_float_safe(data.get('productLength'))
+    cutting_loss = parse_float_safe(data.get('cuttingLoss'))
+    head_cut = parse_float_safe(data.get('headCut'))
+    tail_cut = parse_float_safe(data.get('tailCut'))
+    standard_bar_length = parse_float_safe(data.get('standardBarLength'))
+    quantity = int(parse_float_safe(data.get('quantity')))
+    unit_length = product_length + cutting_loss
+
+    with inventory.lock:
+        usage = inventory.plan_draw(key, unit_length, head_cut, tail_cut, quantity)
+        pieces_from_remnants = sum(item["pieces"] for item in usage)
+        remaining_quantity = quantity - pieces_from_remnants
+
+        bars_without = calculate_bars_needed(data)
+        bars_after = calculate_bars_needed({**data, 'quantity': remaining_quantity}) if remaining_quantity > 0 else 0
+
+        added_ids = []
+        if consume:
+            # 신규 봉재의 자투리: 가득 채운 봉재와 마지막 봉재의 실물 잔여 길이
+            new_offcuts = []
+            usable_length = standard_bar_length - head_cut - tail_cut
+            if bars_after > 0:
+                pieces_per_bar = int(math.floor(usable_length / unit_length))
+                last_pieces = remaining_quantity - pieces_per_bar * (bars_after - 1)
+                full_offcut = standard_bar_length - head_cut - pieces_per_bar * unit_length
+                new_offcuts = [full_offcut] * (bars_after - 1) + [standard_bar_length - head_cut - last_pieces * unit_length]
+            added_ids = inventory.commit(key, usage, new_offcuts, min_remnant_length)
+
+    return {
+        "remnantsUsed": usage,
+        "piecesFromRemnants": pieces_from_remnants,
+        "barsNeededWithoutRemnants": bars_without,
+        "barsNeededAfterRemnants": bars_after,
+        "barsSaved": max(bars_without - bars_after, 0),
+        "consumed": consume,
+        "remnantsAdded": len(added_ids),
+    }
+
+
+# 판재 잔재 사용 계획
+# 재고는 (재질, 두께) 키별 (면적, 잔재 ID) 인덱스. 직사각형이라 "들어가는" 조건이 길이 하나로 정해지지 않으므로
+# 필요 면적 이상인 후보부터 훑는다 (면적이 작은 잔재부터 - 큰 잔재를 작은 작업에 쓰지 않도록).
+# 잔재 치수는 실물 치수이며 가장자리 손실 없이 절단 폭만 적용해 배치한다.
+
+PLATE_REMNANT_FIT_ATTEMPTS = 16  # 남은 부품 전체가 들어가는 잔재를 찾을 때 배치를 시도해 볼 후보 수
+
+
+def make_plate_remnant_key(material, thickness) -> Optional[RemnantKey]:
+    """재질/두께로 판재 잔재 키 생성 (재질 또는 두께가 없으면 None)"""
+    material = (material or "").strip().lower()
+    thickness = parse_float_safe(thickness)
+    if not material or thickness <= 0:
+        return None
+    return (material, "plate", round(thickness, 3))
+
+
+def plan_plate_with_remnants(inventory, data, consume: bool = False) -> Optional[Dict]:
+    """
+    판재 계산에서 잔재를 먼저 사용하는 계획 (inventory: app.storage.remnant_store.PlateRemnantStore)
+    data 는 네스팅 요청 형식 - items, 원판 크기, cuttingLoss, minRemnantSize
+    반환: 잔재 사용 내역, 잔재로 만드는 수량, 잔재 사용 전/후 신규 원판 수, 절약 원판 수 (재질/두께/원판 크기가 없으면 None)
+    """
+    key = make_plate_remnant_key(data.get('material'), data.get('plateThickness'))
+    if key is None or not data.get('sheetWidth') or not data.get('sheetLength'):
+        return None
+
+    kerf = parse_float_safe(data.get('cuttingLoss'))
+    min_size = parse_float_safe(data.get('minRemnantSize')) or DEFAULT_MIN_PLATE_REMNANT_SIZE
+    items = nesting_items(data)
+
+    with inventory.lock:
+        usage, remaining = inventory.plan_draw(key, items, kerf, min_size)
+        pieces_from_remnants = sum(item["pieces"] for item in usage)
+        sheets_without = optimize_plate_nesting(data)["sheetsNeeded"]
+
+        after = None
+        if any(remaining):
+            after = optimize_plate_nesting({**data, "items": [
+                {"partWidth": item["width"], "partLength": item["length"], "quantity": left,
+                 "allowRotation": item["allowRotation"]}
+                for item, left in zip(items, remaining) if left > 0
+            ]})
+        sheets_after = after["sheetsNeeded"] if after else 0
+
+        added_ids = []
+        if consume:
+            # 신규 원판에서 남는 잔재 (같은 배치의 원판 수만큼)
+            new_offcuts = [
+                (r["width"], r["length"])
+                for layout in (after["layouts"] if after else [])
+                for r in layout["remnants"]
+                for _ in range(layout["sheets"])
+            ]
+            added_ids = inventory.commit(key, usage, new_offcuts)
+
+    return {
+        "remnantsUsed": [{k: v for k, v in item.items() if k != "leftovers"} for item in usage],
+        "piecesFromRemnants": pieces_from_remnants,
+        "sheetsNeededWithoutRemnants": sheets_without,
+        "sheetsNeededAfterRemnants": sheets_after,
+        "sheetsSaved": max(sheets_without - sheets_after, 0),
+        "consumed": consume,
+        "remnantsAdded": len(added_ids),
+    }
@@ -3,13 +3,11 @@ from app.api.schemas import ValidationWarning, ConstraintValidator
 from typing import List, Dict
 import math
 
+# 각 계산은 이미 float 로 변환된 값을 받는 함수(rod_pipeline.RodJob 이 사용)와
+# 요청 dict 를 받아 값을 꺼내 넘기는 calculate_* 래퍼로 나뉜다.
+
 # 1. 단면적 계산
-def calculate_cross_sectional_area(data):
-    shape = data.get('shape', '').lower()
-    diameter = parse_float_safe(data.get('diameter'))
-    width = parse_float_safe(data.get('width'))
-    height = parse_float_safe(data.get('height'))
-    
+def cross_sectional_area(shape: str, diameter: float, width: float, height: float) -> float:
     if shape == 'circle':
         return math.pi * (diameter / 2) ** 2
     elif shape == 'square':
@@ -21,15 +19,17 @@ def calculate_cross_sectional_area(data):
     else:
         return 0.0
 
+def calculate_cross_sectional_area(data):
+    return cross_sectional_area(
+        data.get('shape', '').lower(),
+        parse_float_safe(data.get('diameter')),
+        parse_float_safe(data.get('width')),
+        parse_float_safe(data.get('height')),
+    )
+
 # 2. 봉재 필요 개수 계산
-def calculate_bars_needed(data):
-    product_length = parse_float_safe(data.get('productLength'))
-    cutting_loss = parse_float_safe(data.get('cuttingLoss'))
-    standard_bar_length = parse_float_safe(data.get('standardBarLength'))
-    head_cut = parse_float_safe(data.get('headCut'))
-    tail_cut = parse_float_safe(data.get('tailCut'))
-    quantity = parse_float_safe(data.get('quantity'))
-    
+def bars_needed(product_length: float, cutting_loss: float, standard_bar_length: float,
+                head_cut: float, tail_cut: float, quantity: float) -> int:
     # 입력값 유효성 검증
     if product_length <= 0 or quantity <= 0 or standard_bar_length <= 0:
         return 0
@@ -45,50 +45,56 @@ def calculate_bars_needed(data):
     if pieces_per_bar <= 0:
         return 0
     
-    bars_needed = math.ceil(quantity / pieces_per_bar)
-    return int(bars_needed)
+    return int(math.ceil(quantity / pieces_per_bar))
+
+def calculate_bars_needed(data):
+    return bars_needed(
+        parse_float_safe(data.get('productLength')),
+        parse_float_safe(data.get('cuttingLoss')),
+        parse_float_safe(data.get('standardBarLength')),
+        parse_float_safe(data.get('headCut')),
+        parse_float_safe(data.get('tailCut')),
+        parse_float_safe(data.get('quantity')),
+    )
 
 # 3. 봉재 총 중량 계산 (컬럼마스터: materialTotalWeight)
-def calculate_material_total_weight(data):
-    area = calculate_cross_sectional_area(data)
-    bars_needed = parse_float_safe(data.get('barsNeeded'))
-    standard_bar_length = parse_float_safe(data.get('standardBarLength'))
-    material_density_kg_per_m3 = parse_float_safe(data.get('materialDensity'))
-    
+def material_total_weight(area: float, bars: float, standard_bar_length: float, material_density_kg_per_m3: float) -> float:
     # 입력값 유효성 검증
-    if area <= 0 or bars_needed <= 0 or standard_bar_length <= 0 or material_density_kg_per_m3 <= 0:
+    if area <= 0 or bars <= 0 or standard_bar_length <= 0 or material_density_kg_per_m3 <= 0:
         return 0.0
     
     # 컬럼마스터 단위 정책: kg/m³ → g/cm³ 변환
     material_density = kg_per_m3_to_g_per_cm3(material_density_kg_per_m3)
     
-    total_bar_length = bars_needed * standard_bar_length
+    total_bar_length = bars * standard_bar_length
     volume = area * total_bar_length  # mm^3
     volume_cm3 = volume / 1000.0
     total_weight = (volume_cm3 * material_density) / 1000.0  # kg
     
     return total_weight if total_weight > 0 else 0.0
 
+def calculate_material_total_weight(data):
+    return material_total_weight(
+        calculate_cross_sectional_area(data),
+        parse_float_safe(data.get('barsNeeded')),
+        parse_float_safe(data.get('standardBarLength')),
+        parse_float_safe(data.get('materialDensity')),
+    )
+
 # 4. 제품 총 중량 계산 (컬럼마스터: totalWeight)
-def calculate_product_total_weight(data):
-    quantity = parse_float_safe(data.get('quantity'))
-    product_weight_g = parse_float_safe(data.get('productWeight'))  # g 단위 (선택사항)
-    
+def product_total_weight(quantity: float, product_weight_g: float, area: float,
+                         product_length: float, material_density_kg_per_m3: float) -> float:
     # 입력값 유효성 검증
     if quantity <= 0:
         return 0.0
     
-    # productWeight가 제공된 경우 사용
+    # productWeight(g, 선택사항)가 제공된 경우 사용
     if product_weight_g is not None and product_weight_g > 0:
         # 제품 총 중량 계산 (g → kg 변환)
         total_product_weight_kg = (quantity * product_weight_g) / 1000.0
         return total_product_weight_kg if total_product_weight_kg > 0 else 0.0
     
     # productWeight가 없으면 치수로부터 계산
-    area = calculate_cross_sectional_area(data)
-    product_length = parse_float_safe(data.get('productLength'))
-    material_density_kg_per_m3 = parse_float_safe(data.get('materialDensity'))
-    
     if area <= 0 or product_length <= 0 or material_density_kg_per_m3 <= 0:
         return 0.0
     
@@ -105,18 +111,22 @@ def calculate_product_total_weight(data):
     
     return total_product_weight_kg if total_product_weight_kg > 0 else 0.0
 
-# 5. 절단 효율 계산 (수정됨 - 100% 초과 방지)
-def calculate_utilization_rate(data):
-    product_length = parse_float_safe(data.get('productLength'))
-    cutting_loss = parse_float_safe(data.get('cuttingLoss'))
-    head_cut = parse_float_safe(data.get('headCut'))
-    tail_cut = parse_float_safe(data.get('tailCut'))
+def calculate_product_total_weight(data):
     quantity = parse_float_safe(data.get('quantity'))
-    standard_bar_length = parse_float_safe(data.get('standardBarLength'))
-    bars_needed = parse_float_safe(data.get('barsNeeded'))
-    
+    product_weight_g = parse_float_safe(data.get('productWeight'))
+    # 단면적은 productWeight 가 없을 때만 필요
+    area = calculate_cross_sectional_area(data) if quantity > 0 and not product_weight_g > 0 else 0.0
+    return product_total_weight(
+        quantity, product_weight_g, area,
+        parse_float_safe(data.get('productLength')),
+        parse_float_safe(data.get('materialDensity')),
+    )
+
+# 5. 절단 효율 계산 (수정됨 - 100% 초과 방지)
+def utilization_rate(product_length: float, cutting_loss: float, head_cut: float, tail_cut: float,
+                     quantity: float, standard_bar_length: float, bars: float) -> float:
     # 입력값 유효성 검증
-    if quantity <= 0 or bars_needed <= 0 or standard_bar_length <= 0:
+    if quantity <= 0 or bars <= 0 or standard_bar_length <= 0:
         return 0.0
     
     # 실제 사용된 길이 계산 (절단 손실 포함)
@@ -125,63 +135,68 @@ def calculate_utilization_rate(data):
     
     # 사용 가능한 총 길이 계산
     usable_length_per_bar = standard_bar_length - head_cut - tail_cut
-    total_usable_length = bars_needed * usable_length_per_bar
+    total_usable_length = bars * usable_length_per_bar
     
     if total_usable_length <= 0:
         return 0.0
     
     # 활용률 계산 (컬럼마스터 제약조건: 0-100% 범위)
-    utilization_rate = min((total_used_length / total_usable_length) * 100.0, 100.0)
+    rate = min((total_used_length / total_usable_length) * 100.0, 100.0)
     
-    return utilization_rate if utilization_rate > 0 else 0.0
+    return rate if rate > 0 else 0.0
+
+def calculate_utilization_rate(data):
+    return utilization_rate(
+        parse_float_safe(data.get('productLength')),
+        parse_float_safe(data.get('cuttingLoss')),
+        parse_float_safe(data.get('headCut')),
+        parse_float_safe(data.get('tailCut')),
+        parse_float_safe(data.get('quantity')),
+        parse_float_safe(data.get('standardBarLength')),
+        parse_float_safe(data.get('barsNeeded')),
+    )
 
 # 6. 총 재료비 계산
-def calculate_total_cost(data):
-    material_total_weight = parse_float_safe(data.get('materialTotalWeight'))
-    material_price = parse_float_safe(data.get('materialPrice'))
-    
+def total_cost(material_total_weight_kg: float, material_price: float) -> float:
     # 입력값 유효성 검증
-    if material_total_weight <= 0 or material_price <= 0:
+    if material_total_weight_kg <= 0 or material_price <= 0:
         return 0.0
     
-    total_cost = material_total_weight * material_price
-    return total_cost
+    return material_total_weight_kg * material_price
+
+def calculate_total_cost(data):
+    return total_cost(
+        parse_float_safe(data.get('materialTotalWeight')),
+        parse_float_safe(data.get('materialPrice')),
+    )
 
 # 7. 개당 단가 계산
-def calculate_unit_cost(data):
-    total_cost = parse_float_safe(data.get('totalCost'))
-    quantity = parse_float_safe(data.get('quantity'))
-    
-    if quantity <= 0 or total_cost <= 0:
+def unit_cost(total_cost_value: float, quantity: float) -> float:
+    if quantity <= 0 or total_cost_value <= 0:
         return 0.0
     
-    unit_cost = total_cost / quantity
-    return unit_cost
+    return total_cost_value / quantity
+
+def calculate_unit_cost(data):
+    return unit_cost(parse_float_safe(data.get('totalCost')), parse_float_safe(data.get('quantity')))
 
 # 8. 손실률 계산
-def calculate_wastage(data):
-    utilization_rate = parse_float_safe(data.get('utilizationRate'))
-    
+def wastage(utilization_rate_value: float) -> float:
     # 컬럼마스터 제약조건 준수: 0-100% 범위
-    if utilization_rate < 0:
-        utilization_rate = 0
-    elif utilization_rate > 100:
-        utilization_rate = 100
+    if utilization_rate_value < 0:
+        utilization_rate_value = 0
+    elif utilization_rate_value > 100:
+        utilization_rate_value = 100
     
-    wastage = 100.0 - utilization_rate
-    return max(wastage, 0.0)
+    return max(100.0 - utilization_rate_value, 0.0)
+
+def calculate_wastage(data):
+    return wastage(parse_float_safe(data.get('utilizationRate')))
 
 # 9. 단순화된 검증 함수 (두 가지 경우만 경고)
-def validate_rod_calculation(data) -> List[ValidationWarning]:
-    """
-    봉재 계산의 단순화된 유효성 검증 - 두 가지 경우만 경고
-    1. 실제 제품 중량 > 계산된 제품 중량
-    2. 스크랩 환산 비율 > 100%
-    """
+def rod_input_warnings(recovery_ratio: float) -> List[ValidationWarning]:
+    """스크랩 환산 비율 > 100% 검증 (제품 중량 비교는 scrap.py에서 처리됨)"""
     warnings = []
-    
-    # 1. 스크랩 환산 비율 검증
-    recovery_ratio = parse_float_safe(data.get('recoveryRatio'))
     if recovery_ratio is not None and recovery_ratio > 100:
         warnings.append(ValidationWarning(
             type="error",
@@ -189,7 +204,12 @@ def validate_rod_calculation(data) -> List[ValidationWarning]:
             message=f"스크랩 환산 비율이 100%를 초과합니다 ({recovery_ratio}%).",
             suggestion="100% 이하의 값을 입력하세요."
         ))
-    
-    # 2. 제품 중량 비교는 scrap.py에서 처리됨
-    
     return warnings
+
+def validate_rod_calculation(data) -> List[ValidationWarning]:
+    """
+    봉재 계산의 단순화된 유효성 검증 - 두 가지 경우만 경고
+    1. 실제 제품 중량 > 계산된 제품 중량
+    2. 스크랩 환산 비율 > 100%
+    """
+    return rod_input_warnings(parse_float_safe(data.get('recoveryRatio')))
@@ -0,0 +1,301 @@
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .utils import parse_float_safe
+from .rod import validate_rod_calculation
+from .scrap import validate_scrap_inputs
+
+
+# 봉재 일괄 계산 - core_logic/rod.py 의 스칼라 산식을 NumPy 배열 단위로 동일하게 수행
+# 연산 순서와 제곱 연산(libm pow)을 스칼라 함수와 맞춰 결과가 비트 단위로 일치하도록 유지
+
+ROD_NUMERIC_FIELDS = (
+    "diameter", "width", "height", "productLength", "quantity",
+    "cuttingLoss", "headCut", "tailCut", "standardBarLength",
+    "materialDensity", "materialPrice", "productWeight",
+    "actualProductWeight", "recoveryRatio", "scrapUnitPrice",
+)
+
+SHAPE_CODES = {"circle": 1, "square": 2, "rectangle": 3, "hexagon": 4}
+
+# 행 상태 코드
+ROW_OK = 0
+ROW_INPUT_ERROR = 1    # validate_rod_calculation 의 error (recoveryRatio > 100)
+ROW_UNUSABLE_BAR = 2   # barsNeeded <= 0
+
+
+def _pow2(values):
+    # 스칼라 코드의 `x ** 2`(libm pow)와 동일한 결과를 내기 위해 float_power 사용
+    return np.float_power(values, 2.0)
+
+
+def rows_to_columns(rows: Sequence[dict]) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """요청 dict 목록을 필드별 float64 배열과 형상 코드 배열로 변환"""
+    columns = {
+        key: np.fromiter((parse_float_safe(row.get(key)) for row in rows), dtype=np.float64, count=len(rows))
+        for key in ROD_NUMERIC_FIELDS
+    }
+    shape_codes = np.fromiter(
+        (SHAPE_CODES.get((row.get("shape") or "").lower(), 0) for row in rows),
+        dtype=np.int8,
+        count=len(rows),
+    )
+    return columns, shape_codes
+
+
+# 1. 단면적 (calculate_cross_sectional_area)
+def cross_sectional_area_array(columns, shape_codes):
+    diameter = columns["diameter"]
+    area = np.zeros(np.broadcast(diameter, shape_codes).shape, dtype=np.float64)
+    area = np.where(shape_codes == 1, math.pi * _pow2(diameter / 2), area)
+    area = np.where(shape_codes == 2, _pow2(diameter), area)
+    area = np.where(shape_codes == 3, columns["width"] * columns["height"], area)
+    area = np.where(shape_codes == 4, (3 * math.sqrt(3) / 8) * _pow2(diameter), area)
+    return area
+
+
+def compute_rod_arrays(columns: Dict[str, np.ndarray], shape_codes: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    봉재 계산 전 과정을 배열 단위로 한 번에 수행
+    (단면적 → 봉재 수 → 중량 → 비용 → 활용률/손실률 → 스크랩)
+    입력 배열은 서로 브로드캐스트 가능한 형태면 되며, 결과 배열은 브로드캐스트된 형태를 따른다.
+    """
+    product_length = columns["productLength"]
+    cutting_loss = columns["cuttingLoss"]
+    head_cut = columns["headCut"]
+    tail_cut = columns["tailCut"]
+    standard_bar_length = columns["standardBarLength"]
+    quantity = columns["quantity"]
+    density_kg_per_m3 = columns["materialDensity"]
+    material_price = columns["materialPrice"]
+    product_weight_g = columns["productWeight"]
+    actual_product_weight_g = columns["actualProductWeight"]
+    recovery_ratio = columns["recoveryRatio"]
+    scrap_unit_price = columns["scrapUnitPrice"]
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        area = cross_sectional_area_array(columns, shape_codes)
+
+        # 2. 봉재 필요 개수 (calculate_bars_needed)
+        unit_length = product_length + cutting_loss
+        usable_length = standard_bar_length - head_cut - tail_cut
+        valid = (product_length > 0) & (quantity > 0) & (standard_bar_length > 0)
+        valid = valid & (usable_length > 0) & ~(unit_length > usable_length)
+        pieces_per_bar = np.where(valid, np.floor(usable_length / unit_length), 0.0)
+        valid = valid & (pieces_per_bar > 0)
+        bars_needed = np.where(valid, np.ceil(quantity / np.where(valid, pieces_per_bar, 1.0)), 0.0)
+
+        # 3. 봉재 총 중량 (calculate_material_total_weight)
+        density_g_per_cm3 = density_kg_per_m3 / 1000.0
+        volume_cm3 = (area * (bars_needed * standard_bar_length)) / 1000.0
+        material_total_weight = (volume_cm3 * density_g_per_cm3) / 1000.0
+        weight_ok = (area > 0) & (bars_needed > 0) & (standard_bar_length > 0) & (density_kg_per_m3 > 0)
+        material_total_weight = np.where(weight_ok & (material_total_weight > 0), material_total_weight, 0.0)
+
+        # 4. 제품 총 중량 (calculate_product_total_weight)
+        weight_from_input = (quantity * product_weight_g) / 1000.0
+        weight_from_input = np.where(weight_from_input > 0, weight_from_input, 0.0)
+        individual_weight_g = ((area * product_length) / 1000.0) * density_g_per_cm3
+        weight_from_dims = (quantity * individual_weight_g) / 1000.0
+        dims_ok = (area > 0) & (product_length > 0) & (density_kg_per_m3 > 0) & (weight_from_dims > 0)
+        weight_from_dims = np.where(dims_ok, weight_from_dims, 0.0)
+        product_total_weight = np.where(product_weight_g > 0, weight_from_input, weight_from_dims)
+        product_total_weight = np.where(quantity > 0, product_total_weight, 0.0)
+
+        # 6. 총 재료비 (calculate_total_cost)
+        total_cost = np.where(
+            (material_total_weight > 0) & (material_price > 0),
+            material_total_weight * material_price,
+            0.0,
+        )
+
+        # 5. 절단 효율 (calculate_utilization_rate)
+        total_used_length = quantity * unit_length
+        total_usable_length = bars_needed * usable_length
+        utilization_rate = np.minimum((total_used_length / total_usable_length) * 100.0, 100.0)
+        util_ok = (quantity > 0) & (bars_needed > 0) & (standard_bar_length > 0) & (total_usable_length > 0)
+        utilization_rate = np.where(util_ok & (utilization_rate > 0), utilization_rate, 0.0)
+
+        # 8. 손실률 (calculate_wastage)
+        wastage = np.maximum(100.0 - np.clip(utilization_rate, 0, 100), 0.0)
+
+        # 스크랩 (calculate_scrap_metrics) - totalWeight 는 제품 총 중량
+        has_actual = actual_product_weight_g > 0
+        actual_total_kg = (actual_product_weight_g * quantity) / 1000.0
+        estimated_total_kg = np.where(product_total_weight != 0, product_total_weight * 0.8, 0.0)
+        total_actual_product_weight = np.where(has_actual, actual_total_kg, estimated_total_kg)
+        updated_total_weight = np.where(has_actual & (quantity > 0), actual_total_kg, product_total_weight)
+
+        scrap_applicable = has_actual & (recovery_ratio > 0) & (scrap_unit_price > 0)
+        calculated_unit_weight_g = (product_total_weight * 1000) / quantity
+        weight_warning = scrap_applicable & (quantity > 0) & (actual_product_weight_g > calculated_unit_weight_g)
+        scrap_error = scrap_applicable & (recovery_ratio > 100)
+
+        scrap_base_weight = np.where(material_total_weight != 0, material_total_weight, product_total_weight)
+        scrap_weight = np.where(
+            total_actual_product_weight != 0,
+            np.maximum(scrap_base_weight - total_actual_product_weight, 0.0),
+            0.0,
+        )
+        scrap_weight = np.where(scrap_applicable & ~scrap_error & (scrap_weight > 0), scrap_weight, 0.0)
+        clamped_ratio = np.where(recovery_ratio > 100, 100.0, recovery_ratio)
+        scrap_savings = np.where(scrap_weight > 0, scrap_weight * scrap_unit_price * (clamped_ratio / 100.0), 0.0)
+        real_cost = np.where(scrap_weight > 0, np.maximum(total_cost - scrap_savings, 0.0), total_cost)
+
+        # 7. 개당 단가 (calculate_unit_cost) - 원재료 기준
+        unit_cost = np.where((quantity > 0) & (total_cost > 0), total_cost / quantity, 0.0)
+
+    status = np.where(bars_needed > 0, ROW_OK, ROW_UNUSABLE_BAR)
+    status = np.where(recovery_ratio > 100, ROW_INPUT_ERROR, status)
+
+    return {
+        "status": status,
+        "area": area,
+        "piecesPerBar": pieces_per_bar,
+        "barsNeeded": bars_needed.astype(np.int64),
+        "materialTotalWeight": material_total_weight,
+        "totalWeight": updated_total_weight,
+        "productTotalWeight": product_total_weight,
+        "totalCost": total_cost,
+        "unitCost": unit_cost,
+        "utilizationRate": utilization_rate,
+        "wastage": wastage,
+        "scrapWeight": scrap_weight,
+        "scrapSavings": scrap_savings,
+        "realCost": real_cost,
+        "totalActualProductWeight": total_actual_product_weight,
+        "scrapWeightWarning": weight_warning,
+        "scrapError": scrap_error,
+    }
+
+
+def calculate_rod_batch(rows: Sequence[dict]) -> List[Dict]:
+    """
+    봉재 일괄 계산 - 행별 결과 dict 목록 반환
+    각 행: {"index", "status", "values"(ROW_OK), "warnings"}
+    경고 메시지는 해당되는 행에 한해 스칼라 검증 함수를 그대로 호출해 생성한다.
+    """
+    if not rows:
+        return []
+
+    columns, shape_codes = rows_to_columns(rows)
+    arrays = compute_rod_arrays(columns, shape_codes)
+
+    status = arrays["status"].tolist()
+    bars_needed = arrays["barsNeeded"].tolist()
+    material_total_weight = arrays["materialTotalWeight"].tolist()
+    total_weight = arrays["totalWeight"].tolist()
+    product_total_weight = arrays["productTotalWeight"].tolist()
+    total_cost = arrays["totalCost"].tolist()
+    unit_cost = arrays["unitCost"].tolist()
+    utilization_rate = arrays["utilizationRate"].tolist()
+    wastage = arrays["wastage"].tolist()
+    scrap_weight = arrays["scrapWeight"].tolist()
+    scrap_savings = arrays["scrapSavings"].tolist()
+    real_cost = arrays["realCost"].tolist()
+    total_actual_product_weight = arrays["totalActualProductWeight"].tolist()
+    scrap_flagged = (arrays["scrapWeightWarning"] | arrays["scrapError"]).tolist()
+
+    results = []
+    for i, row in enumerate(rows):
+        if status[i] == ROW_INPUT_ERROR:
+            results.append({"index": i, "status": ROW_INPUT_ERROR, "warnings": validate_rod_calculation(row)})
+            continue
+        if status[i] == ROW_UNUSABLE_BAR:
+            results.append({"index": i, "status": ROW_UNUSABLE_BAR, "warnings": []})
+            continue
+
+        warnings = []
+        if scrap_flagged[i]:
+            warnings = validate_scrap_inputs({**row, "totalWeight": product_total_weight[i]})
+
+        results.append({
+            "index": i,
+            "status": ROW_OK,
+            "values": {
+                "barsNeeded": bars_needed[i],
+                "materialTotalWeight": material_total_weight[i],
+                "totalWeight": total_weight[i],
+                "totalCost": total_cost[i],
+                "unitCost": unit_cost[i],
+                "utilizationRate": utilization_rate[i],
+                "wastage": wastage[i],
+                "scrapWeight": scrap_weight[i],
+                "scrapSavings": scrap_savings[i],
+                "realCost": real_cost[i],
+                "totalActualProductWeight": total_actual_product_weight[i],
+            },
+            "warnings": warnings,
+        })
+
+    return results
+
+
+# 파라미터 스윕 - 기준 요청 1건에서 한두 개 입력값을 바꿔가며 격자 전체를 한 번에 계산
+SWEEP_FIELDS = ("standardBarLength", "cuttingLoss", "headCut", "tailCut", "quantity")
+
+
+def sweep_rod(data: dict, x_field: str, x_values: Sequence[float],
+              y_field: Optional[str] = None, y_values: Optional[Sequence[float]] = None) -> Dict[str, np.ndarray]:
+    """
+    봉재 비용 곡선 계산 - 결과 배열 형태는 (len(y_values), len(x_values)), y 축이 없으면 (1, len(x_values))
+    compute_rod_arrays 의 브로드캐스트를 그대로 이용하므로 격자 크기와 무관하게 배열 연산 한 번으로 끝난다.
+    """
+    if x_field not in SWEEP_FIELDS or (y_field is not None and y_field not in SWEEP_FIELDS):
+        raise ValueError(f"스윕 가능한 항목: {', '.join(SWEEP_FIELDS)}")
+    if y_field is not None and y_field == x_field:
+        raise ValueError("x 축과 y 축은 서로 다른 항목이어야 합니다.")
+
+    columns, shape_codes = rows_to_columns([data])
+    columns = {key: values.reshape(1, 1) for key, values in columns.items()}
+    columns[x_field] = np.asarray(x_values, dtype=np.float64).reshape(1, -1)
+    if y_field is not None:
+        columns[y_field] = np.asarray(y_values, dtype=np.float64).reshape(-1, 1)
+
+    arrays = compute_rod_arrays(columns, shape_codes.reshape(1, 1))
+    grid_shape = np.broadcast_shapes(columns[x_field].shape, columns[y_field].shape if y_field else (1, 1))
+    ok = np.broadcast_to(arrays["status"] == ROW_OK, grid_shape)
+    return {
+        key: np.where(ok, np.broadcast_to(arrays[key], grid_shape), 0)
+        for key in ("barsNeeded", "totalCost", "utilizationRate", "realCost", "unitCost", "materialTotalWeight")
+    }
+
+
+# 수량별 가격표 - 봉재 수 ceil(q / 봉재당 개수) 가 계단 함수이므로 수량 배열 전체를 한 번에 계산하고,
+# 마지막 봉재까지 꽉 차는 수량(봉재당 개수의 배수 = 개당 단가가 가장 낮은 수량)은 등차수열로 바로 구한다.
+PRICE_BREAK_FIELDS = ("barsNeeded", "totalCost", "unitCost", "realCost", "utilizationRate")
+
+
+def price_breaks(data: dict, quantities: Sequence[int], max_sweet_spots: int = 100) -> Optional[Dict]:
+    """
+    수량 목록별 봉재 수/재료비/개당 단가/실제 재료비/활용률과 그 범위 안의 꽉 찬 수량(sweet spot)
+    fullBarQuantity: 같은 봉재 수로 만들 수 있는 최대 수량 (= 요청 수량 이상인 가장 가까운 sweet spot)
+    봉재에 배치할 수 없는 조건이면 None
+    """
+    columns, shape_codes = rows_to_columns([{**data, "quantity": 1}])
+    pieces_per_bar = int(compute_rod_arrays(columns, shape_codes)["piecesPerBar"][0])
+    if pieces_per_bar <= 0:
+        return None
+
+    requested = np.asarray(quantities, dtype=np.int64)
+    low, high = int(requested.min()), int(requested.max())
+    first_bars = -(-low // pieces_per_bar)
+    last_bars = high // pieces_per_bar
+    sweet_spot_count = max(last_bars - first_bars + 1, 0)
+    sweet_spots = np.arange(first_bars, first_bars + min(sweet_spot_count, max_sweet_spots), dtype=np.int64) * pieces_per_bar
+
+    # 요청 수량과 sweet spot 을 한 배열로 이어 붙여 한 번에 계산
+    columns["quantity"] = np.concatenate([requested, sweet_spots]).astype(np.float64)
+    arrays = compute_rod_arrays(columns, shape_codes)
+    n = len(requested)
+    result = {key: arrays[key][:n] for key in PRICE_BREAK_FIELDS}
+    return {
+        "piecesPerBar": pieces_per_bar,
+        "quantities": requested,
+        **result,
+        "fullBarQuantity": arrays["barsNeeded"][:n] * pieces_per_bar,
+        "sweetSpotCount": sweet_spot_count,
+        "sweetSpots": {"quantity": sweet_spots, **{key: arrays[key][n:] for key in PRICE_BREAK_FIELDS}},
+    }
@@ -0,0 +1,151 @@
+import math
+from typing import Callable, Dict, List, Optional
+
+from .utils import parse_float_safe
+from .rod import bars_needed, cross_sectional_area, material_total_weight, total_cost
+from .rod_pipeline import RodJob
+from .scrap import validate_scrap_conditions
+
+
+# 역계산 - 보유 봉재 수 / 재료 중량 / 예산으로 만들 수 있는 최대 수량
+# 봉재 중량과 재료비는 봉재 수 b 에만 의존하는 단조 증가 함수이고 수량은 b × 봉재당 개수까지 가능하므로,
+# 한도 / 봉재 1개 값으로 b 를 바로 추정한 뒤 같은 산식(rod.py)으로 경계만 확인한다 (부동소수점 오차 보정, O(1)).
+# 스크랩 회수액을 반영한 실제 재료비(realCost)는 봉재 수가 같으면 수량이 늘수록 스크랩이 줄어 커지는 톱니 모양이라
+# 봉재 수 → 그 봉재 안의 수량 순서로 두 번 이분 탐색한다 (RodJob 으로 /calculate/rod 와 같은 값을 평가).
+
+MAX_INVERSE_BARS = 10 ** 9
+
+INVERSE_LIMITS = (
+    # (한도 key, 응답 이름)
+    ("barsAvailable", "bars"),
+    ("maxMaterialWeight", "weight"),
+    ("maxCost", "cost"),
+)
+
+
+def _largest_within(value: Callable[[int], float], limit: float, guess: int, upper: int = MAX_INVERSE_BARS) -> int:
+    """value(n) <= limit 인 가장 큰 n (value 는 n 에 대해 단조 증가, value(lo) <= limit 가정, lo = guess 근처에서 시작)"""
+    guess = max(0, min(int(guess), upper))
+    lo, hi = guess, guess + 1
+    step = 1
+    while lo > 0 and value(lo) > limit:
+        hi = lo
+        lo = max(lo - step, 0)
+        step *= 2
+    step = 1
+    while hi <= upper and value(hi) <= limit:
+        lo = hi
+        hi = min(hi + step, upper + 1)
+        step *= 2
+    # value(lo) <= limit < value(hi)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if value(mid) <= limit:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+def _real_cost(data: Dict, quantity: int) -> float:
+    return RodJob.from_dict({**data, 'quantity': quantity}).run().real_cost
+
+
+def _max_quantity_for_real_cost(data: Dict, pieces_per_bar: int, budget: float, cost_per_bar: float) -> int:
+    """스크랩 회수액 반영 realCost <= budget 인 최대 수량"""
+    # 봉재 b 개 구간의 최소 realCost 는 구간 첫 수량 (b-1)·p + 1 에서 - b 에 대해 증가해야 예산으로 수량이 정해진다
+    def first_in_bar(bars: int) -> float:
+        return _real_cost(data, (bars - 1) * pieces_per_bar + 1) if bars > 0 else 0.0
+
+    if first_in_bar(2) <= first_in_bar(1):
+        raise ValueError("스크랩 회수액이 재료비 이상이라 예산으로 수량을 정할 수 없습니다.")
+    full_bar_real = _real_cost(data, pieces_per_bar) or cost_per_bar
+    bars = _largest_within(first_in_bar, budget, math.floor(budget / full_bar_real))
+    if bars == 0:
+        return 0
+    start = (bars - 1) * pieces_per_bar + 1
+    offset = _largest_within(lambda extra: _real_cost(data, start + extra), budget, pieces_per_bar - 1,
+                             upper=pieces_per_bar - 1)
+    return start + offset
+
+
+def solve_max_quantity(data) -> Optional[Dict]:
+    """
+    봉재 수(barsAvailable), 재료 중량(maxMaterialWeight, kg), 예산(maxCost, ₩) 중 주어진 한도를 모두 지키는 최대 수량
+    useScrapCredit 이면 예산을 스크랩 회수액 차감 실제 재료비(realCost)와 비교 (actualProductWeight 등 스크랩 입력 필요)
+    반환: 한도별 최대 수량, 최대 수량과 그때의 계산 값 (봉재에 배치할 수 없으면 None)
+    """
+    product_length = parse_float_safe(data.get('productLength'))
+    cutting_loss = parse_float_safe(data.get('cuttingLoss'))
+    head_cut = parse_float_safe(data.get('headCut'))
+    tail_cut = parse_float_safe(data.get('tailCut'))
+    standard_bar_length = parse_float_safe(data.get('standardBarLength'))
+    density = parse_float_safe(data.get('materialDensity'))
+    material_price = parse_float_safe(data.get('materialPrice'))
+
+    if bars_needed(product_length, cutting_loss, standard_bar_length, head_cut, tail_cut, 1) <= 0:
+        return None
+    pieces_per_bar = int(math.floor((standard_bar_length - head_cut - tail_cut) / (product_length + cutting_loss)))
+    area = cross_sectional_area(str(data.get('shape') or '').lower(), parse_float_safe(data.get('diameter')),
+                                parse_float_safe(data.get('width')), parse_float_safe(data.get('height')))
+
+    def weight_of(bars: int) -> float:
+        return material_total_weight(area, bars, standard_bar_length, density)
+
+    def cost_of(bars: int) -> float:
+        return total_cost(weight_of(bars), material_price)
+
+    weight_per_bar = weight_of(1)
+    cost_per_bar = cost_of(1)
+    scrap_credit = bool(data.get('useScrapCredit')) and validate_scrap_conditions(
+        parse_float_safe(data.get('recoveryRatio')), parse_float_safe(data.get('scrapUnitPrice')),
+        parse_float_safe(data.get('actualProductWeight')))
+
+    limits: List[Dict] = []
+    notes: List[str] = []
+    for key, name in INVERSE_LIMITS:
+        limit = data.get(key)
+        if limit is None:
+            continue
+        limit = parse_float_safe(limit)
+        if key == "barsAvailable":
+            bars = int(limit)
+            quantity = bars * pieces_per_bar
+        elif key == "maxMaterialWeight":
+            if weight_per_bar <= 0:
+                notes.append("봉재 중량이 0 이라 중량 한도를 적용하지 않았습니다 (단면/밀도 확인).")
+                continue
+            bars = _largest_within(weight_of, limit, math.floor(limit / weight_per_bar))
+            quantity = bars * pieces_per_bar
+        else:
+            if cost_per_bar <= 0:
+                notes.append("재료 단가가 0 이라 예산 한도를 적용하지 않았습니다.")
+                continue
+            if scrap_credit:
+                quantity = _max_quantity_for_real_cost(data, pieces_per_bar, limit, cost_per_bar)
+                bars = math.ceil(quantity / pieces_per_bar)
+            else:
+                bars = _largest_within(cost_of, limit, math.floor(limit / cost_per_bar))
+                quantity = bars * pieces_per_bar
+        limits.append({"limit": name, "value": limit, "maxQuantity": quantity, "barsNeeded": bars})
+
+    if not limits:
+        raise ValueError("barsAvailable, maxMaterialWeight, maxCost 중 적용할 수 있는 한도가 하나 이상 필요합니다.")
+
+    binding = min(limits, key=lambda entry: entry["maxQuantity"])
+    max_quantity = binding["maxQuantity"]
+    values = RodJob.from_dict({**data, 'quantity': max_quantity}).run().values() if max_quantity > 0 else {}
+    return {
+        "piecesPerBar": pieces_per_bar,
+        "maxQuantity": max_quantity,
+        "limitingFactor": binding["limit"],
+        "scrapCreditApplied": scrap_credit,
+        "limits": limits,
+        "barsNeeded": values.get("barsNeeded", 0),
+        "materialTotalWeight": values.get("materialTotalWeight", 0.0),
+        "totalCost": values.get("totalCost", 0.0),
+        "realCost": values.get("realCost", 0.0),
+        "unitCost": values.get("unitCost", 0.0),
+        "utilizationRate": values.get("utilizationRate", 0.0),
+        "notes": notes,
+    }
@@ -0,0 +1,202 @@
+import time
+from typing import Callable, Dict, List, Optional
+
+from .utils import parse_float_safe
+from .rod import (
+    cross_sectional_area, bars_needed, material_total_weight, product_total_weight,
+    utilization_rate, total_cost, unit_cost, wastage, rod_input_warnings
+)
+from .scrap import scrap_metrics
+from app.api.schemas import ValidationWarning
+
+
+# 봉재 단건 계산 파이프라인
+# calculate_rod 는 요청 dict 를 9개 함수에 차례로 넘기며 중간 결과(barsNeeded, materialTotalWeight, totalWeight ...)를
+# dict 에 다시 써 넣고, 함수마다 같은 키를 parse_float_safe 로 또 변환했다 (quantity 만 5번).
+# RodJob 은 입력을 한 번만 float 로 바꿔 슬롯에 담고, 파생 값을 한 번에 순서대로 계산한다.
+# 계산식은 rod.py / scrap.py 의 값 기반 함수를 그대로 호출하므로 기존 calculate_* 결과와 비트 단위로 같다.
+
+# 단계별 시간 측정 구간 (/metrics 의 bongbi_rod_stage_duration_seconds)
+ROD_STAGES = ("bars", "weights", "cost", "utilization", "scrap")
+
+# (요청 key, 슬롯 이름) - 숫자 입력
+ROD_JOB_INPUTS = (
+    ("diameter", "diameter"),
+    ("width", "width"),
+    ("height", "height"),
+    ("productLength", "product_length"),
+    ("quantity", "quantity"),
+    ("cuttingLoss", "cutting_loss"),
+    ("headCut", "head_cut"),
+    ("tailCut", "tail_cut"),
+    ("standardBarLength", "standard_bar_length"),
+    ("materialDensity", "material_density"),
+    ("materialPrice", "material_price"),
+    ("productWeight", "product_weight"),
+    ("actualProductWeight", "actual_product_weight"),
+    ("recoveryRatio", "recovery_ratio"),
+    ("scrapUnitPrice", "scrap_unit_price"),
+)
+
+# (응답 key, 슬롯 이름) - RodCalculateResponse 계산 값
+ROD_JOB_OUTPUTS = (
+    ("barsNeeded", "bars_needed"),
+    ("materialTotalWeight", "material_total_weight"),
+    ("totalWeight", "total_weight"),
+    ("totalCost", "total_cost"),
+    ("unitCost", "unit_cost"),
+    ("utilizationRate", "utilization_rate"),
+    ("wastage", "wastage"),
+    ("scrapWeight", "scrap_weight"),
+    ("scrapSavings", "scrap_savings"),
+    ("realCost", "real_cost"),
+    ("totalActualProductWeight", "total_actual_product_weight"),
+)
+
+
+def _to_float(value) -> float:
+    """parse_float_safe 와 같은 결과 - 빈 값(None)과 이미 float 인 값은 예외 처리 없이 바로 반환"""
+    if value is None:
+        return 0.0
+    if type(value) is float:
+        return value
+    return parse_float_safe(value)
+
+
+class RodJob:
+    """봉재 계산 1건 - 파싱된 입력과 계산 결과를 슬롯에 보관"""
+
+    __slots__ = (
+        ("shape",) + tuple(slot for _, slot in ROD_JOB_INPUTS)
+        + ("area",) + tuple(slot for _, slot in ROD_JOB_OUTPUTS)
+        + ("input_warnings", "scrap_warnings")
+    )
+
+    def __init__(self, shape: str, diameter: float = 0.0, width: float = 0.0, height: float = 0.0,
+                 product_length: float = 0.0, quantity: float = 0.0, cutting_loss: float = 0.0,
+                 head_cut: float = 0.0, tail_cut: float = 0.0, standard_bar_length: float = 0.0,
+                 material_density: float = 0.0, material_price: float = 0.0, product_weight: float = 0.0,
+                 actual_product_weight: float = 0.0, recovery_ratio: float = 0.0, scrap_unit_price: float = 0.0):
+        self.shape = shape
+        self.diameter = diameter
+        self.width = width
+        self.height = height
+        self.product_length = product_length
+        self.quantity = quantity
+        self.cutting_loss = cutting_loss
+        self.head_cut = head_cut
+        self.tail_cut = tail_cut
+        self.standard_bar_length = standard_bar_length
+        self.material_density = material_density
+        self.material_price = material_price
+        self.product_weight = product_weight
+        self.actual_product_weight = actual_product_weight
+        self.recovery_ratio = recovery_ratio
+        self.scrap_unit_price = scrap_unit_price
+
+        self.area = 0.0
+        self.bars_needed = 0
+        self.material_total_weight = 0.0
+        self.total_weight = 0.0
+        self.total_cost = 0.0
+        self.unit_cost = 0.0
+        self.utilization_rate = 0.0
+        self.wastage = 100.0
+        self.scrap_weight = 0.0
+        self.scrap_savings = 0.0
+        self.real_cost = 0.0
+        self.total_actual_product_weight: Optional[float] = None
+        self.input_warnings: List[ValidationWarning] = []
+        self.scrap_warnings: List[ValidationWarning] = []
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RodJob":
+        """요청 dict (별칭 정규화 후) → RodJob - 각 입력을 한 번만 변환"""
+        get = data.get
+        return cls(str(get('shape') or '').lower(), *[_to_float(get(key)) for key, _ in ROD_JOB_INPUTS])
+
+    def run(self) -> "RodJob":
+        """모든 파생 값을 한 번에 계산 (calculate_rod 의 계산 순서와 동일)"""
+        self.input_warnings = rod_input_warnings(self.recovery_ratio)
+        self._bars()
+        self._weights()
+        self._cost()
+        self._utilization()
+        self._scrap()
+        return self
+
+    def run_staged(self, observers: Dict[str, Callable[[float], None]]) -> "RodJob":
+        """run() 과 같은 계산 - ROD_STAGES 단계별 소요 시간(초)을 observers[단계] 로 전달"""
+        self.input_warnings = rod_input_warnings(self.recovery_ratio)
+        clock = time.perf_counter
+        started = clock()
+        for stage, step in zip(ROD_STAGES, (self._bars, self._weights, self._cost, self._utilization, self._scrap)):
+            step()
+            finished = clock()
+            observers[stage](finished - started)
+            started = finished
+        return self
+
+    # 단계별 계산 (ROD_STAGES 순서로만 호출)
+
+    def _bars(self) -> None:
+        self.area = cross_sectional_area(self.shape, self.diameter, self.width, self.height)
+        self.bars_needed = bars_needed(
+            self.product_length, self.cutting_loss, self.standard_bar_length, self.head_cut, self.tail_cut, self.quantity)
+
+    def _weights(self) -> None:
+        self.material_total_weight = material_total_weight(
+            self.area, self.bars_needed, self.standard_bar_length, self.material_density)
+        # 스크랩 단계에서 갱신될 수 있는 제품 총중량 (계산값)
+        self.total_weight = product_total_weight(
+            self.quantity, self.product_weight, self.area, self.product_length, self.material_density)
+
+    def _cost(self) -> None:
+        self.total_cost = total_cost(self.material_total_weight, self.material_price)
+        # 개당 단가는 항상 원재료 기준(스크랩 미반영)
+        self.unit_cost = unit_cost(self.total_cost, self.quantity)
+
+    def _utilization(self) -> None:
+        self.utilization_rate = utilization_rate(
+            self.product_length, self.cutting_loss, self.head_cut, self.tail_cut,
+            self.quantity, self.standard_bar_length, self.bars_needed)
+        self.wastage = wastage(self.utilization_rate)
+
+    def _scrap(self) -> None:
+        scrap = scrap_metrics(self.total_weight, self.total_cost, self.quantity, self.actual_product_weight,
+                              self.recovery_ratio, self.scrap_unit_price, self.material_total_weight)
+        self.scrap_weight = scrap['scrapWeight']
+        self.scrap_savings = scrap['scrapSavings']
+        self.real_cost = scrap['realCost']
+        self.scrap_warnings = scrap['warnings']
+        self.total_actual_product_weight = scrap['totalActualProductWeight']
+        # 실제 제품 중량 입력 시 스크랩 계산에서 갱신된 제품 총중량 사용
+        updated = scrap['updatedTotalWeight']
+        if updated is not None:
+            self.total_weight = updated
+
+    @property
+    def warnings(self) -> List[ValidationWarning]:
+        return self.input_warnings + self.scrap_warnings
+
+    def values(self) -> Dict:
+        """응답 계산 값 dict (컬럼마스터 key, 반올림 전)"""
+        return {
+            "barsNeeded": self.bars_needed,
+            "materialTotalWeight": self.material_total_weight,
+            "totalWeight": self.total_weight,
+            "totalCost": self.total_cost,
+            "unitCost": self.unit_cost,
+            "utilizationRate": self.utilization_rate,
+            "wastage": self.wastage,
+            "scrapWeight": self.scrap_weight,
+            "scrapSavings": self.scrap_savings,
+            "realCost": self.real_cost,
+            "totalActualProductWeight": self.total_actual_product_weight,
+        }
+
+
+def run_rod_job(data: Dict, stage_observers: Optional[Dict[str, Callable[[float], None]]] = None) -> RodJob:
+    """요청 dict → 계산이 끝난 RodJob (stage_observers 가 있으면 단계별 시간 기록)"""
+    job = RodJob.from_dict(data)
+    return job.run_staged(stage_observers) if stage_observers is not None else job.run()
@@ -0,0 +1,160 @@
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .utils import parse_float_safe
+from .rod import calculate_material_total_weight, calculate_total_cost
+from .cutting_stock import optimize_cutting_stock
+
+
+# 여러 행 견적의 봉재 공동 사용 (pooling)
+# 한 주문에서 재질/형상/규격/봉재 조건이 같은 행들은 같은 봉재를 쓸 수 있는데, 행별로 calculate_bars_needed 를 하면
+# 행마다 마지막 봉재의 남는 부분이 버려진다. 행별 온전한 봉재(수량 // 봉재당 개수)는 그대로 두고,
+# 행마다 남는 나머지 제품만 모아 절단 계획(cutting_stock)으로 공동 봉재에 배치한 뒤,
+# 공동 봉재 수와 비용을 각 행의 나머지 소요 길이 비율로 나눠 준다.
+# - 그룹화는 키 dict 한 번 순회, 배분은 행 수에 비례. 절단 계획 대상은 행마다 봉재 1개 미만의 나머지 제품뿐이다.
+# - 재질(material 또는 materialId)이 없는 행은 같은 봉재인지 알 수 없으므로 따로 계산한다.
+# - 공동 배치가 행별 계산보다 봉재를 줄이지 못하면 행별 계산을 그대로 쓴다.
+
+PoolKey = Tuple
+
+
+def make_pool_key(data) -> Optional[PoolKey]:
+    """같은 봉재를 공동으로 쓸 수 있는 행의 키 (재질이 없으면 None)"""
+    material = (data.get('material') or data.get('materialId') or "").strip().lower()
+    if not material:
+        return None
+    shape = (data.get('shape') or "").strip().lower()
+    if shape == "rectangle":
+        dimensions = (round(parse_float_safe(data.get('width')), 3), round(parse_float_safe(data.get('height')), 3))
+    else:
+        dimensions = (round(parse_float_safe(data.get('diameter')), 3),)
+    return (material, shape) + dimensions + tuple(
+        parse_float_safe(data.get(field))
+        for field in ('standardBarLength', 'headCut', 'tailCut', 'cuttingLoss', 'materialDensity', 'materialPrice')
+    )
+
+
+def _line_split(data) -> Tuple[int, int]:
+    """(봉재당 제품 수, 행 단독 봉재 수) - 봉재에 배치할 수 없으면 ValueError"""
+    unit_length = parse_float_safe(data.get('productLength')) + parse_float_safe(data.get('cuttingLoss'))
+    usable_length = (parse_float_safe(data.get('standardBarLength'))
+                     - parse_float_safe(data.get('headCut')) - parse_float_safe(data.get('tailCut')))
+    quantity = int(parse_float_safe(data.get('quantity')))
+    if unit_length <= 0 or usable_length <= 0 or unit_length > usable_length or quantity <= 0:
+        raise ValueError("제품 길이가 사용 가능한 봉재 길이보다 큽니다.")
+    pieces_per_bar = int(math.floor(usable_length / unit_length))
+    return pieces_per_bar, math.ceil(quantity / pieces_per_bar)
+
+
+def _pooled_tail_bars(lines: Sequence[Dict], tails: Sequence[int]) -> int:
+    """그룹 행들의 나머지 제품을 공동 봉재에 배치했을 때의 봉재 수"""
+    first = lines[0]
+    try:
+        plan = optimize_cutting_stock({
+            'items': [{'productLength': line.get('productLength'), 'quantity': tail}
+                      for line, tail in zip(lines, tails) if tail > 0],
+            'cuttingLoss': first.get('cuttingLoss'),
+            'headCut': first.get('headCut'),
+            'tailCut': first.get('tailCut'),
+            'standardBarLength': first.get('standardBarLength'),
+        })
+    except ValueError:
+        # 절단 계획 크기 제한 초과 - 공동 배치 없이 행별 봉재 수 유지
+        return sum(1 for tail in tails if tail > 0)
+    return plan["barsNeeded"]
+
+
+def pool_rod_quote(lines: Sequence[Dict]) -> Dict:
+    """
+    여러 행 봉재 견적 - 같은 키의 행끼리 나머지 제품을 공동 봉재로 모아 봉재 수와 비용을 줄이고 행별로 다시 배분
+    lines: /calculate/rod 요청 dict 목록 (materialId 기본값 적용 후)
+    반환: 행별(lines)/그룹별(groups) 봉재 수와 비용, 행별 계산 대비 절약량. 배치할 수 없는 행이 있으면 ValueError
+    """
+    # 1. 그룹화 - 키가 없는 행은 단독 그룹
+    groups: Dict[object, List[int]] = {}
+    splits: List[Tuple[int, int]] = []
+    for index, line in enumerate(lines):
+        try:
+            splits.append(_line_split(line))
+        except ValueError as e:
+            raise ValueError(f"{index}번 행: {e}") from None
+        key = make_pool_key(line)
+        groups.setdefault(key if key is not None else ("line", index), []).append(index)
+
+    line_results: List[Dict] = [{} for _ in lines]
+    group_results = []
+    for group_index, members in enumerate(groups.values()):
+        first = lines[members[0]]
+        weight_per_bar = calculate_material_total_weight({**first, 'barsNeeded': 1})
+        cost_per_bar = calculate_total_cost({'materialTotalWeight': weight_per_bar, 'materialPrice': first.get('materialPrice')})
+        cutting_loss = parse_float_safe(first.get('cuttingLoss'))
+
+        # 2. 행별 온전한 봉재 + 나머지 제품
+        full_bars = []
+        tails = []
+        for index in members:
+            pieces_per_bar = splits[index][0]
+            quantity = int(parse_float_safe(lines[index].get('quantity')))
+            full_bars.append(quantity // pieces_per_bar)
+            tails.append(quantity % pieces_per_bar)
+        alone_tail_bars = sum(1 for tail in tails if tail > 0)
+
+        pooled_tail_bars = alone_tail_bars
+        if alone_tail_bars > 1:
+            pooled_tail_bars = min(_pooled_tail_bars([lines[i] for i in members], tails), alone_tail_bars)
+
+        # 3. 공동 봉재를 나머지 소요 길이 비율로 배분
+        tail_lengths = [
+            tail * (parse_float_safe(lines[index].get('productLength')) + cutting_loss)
+            for index, tail in zip(members, tails)
+        ]
+        total_tail_length = sum(tail_lengths)
+        bars_alone_total = 0
+        for index, full, tail, tail_length in zip(members, full_bars, tails, tail_lengths):
+            quantity = int(parse_float_safe(lines[index].get('quantity')))
+            bars_alone = splits[index][1]
+            share = pooled_tail_bars * tail_length / total_tail_length if total_tail_length > 0 else 0.0
+            allocated_bars = full + share
+            total_cost = allocated_bars * cost_per_bar
+            line_results[index] = {
+                "index": index,
+                "group": group_index,
+                "quantity": quantity,
+                "barsNeededAlone": bars_alone,
+                "allocatedBars": allocated_bars,
+                "materialTotalWeight": allocated_bars * weight_per_bar,
+                "totalCost": total_cost,
+                "unitCost": total_cost / quantity,
+                "totalCostAlone": bars_alone * cost_per_bar,
+                "costSaved": (bars_alone - allocated_bars) * cost_per_bar,
+            }
+            bars_alone_total += bars_alone
+
+        bars_pooled = sum(full_bars) + pooled_tail_bars
+        group_results.append({
+            "group": group_index,
+            "material": first.get('material') or first.get('materialId'),
+            "shape": first.get('shape'),
+            "lines": list(members),
+            "pooledPieces": sum(tails) if pooled_tail_bars < alone_tail_bars else 0,
+            "barsNeededAlone": bars_alone_total,
+            "barsNeeded": bars_pooled,
+            "barsSaved": bars_alone_total - bars_pooled,
+            "totalCostAlone": bars_alone_total * cost_per_bar,
+            "totalCost": bars_pooled * cost_per_bar,
+            "costSaved": (bars_alone_total - bars_pooled) * cost_per_bar,
+        })
+
+    total_cost_alone = sum(group["totalCostAlone"] for group in group_results)
+    total_cost = sum(group["totalCost"] for group in group_results)
+    return {
+        "barsNeededAlone": sum(group["barsNeededAlone"] for group in group_results),
+        "barsNeeded": sum(group["barsNeeded"] for group in group_results),
+        "barsSaved": sum(group["barsSaved"] for group in group_results),
+        "totalCostAlone": total_cost_alone,
+        "totalCost": total_cost,
+        "costSaved": total_cost_alone - total_cost,
+        "savingRate": (total_cost_alone - total_cost) / total_cost_alone * 100.0 if total_cost_alone > 0 else 0.0,
+        "groups": group_results,
+        "lines": line_results,
+    }
@@ -8,13 +8,20 @@ def calculate_scrap_metrics(data) -> Dict:
     스크랩 계산 및 단순화된 유효성 검증
     actualProductWeight 입력 시 totalWeight도 함께 업데이트
     """
-    total_weight = parse_float_safe(data.get("totalWeight"))  # kg (제품 총중량)
-    total_cost = parse_float_safe(data.get("totalCost"))  # ₩
-    quantity = parse_float_safe(data.get("quantity"))
-    actual_product_weight_g = parse_float_safe(data.get("actualProductWeight"))  # g
-    recovery_ratio = parse_float_safe(data.get("recoveryRatio"))  # %
-    scrap_unit_price = parse_float_safe(data.get("scrapUnitPrice"))  # ₩/kg
+    return scrap_metrics(
+        parse_float_safe(data.get("totalWeight")),  # kg (제품 총중량)
+        parse_float_safe(data.get("totalCost")),  # ₩
+        parse_float_safe(data.get("quantity")),
+        parse_float_safe(data.get("actualProductWeight")),  # g
+        parse_float_safe(data.get("recoveryRatio")),  # %
+        parse_float_safe(data.get("scrapUnitPrice")),  # ₩/kg
+        parse_float_safe(data.get("materialTotalWeight")),  # kg (봉재 총중량)
+    )
 
+
+def scrap_metrics(total_weight: float, total_cost: float, quantity: float, actual_product_weight_g: float,
+                  recovery_ratio: float, scrap_unit_price: float, material_total_weight: float) -> Dict:
+    """calculate_scrap_metrics 의 본체 - float 로 변환된 값을 받는다 (rod_pipeline.RodJob 이 직접 호출)"""
     # actualProductWeight 입력 시 totalWeight 재계산
     updated_total_weight = total_weight
     total_actual_product_weight_kg = None
@@ -43,7 +50,7 @@ def calculate_scrap_metrics(data) -> Dict:
         return default_result
 
     # 단순화된 입력값 유효성 검증
-    warnings = validate_scrap_inputs(data)
+    warnings = scrap_input_warnings(total_weight, quantity, actual_product_weight_g, recovery_ratio)
     
     # 심각한 오류가 있으면 계산 중단
     critical_errors = [w for w in warnings if w.type == "error"]
@@ -53,7 +60,7 @@ def calculate_scrap_metrics(data) -> Dict:
 
     # 스크랩 중량 계산 (봉재 총중량 - 실제 제품 총중량)
     # 여기서는 원래 materialTotalWeight를 사용해야 함
-    material_total_weight = parse_float_safe(data.get("materialTotalWeight")) or total_weight
+    material_total_weight = material_total_weight or total_weight
     scrap_weight = max(0.0, material_total_weight - total_actual_product_weight_kg) if total_actual_product_weight_kg else 0.0
     
     # 스크랩이 없는 경우
@@ -101,13 +108,18 @@ def validate_scrap_inputs(data) -> List[ValidationWarning]:
     1. 실제 제품 중량 > 계산된 개별 제품 중량 (unit weight)
     2. 스크랩 환산 비율 > 100%
     """
+    return scrap_input_warnings(
+        parse_float_safe(data.get("totalWeight")),  # 제품 총중량 (kg)
+        parse_float_safe(data.get("quantity")),  # 수량
+        parse_float_safe(data.get("actualProductWeight")),  # 실제 제품 중량 (g)
+        parse_float_safe(data.get("recoveryRatio")),  # 환산 비율 (%)
+    )
+
+
+def scrap_input_warnings(total_weight: float, quantity: float, actual_product_weight_g: float,
+                         recovery_ratio: float) -> List[ValidationWarning]:
     warnings = []
     
-    total_weight = parse_float_safe(data.get("totalWeight"))  # 제품 총중량 (kg)
-    quantity = parse_float_safe(data.get("quantity"))  # 수량
-    actual_product_weight_g = parse_float_safe(data.get("actualProductWeight"))  # 실제 제품 중량 (g)
-    recovery_ratio = parse_float_safe(data.get("recoveryRatio"))  # 환산 비율 (%)
-    
     # 1. 실제 제품 중량 vs 계산된 개별 제품 중량 비교
     if (actual_product_weight_g is not None and actual_product_weight_g > 0 and 
         total_weight is not None and quantity is not None and quantity > 0):
@@ -0,0 +1,174 @@
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .utils import parse_float_safe
+from .rod import (
+    calculate_bars_needed, calculate_material_total_weight, calculate_total_cost,
+    calculate_utilization_rate
+)
+
+
+# 표준 봉재 길이 카탈로그 최적화
+# 같은 봉재를 여러 길이(2500/3000/3500/4000mm 등)로 살 수 있을 때 주문 수량을 채우는 가장 싼 길이 조합을 구한다.
+# 길이별 봉재 1개 = (제품 수 p, 비용 c) 인 무한 배낭(최소 비용 커버) 문제로 보고,
+# 개당 비용이 가장 싼 길이 b 외의 봉재는 p_b 개 미만만 쓰면 된다는 교환 논리로 탐색 범위를 p_b * max(p) 로 제한한다.
+# (그 이상이면 비둘기집 원리로 합이 p_b 의 배수인 부분집합을 b 봉재로 바꿔도 비용이 늘지 않음)
+
+MAX_DP_PIECES = 2_000_000
+
+
+def _length_option(data, bar_length: float, material_price: float) -> Optional[Dict]:
+    """카탈로그 길이 1개에 대한 봉재당 제품 수, 봉재당 중량/비용"""
+    product_length = parse_float_safe(data.get('productLength'))
+    cutting_loss = parse_float_safe(data.get('cuttingLoss'))
+    head_cut = parse_float_safe(data.get('headCut'))
+    tail_cut = parse_float_safe(data.get('tailCut'))
+    unit_length = product_length + cutting_loss
+    usable_length = bar_length - head_cut - tail_cut
+    if unit_length <= 0 or usable_length <= 0 or unit_length > usable_length:
+        return None
+    pieces_per_bar = int(math.floor(usable_length / unit_length))
+    if pieces_per_bar <= 0:
+        return None
+    bar_data = {**data, 'standardBarLength': bar_length, 'barsNeeded': 1}
+    weight_per_bar = calculate_material_total_weight(bar_data)
+    cost_per_bar = calculate_total_cost({'materialTotalWeight': weight_per_bar, 'materialPrice': material_price})
+    return {
+        "standardBarLength": bar_length,
+        "materialPrice": material_price,
+        "piecesPerBar": pieces_per_bar,
+        "weightPerBar": weight_per_bar,
+        "costPerBar": cost_per_bar,
+    }
+
+
+def _mix_totals(data, quantity: int, mix: List[Dict]) -> Dict:
+    """길이별 봉재 수 조합의 총 중량/비용/활용률 (rod.py 산식 그대로 길이별 합산)"""
+    product_length = parse_float_safe(data.get('productLength'))
+    cutting_loss = parse_float_safe(data.get('cuttingLoss'))
+    head_cut = parse_float_safe(data.get('headCut'))
+    tail_cut = parse_float_safe(data.get('tailCut'))
+
+    total_weight = 0.0
+    total_cost = 0.0
+    total_usable_length = 0.0
+    for entry in mix:
+        entry_data = {**data, 'standardBarLength': entry["standardBarLength"], 'barsNeeded': entry["bars"]}
+        weight = calculate_material_total_weight(entry_data)
+        cost = calculate_total_cost({'materialTotalWeight': weight, 'materialPrice': entry["materialPrice"]})
+        entry["materialTotalWeight"] = weight
+        entry["totalCost"] = cost
+        total_weight += weight
+        total_cost += cost
+        total_usable_length += entry["bars"] * (entry["standardBarLength"] - head_cut - tail_cut)
+
+    total_used_length = quantity * (product_length + cutting_loss)
+    utilization_rate = min((total_used_length / total_usable_length) * 100.0, 100.0) if total_usable_length > 0 else 0.0
+    return {
+        "barsNeeded": sum(entry["bars"] for entry in mix),
+        "materialTotalWeight": total_weight,
+        "totalCost": total_cost,
+        "unitCost": total_cost / quantity if quantity > 0 else 0.0,
+        "utilizationRate": utilization_rate,
+        "mix": mix,
+    }
+
+
+def _min_cost_cover(pieces: List[int], costs: List[float], limit: int) -> np.ndarray:
+    """
+    정확히 t개(0..limit)를 만드는 최소 비용 - 무한 배낭 DP
+    품목별로 나머지 클래스(t mod p)마다 누적 최솟값(minimum.accumulate)을 쓰는 벡터화 갱신
+    """
+    dp = np.full(limit + 1, np.inf)
+    dp[0] = 0.0
+    for p, c in zip(pieces, costs):
+        rows = -(-(limit + 1) // p)
+        padded = np.full(rows * p, np.inf)
+        padded[:limit + 1] = dp
+        grid = padded.reshape(rows, p)
+        steps = (np.arange(rows) * c)[:, None]
+        grid = np.minimum.accumulate(grid - steps, axis=0) + steps
+        dp = np.minimum(dp, grid.reshape(-1)[:limit + 1])
+    return dp
+
+
+def optimize_stock_mix(data, catalog: List[Dict]) -> Dict:
+    """
+    주문 수량을 채우는 가장 싼 표준 봉재 길이 조합
+    catalog: [{standardBarLength, materialPrice(선택, 없으면 data 의 materialPrice)}]
+    반환: 길이별 단독 구매 결과(options), 최적 조합(optimal), 단독 최저가 대비 절감액
+    """
+    quantity = int(parse_float_safe(data.get('quantity')))
+    default_price = parse_float_safe(data.get('materialPrice'))
+
+    options = []
+    for entry in catalog:
+        price = entry.get('materialPrice')
+        option = _length_option(data, parse_float_safe(entry.get('standardBarLength')),
+                                parse_float_safe(price) if price is not None else default_price)
+        if option is not None:
+            options.append(option)
+
+    result = {"quantity": quantity, "options": [], "optimal": None, "savingsVsBestSingle": 0.0}
+    if quantity <= 0 or not options:
+        return result
+
+    # 길이별 단독 구매 (calculate_bars_needed 와 동일한 봉재 수)
+    for option in options:
+        single_data = {**data, 'standardBarLength': option["standardBarLength"], 'materialPrice': option["materialPrice"]}
+        bars = calculate_bars_needed(single_data)
+        single_data['barsNeeded'] = bars
+        weight = calculate_material_total_weight(single_data)
+        cost = calculate_total_cost({'materialTotalWeight': weight, 'materialPrice': option["materialPrice"]})
+        result["options"].append({
+            **option,
+            "barsNeeded": bars,
+            "materialTotalWeight": weight,
+            "totalCost": cost,
+            "unitCost": cost / quantity,
+            "utilizationRate": calculate_utilization_rate(single_data),
+        })
+
+    pieces = [o["piecesPerBar"] for o in options]
+    costs = [o["costPerBar"] for o in options]
+    best = min(range(len(options)), key=lambda i: costs[i] / pieces[i])
+
+    # 개당 최저가 길이 b 를 base_bars 개 먼저 쓰고 나머지(residual)만 DP 로 정확히 푼다
+    window = min(quantity, pieces[best] * max(pieces), MAX_DP_PIECES)
+    base_bars = max(0, -(-(quantity - window) // pieces[best]))
+    residual = quantity - base_bars * pieces[best]
+    limit = residual + max(pieces)
+    exact = _min_cost_cover(pieces, costs, limit)
+    at_least = np.minimum.accumulate(exact[::-1])[::-1]  # t개 이상을 만드는 최소 비용
+    target_cost = at_least[residual]
+    target = residual + int(np.argmax(exact[residual:] <= target_cost + 1e-9))
+
+    # 역추적: exact[t] == exact[t - p] + c 인 길이를 따라 내려감
+    counts = [0] * len(options)
+    counts[best] = base_bars
+    t = target
+    while t > 0:
+        for i, (p, c) in enumerate(zip(pieces, costs)):
+            if t >= p and abs(exact[t - p] + c - exact[t]) <= 1e-6 * max(1.0, exact[t]):
+                counts[i] += 1
+                t -= p
+                break
+        else:
+            break
+    # 부동소수점 오차로 역추적이 끊기면 남은 수량은 개당 최저가 길이로 채움
+    covered = sum(count * p for count, p in zip(counts, pieces))
+    if covered < quantity:
+        counts[best] += -(-(quantity - covered) // pieces[best])
+
+    mix = [
+        {"standardBarLength": options[i]["standardBarLength"], "materialPrice": options[i]["materialPrice"],
+         "piecesPerBar": pieces[i], "bars": counts[i]}
+        for i in range(len(options)) if counts[i] > 0
+    ]
+    optimal = _mix_totals(data, quantity, mix)
+    best_single = min(o["totalCost"] for o in result["options"])
+    result["optimal"] = optimal
+    result["savingsVsBestSingle"] = max(best_single - optimal["totalCost"], 0.0)
+    return result
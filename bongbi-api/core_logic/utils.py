@@ -1,3 +1,6 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+
+
 def parse_float_safe(val):
     """
     안전하게 float 변환. 실패 시 0.0 반환.
@@ -14,3 +17,24 @@ def kg_per_m3_to_g_per_cm3(density_kg_per_m3: float) -> float:
     1000 kg/m³ == 1 g/cm³
     """
     return density_kg_per_m3 / 1000.0
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """
+    정렬된 값 목록의 q 분위 값 (nearest-rank, 0 <= q <= 1). 빈 목록이면 None.
+    """
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def latency_percentiles_ms(seconds: Iterable[float], quantiles: Sequence[float] = (0.50, 0.95, 0.99),
+                           include_max: bool = False, digits: int = 1) -> Dict[str, Optional[float]]:
+    """
+    지연 표본(초) → {"p50": ms, "p95": ms, ...} (+ "max"). 표본이 없으면 값은 None.
+    """
+    ordered = sorted(seconds)
+    points = [(f"p{round(q * 100):g}", percentile(ordered, q)) for q in quantiles]
+    if include_max:
+        points.append(("max", ordered[-1] if ordered else None))
+    return {name: None if value is None else round(value * 1000.0, digits) for name, value in points}
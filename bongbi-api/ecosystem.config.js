@@ -3,10 +3,17 @@ module.exports = {
     {
       name: "bongbi-api",
       cwd: "/root/bongbi-SaaS-v2/bongbi-api",
-      script: "./.venv/bin/uvicorn",
-      args: ["app.main:app", "--host", "127.0.0.1", "--port", "8000"],
+      // gunicorn 마스터 + uvicorn 워커 (설정: gunicorn.conf.py)
+      script: "./.venv/bin/gunicorn",
+      args: ["-c", "gunicorn.conf.py"],
       interpreter: "none",
-      env: { PYTHONPATH: "." }
+      // graceful_timeout(30초) 동안 처리 중인 요청/노션 아웃박스를 마무리할 시간을 준 뒤 강제 종료
+      kill_timeout: 35000,
+      env: {
+        PYTHONPATH: ".",
+        BIND: "127.0.0.1:8000",
+        WEB_CONCURRENCY: "2"
+      }
     }
   ]
 }
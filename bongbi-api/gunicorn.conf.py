@@ -0,0 +1,64 @@
+# 운영 서버 설정 - gunicorn 마스터 + uvicorn 워커 여러 개
+#
+#   cd bongbi-api
+#   gunicorn -c gunicorn.conf.py app.main:app
+#
+# - preload_app: 마스터가 앱(라우터, 컬럼마스터, 재질 카탈로그, OpenAPI 스키마)을 한 번 불러온 뒤 fork 하므로
+#   워커들이 읽기 전용 페이지를 copy-on-write 로 공유한다. fork 전에 gc.freeze() 로 불러온 객체를 GC 대상에서 빼서
+#   GC 가 참조 횟수 필드를 건드려 페이지가 복사되는 것을 줄인다.
+# - 워커끼리 메모리 상태는 공유하지 않는다 (요청별 계산, 결과 캐시/지표는 워커별). 공유 상태는 모두 SQLite 파일이다:
+#   문의 스풀은 행 단위 임대로 나눠 쓰고, 잔재 재고(/remnants, REMNANT_DB_PATH)와 주문은 트랜잭션으로 같은 파일을 쓴다.
+# - 종료/재시작: SIGTERM(과 pm2 가 보내는 SIGINT)을 받은 워커는 바로 draining 으로 표시하고(/ready 503)
+#   READY_DRAIN_SECONDS 동안 요청을 더 받은 뒤 새 연결을 닫고, 처리 중인 요청과 노션 아웃박스를
+#   graceful_timeout 안에서 마무리한 뒤 종료한다 (app/gunicorn_worker.py). SIGHUP 은 새 워커를 띄운 뒤 기존 워커를 같은 방식으로 내린다
+#   (preload 라 코드 변경은 반영되지 않음 - 코드 배포는 pm2 reload).
+# - 워커별 준비 상태: 각 워커가 WORKER_STATE_DIR 에 상태를 쓰고 GET /api/v1/health 가 전체 목록을 보여준다.
+#   GET /api/v1/ready 는 해당 워커가 준비됐고 종료 중이 아니면 200.
+# 환경변수: BIND (기본 127.0.0.1:8000), WEB_CONCURRENCY (워커 수, 기본 CPU 수), GRACEFUL_TIMEOUT (기본 30),
+#          READY_DRAIN_SECONDS (기본 5), WORKER_STATE_DIR (기본 임시 디렉터리)
+import gc
+import glob
+import multiprocessing
+import os
+import tempfile
+
+wsgi_app = "app.main:app"
+bind = os.getenv("BIND", "127.0.0.1:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "0")) or multiprocessing.cpu_count()
+worker_class = "app.gunicorn_worker.DrainingUvicornWorker"
+preload_app = True
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+timeout = 60
+keepalive = 5
+
+# 설정 파일은 SIGHUP 때 다시 읽히므로 처음 만든 디렉터리를 유지
+if not os.getenv("WORKER_STATE_DIR"):
+    os.environ["WORKER_STATE_DIR"] = tempfile.mkdtemp(prefix="bongbi-workers-")
+
+
+def when_ready(server):
+    from app.main import warm_up
+    warm_up()
+    gc.freeze()
+    # pm2 는 중지/재시작 시 SIGINT 를 보낸다 - gunicorn 기본(즉시 종료) 대신 SIGTERM 과 같은 graceful 종료로
+    server.handle_int = server.handle_term
+    server.log.info(f"워커 {workers}개, 상태 디렉터리 {os.environ['WORKER_STATE_DIR']}")
+
+
+def child_exit(server, worker):
+    # 비정상 종료한 워커의 상태 파일 정리 (정상 종료는 워커가 직접 지움)
+    try:
+        os.remove(os.path.join(os.environ["WORKER_STATE_DIR"], f"worker-{worker.pid}.json"))
+    except FileNotFoundError:
+        pass
+
+
+def on_exit(server):
+    # 남은 상태 파일 정리, 비었으면 디렉터리도 삭제
+    state_dir = os.environ["WORKER_STATE_DIR"]
+    for path in glob.glob(os.path.join(state_dir, "worker-*.json*")):
+        os.remove(path)
+    try:
+        os.rmdir(state_dir)
+    except OSError:
+        pass
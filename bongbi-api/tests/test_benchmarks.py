@@ -0,0 +1,29 @@
+from benchmarks.run import compare, measure
+from benchmarks.suite import BENCHMARKS
+
+
+def _result(min_ns, reference_ns, group="micro"):
+    return {"min_ns": min_ns, "median_ns": min_ns, "reference_ns": reference_ns, "ops": 1, "group": group}
+
+
+def test_compare_normalizes_machine_speed_and_flags_regressions():
+    baseline = {"results": {"fast": _result(100, 1000), "slow": _result(100, 1000), "api": _result(1000, 1000, "endpoint")}}
+    # 기계가 2배 느려도(기준 작업 2000) fast 는 그대로, slow 는 50% 느려짐
+    current = {"results": {"fast": _result(200, 2000), "slow": _result(300, 2000),
+                           "api": _result(2600, 2000, "endpoint"), "new": _result(10, 1000)}}
+    rows = {row["name"]: row for row in compare(current, baseline, threshold=0.25, endpoint_threshold=0.35)}
+    assert rows["fast"]["ratio"] == 1.0 and not rows["fast"]["regression"]
+    assert abs(rows["slow"]["ratio"] - 1.5) < 1e-9 and rows["slow"]["regression"]
+    assert not rows["api"]["regression"]  # 30% 증가 < endpoint 임계값
+    assert rows["new"]["ratio"] is None
+
+    raw = {row["name"]: row for row in compare(current, baseline, 0.25, 0.35, normalize=False)}
+    assert raw["fast"]["regression"]
+
+
+def test_micro_benchmarks_run():
+    for bench in BENCHMARKS:
+        if bench.group == "micro":
+            items, fn = bench.setup()
+            result = measure(items[:8], fn, repeat=1, min_time=0.001)
+            assert result["min_ns"] > 0 and result["reference_ns"] > 0
@@ -0,0 +1,45 @@
+import asyncio
+
+from app.api.calculate_router import calculate_rod, validate_inputs
+from app.api.schemas import LegacyFieldSupport, RodCalculateRequest
+from core_logic.column_master import column_registry
+
+
+def test_registry_compiles_aliases_rounding_and_required_masks():
+    assert LegacyFieldSupport.FIELD_ALIASES == {
+        "scrapPrice": "scrapUnitPrice",
+        "thickness": "plateThickness",
+        "width_plate": "plateWidth",
+        "length_plate": "plateLength",
+        "materialCost": "totalCost",
+        "costPerPiece": "unitCost",
+    }
+    assert column_registry.rounding["totalCost"] == 0
+    assert column_registry.rounding["utilizationRate"] == 2
+    assert column_registry.rounding["materialTotalWeight"] == 3
+    assert "barsNeeded" not in column_registry.rounding
+
+    assert column_registry.missing_required({"shape": "circle", "quantity": 3}, "rod") == ["productLength"]
+    assert column_registry.missing_required({"thickness": 3}, "sheet") == ["quantity", "plateThickness", "plateWidth", "plateLength"]
+    assert column_registry.missing_required(column_registry.normalize({"thickness": 3}), "sheet") == ["quantity", "plateWidth", "plateLength"]
+
+
+def test_round_output_in_place():
+    values = {"totalCost": 647364.4361803468, "utilizationRate": 85.59670781893004, "barsNeeded": 15, "wastage": None}
+    assert column_registry.round_output(values) is values
+    assert values == {"totalCost": 647364.0, "utilizationRate": 85.6, "barsNeeded": 15, "wastage": None}
+
+
+def test_rod_response_is_rounded_per_column_master():
+    response = asyncio.run(calculate_rod(RodCalculateRequest(
+        shape="circle", diameter=20, productLength=310, quantity=100, cuttingLoss=2, headCut=20, tailCut=50,
+        standardBarLength=2500, materialDensity=7850, materialPrice=7000)))
+    assert response.totalCost == 647364.0
+    assert response.utilizationRate == 85.6
+    assert response.materialTotalWeight == round(response.materialTotalWeight, 3)
+
+
+def test_validate_reports_missing_required_fields():
+    result = asyncio.run(validate_inputs({"shape": "circle", "diameter": 20}))
+    assert result["valid"] is False
+    assert result["errors"][0] == "필수 입력값 누락: productLength, quantity"
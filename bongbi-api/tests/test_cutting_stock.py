@@ -0,0 +1,80 @@
+import random
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from core_logic.cutting_stock import BFD_MAX_PIECES, PATTERN_SEARCH_MAX_TYPES, optimize_cutting_stock
+from core_logic.rod import calculate_bars_needed
+
+
+def _assert_plan_covers_demand(plan, items):
+    produced = {}
+    for pattern in plan["patterns"]:
+        assert pattern["usedLength"] <= plan["usableLength"] + 1e-6
+        for cut in pattern["cuts"]:
+            produced[cut["productLength"]] = produced.get(cut["productLength"], 0) + cut["count"] * pattern["bars"]
+    demand = {}
+    for item in items:
+        demand[float(item["productLength"])] = demand.get(float(item["productLength"]), 0) + item["quantity"]
+    assert produced == demand
+    assert sum(p["bars"] for p in plan["patterns"]) == plan["barsNeeded"]
+
+
+def test_single_length_matches_calculate_bars_needed():
+    data = {
+        "cuttingLoss": 2, "headCut": 20, "tailCut": 250, "standardBarLength": 2500,
+        "items": [{"productLength": 30, "quantity": 100}],
+    }
+    plan = optimize_cutting_stock(data)
+    expected = calculate_bars_needed({**data, "productLength": 30, "quantity": 100})
+    assert plan["barsNeeded"] == expected
+    _assert_plan_covers_demand(plan, data["items"])
+
+
+def test_mixed_lengths_beat_per_job_rounding():
+    items = [
+        {"productLength": 450, "quantity": 2000},
+        {"productLength": 320, "quantity": 3000},
+        {"productLength": 127.5, "quantity": 4000},
+        {"productLength": 88, "quantity": 3000},
+    ]
+    plan = optimize_cutting_stock({
+        "items": items, "cuttingLoss": 2, "headCut": 20, "tailCut": 50, "standardBarLength": 2500,
+    })
+    _assert_plan_covers_demand(plan, items)
+    assert plan["lowerBound"] <= plan["barsNeeded"] < plan["perJobBarsNeeded"]
+    assert plan["barsSaved"] == plan["perJobBarsNeeded"] - plan["barsNeeded"]
+    assert 0 < plan["utilizationRate"] <= 100
+
+
+def test_ten_thousand_distinct_pieces_under_a_second():
+    rng = random.Random(7)
+    items = [{"productLength": round(rng.uniform(40, 900), 2), "quantity": 1} for _ in range(10000)]
+    start = time.perf_counter()
+    plan = optimize_cutting_stock({
+        "items": items, "cuttingLoss": 2, "headCut": 20, "tailCut": 50, "standardBarLength": 2500,
+    })
+    assert time.perf_counter() - start < 1.0
+    _assert_plan_covers_demand(plan, items)
+
+
+def test_piece_longer_than_bar_is_unusable():
+    plan = optimize_cutting_stock({
+        "items": [{"productLength": 2400, "quantity": 1}], "headCut": 20, "tailCut": 250, "standardBarLength": 2500,
+    })
+    assert plan["barsNeeded"] == 0
+    assert plan["patterns"] == []
+
+
+def test_many_lengths_with_too_many_pieces_are_rejected():
+    types = PATTERN_SEARCH_MAX_TYPES + 1
+    items = [{"productLength": 40 + i * 7.5, "quantity": BFD_MAX_PIECES // types + 1} for i in range(types)]
+    data = {"items": items, "cuttingLoss": 2, "headCut": 20, "tailCut": 50, "standardBarLength": 2500}
+    with pytest.raises(ValueError):
+        optimize_cutting_stock(data)
+
+    response = TestClient(app).post("/api/v1/calculate/rod/cutting-plan", json=data)
+    assert response.status_code == 400
+    assert str(BFD_MAX_PIECES) in response.json()["message"]
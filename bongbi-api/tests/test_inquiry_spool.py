@@ -0,0 +1,159 @@
+import asyncio
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.api import notion_router
+from app.api.notion_outbox import NotionOutbox, STATUS_DELIVERED
+from app.main import app
+from app.storage.inquiry_spool import InquirySpool
+
+
+class FakeNotion:
+    """노션 클라이언트 대역 - down 이면 503 오류, 아니면 페이지 ID 반환"""
+
+    def __init__(self, down=False):
+        self.down = down
+        self.pages = []
+        self._lock = threading.Lock()
+
+    def send(self, properties):
+        if self.down:
+            error = Exception("Notion is unavailable")
+            error.code, error.status = "service_unavailable", 503
+            raise error
+        with self._lock:
+            self.pages.append(properties)
+            return f"page-{len(self.pages)}"
+
+
+async def _drain(outbox, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while outbox.queue_depth and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+
+
+def test_group_commit_survives_reopen(tmp_path):
+    path = str(tmp_path / "inquiries.db")
+    spool = InquirySpool(path)
+
+    def writer(offset):
+        futures = [spool.append(f"id-{offset + n}", {"n": offset + n}) for n in range(250)]
+        for future in futures:
+            future.result()
+
+    threads = [threading.Thread(target=writer, args=(k * 250,)) for k in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert spool.rows_written == 2000
+    assert spool.commits < 2000  # 여러 건이 한 커밋(fsync)으로 묶임
+    spool.close()
+
+    reopened = InquirySpool(path)
+    pending = reopened.pending(limit=5000)
+    assert len(pending) == 2000 and reopened.counts()["queued"] == 2000
+    assert pending[0]["properties"]["n"] in range(2000)
+    reopened.close()
+
+
+def test_claim_skips_rows_leased_by_live_worker(tmp_path):
+    path = str(tmp_path / "inquiries.db")
+    spool = InquirySpool(path)
+    for n in range(3):
+        spool.append(f"id-{n}", {"n": n}).result()
+
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("UPDATE inquiries SET owner = ? WHERE id = 'id-0'", (os.getppid(),))  # 살아 있는 다른 워커
+        conn.execute("UPDATE inquiries SET owner = ? WHERE id = 'id-1'", (dead.pid,))  # 죽은 워커
+    conn.close()
+
+    claimed = spool.claim(10).result()
+    assert sorted(item["id"] for item in claimed) == ["id-1", "id-2"]
+
+    # 임대를 풀면 다른 워커가 가져갈 수 있음
+    spool.release(["id-1"]).result()
+    row = spool.get("id-1")
+    assert row is not None and row["status"] == "queued"
+    conn = sqlite3.connect(path)
+    owners = dict(conn.execute("SELECT id, owner FROM inquiries").fetchall())
+    conn.close()
+    assert owners == {"id-0": os.getppid(), "id-1": None, "id-2": os.getpid()}
+    spool.close()
+
+
+def test_inquiries_spooled_while_notion_down_are_replayed_after_restart(tmp_path):
+    path = str(tmp_path / "inquiries.db")
+    notion = FakeNotion(down=True)
+
+    async def first_process():
+        outbox = NotionOutbox(notion.send, rate_per_sec=0, max_attempts=2, backoff_seconds=0.001,
+                              spool=InquirySpool(path), replay_seconds=60)
+        await outbox.start()
+        items = [await outbox.enqueue({"n": n}) for n in range(20)]
+        await _drain(outbox)
+        await outbox.stop(drain_seconds=0)
+        outbox.spool.close()
+        return items
+
+    items = asyncio.run(first_process())
+    assert notion.pages == []
+
+    notion.down = False
+
+    async def second_process():
+        spool = InquirySpool(path)
+        outbox = NotionOutbox(notion.send, rate_per_sec=0, spool=spool, replay_seconds=60)
+        await outbox.start()
+        await asyncio.sleep(0.05)
+        await _drain(outbox)
+        await outbox.stop(drain_seconds=1)
+        counts = spool.counts()
+        row = spool.get(items[0].id)
+        spool.close()
+        return outbox, counts, row
+
+    outbox, counts, row = asyncio.run(second_process())
+    assert outbox.replayed == 20 and len(notion.pages) == 20
+    assert counts == {"queued": 0, "delivered": 20, "failed": 0}
+    assert row["status"] == STATUS_DELIVERED and row["attempts"] == 3
+
+
+def test_burst_enqueue_latency_stays_flat(tmp_path):
+    async def burst():
+        outbox = NotionOutbox(lambda properties: "page", spool=InquirySpool(str(tmp_path / "burst.db")))
+        started = time.monotonic()
+        await asyncio.gather(*[outbox.enqueue({"n": n}) for n in range(3000)])
+        elapsed = time.monotonic() - started
+        outbox.spool.close()
+        return outbox, elapsed
+
+    outbox, elapsed = asyncio.run(burst())
+    assert outbox.spooled_only == 3000  # 워커가 없으면 스풀에만 남김
+    assert outbox.spool.commits < 300
+    assert elapsed < 5.0
+
+
+def test_inquiry_accepted_without_notion_configuration(monkeypatch, tmp_path):
+    spool = InquirySpool(str(tmp_path / "inquiries.db"))
+    monkeypatch.setattr(notion_router, "NOTION_TOKEN", None)
+    monkeypatch.setattr(notion_router, "inquiry_spool", spool)
+    monkeypatch.setattr(notion_router.notion_outbox, "spool", spool)
+
+    inquiry = {"name": "홍길동", "email": "hong@example.com", "subject": "견적", "message": "노션 미설정"}
+    with TestClient(app) as client:
+        response = client.post("/api/v1/notion/customer-inquiry", json=inquiry)
+        assert response.status_code == 202
+        inquiry_id = response.json()["inquiry_id"]
+        assert client.get(f"/api/v1/notion/customer-inquiry/{inquiry_id}").json()["status"] == "queued"
+        assert client.get("/api/v1/notion/outbox").json()["spool"]["queued"] == 1
+    spool.close()
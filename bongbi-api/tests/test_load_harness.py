@@ -0,0 +1,57 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.api.loop_monitor import EventLoopLagMonitor
+from benchmarks.fake_notion import create_app
+from benchmarks.loadgen import PayloadFactory, histogram_delta_summary, parse_histogram, parse_mix
+from core_logic.utils import latency_percentiles_ms
+
+
+def test_fake_notion_serves_pages_and_injects_rate_limits():
+    client = TestClient(create_app(latency_ms=0, jitter_ms=0))
+    page = client.post("/v1/pages", json={"parent": {"database_id": "db"}, "properties": {}})
+    assert page.status_code == 200 and page.json()["object"] == "page"
+    assert client.get("/v1/databases/db").json()["title"][0]["plain_text"] == "Fake inquiries"
+
+    limited = TestClient(create_app(latency_ms=0, jitter_ms=0, rate_limit_rate=1.0, retry_after_seconds=2))
+    response = limited.post("/v1/pages", json={})
+    assert response.status_code == 429
+    assert response.json()["code"] == "rate_limited" and response.headers["retry-after"] == "2"
+    assert limited.get("/_stats").json()["rate_limited"] == 1
+
+
+def test_lag_histogram_delta_and_mix():
+    before = parse_histogram('x_bucket{le="0.001"} 10\nx_bucket{le="0.01"} 10\nx_bucket{le="+Inf"} 10\nx_sum 0.002\nx_count 10', "x")
+    after = parse_histogram('x_bucket{le="0.001"} 15\nx_bucket{le="0.01"} 19\nx_bucket{le="+Inf"} 20\nx_sum 0.502\nx_count 20', "x")
+    summary = histogram_delta_summary(before, after)
+    assert summary == {"samples": 10, "mean_ms": 50.0, "p50_ms": 1.0, "p99_ms": None}
+
+    mix = parse_mix("rod=3,inquiry=1")
+    assert mix == [("rod", 3.0), ("inquiry", 1.0)]
+    factory = PayloadFactory(seed=1)
+    assert {factory.make(kind)[1] for kind, _ in mix} == {"/api/v1/calculate/rod", "/api/v1/notion/customer-inquiry"}
+
+
+def test_latency_percentiles_use_nearest_rank_in_ms():
+    samples = [i / 1000.0 for i in range(100, 0, -1)]  # 1~100ms, 정렬 안 된 입력
+    assert latency_percentiles_ms(samples) == {"p50": 51.0, "p95": 96.0, "p99": 100.0}
+    assert latency_percentiles_ms(samples, (0.90,), include_max=True, digits=2) == {"p90": 91.0, "max": 100.0}
+    assert latency_percentiles_ms([], include_max=True) == {"p50": None, "p95": None, "p99": None, "max": None}
+
+
+def test_loop_monitor_observes_blocking():
+    observed = []
+
+    async def scenario():
+        monitor = EventLoopLagMonitor(observed.append, interval_seconds=0.01)
+        await monitor.start()
+        await asyncio.sleep(0.03)
+        import time
+        time.sleep(0.1)  # 루프를 막는 동기 작업
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+        return monitor
+
+    monitor = asyncio.run(scenario())
+    assert observed and monitor.max_lag >= 0.08
@@ -0,0 +1,45 @@
+import json
+import logging
+import queue
+
+from fastapi.testclient import TestClient
+
+from app.logging_setup import JsonFormatter, LogSampler, NonBlockingQueueHandler, request_id_var
+from app.main import app
+
+
+def _record(message="hello", **extra):
+    record = logging.LogRecord("bongbi.test", logging.WARNING, __file__, 1, message, None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_sampler_keeps_burst_then_one_in_every():
+    sampler = LogSampler(burst=3, every=10)
+    decisions = [sampler.allow("rod.warnings") for _ in range(33)]
+    kept = [i for i, (allowed, _) in enumerate(decisions) if allowed]
+    assert kept == [0, 1, 2, 12, 22, 32]
+    assert decisions[12] == (True, 9)
+    assert sampler.allow("plate.warnings") == (True, 0)  # 키별로 따로 센다
+
+
+def test_queue_handler_formats_off_thread_and_drops_when_full():
+    log_queue = queue.Queue(maxsize=1)
+    handler = NonBlockingQueueHandler(log_queue)
+    token = request_id_var.set("req-1")
+    try:
+        handler.emit(_record("rod %s", calculation="rod", warnings=["경고"]))
+        handler.emit(_record("dropped"))
+    finally:
+        request_id_var.reset(token)
+    assert handler.dropped == 1
+
+    line = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+    assert line["level"] == "WARNING" and line["request_id"] == "req-1"
+    assert (line["calculation"], line["warnings"]) == ("rod", ["경고"])
+
+
+def test_request_id_is_echoed_or_generated():
+    client = TestClient(app)
+    assert client.get("/", headers={"X-Request-ID": "abc-123"}).headers["x-request-id"] == "abc-123"
+    assert len(client.get("/").headers["x-request-id"]) == 16
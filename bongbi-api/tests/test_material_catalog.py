@@ -0,0 +1,58 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.api.schemas import RodCalculateRequest, PlateCalculateRequest
+from app.main import app
+from core_logic.material_catalog import MaterialCatalog, material_catalog
+
+
+ROD = {"shape": "circle", "diameter": 20, "productLength": 310, "quantity": 100}
+
+
+def test_material_id_fills_missing_fields_only():
+    request = RodCalculateRequest(**ROD, materialId="steel", materialPrice=6500)
+    assert request.materialDensity == 7850
+    assert request.standardBarLength == 2500
+    assert request.materialPrice == 6500
+    assert request.scrapUnitPrice is None
+
+    with_scrap = RodCalculateRequest(**ROD, materialId="SUS304", actualProductWeight=50)
+    assert with_scrap.scrapUnitPrice == 6800
+
+    plate = PlateCalculateRequest(plateThickness=10, plateWidth=100, plateLength=200, quantity=5, materialId="aluminum")
+    assert (plate.materialDensity, plate.plateUnitPrice) == (2800, 4000)
+
+
+def test_unknown_material_or_missing_fields_are_rejected():
+    with pytest.raises(ValidationError):
+        RodCalculateRequest(**ROD, materialId="unobtainium")
+    with pytest.raises(ValidationError):
+        RodCalculateRequest(**ROD)
+
+
+def test_materials_endpoint_revalidates_with_etag():
+    client = TestClient(app)
+    first = client.get("/api/v1/materials")
+    assert first.status_code == 200
+    assert first.json()["count"] == len(material_catalog.list())
+
+    etag = first.headers["etag"]
+    assert client.get("/api/v1/materials", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/v1/materials", headers={"If-None-Match": '"stale"'}).status_code == 200
+    assert client.get("/api/v1/materials/없는재질").status_code == 404
+
+
+def test_reload_changes_etag(tmp_path):
+    path = tmp_path / "materials.json"
+    entry = {"id": "brass", "name": "황동", "materialDensity": 8500, "barUnitPrice": 8000}
+    path.write_text(json.dumps({"version": "1", "materials": [entry]}), encoding="utf-8")
+    catalog = MaterialCatalog(str(path))
+    etag = catalog.list() and catalog.etag
+
+    path.write_text(json.dumps({"version": "1", "materials": [{**entry, "barUnitPrice": 8200}]}), encoding="utf-8")
+    catalog.reload()
+    assert catalog.etag != etag
+    assert catalog.get("황동")["barUnitPrice"] == 8200
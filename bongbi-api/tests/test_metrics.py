@@ -0,0 +1,58 @@
+import random
+
+from fastapi.testclient import TestClient
+
+from app.api.metrics import Histogram, metrics
+from app.main import app
+from core_logic.rod_pipeline import ROD_STAGES, RodJob
+
+ROD_REQUEST = {
+    "shape": "circle", "diameter": 20, "productLength": 50, "quantity": 100,
+    "cuttingLoss": 2, "headCut": 10, "tailCut": 20,
+    "standardBarLength": 2500, "materialDensity": 8500, "materialPrice": 9000,
+}
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+    lines = histogram.render("t", 'route="/x"')
+    assert lines[:3] == ['t_bucket{route="/x",le="0.1"} 2', 't_bucket{route="/x",le="1"} 3',
+                         't_bucket{route="/x",le="+Inf"} 4']
+    assert lines[-1] == 't_count{route="/x"} 4'
+
+
+def test_staged_run_matches_plain_run():
+    rng = random.Random(3)
+    seen = {stage: 0 for stage in ROD_STAGES}
+    observers = {stage: (lambda s: lambda seconds: seen.__setitem__(s, seen[s] + 1))(stage) for stage in ROD_STAGES}
+    for _ in range(200):
+        data = dict(ROD_REQUEST, quantity=rng.randint(1, 3000), productLength=rng.uniform(5, 900))
+        plain, staged = RodJob.from_dict(data), RodJob.from_dict(data)
+        plain.run()
+        staged.run_staged(observers)
+        assert plain.values() == staged.values()
+    assert all(count == 200 for count in seen.values())
+
+
+def test_metrics_endpoint_exposes_routes_stages_and_errors():
+    client = TestClient(app)
+    assert client.post("/api/v1/calculate/rod", json=ROD_REQUEST).status_code == 200
+    assert client.post("/api/v1/calculate/rod", json={"shape": "circle"}).status_code == 422
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'bongbi_http_requests_total{route="/api/v1/calculate/rod",method="POST",status="200"}' in body
+    assert 'bongbi_errors_total{route="/api/v1/calculate/rod",type="validation"}' in body
+    assert 'bongbi_http_request_duration_seconds_bucket{route="/api/v1/calculate/rod",method="POST",le="+Inf"}' in body
+    for stage in ROD_STAGES:
+        assert f'bongbi_rod_stage_duration_seconds_count{{stage="{stage}"}}' in body
+    assert metrics.rod_stages["bars"].count >= 1
+    assert "# TYPE bongbi_notion_outbox_queue_depth gauge" in body
+    assert "# TYPE bongbi_notion_outbox_delivered_total counter" in body
+    assert "# TYPE bongbi_result_cache_size gauge" in body
+    assert "# TYPE bongbi_result_cache_hits_total counter" in body
+    assert "bongbi_result_cache_hits " not in body
@@ -0,0 +1,139 @@
+import random
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from core_logic.nesting import expand_placements, optimize_plate_nesting
+
+SHEET = {"sheetWidth": 1219, "sheetLength": 2438, "plateThickness": 3, "materialDensity": 7850, "plateUnitPrice": 1200}
+
+
+def _assert_valid_layouts(plan, data):
+    """모든 부품이 가장자리 손실 안쪽에, 절단 폭 이상 떨어져 배치되고 수량이 맞는지"""
+    kerf = data.get("cuttingLoss", 0)
+    trim = data.get("edgeTrim", 0)
+    placed = {}
+    for layout in plan["layouts"]:
+        pieces = expand_placements(layout, kerf)
+        assert len(pieces) == layout["pieces"]
+        for item, x, y, width, length in pieces:
+            assert x >= trim - 1e-6 and y >= trim - 1e-6
+            assert x + width <= data["sheetWidth"] - trim + 1e-6
+            assert y + length <= data["sheetLength"] - trim + 1e-6
+            placed[item] = placed.get(item, 0) + layout["sheets"]
+        pieces.sort(key=lambda piece: piece[1])
+        for i, a in enumerate(pieces):
+            for b in pieces[i + 1:]:
+                if b[1] >= a[1] + a[3] + kerf - 1e-6:
+                    break
+                assert a[2] + a[4] + kerf <= b[2] + 1e-6 or b[2] + b[4] + kerf <= a[2] + 1e-6, (a, b)
+    assert placed == {i: item["quantity"] for i, item in enumerate(data["items"])}
+    assert sum(layout["sheets"] for layout in plan["layouts"]) == plan["sheetsNeeded"]
+
+
+def test_single_part_grid_with_kerf_and_trim():
+    # 사용 영역 1209 × 2428 (+절단 폭 3), 부품 간격 303 × 603 → 4열 × 4행 = 16개/장
+    data = {**SHEET, "cuttingLoss": 3, "edgeTrim": 5,
+            "items": [{"partWidth": 300, "partLength": 600, "quantity": 100, "allowRotation": False}]}
+    plan = optimize_plate_nesting(data)
+    _assert_valid_layouts(plan, data)
+    assert plan["sheetsNeeded"] == 7  # 16 × 6 + 4
+    assert plan["layouts"][0]["pieces"] == 16
+    sheet_weight = 1219 * 2438 * 3 / 1000 * 7.85 / 1000
+    assert abs(plan["totalWeight"] - sheet_weight * 7) < 1e-9
+    assert abs(plan["totalCost"] - sheet_weight * 7 * 1200) < 1e-6
+    assert plan["partsWeight"] < plan["totalWeight"]
+    assert 0 < plan["utilizationRate"] < 100
+
+
+def test_rotation_fills_leftover_strip():
+    # 300 × 700 부품: 회전 없이 4열 × 3행 = 12개, 회전 허용 시 위쪽 띠(1219 × 338)에 눕혀서 1개 더
+    items = [{"partWidth": 300, "partLength": 700, "quantity": 130}]
+    fixed = optimize_plate_nesting({**SHEET, "items": [{**items[0], "allowRotation": False}]})
+    rotated = optimize_plate_nesting({**SHEET, "items": items})
+    _assert_valid_layouts(rotated, {**SHEET, "items": items})
+    assert (fixed["sheetsNeeded"], rotated["sheetsNeeded"]) == (11, 10)
+    assert any(block["rotated"] for layout in rotated["layouts"] for block in layout["placements"])
+    assert not any(block["rotated"] for layout in fixed["layouts"] for block in layout["placements"])
+
+
+def test_part_larger_than_sheet_is_rejected():
+    with pytest.raises(ValueError):
+        optimize_plate_nesting({**SHEET, "edgeTrim": 10, "items": [{"partWidth": 1210, "partLength": 100, "quantity": 1,
+                                                                    "allowRotation": False}]})
+    with pytest.raises(ValueError):
+        optimize_plate_nesting({**SHEET, "items": [{"partWidth": 1300, "partLength": 2500, "quantity": 1}]})
+
+
+def test_three_thousand_mixed_parts_under_a_second():
+    rng = random.Random(11)
+    items = [{"partWidth": rng.randint(20, 400), "partLength": rng.randint(20, 600), "quantity": 1,
+              "allowRotation": rng.random() < 0.8} for _ in range(200)]
+    for _ in range(2800):
+        items[rng.randrange(200)]["quantity"] += 1
+    data = {**SHEET, "cuttingLoss": 3, "edgeTrim": 5, "items": items}
+    started = time.perf_counter()
+    plan = optimize_plate_nesting(data)
+    elapsed = time.perf_counter() - started
+    _assert_valid_layouts(plan, data)
+    assert plan["lowerBound"] <= plan["sheetsNeeded"] <= plan["lowerBound"] * 1.15
+    assert elapsed < 1.0
+
+
+def test_plate_endpoint_costs_whole_sheets_when_sheet_size_given():
+    client = TestClient(app)
+    payload = {"plateThickness": 3, "plateWidth": 300, "plateLength": 600, "quantity": 100,
+               "materialDensity": 7850, "plateUnitPrice": 1200}
+    plain = client.post("/api/v1/calculate/plate", json=payload).json()
+    assert plain["utilizationRate"] == 100.0 and "sheetsNeeded" not in plain
+
+    nested = client.post("/api/v1/calculate/plate", json={
+        **payload, "sheetWidth": 1219, "sheetLength": 2438, "cuttingLoss": 3, "edgeTrim": 5, "allowRotation": False,
+    }).json()
+    assert nested["sheetsNeeded"] == 7
+    assert nested["totalWeight"] > plain["totalWeight"]
+    assert nested["utilizationRate"] < 100 and nested["wastage"] > 0
+    assert nested["partsWeight"] == pytest.approx(plain["totalWeight"], rel=1e-3)
+
+    too_big = client.post("/api/v1/calculate/plate", json={**payload, "sheetWidth": 200, "sheetLength": 200})
+    assert too_big.status_code == 400
+
+
+def test_nesting_endpoint_returns_layouts():
+    client = TestClient(app)
+    response = client.post("/api/v1/calculate/plate/nesting", json={
+        "materialId": "steel", "sheetWidth": 1219, "sheetLength": 2438, "plateThickness": 2, "cuttingLoss": 2,
+        "items": [{"partWidth": 400, "partLength": 250, "quantity": 30},
+                  {"partWidth": 120, "partLength": 80, "quantity": 200, "allowRotation": False}],
+    })
+    assert response.status_code == 200
+    plan = response.json()
+    assert plan["sheetsNeeded"] >= plan["lowerBound"] >= 1
+    assert sum(layout["sheets"] * layout["pieces"] for layout in plan["layouts"]) == 230
+    assert plan["totalCost"] > 0 and plan["unitCost"] == pytest.approx(plan["totalCost"] / 230, rel=1e-3)
+
+
+def test_reusable_remnants_are_reported_and_kept_out_of_scrap():
+    # 16개/장 배치에서 위쪽 띠(사용 영역 위로 2428 - 4 × 603 = 16mm) 는 작고, 3장 × 16 + 4개 → 마지막 장에 큰 잔재
+    data = {**SHEET, "cuttingLoss": 3, "edgeTrim": 5, "minRemnantSize": 100,
+            "items": [{"partWidth": 300, "partLength": 600, "quantity": 52, "allowRotation": False}]}
+    plan = optimize_plate_nesting(data)
+    last = [layout for layout in plan["layouts"] if layout["pieces"] == 4][0]
+    assert last["remnants"] and all(min(r["width"], r["length"]) >= 100 for r in last["remnants"])
+    assert plan["remnantCount"] == sum(layout["sheets"] * len(layout["remnants"]) for layout in plan["layouts"])
+    assert 0 < plan["remnantWeight"] < plan["totalWeight"] - plan["partsWeight"]
+
+    strict = optimize_plate_nesting({**data, "minRemnantSize": 5000})
+    assert strict["remnantCount"] == 0 and strict["remnantWeight"] == 0
+
+    client = TestClient(app)
+    payload = {"plateThickness": 3, "plateWidth": 300, "plateLength": 600, "quantity": 52, "materialDensity": 7850,
+               "plateUnitPrice": 1200, "sheetWidth": 1219, "sheetLength": 2438, "cuttingLoss": 3, "edgeTrim": 5,
+               "allowRotation": False, "recoveryRatio": 80, "scrapUnitPrice": 300}
+    result = client.post("/api/v1/calculate/plate", json=payload).json()
+    assert result["scrapWeight"] == pytest.approx(
+        result["totalWeight"] - result["partsWeight"] - result["remnantWeight"], abs=2e-3)
+    assert result["scrapSavings"] == pytest.approx(result["scrapWeight"] * 300 * 0.8, abs=1)
+    assert result["realCost"] == pytest.approx(result["totalCost"] - result["scrapSavings"], abs=1)
@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from app.api import notion_router
+from app.api.notion_health import NotionHealthProber
+from app.main import app
+
+
+def test_prober_records_success_failure_and_timeout():
+    outcomes = iter(["ok", "error", "slow", "ok"])
+
+    def probe():
+        outcome = next(outcomes)
+        if outcome == "error":
+            raise RuntimeError("service_unavailable")
+        if outcome == "slow":
+            time.sleep(0.2)
+        return {"database_title": "고객 문의"}
+
+    async def scenario():
+        prober = NotionHealthProber(probe, timeout_seconds=0.05)
+        snapshots = [prober.snapshot()]
+        for _ in range(4):
+            await prober.check_once()
+            snapshots.append(prober.snapshot())
+        return snapshots
+
+    initial, ok, error, slow, recovered = asyncio.run(scenario())
+    assert initial["status"] == "checking" and initial["age_seconds"] is None
+    assert (ok["status"], ok["database_title"], ok["database_connection"]) == ("healthy", "고객 문의", "success")
+    assert error["status"] == "unhealthy" and error["connection_error"] == "service_unavailable"
+    assert error["last_success_at"] == ok["last_success_at"]
+    assert slow["consecutive_failures"] == 2 and "응답이 없습니다" in slow["connection_error"]
+    assert recovered["status"] == "healthy" and recovered["consecutive_failures"] == 0
+    assert recovered["last_failure_at"] == slow["last_failure_at"]
+    assert recovered["probes"] == 4 and recovered["latency_ms"]["p99"] >= 50.0
+
+
+def test_health_endpoint_serves_cache_without_calling_notion(monkeypatch):
+    calls = []
+
+    class Databases:
+        def retrieve(self, database_id):
+            calls.append(database_id)
+            return {"title": [{"plain_text": "고객 문의"}]}
+
+    class FakeClient:
+        databases = Databases()
+
+    monkeypatch.setattr(notion_router, "NOTION_AVAILABLE", True)
+    monkeypatch.setattr(notion_router, "NOTION_TOKEN", "secret")
+    monkeypatch.setattr(notion_router, "NOTION_DATABASE_ID", "db")
+    monkeypatch.setattr(notion_router, "notion_client", FakeClient())
+    monkeypatch.setattr(notion_router.notion_health, "interval_seconds", 60.0)
+
+    with TestClient(app) as client:
+        for _ in range(50):
+            if client.get("/api/v1/notion/health").json()["status"] != "checking":
+                break
+            time.sleep(0.01)
+        for _ in range(50):
+            body = client.get("/api/v1/notion/health").json()
+        assert body["status"] == "healthy" and body["database_title"] == "고객 문의"
+        assert body["age_seconds"] >= 0 and body["last_success_at"] is not None
+    assert calls == ["db"]
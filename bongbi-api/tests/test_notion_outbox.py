@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.api import notion_router
+from app.api.notion_outbox import NotionOutbox, OutboxFull, STATUS_DELIVERED, STATUS_FAILED
+from app.main import app
+from app.storage.inquiry_spool import InquirySpool
+
+
+class FakeNotionError(Exception):
+    def __init__(self, code, status, headers=None):
+        super().__init__(code)
+        self.code = code
+        self.status = status
+        self.headers = headers or {}
+
+
+async def _wait_for(outbox, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while outbox.queue_depth and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+
+
+def test_retries_transient_errors_and_bounds_concurrency():
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0, "calls": {}}
+
+    def send(properties):
+        key = properties["n"]
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            state["calls"][key] = state["calls"].get(key, 0) + 1
+            calls = state["calls"][key]
+        time.sleep(0.02)
+        with lock:
+            state["active"] -= 1
+        if key == 0 and calls < 3:
+            raise FakeNotionError("service_unavailable", 503)
+        return f"page-{key}"
+
+    async def scenario():
+        outbox = NotionOutbox(send, concurrency=2, rate_per_sec=0, backoff_seconds=0.01)
+        await outbox.start()
+        items = [outbox.submit({"n": n}) for n in range(10)]
+        await _wait_for(outbox)
+        await outbox.stop(drain_seconds=0)
+        return outbox, items
+
+    outbox, items = asyncio.run(scenario())
+    assert all(item.status == STATUS_DELIVERED for item in items)
+    assert items[0].attempts == 3 and items[0].page_id == "page-0"
+    assert state["peak"] == 2
+    stats = outbox.stats()
+    assert (stats["delivered"], stats["retries"], stats["queue_depth"]) == (10, 2, 0)
+    assert stats["delivery_latency_ms"]["p50"] is not None
+
+
+def test_permanent_errors_fail_without_retry_and_rate_limit_pauses():
+    def send(properties):
+        if properties["kind"] == "bad":
+            raise FakeNotionError("validation_error", 400)
+        raise FakeNotionError("rate_limited", 429, {"retry-after": "0.05"})
+
+    async def scenario():
+        outbox = NotionOutbox(send, concurrency=1, rate_per_sec=0, max_attempts=2, backoff_seconds=0.001)
+        await outbox.start()
+        bad = outbox.submit({"kind": "bad"})
+        limited = outbox.submit({"kind": "limited"})
+        started = time.monotonic()
+        await _wait_for(outbox)
+        elapsed = time.monotonic() - started
+        await outbox.stop(drain_seconds=0)
+        return outbox, bad, limited, elapsed
+
+    outbox, bad, limited, elapsed = asyncio.run(scenario())
+    assert (bad.status, bad.attempts) == (STATUS_FAILED, 1)
+    assert (limited.status, limited.attempts) == (STATUS_FAILED, 2)
+    assert outbox.rate_limited == 1 and elapsed >= 0.05
+
+
+def test_submit_rejects_when_full():
+    outbox = NotionOutbox(lambda properties: "page", max_pending=1)
+    outbox.submit({})
+    try:
+        outbox.submit({})
+        assert False, "OutboxFull expected"
+    except OutboxFull:
+        assert outbox.rejected == 1
+
+
+def test_inquiry_endpoint_returns_before_notion_round_trip(monkeypatch, tmp_path):
+    class SlowPages:
+        def create(self, parent, properties):
+            time.sleep(0.3)
+            return {"id": "page-123"}
+
+    class SlowClient:
+        pages = SlowPages()
+
+    monkeypatch.setattr(notion_router, "NOTION_AVAILABLE", True)
+    monkeypatch.setattr(notion_router, "NOTION_TOKEN", "secret")
+    monkeypatch.setattr(notion_router, "NOTION_DATABASE_ID", "db")
+    monkeypatch.setattr(notion_router, "notion_client", SlowClient())
+    spool = InquirySpool(str(tmp_path / "inquiries.db"))
+    monkeypatch.setattr(notion_router, "inquiry_spool", spool)
+    monkeypatch.setattr(notion_router.notion_outbox, "spool", spool)
+
+    inquiry = {"name": "홍길동", "email": "hong@example.com", "subject": "견적", "message": "황동 봉재 문의"}
+    with TestClient(app) as client:
+        started = time.monotonic()
+        response = client.post("/api/v1/notion/customer-inquiry", json=inquiry)
+        assert time.monotonic() - started < 0.25
+        assert response.status_code == 202
+        inquiry_id = response.json()["inquiry_id"]
+
+        for _ in range(100):
+            status = client.get(f"/api/v1/notion/customer-inquiry/{inquiry_id}").json()
+            if status["status"] == STATUS_DELIVERED:
+                break
+            time.sleep(0.02)
+        assert status["page_id"] == "page-123"
+        assert client.get("/api/v1/notion/outbox").json()["delivered"] >= 1
+        assert client.get("/api/v1/notion/customer-inquiry/none").status_code == 404
+    spool.close()
@@ -0,0 +1,114 @@
+import asyncio
+import csv
+
+import openpyxl
+
+from app.api.calculate_router import calculate_plate, calculate_rod
+from app.api.schemas import PlateCalculateRequest, RodCalculateRequest
+from core_logic.column_master import resolve_header
+from core_logic import order_import
+from core_logic.order_import import import_orders
+
+
+HEADERS = ["제품명", "봉재 형태", "직경", "제품 길이", "수량", "절단손실", "선두 로스", "후미 로스",
+           "표준봉길이", "재질비중", "봉단가", "thickness", "폭(판재)", "length_plate", "판단가", "재질", "메모"]
+ROWS = [
+    ["A-1", "circle", "20", "310", "100", "2", "20", "50", "2500", "7850", "7000", "", "", "", "", "", "첫 행"],
+    ["B-1", "", "", "", "50", "", "", "", "", "7850", "", "10", "100", "200", "7000", "sheet", ""],
+    ["A-2", "hexagon", "17", "3000", "10", "0", "0", "0", "2500", "8500", "8000", "", "", "", "", "", ""],
+    ["", "", "", "", "", "", "", "", "", "", "", "", "", "", "", "", ""],
+    ["A-3", "circle", "", "310", "1,200", "2", "20", "50", "2500", "7850", "7000", "", "", "", "", "", ""],
+    ["A-4", "square", "25", "42.5", "1,200", "2", "20", "50", "3000", "7850", "7000", "", "", "", "", "rod", ""],
+]
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="", encoding="cp949") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        writer.writerows(rows)
+
+
+def _read_result_csv(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return list(csv.DictReader(f))
+
+
+def test_headers_resolve_through_column_master():
+    assert resolve_header("봉재 형태") == "shape"
+    assert resolve_header("ProductLength") == "productLength"
+    assert resolve_header("thickness") == "plateThickness"
+    assert resolve_header("materialCost") == "totalCost"
+    assert resolve_header("메모") is None
+
+
+def test_csv_import_annotates_rows(tmp_path):
+    source = tmp_path / "orders.csv"
+    _write_csv(source, ROWS)
+    summary = import_orders(str(source), str(tmp_path / "result.csv"), workers=1)
+
+    assert (summary["total"], summary["succeeded"], summary["failed"]) == (5, 3, 2)
+    assert summary["unmappedHeaders"] == ["메모"]
+
+    result = _read_result_csv(tmp_path / "result.csv")
+    assert [r["importStatus"] for r in result] == ["ok", "ok", "error", "error", "ok"]
+    assert result[0]["메모"] == "첫 행"
+    assert result[2]["importMessage"].startswith("계산 불가능")
+    assert "diameter" in result[3]["importMessage"] or "직경" in result[3]["importMessage"]
+    assert float(result[1]["totalWeight"]) == 78.5
+
+    expected = asyncio.run(calculate_rod(RodCalculateRequest(
+        shape="square", diameter=25, productLength=42.5, quantity=1200, cuttingLoss=2, headCut=20,
+        tailCut=50, standardBarLength=3000, materialDensity=7850, materialPrice=7000)))
+    assert int(result[4]["barsNeeded"]) == expected.barsNeeded
+    assert float(result[4]["totalCost"]) == expected.totalCost
+
+
+def test_worker_pool_and_xlsx_output_match_inline(tmp_path):
+    source = tmp_path / "orders.csv"
+    _write_csv(source, [[f"P{i}"] + row[1:] for i in range(300) for row in ROWS])
+    import_orders(str(source), str(tmp_path / "inline.csv"), workers=1, chunk_rows=97)
+    try:
+        import_orders(str(source), str(tmp_path / "pool.csv"), workers=2, chunk_rows=97)
+        pool = order_import._pool
+        # 가져오기마다 풀을 만들지 않고 공유 풀을 다시 쓴다 (fork 가 아닌 forkserver/spawn)
+        import_orders(str(source), str(tmp_path / "pool2.csv"), workers=2, chunk_rows=97)
+        assert order_import._pool is pool
+        assert pool._mp_context.get_start_method() in ("forkserver", "spawn")
+    finally:
+        order_import.shutdown_pool()
+    assert order_import._pool is None
+    assert (tmp_path / "inline.csv").read_bytes() == (tmp_path / "pool.csv").read_bytes()
+    assert (tmp_path / "pool.csv").read_bytes() == (tmp_path / "pool2.csv").read_bytes()
+
+    summary = import_orders(str(source), str(tmp_path / "result.xlsx"), workers=1)
+    workbook = openpyxl.load_workbook(tmp_path / "result.xlsx", read_only=True)
+    sheet_rows = list(workbook.active.iter_rows(values_only=True))
+    workbook.close()
+    assert len(sheet_rows) == summary["total"] + 1
+    assert sheet_rows[0][len(HEADERS)] == "importStatus"
+
+
+def test_plate_rows_match_plate_endpoint_with_scrap_and_sheets(tmp_path):
+    headers = ["thickness", "폭(판재)", "length_plate", "수량", "재질비중", "판단가", "materialType",
+               "actualProductWeight", "recoveryRatio", "scrapUnitPrice", "sheetWidth", "sheetLength"]
+    rows = [
+        ["10", "100", "200", "50", "7850", "7000", "sheet", "1200", "80", "500", "", ""],
+        ["10", "100", "200", "50", "7850", "7000", "sheet", "1200", "80", "500", "1000", "2000"],
+    ]
+    source = tmp_path / "plates.csv"
+    with open(source, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        writer.writerows(rows)
+    import_orders(str(source), str(tmp_path / "result.csv"), workers=1)
+    result = _read_result_csv(tmp_path / "result.csv")
+    assert [r["importStatus"] for r in result] == ["ok", "ok"]
+
+    base = dict(plateThickness=10, plateWidth=100, plateLength=200, quantity=50, materialDensity=7850,
+                plateUnitPrice=7000, actualProductWeight=1200, recoveryRatio=80, scrapUnitPrice=500)
+    for row, sheet in zip(result, [{}, {"sheetWidth": 1000, "sheetLength": 2000}]):
+        expected = asyncio.run(calculate_plate(PlateCalculateRequest(**base, **sheet)))
+        assert expected.scrapSavings > 0
+        for field in ("totalWeight", "totalCost", "utilizationRate", "scrapWeight", "scrapSavings", "realCost"):
+            assert float(row[field]) == getattr(expected, field), field
@@ -0,0 +1,81 @@
+from fastapi.testclient import TestClient
+
+from app.api.order_router import get_order_store
+from app.main import app
+from app.storage.order_store import OrderStore
+
+
+ROD = {
+    "shape": "circle", "diameter": 20, "productLength": 310, "quantity": 100,
+    "cuttingLoss": 2, "headCut": 20, "tailCut": 50, "standardBarLength": 2500,
+    "materialDensity": 7850, "materialPrice": 7000, "material": "SUM24L",
+}
+PLATE = {
+    "plateThickness": 10, "plateWidth": 100, "plateLength": 200, "quantity": 50,
+    "materialDensity": 7850, "plateUnitPrice": 7000,
+}
+
+
+def _client(store):
+    app.dependency_overrides[get_order_store] = lambda: store
+    return TestClient(app)
+
+
+def test_order_crud_keeps_quoted_result():
+    store = OrderStore(":memory:")
+    client = _client(store)
+    try:
+        quote = client.post("/api/v1/calculate/rod", json=ROD).json()
+        created = client.post("/api/v1/orders", json={"customer": "한빛정밀", "rod": ROD}).json()
+        assert created["material"] == "SUM24L"
+        assert created["materialType"] == "rod"
+        assert created["result"] == quote
+
+        plate = client.post("/api/v1/orders", json={"customer": "한빛정밀", "plate": PLATE, "status": "ordered"})
+        assert plate.status_code == 201
+        assert plate.json()["result"]["isPlate"] is True
+
+        updated = client.patch(f"/api/v1/orders/{created['id']}", json={"status": "completed", "deliveryDate": "2025-09-01"}).json()
+        assert updated["status"] == "completed"
+        assert updated["deliveryDate"] == "2025-09-01"
+        assert updated["result"] == quote
+        # status 는 null 로 비울 수 없고 (422), 다른 조회용 필드는 null 로 비울 수 있다
+        assert client.patch(f"/api/v1/orders/{created['id']}", json={"status": None}).status_code == 422
+        cleared = client.patch(f"/api/v1/orders/{created['id']}", json={"deliveryDate": None, "notes": None}).json()
+        assert cleared["status"] == "completed" and cleared["deliveryDate"] is None
+
+        assert client.post("/api/v1/orders", json={"rod": ROD, "plate": PLATE}).status_code == 422
+        assert client.post("/api/v1/orders", json={"rod": ROD, "result": {"totalCost": 1}}).status_code == 400
+
+        assert client.delete(f"/api/v1/orders/{created['id']}").status_code == 200
+        assert client.get(f"/api/v1/orders/{created['id']}").status_code == 404
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_keyset_pagination_with_filters():
+    store = OrderStore(":memory:")
+    result = {"totalCost": 1.0, "unitCost": 0.1}
+    for i in range(25):
+        store.create({
+            "customer": "A" if i % 2 else "B", "material": "SUM24L", "materialType": "rod",
+            "status": "quoted", "quantity": 10, "request": {}, "result": result,
+        }, created_at=1_700_000_000_000 + (i // 3) * 1000)  # 같은 시각 주문 포함
+
+    seen, cursor = [], None
+    while True:
+        page = store.list(customer="A", cursor=cursor, limit=4)
+        seen.extend(order["id"] for order in page["items"])
+        cursor = page["nextCursor"]
+        if cursor is None:
+            break
+    expected = sorted((o for o in range(1, 26) if (o - 1) % 2), key=lambda o: (((o - 1) // 3), o), reverse=True)
+    assert seen == expected
+
+    client = _client(store)
+    try:
+        assert client.get("/api/v1/orders", params={"cursor": "%%%"}).status_code == 400
+        body = client.get("/api/v1/orders", params={"customer": "B", "limit": 100}).json()
+        assert body["count"] == 13 and body["nextCursor"] is None
+    finally:
+        app.dependency_overrides.clear()
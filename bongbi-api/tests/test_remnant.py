@@ -0,0 +1,224 @@
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import remnant_router
+from app.main import app
+from app.storage.remnant_store import PlateRemnantStore, RemnantStore
+from core_logic.remnant import make_plate_remnant_key, make_remnant_key, plan_plate_with_remnants, plan_rod_with_remnants
+
+
+ROD = {
+    "material": "SUM24L",
+    "shape": "circle",
+    "diameter": 20,
+    "productLength": 30,
+    "quantity": 100,
+    "cuttingLoss": 2,
+    "headCut": 20,
+    "tailCut": 50,
+    "standardBarLength": 2500,
+}
+
+
+@pytest.fixture
+def rod_inventory(tmp_path):
+    return RemnantStore(str(tmp_path / "remnants.db"))
+
+
+def test_shortest_remnant_at_least_needed_length(rod_inventory):
+    inventory = rod_inventory
+    key = make_remnant_key("SUM24L", "circle", 20)
+    for length in [900, 150, 420, 1300, 420]:
+        inventory.add(key, length)
+
+    assert inventory.find_shortest_at_least(key, 400)["length"] == 420
+    assert inventory.find_shortest_at_least(key, 1000)["length"] == 1300
+    assert inventory.find_shortest_at_least(key, 1500) is None
+    assert inventory.find_shortest_at_least(make_remnant_key("SUS304", "circle", 20), 10) is None
+
+
+def test_rod_plan_draws_remnants_before_new_bars(rod_inventory):
+    inventory = rod_inventory
+    key = make_remnant_key("sum24l", "circle", 20.0)
+    # 2430mm 봉재 1개 = 75개, 100개 → 신규 봉재 2개
+    inventory.add(key, 1000)  # (1000 - 70) / 32 = 29개
+    inventory.add(key, 80)    # 한 개도 못 만드는 자투리
+
+    plan = plan_rod_with_remnants(inventory, ROD)
+    assert plan["barsNeededWithoutRemnants"] == 2
+    assert plan["piecesFromRemnants"] == 29
+    assert plan["barsNeededAfterRemnants"] == 1
+    assert plan["barsSaved"] == 1
+    assert inventory.stats()["totalRemnants"] == 2  # 미리보기는 재고를 바꾸지 않음
+
+
+def test_rod_plan_consume_updates_inventory(rod_inventory):
+    inventory = rod_inventory
+    key = make_remnant_key("SUM24L", "circle", 20)
+    small_id = inventory.add(key, 500)
+    exact_id = inventory.add(key, 3300)
+
+    plan = plan_rod_with_remnants(inventory, ROD, consume=True, min_remnant_length=200)
+    # 100개를 한 번에 만들 수 있는 가장 짧은 잔재(3200mm 이상) 사용
+    assert [u["id"] for u in plan["remnantsUsed"]] == [exact_id]
+    assert plan["barsNeededAfterRemnants"] == 0
+    assert inventory.get(exact_id) is None
+    assert inventory.get(small_id) is not None
+    # 3300 - 20 - 100*32 = 80mm 는 최소 길이 미만이라 등록하지 않음
+    assert plan["remnantsAdded"] == 0
+
+
+
+def test_remnant_store_persists_and_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "remnants.db")
+    key = make_remnant_key("SUM24L", "circle", 20)
+    first = RemnantStore(path)
+    kept = first.add(key, 3300)
+    first.add(key, 500)
+
+    # 재시작(또는 다른 워커) - 같은 파일의 새 저장소가 같은 재고를 본다
+    second = RemnantStore(path)
+    assert [r["length"] for r in second.list(key)] == [500.0, 3300.0]
+    assert second.get(kept)["key"] == key
+
+    # 여러 스레드(워커)가 동시에 consume 해도 같은 잔재를 두 번 배정하지 않는다
+    plans = []
+
+    def consume():
+        plans.append(plan_rod_with_remnants(RemnantStore(path), ROD, consume=True, min_remnant_length=10000))
+
+    threads = [threading.Thread(target=consume) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    used = [u["id"] for plan in plans for u in plan["remnantsUsed"]]
+    assert used.count(kept) == 1 and len(used) == len(set(used))
+    assert first.list(key) == []
+
+
+def test_lookups_do_not_wait_for_another_workers_write_transaction(tmp_path):
+    path = str(tmp_path / "remnants.db")
+    rods, plates = RemnantStore(path), PlateRemnantStore(path)
+    rod_key, plate_key = make_remnant_key("SUM24L", "circle", 20), make_plate_remnant_key("SS400", 3)
+    rod_id, plate_id = rods.add(rod_key, 1000), plates.add(plate_key, 500, 500)
+
+    # 다른 워커가 plan_draw → commit 중 (쓰기 잠금 보유)
+    writer = RemnantStore(path)
+    results = []
+
+    def lookups():
+        results.append((
+            rods.get(rod_id)["length"], len(rods.list(rod_key)), rods.find_shortest_at_least(rod_key, 900)["id"],
+            rods.stats()["totalRemnants"], plates.get(plate_id)["width"], len(plates.list(plate_key)),
+            plates.find_smallest_fitting(plate_key, 100, 100)["id"], plates.stats()["totalRemnants"],
+        ))
+
+    with writer.lock as conn:
+        conn.execute("DELETE FROM rod_remnants")
+        reader = threading.Thread(target=lookups)
+        reader.start()
+        reader.join(timeout=5)
+        assert not reader.is_alive()
+    # 아직 커밋되지 않은 삭제는 보이지 않는다
+    assert results == [(1000.0, 1, rod_id, 1, 500.0, 1, plate_id, 1)]
+    assert rods.stats()["totalRemnants"] == 0
+
+
+def test_rod_endpoint_consumes_persistent_inventory(tmp_path, monkeypatch):
+    monkeypatch.setattr(remnant_router, "_remnant_store", RemnantStore(str(tmp_path / "remnants.db")))
+    client = TestClient(app)
+    created = client.post("/api/v1/remnants", json={"material": "SUM24L", "shape": "circle", "diameter": 20,
+                                                    "lengths": [1000]}).json()
+    payload = {**ROD, "materialDensity": 7850, "materialPrice": 1500, "useRemnants": True, "consumeRemnants": True}
+    plan = client.post("/api/v1/calculate/rod", json=payload).json()["remnantPlan"]
+    assert [u["id"] for u in plan["remnantsUsed"]] == created["ids"] and plan["piecesFromRemnants"] == 29
+
+    # 새 프로세스가 같은 파일을 열어도 사용한 잔재는 없고 새 자투리가 남아 있다
+    reopened = RemnantStore(str(tmp_path / "remnants.db"))
+    assert reopened.get(created["ids"][0]) is None
+    assert reopened.stats()["totalRemnants"] == plan["remnantsAdded"]
+    assert client.get("/api/v1/remnants/stats").json()["totalRemnants"] == plan["remnantsAdded"]
+
+PLATE_JOB = {
+    "material": "SS400",
+    "plateThickness": 3,
+    "sheetWidth": 1219,
+    "sheetLength": 2438,
+    "cuttingLoss": 3,
+    "materialDensity": 7850,
+    "plateUnitPrice": 1200,
+    "items": [{"partWidth": 300, "partLength": 600, "quantity": 100, "allowRotation": False}],
+}
+
+
+@pytest.fixture
+def plate_inventory(tmp_path):
+    return PlateRemnantStore(str(tmp_path / "remnants.db"))
+
+
+def test_smallest_plate_remnant_that_fits_part(plate_inventory):
+    inventory = plate_inventory
+    key = make_plate_remnant_key("SS400", 3)
+    for width, length in [(1000, 1000), (350, 620), (620, 350), (200, 2000)]:
+        inventory.add(key, width, length)
+
+    assert inventory.find_smallest_fitting(key, 300, 600) == {"id": 2, "width": 350.0, "length": 620.0}
+    assert inventory.find_smallest_fitting(key, 600, 300, allow_rotation=False)["id"] == 3
+    assert inventory.find_smallest_fitting(key, 150, 1500)["id"] == 4
+    assert inventory.find_smallest_fitting(key, 1100, 900) is None
+    assert inventory.find_smallest_fitting(make_plate_remnant_key("SS400", 4.5), 10, 10) is None
+
+
+def test_plate_plan_places_parts_on_remnants_before_new_sheets(plate_inventory):
+    inventory = plate_inventory
+    key = make_plate_remnant_key("SS400", 3)
+    big = inventory.add(key, 1219, 1300)   # 4열 × 2행 = 8개
+    small = inventory.add(key, 700, 700)   # 2개
+    inventory.add(key, 250, 250)           # 부품이 들어가지 않음
+
+    plan = plan_plate_with_remnants(inventory, PLATE_JOB)
+    assert {item["id"]: item["pieces"] for item in plan["remnantsUsed"]} == {big: 8, small: 2}
+    assert plan["piecesFromRemnants"] == 10
+    assert plan["sheetsNeededWithoutRemnants"] == 7
+    assert plan["sheetsNeededAfterRemnants"] == 6 and plan["sheetsSaved"] == 1
+    assert inventory.stats()["totalRemnants"] == 3  # 계획만 - 재고 변경 없음
+
+    assert plan_plate_with_remnants(inventory, {**PLATE_JOB, "material": None}) is None
+    assert plan_plate_with_remnants(inventory, {**PLATE_JOB, "sheetWidth": None}) is None
+
+
+def test_plate_plan_consume_updates_inventory(plate_inventory):
+    inventory = plate_inventory
+    key = make_plate_remnant_key("SS400", 3)
+    used = inventory.add(key, 1219, 1300)
+
+    plan = plan_plate_with_remnants(inventory, PLATE_JOB, consume=True)
+    assert plan["consumed"] and plan["remnantsAdded"] > 0
+    remnants = inventory.list(key)
+    assert used not in [r["id"] for r in remnants]
+    assert len(remnants) == plan["remnantsAdded"]
+    # 사용한 잔재에서 부품 2행 위로 남는 띠 (길이 1300 - 2 × 603 = 94) 는 최소 크기 미만이라 버려짐
+    assert all(min(r["width"], r["length"]) >= 100 for r in remnants)
+
+
+def test_plate_remnants_are_shared_through_the_store_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "remnants.db")
+    monkeypatch.setattr(remnant_router, "_plate_remnant_store", PlateRemnantStore(path))
+    client = TestClient(app)
+    created = client.post("/api/v1/remnants/plates", json={"material": "SS400", "plateThickness": 3,
+                                                           "remnants": [{"width": 1219, "length": 1300}]}).json()
+    payload = {"material": "SS400", "plateThickness": 3, "plateWidth": 300, "plateLength": 600, "quantity": 100,
+               "sheetWidth": 1219, "sheetLength": 2438, "cuttingLoss": 3, "allowRotation": False,
+               "materialDensity": 7850, "plateUnitPrice": 1200, "useRemnants": True, "consumeRemnants": True}
+    plan = client.post("/api/v1/calculate/plate", json=payload).json()["remnantPlan"]
+    assert [u["id"] for u in plan["remnantsUsed"]] == created["ids"]
+
+    # 다른 워커(같은 파일의 새 저장소)에서도 사용한 잔재는 없고 새 잔재가 보인다
+    other = PlateRemnantStore(path)
+    key = make_plate_remnant_key("SS400", 3)
+    assert other.get(created["ids"][0]) is None
+    assert len(other.list(key)) == plan["remnantsAdded"] > 0
+    assert client.get("/api/v1/remnants/stats").json()["plates"]["totalRemnants"] == plan["remnantsAdded"]
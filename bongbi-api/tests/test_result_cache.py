@@ -0,0 +1,46 @@
+import asyncio
+
+from app.api.calculate_router import calculate_plate
+from app.api.result_cache import ResultCache, result_cache
+from app.api.schemas import PlateCalculateRequest
+
+
+def test_equivalent_requests_share_a_key():
+    key = ResultCache.make_key("plate", {"thickness": 10, "plateWidth": 100.0000000001, "quantity": 5})
+    same = ResultCache.make_key("plate", {"quantity": 5.0, "plateWidth": 100, "plateThickness": 10.0})
+    assert key == same
+    assert key != ResultCache.make_key("rod", {"plateThickness": 10, "plateWidth": 100, "quantity": 5})
+    assert key != ResultCache.make_key("plate", {"plateThickness": 10, "plateWidth": 100.01, "quantity": 5})
+
+
+def test_lru_eviction_and_ttl():
+    cache = ResultCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a 가 최근 사용
+    cache.set("c", 3)           # b 제거
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+    expired = ResultCache(max_size=2, ttl_seconds=-1)
+    expired.set("a", 1)
+    assert expired.get("a") is None
+
+
+def test_disabled_cache_never_stores():
+    cache = ResultCache(enabled=False)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_plate_endpoint_hits_cache_for_equivalent_payload():
+    result_cache.clear()
+    hits_before = result_cache.hits
+    body = {"plateThickness": 10, "plateWidth": 100, "plateLength": 200, "quantity": 50,
+            "materialDensity": 7850, "plateUnitPrice": 7000}
+    first = asyncio.run(calculate_plate(PlateCalculateRequest(**body)))
+    second = asyncio.run(calculate_plate(PlateCalculateRequest(**{**body, "quantity": 50.0})))
+    assert second is first
+    assert result_cache.hits == hits_before + 1
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import random
+
+from fastapi.testclient import TestClient
+
+from app.api import calculate_router
+from app.api.calculate_router import calculate_rod, calculate_rod_batch_endpoint, calculate_rod_price_breaks
+from app.main import app
+from app.api.schemas import RodCalculateRequest, RodBatchCalculateRequest, RodPriceBreakRequest
+from core_logic.column_master import column_registry
+from core_logic.rod_batch import price_breaks, sweep_rod
+
+
+def _random_rod_request(rng):
+    shape = rng.choice(["circle", "square", "rectangle", "hexagon"])
+    data = {
+        "shape": shape,
+        "productLength": round(rng.uniform(5, 600), rng.choice([0, 1, 2])),
+        "quantity": rng.randint(1, 5000),
+        "cuttingLoss": round(rng.uniform(0, 5), 1),
+        "headCut": rng.choice([0, 10, 20, 35.5]),
+        "tailCut": rng.choice([0, 50, 250]),
+        "standardBarLength": rng.choice([500, 2500, 3000, 4000]),
+        "materialDensity": rng.choice([2800, 7850, 7930, 8500]),
+        "materialPrice": rng.choice([0, 4000, 7000, 8500.5]),
+    }
+    if shape == "rectangle":
+        data["width"] = round(rng.uniform(1, 80), 2)
+        data["height"] = round(rng.uniform(1, 80), 2)
+    else:
+        data["diameter"] = round(rng.uniform(1, 120), rng.choice([0, 1, 3]))
+    if rng.random() < 0.3:
+        data["productWeight"] = round(rng.uniform(1, 3000), 1)
+    if rng.random() < 0.7:
+        data["actualProductWeight"] = round(rng.uniform(0, 3000), 1)
+        data["recoveryRatio"] = rng.choice([0, 50, 80, 100])
+        data["scrapUnitPrice"] = rng.choice([0, 3000, 5600])
+    return RodCalculateRequest(**data)
+
+
+def _scalar_payload(request):
+    response = asyncio.run(calculate_rod(request))
+    if hasattr(response, "model_dump"):
+        return True, response.model_dump(exclude_none=True)
+    return False, json.loads(response.body)
+
+
+def test_rod_batch_matches_scalar_endpoint():
+    rng = random.Random(20250821)
+    requests = [_random_rod_request(rng) for _ in range(400)]
+    batch = asyncio.run(calculate_rod_batch_endpoint(RodBatchCalculateRequest(items=requests)))
+
+    assert batch.total == len(requests)
+    assert batch.succeeded + batch.failed == batch.total
+    for request, row in zip(requests, batch.results):
+        success, expected = _scalar_payload(request)
+        assert row.success == success
+        if success:
+            assert row.result.model_dump(exclude_none=True) == expected
+        else:
+            assert row.error.model_dump() == expected
+
+
+def test_rod_batch_reports_unusable_bar_per_row():
+    base = {
+        "shape": "circle", "diameter": 20, "productLength": 30, "quantity": 100,
+        "standardBarLength": 2500, "materialDensity": 7850, "materialPrice": 7000,
+    }
+    items = [RodCalculateRequest(**base), RodCalculateRequest(**{**base, "productLength": 3000})]
+    batch = asyncio.run(calculate_rod_batch_endpoint(RodBatchCalculateRequest(items=items)))
+
+    assert [r.success for r in batch.results] == [True, False]
+    assert batch.results[1].error.message.startswith("계산 불가능")
+
+
+def test_rod_sweep_grid_matches_scalar_endpoint():
+    base = {
+        "shape": "hexagon", "diameter": 17, "productLength": 42.5, "quantity": 300,
+        "cuttingLoss": 2, "headCut": 20, "tailCut": 50, "standardBarLength": 2500,
+        "materialDensity": 8500, "materialPrice": 8000,
+        "actualProductWeight": 60, "recoveryRatio": 80, "scrapUnitPrice": 6400,
+    }
+    bar_lengths = [30.0, 2000.0, 2500.0, 3000.0]
+    quantities = [1, 59, 60, 61, 1000]
+    grid = sweep_rod(base, "standardBarLength", bar_lengths, "quantity", quantities)
+
+    assert grid["barsNeeded"].shape == (len(quantities), len(bar_lengths))
+    for yi, quantity in enumerate(quantities):
+        for xi, bar_length in enumerate(bar_lengths):
+            request = RodCalculateRequest(**{**base, "standardBarLength": bar_length, "quantity": quantity})
+            success, expected = _scalar_payload(request)
+            if not success:
+                assert grid["barsNeeded"][yi, xi] == 0
+                continue
+            for key in ("barsNeeded", "totalCost", "utilizationRate", "realCost", "unitCost"):
+                assert column_registry.round_values(key, [grid[key][yi, xi]])[0] == expected[key]
+
+
+def test_sweep_endpoint_builds_grid_off_the_event_loop(monkeypatch):
+    on_loop = []
+    build = calculate_router._sweep_response
+
+    def recording_build(*args):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return build(*args)
+
+    monkeypatch.setattr(calculate_router, "_sweep_response", recording_build)
+    base = {
+        "shape": "circle", "diameter": 20, "productLength": 310, "quantity": 100,
+        "cuttingLoss": 2, "headCut": 20, "tailCut": 50, "standardBarLength": 2500,
+        "materialDensity": 7850, "materialPrice": 7000,
+    }
+    body = {"base": base, "x": {"field": "standardBarLength", "values": [2000, 2500]},
+            "y": {"field": "quantity", "values": [1, 100, 1000]}}
+    response = TestClient(app).post("/api/v1/calculate/rod/sweep", json=body)
+
+    assert response.status_code == 200
+    assert on_loop == [False]
+    grid = sweep_rod(base, "standardBarLength", [2000, 2500], "quantity", [1, 100, 1000])
+    result = response.json()
+    assert result["barsNeeded"] == grid["barsNeeded"].tolist()
+    assert result["totalCost"] == [column_registry.round_values("totalCost", row) for row in grid["totalCost"].tolist()]
+
+
+def test_price_breaks_match_scalar_endpoint_and_sweet_spots():
+    base = {
+        "shape": "hexagon", "diameter": 17, "productLength": 42.5, "quantity": 1,
+        "cuttingLoss": 2, "headCut": 20, "tailCut": 50, "standardBarLength": 2500,
+        "materialDensity": 8500, "materialPrice": 8000,
+        "actualProductWeight": 60, "recoveryRatio": 80, "scrapUnitPrice": 6400,
+    }
+    # 사용 가능 길이 2430 / 44.5 → 봉재당 54개
+    quantities = [100, 500, 1000, 5000, 54, 55]
+    breaks = price_breaks(base, quantities, max_sweet_spots=10)
+    assert breaks["piecesPerBar"] == 54
+    for i, quantity in enumerate(quantities):
+        success, expected = _scalar_payload(RodCalculateRequest(**{**base, "quantity": quantity}))
+        assert success
+        for key in ("barsNeeded", "totalCost", "utilizationRate", "realCost", "unitCost"):
+            assert column_registry.round_values(key, [breaks[key][i]])[0] == expected[key]
+    assert breaks["fullBarQuantity"].tolist() == [108, 540, 1026, 5022, 54, 108]
+
+    # sweet spot: 54 ~ 5000 사이의 54 배수 92개, 앞에서 10개만 - 개당 단가가 모두 같고 범위 내 최저
+    spots = breaks["sweetSpots"]
+    assert breaks["sweetSpotCount"] == 92
+    assert spots["quantity"].tolist() == [54 * k for k in range(1, 11)]
+    assert spots["barsNeeded"].tolist() == list(range(1, 11))
+    assert max(spots["unitCost"]) - min(spots["unitCost"]) < 1e-9
+    assert min(spots["unitCost"]) <= breaks["unitCost"].min() + 1e-9
+
+    assert price_breaks({**base, "productLength": 3000}, [10]) is None
+
+
+def test_price_break_endpoint_range():
+    base = RodCalculateRequest(shape="circle", diameter=20, productLength=30, quantity=1, cuttingLoss=2, headCut=20,
+                               tailCut=50, standardBarLength=2500, materialDensity=7850, materialPrice=1500)
+    response = asyncio.run(calculate_rod_price_breaks(RodPriceBreakRequest(base=base, start=1, stop=1000, step=1)))
+    assert response.piecesPerBar == 75
+    assert response.quantities == list(range(1, 1001))
+    assert response.barsNeeded[74:77] == [1, 2, 2]
+    assert response.sweetSpotCount == 13 and response.sweetSpots[-1].quantity == 975
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from core_logic.rod_inverse import solve_max_quantity
+from core_logic.rod_pipeline import RodJob
+
+BASE = {
+    "shape": "circle",
+    "diameter": 20,
+    "productLength": 30,
+    "cuttingLoss": 2,
+    "headCut": 20,
+    "tailCut": 50,
+    "standardBarLength": 2500,
+    "materialDensity": 7850,
+    "materialPrice": 1500,
+}
+
+
+def _job(data, quantity):
+    return RodJob.from_dict({**data, "quantity": quantity}).run()
+
+
+def test_bar_weight_and_budget_limits_round_trip_through_forward_formulas():
+    # 봉재당 75개 - 37개 보유 → 2775개
+    result = solve_max_quantity({**BASE, "barsAvailable": 37})
+    assert (result["piecesPerBar"], result["maxQuantity"], result["barsNeeded"]) == (75, 2775, 37)
+
+    budget = 2_000_000
+    result = solve_max_quantity({**BASE, "maxCost": budget, "maxMaterialWeight": 1000, "barsAvailable": 500})
+    by_limit = {entry["limit"]: entry for entry in result["limits"]}
+    assert result["limitingFactor"] == "weight"
+    assert result["maxQuantity"] == min(entry["maxQuantity"] for entry in result["limits"])
+    # 한도 안의 최대 봉재 수 - 봉재 1개 더하면 한도 초과
+    cost_bars = by_limit["cost"]["barsNeeded"]
+    assert _job(BASE, cost_bars * 75).total_cost <= budget < _job(BASE, cost_bars * 75 + 1).total_cost
+    weight_bars = by_limit["weight"]["barsNeeded"]
+    assert _job(BASE, weight_bars * 75).material_total_weight <= 1000 < _job(BASE, weight_bars * 75 + 1).material_total_weight
+
+
+def test_budget_with_scrap_credit_matches_brute_force():
+    rng = random.Random(8)
+    for _ in range(60):
+        data = {**BASE, "productLength": rng.randint(10, 300), "diameter": rng.choice([8, 20, 45]),
+                "actualProductWeight": rng.choice([5, 20, 60, 200]), "recoveryRatio": rng.choice([50, 80, 100]),
+                "scrapUnitPrice": rng.choice([300, 900, 1400]), "useScrapCredit": True,
+                "maxCost": rng.uniform(1000, 300000)}
+        result = solve_max_quantity(data)
+        assert result["scrapCreditApplied"]
+        quantity, per_bar = result["maxQuantity"], result["piecesPerBar"]
+        # 실제 재료비는 톱니 모양 - 최대 수량 뒤로 봉재 몇 개 구간까지 예산 안에 드는 수량이 없어야 한다
+        assert quantity == 0 or _job(data, quantity).real_cost <= data["maxCost"]
+        assert all(_job(data, q).real_cost > data["maxCost"] for q in range(quantity + 1, quantity + 3 * per_bar))
+
+    plain = solve_max_quantity({**data, "useScrapCredit": False})
+    assert not plain["scrapCreditApplied"] and plain["maxQuantity"] <= result["maxQuantity"]
+
+
+def test_unusable_and_missing_limits():
+    assert solve_max_quantity({**BASE, "productLength": 3000, "barsAvailable": 3}) is None
+    with pytest.raises(ValueError):
+        solve_max_quantity({**BASE, "materialPrice": 0, "maxCost": 1000})
+    result = solve_max_quantity({**BASE, "materialPrice": 0, "maxCost": 1000, "barsAvailable": 2})
+    assert result["maxQuantity"] == 150 and result["notes"]
+
+
+def test_max_quantity_endpoint():
+    client = TestClient(app)
+    response = client.post("/api/v1/calculate/rod/max-quantity", json={**BASE, "barsAvailable": 37, "maxCost": 2_000_000})
+    assert response.status_code == 200
+    result = response.json()
+    assert result["maxQuantity"] == 2775 and result["limitingFactor"] == "bars"
+
+    assert client.post("/api/v1/calculate/rod/max-quantity", json=BASE).status_code == 422
+    unusable = client.post("/api/v1/calculate/rod/max-quantity", json={**BASE, "productLength": 3000, "barsAvailable": 3})
+    assert unusable.status_code == 400
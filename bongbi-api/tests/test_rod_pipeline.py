@@ -0,0 +1,80 @@
+import random
+
+from core_logic.rod import (
+    calculate_bars_needed, calculate_material_total_weight, calculate_product_total_weight,
+    calculate_total_cost, calculate_utilization_rate, calculate_wastage, calculate_unit_cost,
+    validate_rod_calculation
+)
+from core_logic.rod_pipeline import RodJob, run_rod_job
+from core_logic.scrap import calculate_scrap_metrics
+
+
+def _threaded(data):
+    """기존 calculate_rod 방식 - dict 에 중간 결과를 써 넣으며 함수별로 다시 읽음"""
+    data = dict(data)
+    warnings = validate_rod_calculation(data)
+    data['barsNeeded'] = calculate_bars_needed(data)
+    data['materialTotalWeight'] = calculate_material_total_weight(data)
+    data['totalWeight'] = calculate_product_total_weight(data)
+    data['totalCost'] = calculate_total_cost(data)
+    data['utilizationRate'] = calculate_utilization_rate(data)
+    wastage = calculate_wastage(data)
+    scrap = calculate_scrap_metrics(data)
+    if scrap.get('updatedTotalWeight') is not None:
+        data['totalWeight'] = scrap['updatedTotalWeight']
+    return {
+        "barsNeeded": data['barsNeeded'],
+        "materialTotalWeight": data['materialTotalWeight'],
+        "totalWeight": data['totalWeight'],
+        "totalCost": data['totalCost'],
+        "unitCost": calculate_unit_cost(data),
+        "utilizationRate": data['utilizationRate'],
+        "wastage": wastage,
+        "scrapWeight": scrap['scrapWeight'],
+        "scrapSavings": scrap['scrapSavings'],
+        "realCost": scrap['realCost'],
+        "totalActualProductWeight": scrap['totalActualProductWeight'],
+    }, [w.message for w in warnings + scrap['warnings']]
+
+
+def _random_request(rng):
+    data = {
+        "shape": rng.choice(["circle", "square", "rectangle", "hexagon", "Circle"]),
+        "diameter": rng.choice([0, rng.uniform(3, 80)]),
+        "width": rng.uniform(5, 60),
+        "height": rng.uniform(5, 60),
+        "productLength": rng.uniform(5, 900),
+        "quantity": rng.randint(0, 5000),
+        "cuttingLoss": rng.uniform(0, 5),
+        "headCut": rng.uniform(0, 60),
+        "tailCut": rng.uniform(0, 120),
+        "standardBarLength": rng.choice([2500, 3000, 4000, 600]),
+        "materialDensity": rng.choice([7850, 8500, "2700", None]),
+        "materialPrice": rng.uniform(0, 12000),
+    }
+    if rng.random() < 0.3:
+        data["productWeight"] = rng.uniform(1, 900)
+    if rng.random() < 0.6:
+        data["actualProductWeight"] = rng.uniform(1, 900)
+        data["recoveryRatio"] = rng.uniform(0, 120)
+        data["scrapUnitPrice"] = rng.uniform(0, 6000)
+    return data
+
+
+def test_job_matches_threaded_functions_bit_for_bit():
+    rng = random.Random(12)
+    for _ in range(3000):
+        data = _random_request(rng)
+        expected, expected_messages = _threaded(data)
+        job = run_rod_job(data)
+        assert job.values() == expected, data
+        assert [w.message for w in job.warnings] == expected_messages
+
+
+def test_job_parses_strings_and_missing_values_once():
+    job = RodJob.from_dict({"shape": "CIRCLE", "diameter": "20", "productLength": 310, "quantity": "100",
+                            "standardBarLength": 2500, "materialDensity": None})
+    assert (job.shape, job.diameter, job.quantity, job.material_density) == ("circle", 20.0, 100.0, 0.0)
+    assert job.run().bars_needed == 13
+    assert job.material_total_weight == 0.0
+    assert not hasattr(job, "__dict__")
@@ -0,0 +1,95 @@
+import random
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from core_logic.rod import calculate_bars_needed
+from core_logic.rod_pooling import pool_rod_quote
+
+BASE = {
+    "material": "SUM24L",
+    "shape": "circle",
+    "diameter": 20,
+    "cuttingLoss": 2,
+    "headCut": 20,
+    "tailCut": 50,
+    "standardBarLength": 2500,
+    "materialDensity": 7850,
+    "materialPrice": 1500,
+}
+
+
+def test_partial_bars_of_matching_lines_are_pooled_and_allocated_back():
+    # 사용 가능 길이 2430: 30mm → 75개/봉재 (나머지 25개), 45mm → 51개/봉재 (나머지 19개), 120mm → 19개/봉재 (나머지 13개)
+    lines = [
+        {**BASE, "productLength": 30, "quantity": 100},
+        {**BASE, "productLength": 45, "quantity": 70},
+        {**BASE, "productLength": 120, "quantity": 13},
+    ]
+    quote = pool_rod_quote(lines)
+
+    assert quote["barsNeededAlone"] == sum(calculate_bars_needed(line) for line in lines) == 5
+    assert quote["barsNeeded"] == 4 and quote["barsSaved"] == 1
+    assert quote["savingRate"] == pytest.approx(20.0)
+    [group] = quote["groups"]
+    assert group["lines"] == [0, 1, 2] and group["pooledPieces"] == 25 + 19 + 13
+
+    # 배분한 봉재/비용의 합은 그룹 합계와 같고, 각 행은 온전한 봉재 수 이상을 받는다
+    assert sum(line["allocatedBars"] for line in quote["lines"]) == pytest.approx(group["barsNeeded"])
+    assert sum(line["totalCost"] for line in quote["lines"]) == pytest.approx(group["totalCost"])
+    assert [line["allocatedBars"] >= full for line, full in zip(quote["lines"], [1, 1, 0])] == [True] * 3
+    assert quote["costSaved"] == pytest.approx(sum(line["costSaved"] for line in quote["lines"]))
+
+
+def test_lines_are_pooled_only_with_the_same_stock():
+    lines = [
+        {**BASE, "productLength": 30, "quantity": 10},
+        {**BASE, "material": "SUS304", "productLength": 30, "quantity": 10},
+        {**BASE, "diameter": 25, "productLength": 30, "quantity": 10},
+        {**BASE, "standardBarLength": 3000, "productLength": 30, "quantity": 10},
+        {**BASE, "material": None, "productLength": 30, "quantity": 10},
+        {**BASE, "material": None, "productLength": 30, "quantity": 10},
+    ]
+    quote = pool_rod_quote(lines)
+    assert len(quote["groups"]) == 6
+    assert quote["barsSaved"] == 0 and quote["costSaved"] == 0
+
+    with pytest.raises(ValueError, match="1번 행"):
+        pool_rod_quote([lines[0], {**BASE, "productLength": 2500, "quantity": 1}])
+
+
+def test_grouping_and_allocation_scale_linearly():
+    rng = random.Random(3)
+
+    def lines(n):
+        return [{**BASE, "material": rng.choice(["SUM24L", "SUS304", "S45C"]), "diameter": rng.choice([10, 20, 30]),
+                 "productLength": rng.randint(20, 400), "quantity": rng.randint(1, 500)} for _ in range(n)]
+
+    small, large = lines(1000), lines(8000)
+    started = time.perf_counter()
+    pool_rod_quote(small)
+    small_elapsed = time.perf_counter() - started
+    started = time.perf_counter()
+    quote = pool_rod_quote(large)
+    large_elapsed = time.perf_counter() - started
+
+    assert len(quote["lines"]) == 8000 and quote["barsSaved"] > 0
+    assert large_elapsed < 2.0
+    assert large_elapsed < small_elapsed * 8 * 3  # 선형 + 여유
+
+
+def test_quote_endpoint():
+    client = TestClient(app)
+    response = client.post("/api/v1/calculate/rod/quote", json={"lines": [
+        {**BASE, "productLength": 30, "quantity": 100},
+        {**BASE, "productLength": 45, "quantity": 70},
+    ]})
+    assert response.status_code == 200
+    quote = response.json()
+    assert quote["barsNeeded"] == quote["barsNeededAlone"] - 1
+    assert quote["lines"][0]["totalCost"] < quote["lines"][0]["totalCostAlone"]
+
+    unusable = client.post("/api/v1/calculate/rod/quote", json={"lines": [{**BASE, "productLength": 3000, "quantity": 1}]})
+    assert unusable.status_code == 400 and "0번 행" in unusable.json()["message"]
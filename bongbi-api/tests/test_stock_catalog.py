@@ -0,0 +1,71 @@
+import itertools
+import math
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from core_logic.rod import calculate_bars_needed, calculate_material_total_weight, calculate_total_cost
+from core_logic.stock_catalog import optimize_stock_mix
+
+
+BASE = {
+    "shape": "circle", "diameter": 20, "productLength": 310, "quantity": 100,
+    "cuttingLoss": 2, "headCut": 20, "tailCut": 50,
+    "materialDensity": 7850, "materialPrice": 7000,
+}
+CATALOG = [
+    {"standardBarLength": 2500},
+    {"standardBarLength": 3000, "materialPrice": 6900},
+    {"standardBarLength": 3500, "materialPrice": 6950},
+]
+
+
+def _brute_force_cost(data, options):
+    quantity = data["quantity"]
+    best = math.inf
+    ranges = [range(0, -(-quantity // o["piecesPerBar"]) + 1) for o in options]
+    for counts in itertools.product(*ranges):
+        if sum(c * o["piecesPerBar"] for c, o in zip(counts, options)) >= quantity:
+            best = min(best, sum(c * o["costPerBar"] for c, o in zip(counts, options)))
+    return best
+
+
+def test_stock_mix_matches_brute_force():
+    for quantity in (1, 7, 19, 100, 137):
+        data = {**BASE, "quantity": quantity}
+        result = optimize_stock_mix(data, CATALOG)
+        expected = _brute_force_cost(data, result["options"])
+        assert math.isclose(result["optimal"]["totalCost"], expected, rel_tol=1e-9)
+        assert sum(e["bars"] * e["piecesPerBar"] for e in result["optimal"]["mix"]) >= quantity
+        best_single = min(o["totalCost"] for o in result["options"])
+        assert result["optimal"]["totalCost"] <= best_single + 1e-6
+
+
+def test_single_length_catalog_equals_scalar_rod():
+    result = optimize_stock_mix(BASE, [{"standardBarLength": 2500}])
+    data = {**BASE, "standardBarLength": 2500}
+    bars = calculate_bars_needed(data)
+    weight = calculate_material_total_weight({**data, "barsNeeded": bars})
+    assert result["optimal"]["barsNeeded"] == bars
+    assert math.isclose(result["optimal"]["totalCost"],
+                        calculate_total_cost({"materialTotalWeight": weight, "materialPrice": 7000}))
+    assert result["savingsVsBestSingle"] == 0.0
+
+
+def test_stock_mix_skips_lengths_that_cannot_fit_a_piece():
+    result = optimize_stock_mix({**BASE, "productLength": 2800}, CATALOG)
+    assert [o["standardBarLength"] for o in result["options"]] == [3000, 3500]
+
+    none_fit = optimize_stock_mix({**BASE, "productLength": 5000}, CATALOG)
+    assert none_fit["optimal"] is None
+
+
+def test_stock_mix_endpoint_is_rounded_per_column_master():
+    response = TestClient(app).post("/api/v1/calculate/rod/stock-mix", json={**BASE, "quantity": 137, "catalog": CATALOG})
+    assert response.status_code == 200
+    body = response.json()
+    rows = body["options"] + [body["optimal"]] + body["optimal"]["mix"]
+    assert all(row["totalCost"] == round(row["totalCost"]) for row in rows)
+    assert all(row["materialTotalWeight"] == round(row["materialTotalWeight"], 3) for row in rows)
+    assert all(row["utilizationRate"] == round(row["utilizationRate"], 2) for row in rows if "utilizationRate" in row)
+    assert body["savingsVsBestSingle"] == round(body["savingsVsBestSingle"])
@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import remnant_router, stream_router
+from app.api.calculate_router import calculate_rod, plate_response
+from app.api.result_cache import result_cache
+from app.api.schemas import LegacyFieldSupport, PlateCalculateRequest, RodCalculateRequest
+from app.main import app
+from app.storage.remnant_store import PlateRemnantStore, RemnantStore
+from core_logic.remnant import make_plate_remnant_key, make_remnant_key
+
+
+ROD = {
+    "shape": "circle", "diameter": 20, "productLength": 310, "quantity": 100,
+    "cuttingLoss": 2, "headCut": 20, "tailCut": 50, "standardBarLength": 2500,
+    "materialDensity": 7850, "materialPrice": 7000,
+}
+PLATE = {
+    "plateThickness": 10, "plateWidth": 100, "plateLength": 200, "quantity": 50,
+    "materialDensity": 7850, "plateUnitPrice": 7000,
+}
+
+
+def _post_stream(body: bytes):
+    client = TestClient(app)
+    response = client.post("/api/v1/calculate/stream", content=body)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_stream_rows_match_scalar_endpoint_across_chunks(monkeypatch):
+    monkeypatch.setattr(stream_router, "STREAM_CHUNK_ROWS", 3)
+    rows = [{**ROD, "id": i, "quantity": i * 37 + 1} for i in range(10)]
+    body = "\n".join(json.dumps(row) for row in rows).encode()
+
+    results = _post_stream(body)
+
+    assert [r["id"] for r in results] == list(range(10))
+    for row, result in zip(rows, results):
+        request = RodCalculateRequest(**{k: v for k, v in row.items() if k != "id"})
+        expected = asyncio.run(calculate_rod(request)).model_dump(mode="json", exclude_none=True)
+        assert result["success"] is True
+        assert result["result"] == expected
+
+
+def test_stream_reports_bad_rows_without_aborting():
+    lines = [
+        json.dumps({**ROD, "type": "rod"}),
+        "{not json",
+        "",
+        json.dumps({**ROD, "productLength": 3000}),
+        json.dumps({**PLATE, "type": "plate"}),
+        json.dumps({"type": "scrap"}),
+        json.dumps({"type": "unknown"}),
+        "x" * (stream_router.STREAM_MAX_LINE_BYTES + 1),
+        json.dumps({**ROD, "type": "rod", "id": "last"}),
+    ]
+    results = _post_stream("\n".join(lines).encode())
+
+    assert [r["line"] for r in results] == [1, 2, 4, 5, 6, 7, 8, 9]
+    assert [r["success"] for r in results] == [True, False, False, True, False, False, False, True]
+    assert results[2]["error"]["message"].startswith("계산 불가능")
+    assert results[3]["result"]["isPlate"] is True
+    assert results[5]["error"]["field"] == "type"
+    assert results[7]["id"] == "last"
+
+
+def test_stream_rows_are_stateless_for_every_type(monkeypatch, tmp_path):
+    rods = RemnantStore(str(tmp_path / "remnants.db"))
+    plates = PlateRemnantStore(str(tmp_path / "remnants.db"))
+    monkeypatch.setattr(remnant_router, "_remnant_store", rods)
+    monkeypatch.setattr(remnant_router, "_plate_remnant_store", plates)
+    rods.add(make_remnant_key("SUM24L", "circle", 20), 1000)
+    plates.add(make_plate_remnant_key("SS400", 10), 1219, 1300)
+    remnant_flags = {"useRemnants": True, "consumeRemnants": True}
+    plate = {**PLATE, "material": "SS400", "sheetWidth": 1219, "sheetLength": 2438}
+    lines = [
+        json.dumps({**ROD, **remnant_flags, "material": "SUM24L", "type": "rod"}),
+        json.dumps({**plate, **remnant_flags, "type": "plate"}),
+        json.dumps({"type": "scrap", "totalWeight": 100, "totalCost": 70000, "quantity": 1000,
+                    "actualProductWeight": 80, "recoveryRatio": 80, "scrapUnitPrice": 500}),
+    ]
+    # 결과 캐시에 다른 값이 들어 있어도 스트림은 매번 계산한다
+    monkeypatch.setattr(result_cache, "get", lambda key: pytest.fail("stream must not read the result cache"))
+
+    results = _post_stream("\n".join(lines).encode())
+
+    assert [r["success"] for r in results] == [True, True, True]
+    assert all("remnantPlan" not in r["result"] for r in results)
+    assert rods.stats()["totalRemnants"] == 1 and plates.stats()["totalRemnants"] == 1
+    expected_plate = plate_response(LegacyFieldSupport.apply_aliases(PlateCalculateRequest(**plate).model_dump()))
+    assert results[1]["result"] == expected_plate.model_dump(mode="json", exclude_none=True)
+    assert results[1]["result"]["sheetsNeeded"] > 0
+
+
+def test_unhashable_type_and_unexpected_parse_errors_become_error_lines(monkeypatch):
+    def broken_model(**payload):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(stream_router.STREAM_REQUEST_MODELS, "scrap", broken_model)
+    lines = [
+        json.dumps({"type": ["rod"]}),
+        json.dumps({"type": {"kind": "rod"}}),
+        json.dumps({"type": "scrap"}),
+        json.dumps({**ROD, "id": "ok"}),
+    ]
+    results = _post_stream("\n".join(lines).encode())
+
+    assert [r["success"] for r in results] == [False, False, False, True]
+    assert results[0]["error"]["field"] == "type" and results[1]["error"]["field"] == "type"
+    assert "boom" in results[2]["error"]["message"]
+    assert results[3]["id"] == "ok"
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import os
+import signal
+import socket
+import time
+
+import httpx
+import uvicorn
+from fastapi.testclient import TestClient
+
+from app.api.worker_status import WorkerStatus, worker_status
+from app.gunicorn_worker import DrainingServer
+from app.main import app
+
+
+def test_cluster_lists_workers_and_marks_stale(tmp_path):
+    status = WorkerStatus(str(tmp_path), heartbeat_seconds=0.05, stats=lambda: {"in_flight": 0})
+
+    async def scenario():
+        await status.start()
+        # 하트비트가 끊긴 다른 워커
+        with open(tmp_path / "worker-1.json", "w", encoding="utf-8") as f:
+            json.dump({"pid": 1, "ready": True, "draining": False, "heartbeat_at": time.time() - 10}, f)
+        await asyncio.sleep(0.12)
+        workers = {state["pid"]: state for state in status.cluster()}
+        assert workers[os.getpid()]["ready"] and not workers[os.getpid()]["stale"]
+        assert workers[os.getpid()]["in_flight"] == 0
+        assert workers[1]["stale"] and not workers[1]["ready"]
+
+        status.mark_draining()
+        workers = {state["pid"]: state for state in status.cluster()}
+        assert workers[os.getpid()]["draining"] and not workers[os.getpid()]["ready"]
+        await status.stop()
+
+    asyncio.run(scenario())
+    assert os.listdir(tmp_path) == ["worker-1.json"]
+
+
+def test_ready_endpoint_follows_worker_state(monkeypatch):
+    client = TestClient(app)
+    monkeypatch.setattr(worker_status, "ready", True)
+    monkeypatch.setattr(worker_status, "draining", False)
+    assert client.get("/api/v1/ready").status_code == 200
+    health = client.get("/api/v1/health").json()
+    assert health["status"] == "ok" and health["worker"]["pid"] == os.getpid()
+
+    monkeypatch.setattr(worker_status, "draining", True)
+    assert client.get("/api/v1/ready").status_code == 503
+    assert client.get("/api/v1/health").json()["status"] == "draining"
+
+
+def test_draining_server_reports_503_before_in_flight_requests_finish(monkeypatch):
+    monkeypatch.setattr(worker_status, "ready", True)
+    monkeypatch.setattr(worker_status, "draining", False)
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def slow_app(scope, receive, send):
+            # 처리 중인 요청 흉내 - release 될 때까지 응답하지 않음
+            if scope["type"] == "http" and scope["path"] == "/slow":
+                await release.wait()
+                await send({"type": "http.response.start", "status": 200, "headers": []})
+                await send({"type": "http.response.body", "body": b"done"})
+                return
+            await app(scope, receive, send)
+
+        server = DrainingServer(uvicorn.Config(slow_app, host="127.0.0.1", port=port, lifespan="off",
+                                               log_level="warning"), drain_seconds=0.5)
+        serving = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.01)
+        base = f"http://127.0.0.1:{port}"
+        async with httpx.AsyncClient() as client:
+            in_flight = asyncio.create_task(client.get(f"{base}/slow"))
+            await asyncio.sleep(0.1)
+            server.handle_exit(signal.SIGTERM, None)
+
+            # 종료 신호 직후 - 처리 중인 요청이 남아 있는 동안 이미 503 / draining
+            async with httpx.AsyncClient() as probe:
+                assert (await probe.get(f"{base}/api/v1/ready")).status_code == 503
+                assert (await probe.get(f"{base}/api/v1/health")).json()["status"] == "draining"
+            assert not in_flight.done() and not server.should_exit
+
+            release.set()
+            response = await in_flight
+            assert response.status_code == 200 and response.text == "done"
+        await asyncio.wait_for(serving, 5)
+
+    asyncio.run(scenario())